@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# FastMDSimulation/scripts/benchmark_batched.py
+
+"""
+Aggregate CPU throughput of N small implicit-solvent systems, one Context each
+versus one batched Context (defaults.batch).
+
+  python scripts/benchmark_batched.py trpcage.pdb --copies 8 16 32 64 --steps 2000
+
+Reports ns/day summed over all copies for both modes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+
+def _defaults(platform: str) -> dict:
+    return {
+        "forcefield": ["amber14-all.xml", "implicit/gbn2.xml"],
+        "create_system": {"nonbondedMethod": "CutoffNonPeriodic"},
+        "platform": platform,
+        "temperature_K": 300,
+        "timestep_fs": 2.0,
+    }
+
+
+def _ns_per_day(copies: int, steps: int, dt_fs: float, wall_s: float) -> float:
+    return copies * steps * dt_fs * 1e-6 / (wall_s / 86400.0)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("pdb")
+    ap.add_argument("--copies", type=int, nargs="+", default=[8, 16, 32, 64])
+    ap.add_argument("--steps", type=int, default=2000)
+    ap.add_argument("--platform", default="CPU")
+    args = ap.parse_args()
+
+    from fastmdsimulation.engines.openmm_engine import build_batched_simulation
+
+    defaults = _defaults(args.platform)
+    spec = {"pdb": args.pdb}
+    print(f"{args.pdb}: {args.steps} steps, platform {args.platform}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.copies:
+            dirs = [Path(tmp) / f"n{n}" / f"c{i}" for i in range(n)]
+
+            # a batch of one is the same System as an unbatched build
+            sims = [build_batched_simulation([spec], defaults, [d])[0] for d in dirs]
+            t0 = time.perf_counter()
+            for sim in sims:
+                sim.step(args.steps)
+            single = time.perf_counter() - t0
+            del sims
+
+            sim, _ = build_batched_simulation([spec] * n, defaults, dirs)
+            t0 = time.perf_counter()
+            sim.step(args.steps)
+            batched = time.perf_counter() - t0
+
+            a = _ns_per_day(n, args.steps, defaults["timestep_fs"], single)
+            b = _ns_per_day(n, args.steps, defaults["timestep_fs"], batched)
+            print(
+                f"  N={n:3d}  separate {a:9.1f} ns/day   batched {b:9.1f} ns/day   x{b / a:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# FastMDSimulation/scripts/benchmark_forcefield_cache.py
+
+"""
+Per-run ForceField setup time with and without the ForceField cache.
+
+  python scripts/benchmark_forcefield_cache.py --runs 5
+  python scripts/benchmark_forcefield_cache.py --forcefield amber14-all.xml amber14/tip3p.xml
+
+Reports:
+  uncached   every run re-parses the XML (behaviour before the memo)
+  memoized   later runs in the same process reuse the parsed ForceField
+  disk       a fresh worker process loading the pickled ForceField
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+_CHILD = """
+import sys, time
+from fastmdsimulation.engines.openmm_engine import _load_forcefield
+t0 = time.perf_counter()
+_load_forcefield(sys.argv[1:])
+print(time.perf_counter() - t0)
+"""
+
+
+def _fresh_process(files, env) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, *files],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument(
+        "--forcefield", nargs="+", default=["charmm36.xml", "charmm36/water.xml"]
+    )
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    from fastmdsimulation.engines import openmm_engine
+
+    files = args.forcefield
+
+    uncached = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        openmm_engine._parse_forcefield(files)
+        uncached.append(time.perf_counter() - t0)
+
+    openmm_engine._FF_CACHE.clear()
+    memoized = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        openmm_engine._load_forcefield(files)
+        memoized.append(time.perf_counter() - t0)
+
+    with tempfile.TemporaryDirectory() as cache:
+        env = dict(os.environ, FASTMDS_CACHE_DIR=cache, FASTMDS_FORCEFIELD_CACHE="disk")
+        cold = _fresh_process(files, env)  # parses and writes the pickle
+        disk = [_fresh_process(files, env) for _ in range(args.runs)]
+
+    def _fmt(ts):
+        return f"mean {sum(ts) / len(ts):8.3f} s   total {sum(ts):8.3f} s"
+
+    print(f"ForceField: {' '.join(files)}  ({args.runs} runs)")
+    print(f"  uncached : {_fmt(uncached)}")
+    print(f"  memoized : {_fmt(memoized)}")
+    print(f"  disk     : {_fmt(disk)}   (first process {cold:.3f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,32 @@
 
 """FastMDSimulation — Automated MD with optional FastMDAnalysis handoff."""
 
-from .api import FastMDSimulation
-
-# Expose package version (doesn't crash if metadata is unavailable, e.g., editable installs)
-try:
-    from importlib.metadata import PackageNotFoundError, version  # Python 3.8+
 
+def _package_version() -> str:
+    # Doesn't crash if metadata is unavailable, e.g., editable installs
     try:
-        __version__ = version("fastmdsimulation")
-    except PackageNotFoundError:
-        __version__ = "0.0.0"
-except Exception:  # very old Python or unexpected env
-    __version__ = "0.0.0"
+        from importlib.metadata import PackageNotFoundError, version  # Python 3.8+
+
+        try:
+            return version("fastmdsimulation")
+        except PackageNotFoundError:
+            return "0.0.0"
+    except Exception:  # very old Python or unexpected env
+        return "0.0.0"
+
+
+def __getattr__(name):
+    # Resolved on first access, so `import fastmdsimulation.cli` (e.g. for
+    # `fastmds -v`) does not import the orchestrator and engines
+    if name == "FastMDSimulation":
+        from .api import FastMDSimulation
+
+        globals()[name] = FastMDSimulation
+        return FastMDSimulation
+    if name == "__version__":
+        value = globals()[name] = _package_version()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["FastMDSimulation", "__version__"]
@@ -38,6 +38,8 @@ class FastMDSimulation:
         frames: Optional[str] = None,
         atoms: Optional[str] = None,
         slides: bool = True,
+        analyze_as_you_go: bool = False,
+        analysis_workers: int = 1,
     ) -> str:
         """
         Run the simulation (and optional analysis).
@@ -52,6 +54,11 @@ class FastMDSimulation:
             Atom selection string (e.g., "protein", "protein and name CA").
         slides : bool
             If True, include slide deck output in analysis.
+        analyze_as_you_go : bool
+            YAML jobs only: analyze each run in the background as soon as it
+            finishes instead of after the whole project (implies `analyze`).
+        analysis_workers : int
+            Maximum number of concurrent analyses.
 
         Returns
         -------
@@ -63,17 +70,37 @@ class FastMDSimulation:
                 logger.warning(
                     "Ignoring `config`: a job YAML was supplied as `system`."
                 )
+            if analyze_as_you_go:
+                from .reporting.analysis_bridge import AnalysisPool
+
+                pool = AnalysisPool(
+                    analysis_workers, slides=slides, frames=frames, atoms=atoms
+                )
+                try:
+                    project = run_from_yaml(
+                        self.system, self.output, on_run_done=pool.submit
+                    )
+                finally:
+                    status = pool.join()
+                if "ok" not in status.values():
+                    logger.error("Analysis failed or found no production stages.")
+                return project
             project = run_from_yaml(self.system, self.output)
         else:
             project = simulate_from_pdb(
                 self.system, outdir=self.output, config=self.config
             )
 
-        if analyze:
+        if analyze or analyze_as_you_go:
             try:
                 from .reporting.analysis_bridge import analyze_with_bridge
 
-                analyze_with_bridge(project, slides=slides, frames=frames, atoms=atoms)
+                extra = {"workers": analysis_workers} if analysis_workers != 1 else {}
+                status = analyze_with_bridge(
+                    project, slides=slides, frames=frames, atoms=atoms, **extra
+                )
+                if "ok" not in status.values():
+                    logger.error("Analysis failed or found no production stages.")
             except Exception as e:
                 logger.error(f"Analysis step failed or is unavailable: {e}")
 
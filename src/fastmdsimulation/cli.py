@@ -6,12 +6,62 @@ from pathlib import Path
 
 import yaml
 
-from .core.orchestrator import resolve_plan, run_from_yaml
-from .core.simulate import build_auto_config, simulate_from_pdb
-from .reporting.analysis_bridge import analyze_with_bridge, build_analyze_cmd
 from .utils.logging import attach_file_logger, setup_console
 
 
+# ---------------------------
+# Lazy entry points
+# ---------------------------
+# `fastmds -v` and dry runs must start fast, so the orchestrator (and with it
+# the engines, PDBFixer and OpenMM helpers) loads only on the paths that run
+# something. Thin wrappers keep these names patchable on this module.
+def resolve_plan(config_path, outdir):
+    from .core.plan import resolve_plan as _impl
+
+    return _impl(config_path, outdir)
+
+
+def run_from_yaml(config_path, outdir, **kwargs):
+    from .core.orchestrator import run_from_yaml as _impl
+
+    return _impl(config_path, outdir, **kwargs)
+
+
+def simulate_from_pdb(system_pdb, **kwargs):
+    from .core.simulate import simulate_from_pdb as _impl
+
+    return _impl(system_pdb, **kwargs)
+
+
+def build_auto_config(fixed_pdb, project=None):
+    from .core.simulate import build_auto_config as _impl
+
+    return _impl(fixed_pdb, project)
+
+
+def _production_trajectory(run, defaults):
+    from .reporting.analysis_bridge import planned_trajectory
+
+    prod = next((s for s in run["stages"] if s["name"] == "production"), {})
+    return planned_trajectory(Path(run["run_dir"]) / "production", prod, defaults)
+
+
+class _VersionAction(argparse.Action):
+    """Print the version and exit while parsing (no subcommand needed)."""
+
+    def __init__(self, option_strings, dest, **kwargs):
+        super().__init__(option_strings, dest, nargs=0, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        try:
+            from importlib.metadata import version
+
+            print(version("fastmdsimulation"))
+        except Exception:
+            print("fastmdsimulation")
+        parser.exit()
+
+
 # ---------------------------
 # Helpers for config merging and log-style detection
 # ---------------------------
@@ -103,6 +153,7 @@ def _resolve_plan_from_pdb(
             "run_dir": str(
                 tmp / f'auto_T{yml_like["defaults"].get("temperature_K", 300)}'
             ),
+            "input": {"id": "auto", "pdb": pdb},  # unfixed; --estimate adds H
             "stages": [
                 {
                     "name": st["name"],
@@ -113,7 +164,40 @@ def _resolve_plan_from_pdb(
             ],
         }
     ]
-    return {"project": auto_cfg["project"], "output_dir": str(tmp), "runs": runs}
+    return {
+        "project": auto_cfg["project"],
+        "output_dir": str(tmp),
+        "runs": runs,
+        "defaults": yml_like["defaults"],
+    }
+
+
+def _plan_estimator(plan: dict):
+    """Per-run cost estimator for `--estimate` (see core.estimate)."""
+    from .core.estimate import PlanEstimator
+
+    return PlanEstimator(plan.get("defaults") or {})
+
+
+def _describe_estimate(est: dict) -> str:
+    from .core.estimate import describe
+
+    return describe(est)
+
+
+def _report_analysis(status: dict) -> None:
+    """Print a one-line summary of a per-run analysis status map."""
+    from .reporting.analysis_bridge import run_label
+
+    failed = sorted(run_label(d) for d, st in status.items() if st != "ok")
+    if "ok" not in status.values() or failed:
+        print(
+            "Analysis skipped or failed"
+            + (f" for: {', '.join(failed)}" if failed else "")
+            + "; install FastMDAnalysis or adjust flags."
+        )
+    else:
+        print(f"Analysis: {len(status)} run(s) ok")
 
 
 # ---------------------------
@@ -125,7 +209,7 @@ def main():
         description="Automated MD simulation. Supports Many-Shot and One-Shot (single PDB) Simulations.",
     )
     parser.add_argument(
-        "-v", "--version", action="store_true", help="Print version and exit"
+        "-v", "--version", action=_VersionAction, help="Print version and exit"
     )
     sub = parser.add_subparsers(dest="cmd", required=True)
 
@@ -159,6 +243,19 @@ def main():
         action="store_true",
         help="Run analysis after simulation (FastMDAnalysis)",
     )
+    p_sim.add_argument(
+        "--analyze-as-you-go",
+        action="store_true",
+        help="Analyze each run as soon as it finishes, in the background, while the "
+        "remaining runs simulate (Systemic Simulations; implies --analyze)",
+    )
+    p_sim.add_argument(
+        "--analysis-workers",
+        type=int,
+        default=None,
+        help="Maximum number of concurrent FastMDAnalysis jobs, for --analyze and "
+        "--analyze-as-you-go (default 1)",
+    )
     p_sim.add_argument(
         "--frames",
         type=str,
@@ -191,6 +288,52 @@ def main():
         help="Print resolved plan (stages, durations, output dirs) and exit. "
         "If --analyze is set, also print the exact fastmda analyze command(s).",
     )
+    p_sim.add_argument(
+        "--estimate",
+        action="store_true",
+        help="Dry run with a cost estimate per run: atom count, ns/day from this "
+        "host's recorded benchmarks, wall time, trajectory size and peak memory "
+        "(implies --dry-run)",
+    )
+    p_sim.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Run up to N runs concurrently, one worker process per device slot "
+        "(Systemic Simulations; overrides defaults.execution.workers)",
+    )
+    p_sim.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted Systemic Simulation: skip runs with done.ok and "
+        "completed stages, continue partial stages from their checkpoints",
+    )
+    p_sim.add_argument(
+        "--via-daemon",
+        action="store_true",
+        help="Run the Systemic Simulation in a running `fastmds serve` daemon and "
+        "stream its log here",
+    )
+    p_sim.add_argument(
+        "--socket",
+        default=None,
+        help="Daemon socket for --via-daemon (default: $FASTMDS_SOCKET or a per-user "
+        "socket in $XDG_RUNTIME_DIR)",
+    )
+    p_sim.add_argument(
+        "--priority",
+        type=int,
+        default=0,
+        help="Daemon queue priority for --via-daemon (higher runs first; default 0)",
+    )
+    p_sim.add_argument(
+        "--run-index",
+        type=str,
+        default=None,
+        metavar="A:B",
+        help="Run only plan runs A..B-1 (Systemic Simulations; used by the job "
+        "arrays of `fastmds submit`)",
+    )
     # Ligand helpers (protein–ligand one-shot)
     p_sim.add_argument(
         "--ligand",
@@ -210,23 +353,242 @@ def main():
         help="Ligand residue name (default LIG)",
     )
 
+    # Cluster submission: one scheduler array task per run (or packed group)
+    p_sub = sub.add_parser(
+        "submit",
+        help="Submit a Systemic Simulation (job.yml) as SLURM/PBS job arrays with "
+        "dependent analysis",
+    )
+    p_sub.add_argument(
+        "-s", "--system", "-system", required=True, help="Path to the job YAML"
+    )
+    p_sub.add_argument(
+        "-o",
+        "--output",
+        default="simulate_output",
+        type=str,
+        help="Output base directory (default: simulate_output)",
+    )
+    p_sub.add_argument(
+        "--scheduler",
+        choices=["slurm", "pbs"],
+        default=None,
+        help="Scheduler (default: inferred from --options; SLURM if not set)",
+    )
+    p_sub.add_argument(
+        "--options",
+        default=None,
+        help="Scheduler options YAML (see examples/slurm_options.yml, "
+        "examples/pbs_options.yml)",
+    )
+    p_sub.add_argument(
+        "--pack",
+        type=int,
+        default=None,
+        help="Runs per array task (default 1, or `pack` in --options)",
+    )
+    p_sub.add_argument(
+        "--no-analyze",
+        action="store_true",
+        help="Do not submit the dependent analysis array",
+    )
+    p_sub.add_argument(
+        "--render-only",
+        action="store_true",
+        help="Write the job scripts to <output>/<project>/_submit/ without "
+        "calling sbatch/qsub",
+    )
+    p_sub.add_argument(
+        "--frames",
+        type=str,
+        default=None,
+        help='Frames selection, e.g., "0,-1,10" or "200"',
+    )
+    p_sub.add_argument(
+        "--atoms", type=str, default=None, help='Atom selection (e.g., "protein")'
+    )
+    p_sub.add_argument(
+        "--slides",
+        choices=["True", "False"],
+        default="True",
+        help="Include slides (default True)",
+    )
+
+    # Shared-filesystem worker: drain a prepared project's runs
+    p_work = sub.add_parser(
+        "worker",
+        help="Claim and run a project's runs from a shared filesystem; start any "
+        "number of workers on any nodes",
+    )
+    p_work.add_argument(
+        "--project",
+        required=True,
+        help="Project directory (<output>/<project>) containing plan.json",
+    )
+    p_work.add_argument(
+        "-s",
+        "--system",
+        "-system",
+        default=None,
+        help="Job YAML; prepares the project and freezes plan.json if it does "
+        "not exist yet (the first worker does it, the others wait)",
+    )
+    p_work.add_argument(
+        "--heartbeat",
+        type=float,
+        default=30.0,
+        help="Seconds between claim heartbeats (default 30)",
+    )
+    p_work.add_argument(
+        "--stale-after",
+        type=float,
+        default=300.0,
+        help="Reclaim runs whose claim has had no heartbeat for this many "
+        "seconds (default 300)",
+    )
+    p_work.add_argument(
+        "--wait",
+        action="store_true",
+        help="Keep polling while other workers hold runs, to take over the runs "
+        "of workers that die (default: exit when nothing is claimable)",
+    )
+    p_work.add_argument(
+        "--max-runs",
+        type=int,
+        default=None,
+        help="Exit after this many runs",
+    )
+
+    # Persistent daemon with warm platforms and force fields
+    p_serve = sub.add_parser(
+        "serve",
+        help="Run a daemon that keeps OpenMM, platforms and force fields warm and "
+        "runs job YAMLs submitted with `simulate --via-daemon`",
+    )
+    p_serve.add_argument(
+        "--socket",
+        default=None,
+        help="Unix socket path (default: $FASTMDS_SOCKET or a per-user socket in "
+        "$XDG_RUNTIME_DIR)",
+    )
+    p_serve.add_argument(
+        "--platform",
+        default="auto",
+        help="Platform to resolve at start-up (default auto)",
+    )
+    p_serve.add_argument(
+        "--forcefield",
+        action="append",
+        default=[],
+        help="Force field XML to parse at start-up (repeat for several files)",
+    )
+    p_serve.add_argument(
+        "--status",
+        action="store_true",
+        help="Print the jobs of the running daemon and exit",
+    )
+    p_serve.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the running daemon after its current job",
+    )
+
     args = parser.parse_args()
 
     # Determine console log style (YAML or overrides or env; default pretty)
-    style = _detect_log_style(args.system, args.config)
+    style = _detect_log_style(
+        getattr(args, "system", None) or "", getattr(args, "config", None)
+    )
     setup_console(style=style)
 
-    if args.version:
-        try:
-            from importlib.metadata import version
+    if args.cmd == "serve":
+        from .core import daemon
 
-            print(version("fastmdsimulation"))
-        except Exception:
-            print("fastmdsimulation")
+        path = args.socket or daemon.default_socket()
+        if args.status or args.stop:
+            try:
+                reply = daemon.request(
+                    path, {"op": "shutdown" if args.stop else "status"}
+                )
+            except OSError:
+                print(f"No daemon at {path}")
+                raise SystemExit(1)
+            if args.stop:
+                print(f"Daemon at {path} stopping")
+                return
+            for job in reply["jobs"]:
+                print(
+                    f"{job['id']:>4}  {job['state']:<9}  p={job['priority']:<3} "
+                    f"{job['config']}"
+                )
+            if not reply["jobs"]:
+                print("No jobs")
+            return
+        daemon.serve(path, platform=args.platform, forcefields=args.forcefield)
+        return
+
+    if args.cmd == "worker":
+        from .core import workqueue
+        from .core.plan import PLAN_FILE
+        from .utils.filelock import FileLock
+
+        project = Path(args.project)
+        if args.system:
+            name = (yaml.safe_load(open(args.system)) or {}).get("project")
+            if name != project.name:
+                parser.error(
+                    f"--project {project} does not match project '{name}' of {args.system}"
+                )
+            with FileLock(project / workqueue.QUEUE_DIR / ".lock"):
+                if not (project / PLAN_FILE).exists():
+                    run_from_yaml(args.system, str(project.parent), prepare_only=True)
+        result = workqueue.run_worker(
+            project,
+            heartbeat_s=args.heartbeat,
+            stale_s=args.stale_after,
+            wait=args.wait,
+            max_runs=args.max_runs,
+        )
+        print(
+            f"Worker: {len(result['done'])} run(s) done, "
+            f"{len(result['failed'])} failed"
+        )
+        if result["failed"]:
+            raise SystemExit(1)
+        return
+
+    if args.cmd == "submit":
+        from .core import submit as submit_mod
+
+        rendered = submit_mod.render(
+            args.system,
+            args.output,
+            scheduler=args.scheduler,
+            options=submit_mod.load_options(args.options),
+            pack=args.pack,
+            analyze=not args.no_analyze,
+            slides=(args.slides == "True"),
+            frames=args.frames,
+            atoms=args.atoms,
+        )
+        print(
+            f"{rendered['scheduler'].upper()}: {rendered['runs']} run(s) in "
+            f"{rendered['tasks']} array task(s)"
+        )
+        print(f"Simulate: {rendered['simulate']}")
+        if rendered["analyze"]:
+            print(f"Analyze:  {rendered['analyze']}")
+        if args.render_only:
+            return
+        ids = submit_mod.submit(rendered)
+        for kind, job_id in ids.items():
+            print(f"Submitted {kind}: {job_id}")
         return
 
     if args.cmd == "simulate":
         system = args.system
+        if args.analyze_as_you_go:
+            args.analyze = True
 
         plumed_cfg = None
         if args.plumed or args.plumed_log_frequency is not None:
@@ -259,7 +621,7 @@ def main():
                 print(
                     "Warning: --ligand flags are ignored for Systemic Simulations; set ligand fields inside the YAML systems[]."
                 )
-            if args.dry_run:
+            if args.dry_run or args.estimate:
                 plan = resolve_plan(system, args.output)
                 print("=== DRY RUN (SYSTEMIC SIMULATION) ===")
                 print(f'Project: {plan["project"]}')
@@ -278,33 +640,92 @@ def main():
                     print(
                         f"PLUMED: enabled | script={desc} | log_frequency={pcfg.get('log_frequency', 100)}"
                     )
+                estimator = _plan_estimator(plan) if args.estimate else None
                 for r in plan["runs"]:
+                    swept = ", ".join(
+                        f"{k}={v}" for k, v in (r.get("sweep") or {}).items()
+                    )
                     print(
-                        f'- Run: {r["system_id"]} @ {r["temperature_K"]} K -> {r["run_dir"]}'
+                        f'- Run: {r["system_id"]} @ {r["temperature_K"]} K'
+                        + (f" ({swept})" if swept else "")
+                        + f' -> {r["run_dir"]}'
                     )
                     for s in r["stages"]:
                         print(
                             f'    · {s["name"]}: {s["steps"]} steps (~{s["approx_ps"]} ps)'
                         )
+                    if estimator is not None:
+                        print("    " + _describe_estimate(estimator(r)))
                     if args.analyze:
+                        from .reporting import analysis_bridge
+
                         prod = Path(r["run_dir"]) / "production"
-                        cmd = build_analyze_cmd(
-                            prod / "traj.dcd",
+                        cmd = analysis_bridge.build_analyze_cmd(
+                            _production_trajectory(r, plan.get("defaults") or {}),
                             prod / "topology.pdb",
                             slides=(args.slides == "True"),
                             frames=args.frames,
                             atoms=args.atoms,
                         )
                         print("    → fastmda command:", " ".join(map(str, cmd)))
+                if estimator is not None:
+                    print(estimator.summary())
                 return
+            run_kwargs = {}
             if overrides:
-                project_dir = run_from_yaml(system, args.output, overrides=overrides)
-            else:
-                project_dir = run_from_yaml(system, args.output)
+                run_kwargs["overrides"] = overrides
+            if args.workers is not None:
+                run_kwargs["workers"] = args.workers
+            if args.resume:
+                run_kwargs["resume"] = True
+            if args.run_index:
+                try:
+                    a, b = (int(x) for x in args.run_index.split(":"))
+                except ValueError:
+                    parser.error("--run-index expects A:B, e.g. 0:4")
+                run_kwargs["run_slice"] = (a, b)
+            pool = None
+            if args.via_daemon and args.analyze_as_you_go:
+                print(
+                    "Warning: --analyze-as-you-go is not available with --via-daemon; "
+                    "analyzing after the job instead."
+                )
+                args.analyze_as_you_go = False
+            if args.analyze_as_you_go:
+                from .reporting import analysis_bridge
+
+                pool = analysis_bridge.AnalysisPool(
+                    args.analysis_workers or 1,
+                    slides=(args.slides == "True"),
+                    frames=args.frames,
+                    atoms=args.atoms,
+                )
+                run_kwargs["on_run_done"] = pool.submit
+            try:
+                if args.via_daemon:
+                    from .core.daemon import submit_job
+
+                    project_dir = submit_job(
+                        system,
+                        args.output,
+                        socket_path=args.socket,
+                        priority=args.priority,
+                        **run_kwargs,
+                    )
+                else:
+                    project_dir = run_from_yaml(system, args.output, **run_kwargs)
+            finally:
+                if pool is not None:
+                    # every queued analysis finishes before we exit
+                    status = pool.join()
+            if pool is not None:
+                # run_from_yaml already logs to <project>/fastmds.log
+                _report_analysis(status)
+                return
 
         # One-Shot Simulation path (PDB-driven)
         else:
-            if args.dry_run:
+            if args.dry_run or args.estimate:
                 plan = _resolve_plan_from_pdb(
                     system, args.output, args.config, overrides
                 )
@@ -325,6 +746,7 @@ def main():
                     print(
                         f"PLUMED: enabled | script={desc} | log_frequency={pcfg.get('log_frequency', 100)}"
                     )
+                estimator = _plan_estimator(plan) if args.estimate else None
                 for r in plan["runs"]:
                     print(
                         f'- Run: {r["system_id"]} @ {r["temperature_K"]} K -> {r["run_dir"]}'
@@ -333,16 +755,22 @@ def main():
                         print(
                             f'    · {s["name"]}: {s["steps"]} steps (~{s["approx_ps"]} ps)'
                         )
+                    if estimator is not None:
+                        print("    " + _describe_estimate(estimator(r)))
                     if args.analyze:
+                        from .reporting import analysis_bridge
+
                         prod = Path(r["run_dir"]) / "production"
-                        cmd = build_analyze_cmd(
-                            prod / "traj.dcd",
+                        cmd = analysis_bridge.build_analyze_cmd(
+                            _production_trajectory(r, plan.get("defaults") or {}),
                             prod / "topology.pdb",
                             slides=(args.slides == "True"),
                             frames=args.frames,
                             atoms=args.atoms,
                         )
                         print("    → fastmda command:", " ".join(map(str, cmd)))
+                if estimator is not None:
+                    print(estimator.summary())
                 return
             kwargs = {
                 "outdir": args.output,
@@ -355,13 +783,16 @@ def main():
         # Attach file logger (plain ISO for audits) and optionally run analysis
         attach_file_logger(str(Path(project_dir) / "fastmds.log"), style="plain")
         if args.analyze:
-            ok = analyze_with_bridge(
+            from .reporting import analysis_bridge
+
+            analyze_kwargs = {}
+            if args.analysis_workers is not None:
+                analyze_kwargs["workers"] = args.analysis_workers
+            status = analysis_bridge.analyze_with_bridge(
                 project_dir,
                 slides=(args.slides == "True"),
                 frames=args.frames,
                 atoms=args.atoms,
+                **analyze_kwargs,
             )
-            if not ok:
-                print(
-                    "Analysis skipped or failed; install FastMDAnalysis or adjust flags."
-                )
+            _report_analysis(status)
@@ -0,0 +1,387 @@
+# FastMDSimulation/src/fastmdsimulation/core/daemon.py
+
+"""
+Persistent simulation daemon (`fastmds serve`).
+
+A long-lived process that keeps the expensive per-invocation setup warm: the
+OpenMM import, the platform probe (memoized in openmm_engine._select_platform),
+parsed ForceFields (openmm_engine._FF_CACHE) and any force fields preloaded
+with --forcefield. Jobs (job YAML paths) arrive over a local Unix socket and
+run one at a time from a priority queue (higher priority first, FIFO within a
+priority) in the daemon process, so every job reuses that warm state. A job
+runs in the submitter's working directory, so relative input paths in its
+YAML resolve as they would for `fastmds simulate`.
+
+Protocol: one JSON request line per connection, JSON reply lines back.
+
+  {"op": "submit", "config": ..., "output": ..., "cwd": ..., "priority": 0,
+   "kwargs": {...}, "stream": true}
+      -> {"event": "queued", "job": id, "position": n}
+         {"event": "log", "level": 20, "msg": "..."}     (stream only)
+         {"event": "done", "job": id, "project_dir": ...}
+         or {"event": "failed", "job": id, "error": ...}
+  {"op": "status"}   -> {"jobs": [...]}
+  {"op": "shutdown"} -> {"ok": true}  (the running job finishes first)
+
+`fastmds simulate --via-daemon` is the client side: it submits a job and
+re-emits the streamed log records through its own console logger.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence
+
+from ..utils.logging import detach_file_logger, get_logger
+
+logger = get_logger("daemon")
+
+# Set on the server and connection threads: their records (e.g. another
+# client's job being queued) belong to no job and are not streamed.
+_infra = threading.local()
+
+_KWARGS = (
+    "overrides",
+    "workers",
+    "resume",
+    "run_slice",
+)  # run_from_yaml options a job may set
+
+
+def default_socket() -> Path:
+    """$FASTMDS_SOCKET, else a per-user socket in $XDG_RUNTIME_DIR or /tmp."""
+    env = os.getenv("FASTMDS_SOCKET")
+    if env:
+        return Path(env).expanduser()
+    base = os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(base) / f"fastmds-{os.getuid()}.sock"
+
+
+def warm_up(platform: str = "auto", forcefields: Sequence[str] = ()) -> None:
+    """Import OpenMM, resolve the platform and parse force fields once."""
+    try:
+        from ..engines.openmm_engine import _load_forcefield, _select_platform
+
+        plat = _select_platform(platform)
+        logger.info(f"Daemon: platform {plat.getName()} ready")
+        if forcefields:
+            _load_forcefield(list(forcefields))
+            logger.info(f"Daemon: force field {', '.join(forcefields)} loaded")
+    except Exception as e:
+        logger.warning(f"Daemon: warm-up incomplete ({e}); jobs will load on demand")
+
+
+class _JobLog(logging.Handler):
+    """Forward log records of the running job to its listeners."""
+
+    def __init__(self, daemon: "Daemon", job_id: int):
+        super().__init__()
+        self.daemon = daemon
+        self.job_id = job_id
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if getattr(record, "fastmds_remote", False):
+            return  # re-emitted by an in-process client; do not echo it back
+        if getattr(_infra, "active", False):
+            return  # logged by a connection or the server, not by this job
+        try:
+            msg = record.getMessage()
+        except Exception:
+            return
+        self.daemon._publish(
+            self.job_id, {"event": "log", "level": record.levelno, "msg": msg}
+        )
+
+
+class Daemon:
+    """Priority job queue plus the single thread that executes the jobs."""
+
+    def __init__(self) -> None:
+        self.jobs: Dict[int, Dict[str, Any]] = {}
+        self._heap: List[tuple] = []
+        self._ids = itertools.count(1)
+        self._cv = threading.Condition()
+        self._listeners: Dict[int, List[queue.Queue]] = {}
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._work, name="fastmds-daemon-jobs", daemon=True
+        )
+
+    # --- queue ---
+    def submit(
+        self,
+        config: str,
+        output: str,
+        priority: int = 0,
+        kwargs: Dict[str, Any] | None = None,
+        listener: queue.Queue | None = None,
+        cwd: str | None = None,
+    ) -> Dict[str, Any]:
+        kwargs = {k: v for k, v in (kwargs or {}).items() if k in _KWARGS}
+        with self._cv:
+            if self._stopping:
+                raise RuntimeError("daemon is shutting down")
+            job_id = next(self._ids)
+            job = {
+                "id": job_id,
+                "config": config,
+                "output": output,
+                "priority": int(priority),
+                "kwargs": kwargs,
+                "cwd": cwd,
+                "state": "queued",
+                "submitted": time.time(),
+            }
+            self.jobs[job_id] = job
+            if listener is not None:
+                self._listeners[job_id] = [listener]
+            # heapq is a min-heap: negate priority; job ids keep FIFO order
+            heapq.heappush(self._heap, (-job["priority"], job_id))
+            self._cv.notify()
+            job["position"] = len(self._heap)
+        logger.info(f"Daemon: job {job_id} queued ({config}, priority {priority})")
+        return job
+
+    def _next(self) -> Dict[str, Any] | None:
+        with self._cv:
+            while not self._heap and not self._stopping:
+                self._cv.wait()
+            if self._stopping:
+                return None
+            _, job_id = heapq.heappop(self._heap)
+            job = self.jobs[job_id]
+            job["state"] = "running"
+            job["started"] = time.time()
+            return job
+
+    def _publish(self, job_id: int, event: Dict[str, Any]) -> None:
+        for q in list(self._listeners.get(job_id, ())):
+            q.put(event)
+
+    def _work(self) -> None:
+        from . import orchestrator
+
+        base = logging.getLogger("fastmds")
+        while True:
+            job = self._next()
+            if job is None:
+                break
+            handler = _JobLog(self, job["id"])
+            base.addHandler(handler)
+            home = os.getcwd()
+            try:
+                if job["cwd"]:
+                    os.chdir(job["cwd"])
+                project_dir = orchestrator.run_from_yaml(
+                    job["config"], job["output"], **job["kwargs"]
+                )
+                job.update(state="done", project_dir=project_dir)
+                end = {"event": "done", "job": job["id"], "project_dir": project_dir}
+            except BaseException as e:
+                job.update(state="failed", error=f"{type(e).__name__}: {e}")
+                end = {"event": "failed", "job": job["id"], "error": job["error"]}
+                logger.error(f"Daemon: job {job['id']} failed: {job['error']}")
+            finally:
+                os.chdir(home)
+                detach_file_logger()  # the project's fastmds.log
+                base.removeHandler(handler)
+                job["finished"] = time.time()
+            self._publish(job["id"], end)
+            self._listeners.pop(job["id"], None)
+
+        # jobs still queued at shutdown are dropped
+        with self._cv:
+            for _, job_id in self._heap:
+                self.jobs[job_id]["state"] = "cancelled"
+                self._publish(
+                    job_id,
+                    {"event": "failed", "job": job_id, "error": "daemon stopped"},
+                )
+            self._heap.clear()
+
+    def status(self) -> List[Dict[str, Any]]:
+        with self._cv:
+            return [
+                {k: v for k, v in job.items() if k != "kwargs"}
+                for job in self.jobs.values()
+            ]
+
+    # --- lifecycle ---
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        with self._cv:
+            self._stopping = True
+            self._cv.notify_all()
+        if wait and self._thread.is_alive():
+            self._thread.join()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _send(self, obj: Dict[str, Any]) -> None:
+        self.wfile.write((json.dumps(obj) + "\n").encode())
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        _infra.active = True
+        daemon: Daemon = self.server.jobs  # type: ignore[attr-defined]
+        try:
+            req = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            self._send({"error": "bad request"})
+            return
+        op = req.get("op")
+        if op == "status":
+            self._send({"jobs": daemon.status()})
+        elif op == "shutdown":
+            self._send({"ok": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif op == "submit":
+            events: queue.Queue | None = queue.Queue() if req.get("stream") else None
+            try:
+                job = daemon.submit(
+                    req["config"],
+                    req["output"],
+                    priority=req.get("priority", 0),
+                    kwargs=req.get("kwargs"),
+                    listener=events,
+                    cwd=req.get("cwd"),
+                )
+            except (KeyError, RuntimeError) as e:
+                self._send({"event": "failed", "error": str(e)})
+                return
+            self._send(
+                {"event": "queued", "job": job["id"], "position": job["position"]}
+            )
+            while events is not None:
+                event = events.get()
+                try:
+                    self._send(event)
+                except OSError:
+                    return  # client went away; the job keeps running
+                if event["event"] in ("done", "failed"):
+                    return
+        else:
+            self._send({"error": f"unknown op {op!r}"})
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(
+    socket_path: str | Path | None = None,
+    platform: str = "auto",
+    forcefields: Sequence[str] = (),
+    ready: threading.Event | None = None,
+) -> None:
+    """Run the daemon until a shutdown request (or KeyboardInterrupt)."""
+    _infra.active = True
+    # absolute: jobs change the working directory while they run
+    path = (Path(socket_path) if socket_path else default_socket()).absolute()
+    if path.exists():
+        try:
+            request(path, {"op": "status"})
+        except OSError:
+            path.unlink()  # left by a daemon that died
+        else:
+            raise RuntimeError(f"a daemon is already listening on {path}")
+
+    warm_up(platform, forcefields)
+    daemon = Daemon()
+    daemon.start()
+    server = _Server(str(path), _Handler)
+    server.jobs = daemon  # type: ignore[attr-defined]
+    os.chmod(path, 0o600)
+    logger.info(f"Daemon: listening on {path}")
+    if ready is not None:
+        ready.set()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+        daemon.stop()
+        logger.info("Daemon: stopped")
+
+
+# ------------------------------------------------------------
+# Client side
+# ------------------------------------------------------------
+def _connect(path: Path) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def request_stream(path: str | Path, req: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Send one request and yield the reply lines."""
+    with _connect(Path(path)) as sock:
+        sock.sendall((json.dumps(req) + "\n").encode())
+        with sock.makefile("rb") as fh:
+            for line in fh:
+                yield json.loads(line)
+
+
+def request(path: str | Path, req: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one request and return its (first) reply."""
+    return next(request_stream(path, req))
+
+
+def submit_job(
+    config: str,
+    output: str,
+    socket_path: str | Path | None = None,
+    priority: int = 0,
+    **kwargs: Any,
+) -> str:
+    """
+    Run a job YAML in the daemon, streaming its log records to this process's
+    logger. Returns the project directory; raises RuntimeError if it fails.
+    """
+    path = Path(socket_path) if socket_path else default_socket()
+    req = {
+        "op": "submit",
+        "config": str(Path(config).resolve()),
+        "output": str(Path(output).resolve()),
+        "cwd": os.getcwd(),
+        "priority": priority,
+        "kwargs": kwargs,
+        "stream": True,
+    }
+    try:
+        for event in request_stream(path, req):
+            kind = event.get("event")
+            if kind == "queued":
+                logger.info(
+                    f"Daemon: job {event['job']} queued (position {event['position']})"
+                )
+            elif kind == "log":
+                logger.log(event["level"], event["msg"], extra={"fastmds_remote": True})
+            elif kind == "done":
+                return event["project_dir"]
+            elif kind == "failed":
+                raise RuntimeError(f"Daemon job failed: {event.get('error')}")
+    except OSError as e:
+        raise RuntimeError(
+            f"No daemon at {path} ({e}); start one with `fastmds serve`"
+        ) from e
+    raise RuntimeError("Daemon closed the connection before the job finished")
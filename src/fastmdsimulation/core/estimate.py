@@ -0,0 +1,339 @@
+# FastMDSimulation/src/fastmdsimulation/core/estimate.py
+
+"""
+Dry-run cost model (`fastmds simulate --dry-run --estimate`).
+
+Estimates, per run and without building anything in OpenMM:
+  - atoms: read from the input (AMBER prmtop POINTERS, GROMACS .gro header,
+    CHARMM psf !NATOM), or for PDB inputs the solute plus the water and ions
+    that solvation with `box_padding_nm` would add (cubic box, TIP3P);
+  - ns/day: from this host's recorded stage benchmarks, scaled by atoms and
+    timestep (throughput = ns/day x atoms / timestep_fs is roughly constant
+    for a platform), else a conservative per-platform default;
+  - wall time, trajectory size (frames x atoms x 12 bytes of DCD coordinates,
+    about a third of that for XTC or lossy HDF5) and peak host memory.
+
+Benchmarks are recorded by engines.openmm_engine.run_stage into
+<cache root>/benchmarks/<hostname>.json (utils.benchmarks). The module is kept
+free of engine imports so the estimate stays as cheap as the dry run itself.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from ..utils.benchmarks import load_benchmarks
+from .sweep import apply_sweep_point
+
+WATERS_PER_NM3 = 33.4  # bulk water at 300 K
+NM3_PER_SOLUTE_ATOM = 0.0086  # protein, ~1.21 nm^3 per kDa at ~7.1 Da per atom
+HYDROGEN_FACTOR = 1.95  # heavy atoms -> atoms once PDBFixer adds hydrogens
+IONS_PER_NM3_PER_MOLAR = 0.6022
+DCD_BYTES_PER_ATOM = 12  # 3 x float32 per atom per frame
+# per atom per frame by `trajectory.format` (as engines.trajectory.bytes_per_atom)
+TRAJ_BYTES_PER_ATOM = {"dcd": 12.0, "xtc": 4.0, "hdf5": 11.0, "hdf5+precision": 5.0}
+MEMORY_BASE_MB = 350.0  # interpreter + OpenMM + platform context
+MEMORY_KB_PER_ATOM = 2.5
+
+# atom*ns/day per fs of timestep, used until the host has benchmarks
+DEFAULT_THROUGHPUT = {"CUDA": 7.5e6, "HIP": 6e6, "OpenCL": 4e6, "CPU": 1.5e5}
+
+_SOLVENT_RESIDUES = {"HOH", "WAT", "SOL", "TIP3", "TIP"}
+
+
+# ------------------------------
+# Atom counts
+# ------------------------------
+def _prmtop_atoms(path: Path) -> int:
+    lines = iter(path.read_text().splitlines())
+    for line in lines:
+        if line.startswith("%FLAG POINTERS"):
+            for line in lines:
+                if not line.startswith("%"):
+                    return int(line.split()[0])
+    raise ValueError(f"{path}: no %FLAG POINTERS section")
+
+
+def _gro_atoms(path: Path) -> int:
+    with open(path) as f:
+        f.readline()
+        return int(f.readline().split()[0])
+
+
+def _psf_atoms(path: Path) -> int:
+    with open(path) as f:
+        for line in f:
+            if "!NATOM" in line:
+                return int(line.split()[0])
+    raise ValueError(f"{path}: no !NATOM section")
+
+
+def _pdb_solute(path: Path) -> Tuple[int, bool, List[float]]:
+    """(solute atoms, has hydrogens, bounding-box extent per axis in nm)."""
+    n, has_h = 0, False
+    lo, hi = [float("inf")] * 3, [float("-inf")] * 3
+    with open(path) as f:
+        for line in f:
+            if not line.startswith(("ATOM", "HETATM")):
+                continue
+            if line[17:21].strip() in _SOLVENT_RESIDUES:
+                continue
+            xyz = [float(line[c : c + 8]) / 10.0 for c in (30, 38, 46)]
+            for i, v in enumerate(xyz):
+                lo[i], hi[i] = min(lo[i], v), max(hi[i], v)
+            element = (
+                line[76:78].strip() or line[12:16].strip().lstrip("0123456789")[:1]
+            )
+            has_h = has_h or element.upper() == "H"
+            n += 1
+    if not n:
+        raise ValueError(f"{path}: no ATOM/HETATM records")
+    return n, has_h, [top - bottom for bottom, top in zip(lo, hi)]
+
+
+def _solvated_atoms(
+    pdb: Path, padding_nm: float, ionic_molar: float, water_sites: int
+) -> int:
+    solute, has_h, extent = _pdb_solute(pdb)
+    if not has_h:
+        solute = int(solute * HYDROGEN_FACTOR)
+    edge = max(extent) + 2.0 * padding_nm  # Modeller.addSolvent(padding=...)
+    volume = edge**3
+    free = max(0.0, volume - solute * NM3_PER_SOLUTE_ATOM)
+    waters = int(free * WATERS_PER_NM3)
+    ions = 2 * int(round(ionic_molar * IONS_PER_NM3_PER_MOLAR * free))
+    return solute + waters * water_sites + ions
+
+
+def _water_sites(defaults: Dict[str, Any]) -> int:
+    ffs = defaults.get("forcefield") or []
+    names = " ".join(ffs if isinstance(ffs, list) else [ffs]).lower()
+    if "tip5p" in names:
+        return 5
+    if "tip4p" in names or "opc.xml" in names:
+        return 4
+    return 3
+
+
+def count_atoms(spec: Dict[str, Any], defaults: Dict[str, Any]) -> Tuple[int, str]:
+    """
+    Estimated atom count of one system spec and how it was obtained.
+    Raises OSError/ValueError if the input cannot be read.
+    """
+    if "prmtop" in spec:
+        return _prmtop_atoms(Path(spec["prmtop"])), "prmtop"
+    if "gro" in spec:
+        return _gro_atoms(Path(spec["gro"])), "gro"
+    if "psf" in spec:
+        return _psf_atoms(Path(spec["psf"])), "psf"
+    pdb = spec.get("pdb") or spec.get("fixed_pdb")
+    if not pdb:
+        raise ValueError(f"no structure file in spec: {spec}")
+    padding = float(spec.get("box_padding_nm", defaults.get("box_padding_nm", 1.0)))
+    ionic = float(
+        spec.get("ionic_strength_molar", defaults.get("ionic_strength_molar", 0.15))
+    )
+    n = _solvated_atoms(Path(pdb), padding, ionic, _water_sites(defaults))
+    return n, f"pdb + solvent, pad {padding:g} nm"
+
+
+# ------------------------------
+# Per-host ns/day model
+# ------------------------------
+def _default_platform() -> str:
+    return "CUDA" if shutil.which("nvidia-smi") else "CPU"
+
+
+def throughput(platform: str = "auto") -> Tuple[float, str, int]:
+    """
+    (atom*ns/day per fs, platform, number of benchmarks behind it). With
+    platform auto or tune the fastest recorded platform is assumed.
+    """
+    data = load_benchmarks()
+    rates = {
+        name: [e["ns_per_day"] * e["atoms"] / e["timestep_fs"] for e in entries]
+        for name, entries in data.items()
+        if entries
+    }
+    if platform.lower() in ("auto", "tune"):
+        if rates:
+            name = max(rates, key=lambda k: statistics.median(rates[k]))
+            return statistics.median(rates[name]), name, len(rates[name])
+        platform = _default_platform()
+    for name, values in rates.items():
+        if name.lower() == platform.lower():
+            return statistics.median(values), name, len(values)
+    name = next((k for k in DEFAULT_THROUGHPUT if k.lower() == platform.lower()), "CPU")
+    return DEFAULT_THROUGHPUT[name], name, 0
+
+
+# ------------------------------
+# Per-run estimate
+# ------------------------------
+def _timestep_fs(defaults: Dict[str, Any]) -> float:
+    integ = defaults.get("integrator")
+    if isinstance(integ, dict) and "timestep_fs" in integ:
+        return float(integ["timestep_fs"])
+    return float(defaults.get("timestep_fs", 2.0))
+
+
+def _replicas(run: Dict[str, Any], defaults: Dict[str, Any]) -> int:
+    cfg = (run.get("input") or {}).get("replicas", defaults.get("replicas", 1))
+    if isinstance(cfg, dict):
+        cfg = cfg.get("count", 1)
+    return max(1, int(cfg or 1))
+
+
+def estimate_run(
+    run: Dict[str, Any],
+    defaults: Dict[str, Any],
+    stages: List[Dict[str, Any]] | None = None,
+    _atoms_cache: Dict[str, Tuple[int, str]] | None = None,
+) -> Dict[str, Any]:
+    """
+    Cost estimate of one planned run. `stages` are the run's stage specs
+    (for per-stage report_interval; defaults to run["stages"]). Returns
+    {"atoms", "atoms_source", "ns_per_day", "platform", "benchmarks",
+    "wall_s", "traj_bytes", "peak_mem_bytes"}; the atom-derived fields are
+    None (with the reason in "atoms_source") if the input cannot be read.
+    """
+    defaults_run = dict(defaults)
+    apply_sweep_point(defaults_run, run.get("sweep") or {})
+    spec = run.get("input") or {}
+    key = json.dumps(
+        [
+            spec,
+            defaults_run.get("box_padding_nm"),
+            defaults_run.get("ionic_strength_molar"),
+            defaults_run.get("forcefield"),
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    cache = _atoms_cache if _atoms_cache is not None else {}
+    if key not in cache:
+        try:
+            cache[key] = count_atoms(spec, defaults_run)
+        except (OSError, ValueError) as e:
+            cache[key] = (0, f"unknown ({e})")
+    atoms, source = cache[key]
+
+    tfs = _timestep_fs(defaults_run)
+    rate, platform, n_bench = throughput(str(defaults_run.get("platform", "auto")))
+    copies = _replicas(run, defaults_run)
+    md_steps, frame_bytes = 0, 0.0
+    for st in stages or run["stages"]:
+        steps = int(st.get("steps", 0))
+        if str(st.get("name", "")).lower() == "minimize":
+            continue  # minimization writes no trajectory and has no MD steps
+        md_steps += steps
+        interval = int(
+            st.get("report_interval", defaults_run.get("report_interval", 1000))
+        )
+        frame_bytes += (
+            steps // max(1, interval) * _traj_bytes_per_atom(st, defaults_run)
+        )
+
+    est: Dict[str, Any] = {
+        "atoms": atoms or None,
+        "atoms_source": source,
+        "platform": platform,
+        "benchmarks": n_bench,
+        "ns_per_day": None,
+        "wall_s": None,
+        "traj_bytes": None,
+        "peak_mem_bytes": None,
+    }
+    if atoms:
+        ns_per_day = rate * tfs / atoms
+        est["ns_per_day"] = ns_per_day
+        est["wall_s"] = copies * md_steps * tfs * 1e-6 / ns_per_day * 86400.0
+        est["traj_bytes"] = int(copies * frame_bytes * atoms)
+        budget = (defaults_run.get("reporting") or {}).get("traj_budget_gb")
+        if budget:  # run_stage coarsens the DCD interval to fit (engines.io_policy)
+            est["traj_bytes"] = min(est["traj_bytes"], int(copies * budget * 1024**3))
+        est["peak_mem_bytes"] = int(
+            (MEMORY_BASE_MB * 1024 + copies * atoms * MEMORY_KB_PER_ATOM) * 1024
+        )
+    return est
+
+
+def _traj_bytes_per_atom(stage: Dict[str, Any], defaults: Dict[str, Any]) -> float:
+    cfg = {**(defaults.get("trajectory") or {}), **(stage.get("trajectory") or {})}
+    fmt = str(cfg.get("format", "dcd")).lower()
+    fmt = {"h5": "hdf5"}.get(fmt, fmt)
+    if fmt == "hdf5" and cfg.get("precision"):
+        fmt = "hdf5+precision"
+    return TRAJ_BYTES_PER_ATOM.get(fmt, DCD_BYTES_PER_ATOM)
+
+
+def format_duration(seconds: float) -> str:
+    minutes = int(round(seconds / 60.0))
+    days, rem = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(rem, 60)
+    if days:
+        return f"{days}d{hours:02d}h"
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    return f"{max(minutes, 1) if seconds else 0}m"
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024.0
+    return f"{n:.1f} TB"
+
+
+def describe(est: Dict[str, Any]) -> str:
+    """One dry-run line for an estimate."""
+    if not est["atoms"]:
+        return f"≈ atoms: {est['atoms_source']}"
+    basis = (
+        f"{est['benchmarks']} benchmarks"
+        if est["benchmarks"]
+        else "default, no benchmarks on this host"
+    )
+    return (
+        f"≈ atoms: {est['atoms']:,} ({est['atoms_source']})  "
+        f"{est['ns_per_day']:.1f} ns/day ({est['platform']}, {basis})  "
+        f"wall: {format_duration(est['wall_s'])}  "
+        f"traj: {format_bytes(est['traj_bytes'])}  "
+        f"peak mem: {format_bytes(est['peak_mem_bytes'])}"
+    )
+
+
+class PlanEstimator:
+    """Estimates the runs of one plan in turn and keeps campaign totals."""
+
+    def __init__(self, defaults: Dict[str, Any]):
+        self.defaults = defaults or {}
+        self.runs = 0
+        self.unknown = 0
+        self.wall_s = 0.0
+        self.traj_bytes = 0
+        self._atoms: Dict[str, Tuple[int, str]] = {}
+
+    def __call__(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        est = estimate_run(run, self.defaults, _atoms_cache=self._atoms)
+        self.runs += 1
+        if est["atoms"]:
+            self.wall_s += est["wall_s"]
+            self.traj_bytes += est["traj_bytes"]
+        else:
+            self.unknown += 1
+        return est
+
+    def summary(self) -> str:
+        line = (
+            f"Estimate: {self.runs} run(s)  wall: {format_duration(self.wall_s)} "
+            f"run back to back  trajectories: {format_bytes(self.traj_bytes)}"
+        )
+        if self.unknown:
+            line += f"  ({self.unknown} run(s) not estimated)"
+        return line
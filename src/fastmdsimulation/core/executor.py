@@ -0,0 +1,208 @@
+# FastMDSimulation/src/fastmdsimulation/core/executor.py
+
+"""
+Multi-process run executor.
+
+Each run is executed in its own worker process bound to a device slot. A slot
+carries the platform name plus the platform properties that pin the worker to
+its device (CudaDeviceIndex / OpenCLDeviceIndex) or CPU share (Threads, plus
+a disjoint, NUMA-local core set the worker pins itself to). A failing or
+crashing worker only loses its own run; the remaining runs continue.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import traceback
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+from ..utils.cpuset import describe, parse_cpulist, partition, pin
+from ..utils.logging import attach_file_logger, get_logger, setup_console
+
+logger = get_logger("executor")
+
+# Platform property that selects the device for each accelerator platform
+_DEVICE_KEYS = {"CUDA": "CudaDeviceIndex", "OpenCL": "OpenCLDeviceIndex"}
+
+
+def resolve_execution(
+    defaults: Dict[str, Any], workers: int | None = None
+) -> Dict[str, Any]:
+    """
+    Normalize `defaults.execution` (CLI `--workers` wins over YAML):
+
+      execution:
+        workers: 4                  # concurrent worker processes (1 = serial)
+        devices: [0, 1]             # CUDA/OpenCL device indices, cycled over slots
+        threads_per_worker: 16      # CPU platform only (default: CPU budget // workers)
+        cpusets: ["0-15", "16-31"]  # CPU platform only: explicit per-worker core sets
+        start_method: spawn         # multiprocessing start method
+        prebuild: 2                 # build the next N runs ahead on CPU (core.pipeline)
+    """
+    ex = dict(defaults.get("execution") or {})
+    if workers is not None:
+        ex["workers"] = workers
+    ex["workers"] = max(1, int(ex.get("workers", 1)))
+    devices = ex.get("devices") or []
+    if not isinstance(devices, (list, tuple)):
+        devices = [devices]
+    ex["devices"] = [str(d) for d in devices]
+    ex["start_method"] = str(ex.get("start_method", "spawn"))
+    return ex
+
+
+def _resolve_platform_name(name: str | None) -> str:
+    if name and name.lower() not in ("auto", "tune"):
+        return name
+    # 'auto' has to be resolved up front so every slot targets the same platform;
+    # 'tune' does too (slots pin devices), so concurrent workers are not tuned
+    from ..engines.openmm_engine import _select_platform
+
+    return _select_platform(name or "auto").getName()
+
+
+def device_slots(
+    execution: Dict[str, Any], platform_name: str | None
+) -> List[Dict[str, Any]]:
+    """Build one slot per worker with the platform properties that pin it."""
+    workers = execution["workers"]
+    devices = execution.get("devices") or []
+    platform = _resolve_platform_name(platform_name)
+    key = _DEVICE_KEYS.get(platform)
+    if platform == "CPU":
+        # explicit plan, else disjoint sets of the CPU budget (utils.cpuset)
+        plan = execution.get("cpusets")
+        if plan:
+            cpu_sets = [parse_cpulist(c) for c in plan]
+        else:
+            cpu_sets = partition(workers, execution.get("threads_per_worker"))
+
+    slots: List[Dict[str, Any]] = []
+    for i in range(workers):
+        props: Dict[str, str] = {}
+        if key and devices:
+            props[key] = devices[i % len(devices)]
+        elif platform == "CPU":
+            cpus = cpu_sets[i % len(cpu_sets)]
+            threads = execution.get("threads_per_worker") or len(cpus)
+            props["Threads"] = str(int(threads))
+        slot = {"index": i, "platform": platform, "platform_properties": props}
+        if platform == "CPU":
+            slot["cpus"] = cpus
+        slots.append(slot)
+    return slots
+
+
+def apply_slot(defaults: Dict[str, Any], slot: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of defaults with the slot's platform and properties applied."""
+    out = dict(defaults)
+    out["platform"] = slot["platform"]
+    props = dict(defaults.get("platform_properties") or {})
+    props.update(slot.get("platform_properties") or {})
+    out["platform_properties"] = props
+    return out
+
+
+def _worker_main(
+    run: Dict[str, Any],
+    defaults: Dict[str, Any],
+    slot: Dict[str, Any],
+    log_path: str | None,
+    resume: bool = False,
+) -> None:
+    """Entry point of a worker process: execute one run, record failures."""
+    setup_console(style=defaults.get("log_style"))
+    if log_path:
+        attach_file_logger(log_path)
+
+    # Local import: the orchestrator imports this module
+    from . import orchestrator
+
+    if slot.get("cpus"):
+        pin(slot["cpus"])
+        logger.info(f"Pinned: {Path(run['run_dir']).name} to {describe(slot['cpus'])}")
+
+    run_dir = Path(run["run_dir"])
+    (run_dir / "error.log").unlink(missing_ok=True)  # stale, from an earlier attempt
+    try:
+        orchestrator._execute_run(run, apply_slot(defaults, slot), resume=resume)
+    except BaseException:
+        run_dir.mkdir(parents=True, exist_ok=True)
+        (run_dir / "error.log").write_text(traceback.format_exc())
+        logger.error(f"Run failed: {run_dir.name} (see {run_dir / 'error.log'})")
+        raise SystemExit(1)
+
+
+def _format_props(props: Dict[str, str]) -> str:
+    return ", ".join(f"{k}={v}" for k, v in props.items()) or "default"
+
+
+def run_parallel(
+    runs: Iterable[Dict[str, Any]],
+    defaults: Dict[str, Any],
+    execution: Dict[str, Any],
+    log_path: str | None = None,
+    resume: bool = False,
+    on_done: Callable[[str], None] | None = None,
+) -> Dict[str, str]:
+    """
+    Execute runs concurrently, one worker process per run, at most one run per
+    device slot. `on_done(run_dir)` is called as each run succeeds.
+    Returns {run_dir: "ok" | "failed"}.
+    """
+    slots = device_slots(execution, defaults.get("platform", "auto"))
+    ctx = mp.get_context(execution.get("start_method", "spawn"))
+    logger.info(
+        f"Executor: {len(slots)} worker(s) on {slots[0]['platform']} "
+        f"(start_method={execution.get('start_method', 'spawn')})"
+    )
+
+    pending = iter(runs)
+    free = list(slots)
+    active: Dict[Any, tuple] = {}
+    status: Dict[str, str] = {}
+    exhausted = False
+
+    while True:
+        while free and not exhausted:
+            run = next(pending, None)
+            if run is None:
+                exhausted = True
+                break
+            slot = free.pop(0)
+            proc = ctx.Process(
+                target=_worker_main,
+                args=(run, defaults, slot, log_path, resume),
+                name=f"fastmds-{Path(run['run_dir']).name}",
+            )
+            proc.start()
+            logger.info(
+                f"Dispatch: {Path(run['run_dir']).name} -> slot {slot['index']} "
+                f"({_format_props(slot['platform_properties'])})"
+            )
+            active[proc.sentinel] = (proc, run, slot)
+
+        if not active:
+            break
+
+        for sentinel in wait(list(active)):
+            proc, run, slot = active.pop(sentinel)
+            proc.join()
+            run_dir = Path(run["run_dir"])
+            if proc.exitcode == 0:
+                status[run["run_dir"]] = "ok"
+                if on_done is not None:
+                    on_done(run["run_dir"])
+            else:
+                status[run["run_dir"]] = "failed"
+                err = run_dir / "error.log"
+                if not err.exists():
+                    # Hard crash (signal / os._exit): the worker could not record it
+                    run_dir.mkdir(parents=True, exist_ok=True)
+                    err.write_text(f"worker exited with code {proc.exitcode}\n")
+                logger.error(f"Worker for {run_dir.name} exited with {proc.exitcode}")
+            free.append(slot)
+
+    return status
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-import hashlib
 import json
+import os
 import platform
 import shutil
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Tuple
 
 import yaml
 
@@ -20,10 +21,28 @@ except Exception:
     # Fallback if needed
     import importlib_metadata  # type: ignore
 
-from ..engines.openmm_engine import build_simulation_from_spec, run_stage
+from ..engines.batched import batch_settings, run_batched_stage, write_batch_summary
+from ..engines.openmm_engine import (
+    build_batched_simulation,
+    build_simulation_from_spec,
+    clone_simulation,
+    has_simulation_bundle,
+    restore_completed_stages,
+    restore_simulation,
+    run_stage,
+    save_simulation_bundle,
+    seed_velocities,
+)
+from ..engines.remd import run_remd
+from ..utils.cache import hash_key, link_or_copy, sha256_file
+from ..utils.filelock import FileLock
 from ..utils.logging import attach_file_logger, get_logger
+from .executor import apply_slot, device_slots, resolve_execution, run_parallel
 from .ligand import prepare_protein_ligand_inputs
 from .pdbfix import fix_pdb_with_pdbfixer  # strict fixer (no circular import)
+from .pipeline import Prebuilder, claim_prebuilt, prebuild_depth
+from .plan import PLAN_FILE, _expand_runs, _steps_to_ps, resolve_plan  # noqa: F401
+from .sweep import MappedSequence, apply_sweep_point
 
 logger = get_logger("orchestrator")
 
@@ -40,14 +59,6 @@ def _deep_update(dst: Dict[str, Any], src: Dict[str, Any] | None) -> Dict[str, A
     return dst
 
 
-def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-
 def _pkg_version(name: str) -> str:
     try:
         return importlib_metadata.version(name)
@@ -214,61 +225,6 @@ def _prepare_systems(cfg: Dict[str, Any], base: Path) -> Dict[str, Any]:
     return new_cfg
 
 
-# ------------------------------
-# Plan expansion
-# ------------------------------
-def _expand_runs(cfg: Dict[str, Any], outdir: str) -> Dict[str, Any]:
-    defaults = cfg.get("defaults", {})
-    project = cfg["project"]
-    base = Path(outdir) / project
-    temps = cfg.get("sweep", {}).get(
-        "temperature_K", [defaults.get("temperature_K", 300)]
-    )
-    runs = []
-    for sys_cfg in cfg["systems"]:
-        for T in temps:
-            sim_id = f'{sys_cfg.get("id", "system")}_T{T}'
-            simdir = base / sim_id
-            run = {
-                "system_id": sys_cfg.get("id", "system"),
-                "temperature_K": T,
-                "run_dir": simdir.as_posix(),
-                "stages": cfg["stages"],
-                "input": sys_cfg,  # full spec (type + files)
-            }
-            if "forcefield" in sys_cfg:
-                run["forcefield"] = sys_cfg["forcefield"]
-            runs.append(run)
-    return {"project": project, "output_dir": base.as_posix(), "runs": runs}
-
-
-def _steps_to_ps(steps: int, timestep_fs: float) -> float:
-    return steps * timestep_fs / 1000.0
-
-
-def resolve_plan(config_path: str, outdir: str) -> Dict[str, Any]:
-    cfg = yaml.safe_load(Path(config_path).read_text())
-    plan = _expand_runs(cfg, outdir)
-    tfs = float(cfg.get("defaults", {}).get("timestep_fs", 2.0))
-    enriched = []
-    for r in plan["runs"]:
-        st = []
-        for s in r["stages"]:
-            steps = int(s.get("steps", 0))
-            st.append(
-                {
-                    "name": s["name"],
-                    "steps": steps,
-                    "approx_ps": round(_steps_to_ps(steps, tfs), 3),
-                }
-            )
-        r2 = dict(r)
-        r2["stages"] = st
-        enriched.append(r2)
-    plan["runs"] = enriched
-    return plan
-
-
 # ------------------------------
 # inputs/ archiving
 # ------------------------------
@@ -364,9 +320,507 @@ def _populate_inputs(cfg: Dict[str, Any], cfg_path: Path, base: Path) -> None:
 # ------------------------------
 # Run
 # ------------------------------
+# Defaults that change the built System or the minimized state (temperature does not)
+_BUILD_KEYS = (
+    "forcefield",
+    "box_padding_nm",
+    "ionic_strength_molar",
+    "neutralize",
+    "ions",
+    "constraints",
+    "create_system",
+    "minimize_tolerance_kjmol_per_nm",
+    "minimize_tolerance_kjmol",
+    "minimize_max_iterations",
+)
+
+
+def _save_bundle(sim, run_dir: Path) -> bool:
+    try:
+        save_simulation_bundle(sim, run_dir)
+        return True
+    except Exception as e:
+        logger.warning(f"Could not serialize System for resume in {run_dir}: {e}")
+        return False
+
+
+def _shares_minimize(stages: List[Dict[str, Any]]) -> bool:
+    """A leading zero-step minimize does not depend on temperature and can be shared."""
+    return (
+        bool(stages)
+        and str(stages[0].get("name", "")).lower() == "minimize"
+        and int(stages[0].get("steps", 0)) == 0
+    )
+
+
+def _shared_build_dir(run: Dict[str, Any], defaults_run: Dict[str, Any]) -> Path:
+    n_shared = 1 if _shares_minimize(run["stages"]) else 0
+    key = hash_key(
+        {
+            "input": run["input"],
+            "defaults": {k: defaults_run.get(k) for k in _BUILD_KEYS},
+            "stages": run["stages"][:n_shared],
+        }
+    )
+    base = Path(run["run_dir"]).parent
+    return base / "_build" / "shared" / f'{run["system_id"]}-{key[:12]}'
+
+
+def _prebuild_dir(run: Dict[str, Any], defaults_run: Dict[str, Any]) -> Path:
+    key = hash_key(
+        {
+            "input": run["input"],
+            "defaults": {k: defaults_run.get(k) for k in _BUILD_KEYS},
+        }
+    )
+    base = Path(run["run_dir"]).parent
+    return base / "_build" / "prebuilt" / f'{run["system_id"]}-{key[:12]}'
+
+
+def _prebuild_job(run: Dict[str, Any], defaults: Dict[str, Any], resume: bool = False):
+    """Build job for the pipeline (see core.pipeline), or None if nothing to build."""
+    if resume and has_simulation_bundle(Path(run["run_dir"])):
+        return None
+    defaults_run = _run_defaults(run, defaults)
+    if (
+        defaults.get("share_build", True)
+        and (_shared_build_dir(run, defaults_run) / "build.ok").exists()
+    ):
+        return None
+    return run["input"], defaults_run, _prebuild_dir(run, defaults_run)
+
+
+def _build(run: Dict[str, Any], defaults_run: Dict[str, Any], target: Path):
+    """Build the run's System, or restore the bundle prebuilt by the pipeline."""
+    prebuilt = claim_prebuilt(_prebuild_dir(run, defaults_run))
+    if prebuilt is None:
+        return build_simulation_from_spec(run["input"], defaults_run, target)
+    logger.info(f"Prebuild: restoring {prebuilt.name}")
+    target.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(prebuilt / "topology.pdb", target / "topology.pdb")
+    return restore_simulation(prebuilt, defaults_run)
+
+
+def _copy_shared_outputs(shared: Path, run_dir: Path, stages) -> None:
+    """Give the run its own copy of the shared bundle and shared stage outputs."""
+    if (shared / "system.xml").exists():
+        # Never rewritten in place (save_simulation_bundle unlinks first)
+        link_or_copy(shared / "system.xml", run_dir / "system.xml")
+    for name in ("topology.pdb", "state.xml"):
+        if (shared / name).exists():
+            shutil.copy2(shared / name, run_dir / name)
+    for st in stages:
+        src = shared / st["name"]
+        if src.is_dir():
+            shutil.copytree(src, run_dir / st["name"], dirs_exist_ok=True)
+
+
+def _shared_build(run: Dict[str, Any], defaults_run: Dict[str, Any]) -> Tuple[Any, int]:
+    """
+    Build the solvated System once per system and run the leading minimize
+    once; the other runs of the sweep restore that minimized state instead of
+    re-solvating, so every temperature starts from the same box.
+    Returns the simulation and the number of leading stages already done.
+    """
+    run_dir = Path(run["run_dir"])
+    stages = run["stages"]
+    n_shared = 1 if _shares_minimize(stages) else 0
+    state_file = "minimized.xml" if n_shared else "state.xml"
+    shared = _shared_build_dir(run, defaults_run)
+
+    sim = None
+    with FileLock(shared / ".lock"):
+        if not (shared / "build.ok").exists():
+            logger.info(f'Shared build: {run["system_id"]} -> {shared}')
+            sim = _build(run, defaults_run, shared)
+            saved = _save_bundle(sim, shared)
+            if n_shared:
+                stage_dir = shared / stages[0]["name"]
+                run_stage(sim, stages[0], stage_dir, defaults_run)
+                sim.saveState(str(shared / state_file))
+                # state.chk only loads on the platform that wrote it; runs that
+                # restore this stage later (resume, REMD) use the State instead
+                sim.saveState(str(stage_dir / "state.xml"))
+            if saved:
+                (shared / "build.ok").write_text("shared build completed\n")
+    if sim is None:
+        logger.info(f"Shared build: reusing {shared.name}")
+        sim = restore_simulation(shared, defaults_run, state_file=state_file)
+
+    _copy_shared_outputs(shared, run_dir, stages[:n_shared])
+    return sim, n_shared
+
+
+def _run_stages(
+    sim,
+    stages: List[Dict[str, Any]],
+    out_dir: Path,
+    defaults_run: Dict[str, Any],
+    resume: bool = False,
+) -> int:
+    """Run stages into out_dir/<stage>; returns the number of MD steps executed."""
+    executed = 0
+    completed = []
+    skipping = resume
+    for st in stages:
+        stage_dir = out_dir / st["name"]
+        if skipping and (stage_dir / "stage.json").exists():
+            logger.info(f"Resume: stage '{st['name']}' already completed; skipping")
+            completed.append((st, stage_dir))
+            continue
+        skipping = False
+        if completed:
+            restore_completed_stages(sim, completed, defaults_run)
+            completed = []
+        run_stage(sim, st, stage_dir, defaults_run, resume=resume)
+        executed += int(st.get("steps", 0))
+    return executed
+
+
+def _replica_settings(run: Dict[str, Any], defaults: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    `replicas: N` (per system, or in defaults) or
+    `replicas: {count: N, concurrent: M}` -> (count, concurrent contexts).
+    """
+    cfg = run["input"].get("replicas", defaults.get("replicas", 1))
+    if isinstance(cfg, dict):
+        count = int(cfg.get("count", 1))
+        concurrent = int(cfg.get("concurrent", count))
+    else:
+        count = int(cfg or 1)
+        concurrent = count
+    count = max(1, count)
+    return count, max(1, min(concurrent, count))
+
+
+def _timestep_fs(defaults: Dict[str, Any]) -> float:
+    integ = defaults.get("integrator")
+    if isinstance(integ, dict) and "timestep_fs" in integ:
+        return float(integ["timestep_fs"])
+    return float(defaults.get("timestep_fs", 2.0))
+
+
+def _device_label(defaults: Dict[str, Any]) -> str:
+    props = defaults.get("platform_properties") or {}
+    label = str(defaults.get("platform", "auto"))
+    for key in ("CudaDeviceIndex", "OpenCLDeviceIndex", "Threads"):
+        if key in props:
+            label += f":{key}={props[key]}"
+    return label
+
+
+def _run_replicas(
+    sim,
+    run: Dict[str, Any],
+    stages: List[Dict[str, Any]],
+    defaults_run: Dict[str, Any],
+    count: int,
+    concurrent: int,
+    resume: bool = False,
+) -> None:
+    """
+    Run `count` independent, velocity-seeded copies of the built system into
+    <run_dir>/rep<k>/, up to `concurrent` Contexts at a time in this process
+    (OpenMM releases the GIL while stepping), and report aggregate ns/day.
+
+    Every copy is cloned from the untouched build here, before any replica
+    starts: OpenMM Contexts and Systems are not thread-safe, so the pool only
+    steps the Simulation it is handed.
+    """
+    run_dir = Path(run["run_dir"])
+    base_seed = int(defaults_run.get("seed") or 0)
+    device = _device_label(defaults_run)
+
+    reps = []
+    for k in range(count):
+        d = dict(defaults_run)
+        d["seed"] = base_seed + k + 1  # 0 would let OpenMM pick a random seed
+        reps.append((sim if k == 0 else clone_simulation(sim, d), d))
+
+    def _one(k: int) -> int:
+        rep_sim, d = reps[k]
+        seed_velocities(rep_sim, d["temperature_K"], d["seed"])
+        return _run_stages(rep_sim, stages, run_dir / f"rep{k}", d, resume=resume)
+
+    logger.info(
+        f"Replicas: {count} x {run['system_id']} ({concurrent} concurrent) on {device}"
+    )
+    t0 = time.perf_counter()
+    steps: Dict[int, int] = {}
+    failed: List[str] = []
+    with ThreadPoolExecutor(max_workers=concurrent) as pool:
+        futures = {pool.submit(_one, k): k for k in range(count)}
+        for fut in as_completed(futures):
+            k = futures[fut]
+            try:
+                steps[k] = fut.result()
+            except Exception as e:
+                logger.error(f"Replica rep{k} failed: {e}")
+                failed.append(f"rep{k}")
+    wall_s = time.perf_counter() - t0
+
+    ns_total = sum(steps.values()) * _timestep_fs(defaults_run) * 1e-6
+    ns_day = ns_total / wall_s * 86400.0 if wall_s > 0 else 0.0
+    report = {
+        "replicas": count,
+        "concurrent": concurrent,
+        "device": device,
+        "wall_s": round(wall_s, 3),
+        "ns_total": round(ns_total, 6),
+        "ns_per_day_aggregate": round(ns_day, 3),
+        "ns_per_day_per_replica": round(ns_day / max(1, len(steps)), 3),
+    }
+    (run_dir / "replicas.json").write_text(json.dumps(report, indent=2))
+    logger.info(
+        f"Replicas: {device} aggregate {report['ns_per_day_aggregate']} ns/day "
+        f"({report['ns_per_day_per_replica']} ns/day per replica, {concurrent} concurrent)"
+    )
+    if failed:
+        raise RuntimeError(
+            f"{len(failed)} replica(s) failed: {', '.join(sorted(failed))}"
+        )
+
+
+def _execute_run(
+    run: Dict[str, Any], defaults: Dict[str, Any], resume: bool = False
+) -> None:
+    """
+    Build one run's simulation, execute its stages and mark it done.
+
+    Runs of the same system share one build and minimization (see
+    _shared_build) unless defaults.share_build is false. With resume=True the
+    run is restored from its serialized System/State bundle (no re-solvation),
+    stages with a stage.json are skipped and a partially completed stage
+    continues from its checkpoint. With `replicas` > 1 the stages after the
+    shared build run once per replica (see _run_replicas).
+    """
+    run_dir = Path(run["run_dir"])
+    run_dir.mkdir(parents=True, exist_ok=True)
+    logger.info(f'Run: {run["system_id"]} @ {run["temperature_K"]} K -> {run_dir}')
+
+    defaults_run = _run_defaults(run, defaults)
+    count, concurrent = _replica_settings(run, defaults)
+
+    n_done = 0
+    if resume and has_simulation_bundle(run_dir):
+        sim = restore_simulation(run_dir, defaults_run)
+        if count > 1:
+            # stages completed at run level came from the shared build
+            shared = []
+            for st in run["stages"]:
+                if not (run_dir / st["name"] / "stage.json").exists():
+                    break
+                shared.append((st, run_dir / st["name"]))
+            if shared:
+                restore_completed_stages(sim, shared, defaults_run)
+                n_done = len(shared)
+    elif defaults.get("share_build", True):
+        sim, n_done = _shared_build(run, defaults_run)
+    else:
+        sim = _build(run, defaults_run, run_dir)
+        _save_bundle(sim, run_dir)
+
+    stages = run["stages"][n_done:]
+    if count > 1:
+        _run_replicas(sim, run, stages, defaults_run, count, concurrent, resume)
+    else:
+        if "replica" in (run.get("sweep") or {}):
+            seed_velocities(sim, defaults_run["temperature_K"], defaults_run["seed"])
+        _run_stages(sim, stages, run_dir, defaults_run, resume=resume)
+
+    if not run.get("remd_pending"):
+        (run_dir / "done.ok").write_text("simulation completed\n")
+
+
+def _run_defaults(run: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Project defaults with the run's temperature, force field and swept values."""
+    defaults_run = dict(defaults)
+    defaults_run["temperature_K"] = run["temperature_K"]
+    if run.get("forcefield"):
+        defaults_run["forcefield"] = run["forcefield"]
+    apply_sweep_point(defaults_run, run.get("sweep") or {})
+    if defaults_run.get("reporting") or any(
+        st.get("reporting") for st in run["stages"]
+    ):
+        # a per-run trajectory budget is shared by the MD stages (engines.io_policy)
+        md_steps = sum(
+            int(st.get("steps", 0))
+            for st in run["stages"]
+            if str(st.get("name", "")).lower() != "minimize"
+        )
+        defaults_run["reporting"] = {
+            **(defaults_run.get("reporting") or {}),
+            "run_steps": md_steps,
+        }
+    return defaults_run
+
+
+def _remd_stage_index(stages: List[Dict[str, Any]]) -> int | None:
+    """Index of the `ensemble: REMD` stage (must be the last stage), if any."""
+    idx = [
+        i
+        for i, st in enumerate(stages)
+        if str(st.get("ensemble", "")).upper() == "REMD"
+    ]
+    if not idx:
+        return None
+    if idx != [len(stages) - 1]:
+        raise ValueError("An 'ensemble: REMD' stage must be the single, last stage.")
+    return idx[0]
+
+
+def _remd_groups(runs) -> Dict[Tuple, List[Dict[str, Any]]]:
+    """Runs that differ only in temperature form one replica-exchange group."""
+    groups: Dict[Tuple, List[Dict[str, Any]]] = {}
+    for run in runs:
+        key = (run["system_id"], tuple(sorted((run.get("sweep") or {}).items())))
+        groups.setdefault(key, []).append(run)
+    return groups
+
+
+def _run_remd_phase(
+    runs,
+    idx: int,
+    defaults: Dict[str, Any],
+    base: Path,
+    execution: Dict[str, Any],
+    log_path: str | None = None,
+    on_done: Callable[[str], None] | None = None,
+) -> None:
+    """Run the REMD stage for every group once its runs completed the earlier stages."""
+    for group in _remd_groups(runs).values():
+        if len(group) < 2:
+            raise ValueError(
+                f"REMD needs at least two sweep temperatures for {group[0]['system_id']}"
+            )
+        group = sorted(group, key=lambda r: float(r["temperature_K"]))
+        stage = group[0]["stages"][idx]
+        lowest = Path(group[0]["run_dir"])
+        out_dir = base / lowest.name.replace(
+            f'_T{group[0]["temperature_K"]}', "_REMD", 1
+        )
+        if all((Path(r["run_dir"]) / "done.ok").exists() for r in group):
+            logger.info(
+                f"Resume: REMD group {out_dir.name} already completed; skipping"
+            )
+            continue
+
+        slots = device_slots(
+            {**execution, "workers": len(group)}, defaults.get("platform", "auto")
+        )
+        members = [
+            (
+                Path(r["run_dir"]),
+                r["temperature_K"],
+                apply_slot(_run_defaults(r, defaults), slot),
+            )
+            for r, slot in zip(group, slots)
+        ]
+        run_remd(
+            members,
+            group[0]["stages"][:idx],
+            stage,
+            out_dir,
+            start_method=execution.get("start_method", "spawn"),
+            log_path=log_path,
+        )
+        for r in group:
+            (Path(r["run_dir"]) / "done.ok").write_text("simulation completed\n")
+            if on_done is not None:
+                on_done(r["run_dir"])
+
+
+def _batch_groups(runs, size: int):
+    """
+    Yield lists of up to `size` runs that can share one Context: same
+    temperature, swept values and force field (batches fill in run order).
+    """
+    open_groups: Dict[Tuple, List[Dict[str, Any]]] = {}
+    for run in runs:
+        key = (
+            run["temperature_K"],
+            tuple(sorted((run.get("sweep") or {}).items())),
+            tuple(run.get("forcefield") or ()),
+        )
+        group = open_groups.setdefault(key, [])
+        group.append(run)
+        if len(group) >= size:
+            yield open_groups.pop(key)
+    yield from open_groups.values()
+
+
+def _execute_batch(batch: List[Dict[str, Any]], defaults: Dict[str, Any]) -> None:
+    """
+    Build the runs of one batch as copies in a single Simulation, run the
+    stages together and mark every run done (see engines.batched).
+    """
+    names = ", ".join(Path(r["run_dir"]).name for r in batch)
+    logger.info(f'Batch: {len(batch)} runs @ {batch[0]["temperature_K"]} K -> {names}')
+    for run in batch:
+        if _replica_settings(run, defaults)[0] > 1:
+            raise ValueError("batch mode does not support replicas")
+    defaults_run = _run_defaults(batch[0], defaults)
+    sim, members = build_batched_simulation(
+        [r["input"] for r in batch], defaults_run, [Path(r["run_dir"]) for r in batch]
+    )
+    summary = []
+    for stage in batch[0]["stages"]:
+        stats = run_batched_stage(sim, members, stage, defaults_run)
+        summary.append({"name": stage.get("name"), **stats})
+    write_batch_summary(members, summary)
+    for run in batch:
+        (Path(run["run_dir"]) / "done.ok").write_text("simulation completed\n")
+
+
+def _notify_done(run_dir: str, on_run_done: Callable[[str], None] | None) -> None:
+    """Hand a finished run (done.ok written) to the caller's hook; hook errors are logged."""
+    if on_run_done is None or not (Path(run_dir) / "done.ok").exists():
+        return
+    try:
+        on_run_done(str(run_dir))
+    except Exception as e:
+        logger.warning(f"on_run_done hook failed for {Path(run_dir).name}: {e}")
+
+
+def _freeze_plan(base: Path, cfg: Dict[str, Any]) -> Path:
+    """
+    Write the prepared config (inputs already fixed and copied) to
+    <project>/plan.json, from which workers re-expand the runs.
+    """
+    path = base / PLAN_FILE
+    tmp = path.with_name(f".{PLAN_FILE}.{os.getpid()}")
+    tmp.write_text(json.dumps(cfg, indent=2, default=str))
+    os.replace(tmp, path)  # readers never see a partial plan
+    return path
+
+
+def _pending_runs(runs, resume: bool):
+    """Yield runs still to execute (with resume, runs marked done.ok are skipped)."""
+    for run in runs:
+        if resume and (Path(run["run_dir"]) / "done.ok").exists():
+            logger.info(f'Resume: {Path(run["run_dir"]).name} already done; skipping')
+            continue
+        yield run
+
+
 def run_from_yaml(
-    config_path: str, outdir: str, overrides: Dict[str, Any] | None = None
+    config_path: str,
+    outdir: str,
+    overrides: Dict[str, Any] | None = None,
+    workers: int | None = None,
+    resume: bool = False,
+    on_run_done: Callable[[str], None] | None = None,
+    run_slice: Tuple[int, int] | None = None,
+    prepare_only: bool = False,
 ) -> str:
+    """
+    Run every run of the job YAML. `on_run_done(run_dir)` is called as soon as
+    a run is marked done.ok (e.g. to start its analysis while others continue).
+    `run_slice=(a, b)` runs only plan runs a..b-1 (one scheduler array task);
+    several slices of one project may run at the same time. Every call freezes
+    the prepared plan to <project>/plan.json; `prepare_only=True` stops there
+    (for `fastmds worker`).
+    """
     cfg_path = Path(config_path)
     cfg = yaml.safe_load(open(cfg_path))
     if overrides:
@@ -399,8 +853,15 @@ def run_from_yaml(
     (base / "inputs").mkdir(exist_ok=True)
 
     # Normalize (includes fixing pdb at requested pH if needed)
-    cfg = _prepare_systems(cfg, base)
-    _populate_inputs(cfg, cfg_path, base)
+    if run_slice is not None:
+        # concurrent array tasks share the fixed inputs; one prepares them
+        (base / "_build").mkdir(exist_ok=True)
+        with FileLock(base / "_build" / ".prepare.lock"):
+            cfg = _prepare_systems(cfg, base)
+            _populate_inputs(cfg, cfg_path, base)
+    else:
+        cfg = _prepare_systems(cfg, base)
+        _populate_inputs(cfg, cfg_path, base)
 
     meta = {
         "time_start": time.time(),
@@ -408,28 +869,105 @@ def run_from_yaml(
         "cli_argv": sys.argv,
         "versions": versions,
     }
-    (base / "meta.json").write_text(json.dumps(meta, indent=2))
+    if resume:
+        meta["resume"] = True
+    meta_path = base / "meta.json"
+    if run_slice is not None:
+        meta["run_slice"] = list(run_slice)
+        meta_path = base / f"meta.{run_slice[0]}-{run_slice[1]}.json"
+    meta_path.write_text(json.dumps(meta, indent=2))
+    _freeze_plan(base, cfg)
+    if prepare_only:
+        return str(base)
 
     plan = _expand_runs(cfg, outdir)
+    remd_idx = _remd_stage_index(cfg.get("stages") or [])
+    runs = plan["runs"]
+    if run_slice is not None:
+        if remd_idx is not None:
+            raise ValueError("an REMD stage couples all runs; it cannot be sliced")
+        a, b = run_slice
+        runs = runs[a:b]
+        logger.info(
+            f"Runs: {a}..{min(b, len(plan['runs'])) - 1} of {len(plan['runs'])}"
+        )
+    if remd_idx is not None:
+        if any(
+            _replica_settings({"input": sys_cfg}, defaults)[0] > 1
+            for sys_cfg in cfg.get("systems", [])
+        ):
+            raise ValueError("replicas cannot be combined with an REMD stage")
+        # Stages before the REMD stage run per temperature as usual
+        runs = MappedSequence(
+            runs,
+            lambda r: {**r, "stages": r["stages"][:remd_idx], "remd_pending": True},
+        )
+    runs = _pending_runs(runs, resume)
+
+    execution = resolve_execution(defaults, workers)
+    batch = batch_settings(defaults)
+    if batch["size"] and remd_idx is not None:
+        raise ValueError("batch mode cannot be combined with an REMD stage")
+    failed: List[str] = []
+    depth = 0 if batch["size"] else prebuild_depth(execution)
+    prebuilder = None
+    if depth:
+        prebuilder = Prebuilder(
+            depth,
+            lambda r: _prebuild_job(r, defaults, resume),
+            start_method=execution["start_method"],
+            log_path=str(base / "fastmds.log"),
+        )
+        runs = prebuilder.prefetch(runs)
+    try:
+        if batch["size"]:
+            if execution["workers"] > 1:
+                logger.warning(
+                    "batch mode steps each batch in this process; ignoring workers"
+                )
+            for group in _batch_groups(runs, batch["size"]):
+                _execute_batch(group, defaults)
+                for run in group:
+                    _notify_done(run["run_dir"], on_run_done)
+        elif execution["workers"] > 1:
+            status = run_parallel(
+                runs,
+                defaults,
+                execution,
+                log_path=str(base / "fastmds.log"),
+                resume=resume,
+                on_done=lambda d: _notify_done(d, on_run_done),
+            )
+            failed = sorted(d for d, st in status.items() if st != "ok")
+        else:
+            for run in runs:
+                _execute_run(run, defaults, resume=resume)
+                _notify_done(run["run_dir"], on_run_done)
+    finally:
+        if prebuilder is not None:
+            prebuilder.close()
+
+    if remd_idx is not None and not failed:
+        _run_remd_phase(
+            plan["runs"],
+            remd_idx,
+            defaults,
+            base,
+            execution,
+            log_path=str(base / "fastmds.log"),
+            on_done=lambda d: _notify_done(d, on_run_done),
+        )
 
-    for run in plan["runs"]:
-        run_dir = Path(run["run_dir"])
-        run_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f'Run: {run["system_id"]} @ {run["temperature_K"]} K -> {run_dir}')
-
-        defaults_run = dict(defaults)
-        defaults_run["temperature_K"] = run["temperature_K"]
-        if run.get("forcefield"):
-            defaults_run["forcefield"] = run["forcefield"]
-
-        sim = build_simulation_from_spec(run["input"], defaults_run, run_dir)
-        for st in run["stages"]:
-            stage_dir = run_dir / st["name"]
-            run_stage(sim, st, stage_dir, defaults_run)
-
-        (run_dir / "done.ok").write_text("simulation completed\n")
+    meta["time_end"] = time.time()
+    if failed:
+        meta["failed_runs"] = failed
+        meta_path.write_text(json.dumps(meta, indent=2))
+        raise RuntimeError(
+            f"{len(failed)} run(s) failed: "
+            + ", ".join(Path(d).name for d in failed)
+            + " (see <run_dir>/error.log)"
+        )
 
     logger.info("All runs completed.")
-    meta["time_end"] = time.time()
-    (base / "meta.json").write_text(json.dumps(meta, indent=2))
+    meta_path.write_text(json.dumps(meta, indent=2))
     return str(base)
@@ -4,11 +4,37 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from ..utils.cache import (
+    cache_dir,
+    cache_enabled,
+    hash_key,
+    link_or_copy,
+    package_version,
+    sha256_file,
+    store_atomic,
+)
 from ..utils.logging import get_logger
 
 logger = get_logger("pdbfix")
 
 
+def _fixer_cache_key(
+    inp: Path, ph: float, keep_heterogens: bool, keep_water: bool
+) -> str:
+    """Everything the fixed PDB depends on: input bytes, options, tool versions."""
+    return hash_key(
+        {
+            "kind": "pdbfixer",
+            "input_sha256": sha256_file(inp),
+            "ph": float(ph),
+            "keep_heterogens": bool(keep_heterogens),
+            "keep_water": bool(keep_water),
+            "pdbfixer": package_version("pdbfixer"),
+            "openmm": package_version("openmm"),
+        }
+    )
+
+
 def fix_pdb_with_pdbfixer(
     input_pdb: str,
     output_pdb: str,
@@ -16,17 +42,34 @@ def fix_pdb_with_pdbfixer(
     ph: float = 7.0,
     keep_heterogens: bool = False,
     keep_water: bool = False,
+    use_cache: bool | None = None,
 ) -> None:
     """
     Strict PDBFixer wrapper: raises on failure.
     - By default removes heterogens (and waters); set keep_heterogens/keep_water to retain them.
     - Repairs missing residues/atoms and adds hydrogens at the requested pH.
+    - Results are cached by input sha256 + options + pdbfixer/openmm versions; a hit
+      hard-links (or copies) the cached file to output_pdb. use_cache=None follows
+      FASTMDS_CACHE (enabled unless set to 0/off).
     """
+    inp = Path(input_pdb)
+    out = Path(output_pdb)
+
+    if use_cache is None:
+        use_cache = cache_enabled()
+    cached: Path | None = None
+    if use_cache and inp.is_file():
+        key = _fixer_cache_key(inp, ph, keep_heterogens, keep_water)
+        cached = cache_dir("pdbfixer") / f"{key}.pdb"
+        if cached.exists():
+            how = link_or_copy(cached, out)
+            logger.info(f"PDBFixer cache hit: {inp.name} (pH={ph}) -> {out} ({how})")
+            return
+        logger.info(f"PDBFixer cache miss: {inp.name} (pH={ph}) [{key[:12]}]")
+
     from openmm.app import PDBFile
     from pdbfixer import PDBFixer
 
-    inp = Path(input_pdb)
-    out = Path(output_pdb)
     logger.info(f"Fixing PDB with PDBFixer: {inp} (pH={ph})")
     fixer = PDBFixer(filename=str(inp))
     if not keep_heterogens:
@@ -36,6 +79,14 @@ def fix_pdb_with_pdbfixer(
     fixer.addMissingAtoms()
     fixer.addMissingHydrogens(pH=float(ph))
     out.parent.mkdir(parents=True, exist_ok=True)
+    if out.exists():
+        out.unlink()  # may be a hard link into the cache; never write through it
     with open(out, "w") as f:
         PDBFile.writeFile(fixer.topology, fixer.positions, f, keepIds=True)
     logger.info(f" - wrote fixed PDB to {out}")
+
+    if cached is not None:
+        try:
+            store_atomic(out, cached)
+        except Exception as e:
+            logger.warning(f"PDBFixer cache: could not store {cached}: {e}")
@@ -0,0 +1,144 @@
+# FastMDSimulation/src/fastmdsimulation/core/pipeline.py
+
+"""
+Build-ahead pipeline (`execution.prebuild: N`).
+
+While a run is stepping, a pool of N CPU worker processes builds the Systems
+of the next N runs (solvation, createSystem) and hands each one off as a
+serialized bundle (system.xml, state.xml, topology.pdb) in
+<project>/_build/prebuilt/<system-id>-<key>/, so the device only restores a
+finished System between runs instead of waiting for the build.
+
+The hand-off is guarded by a FileLock per bundle: a worker builds under the
+lock and marks the bundle `prebuilt.ok`; a run that reaches its build first
+marks it `claimed` and builds in-process, and the worker then skips it. Runs
+that share a build key (e.g. a temperature sweep) share one prebuilt bundle.
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from ..utils.filelock import FileLock
+from ..utils.logging import attach_file_logger, get_logger
+
+logger = get_logger("pipeline")
+
+READY = "prebuilt.ok"
+CLAIMED = "claimed"
+
+Job = Tuple[Dict[str, Any], Dict[str, Any], Path]
+
+
+def prebuild_depth(execution: Dict[str, Any]) -> int:
+    """Number of runs to build ahead (execution.prebuild; 0 = off)."""
+    return max(0, int(execution.get("prebuild", 0) or 0))
+
+
+def _init_worker(log_path: Optional[str]) -> None:
+    if log_path:
+        attach_file_logger(log_path)
+
+
+def _prebuild_main(spec: Dict[str, Any], defaults: Dict[str, Any], target: str) -> str:
+    """Worker: build one System on the CPU and publish it as a bundle."""
+    from ..engines.openmm_engine import (
+        build_simulation_from_spec,
+        save_simulation_bundle,
+    )
+
+    out = Path(target)
+    with FileLock(out / ".lock"):
+        if (out / READY).exists() or (out / CLAIMED).exists():
+            return "skipped"
+        # The Context is throwaway; the consumer restores on its own platform
+        cpu = {**defaults, "platform": "Reference", "platform_properties": {}}
+        sim = build_simulation_from_spec(spec, cpu, out)
+        save_simulation_bundle(sim, out)
+        (out / READY).write_text("prebuilt\n")
+    logger.info(f"Prebuild: {out.name} ready")
+    return "built"
+
+
+def claim_prebuilt(target: Path) -> Optional[Path]:
+    """
+    Consumer side: the finished bundle in `target`, waiting for an in-flight
+    build; None (and the bundle is claimed) if no worker has started it.
+    """
+    if not target.is_dir():
+        return None
+    with FileLock(target / ".lock"):
+        if (target / READY).exists():
+            return target
+        (target / CLAIMED).write_text("built in-process\n")
+    return None
+
+
+class Prebuilder:
+    """
+    Pool of build-ahead workers. `plan(run)` returns the (spec, defaults,
+    target) build job of a run, or None if the run needs no build.
+    """
+
+    def __init__(
+        self,
+        depth: int,
+        plan: Callable[[Dict[str, Any]], Optional[Job]],
+        start_method: str = "spawn",
+        log_path: Optional[str] = None,
+    ):
+        self.depth = depth
+        self.plan = plan
+        self.pool = ProcessPoolExecutor(
+            max_workers=depth,
+            mp_context=mp.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(log_path,),
+        )
+        self.futures: Dict[str, Any] = {}
+        logger.info(f"Prebuild: building up to {depth} run(s) ahead")
+
+    def submit(self, run: Dict[str, Any]) -> None:
+        job = self.plan(run)
+        if job is None:
+            return
+        spec, defaults, target = job
+        if target.exists():
+            return  # shared with an earlier run, or left by a previous attempt
+        target.mkdir(parents=True)
+        fut = self.pool.submit(_prebuild_main, spec, defaults, str(target))
+        fut.add_done_callback(lambda f, name=target.name: self._done(name, f))
+        self.futures[str(target)] = fut
+
+    @staticmethod
+    def _done(name: str, fut) -> None:
+        if fut.cancelled():
+            return
+        err = fut.exception()
+        if err is not None:
+            logger.warning(f"Prebuild: {name} failed ({err}); the run builds it itself")
+
+    def prefetch(self, runs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield runs in order, submitting each run's build `depth` runs early."""
+        it = iter(runs)
+        window: collections.deque = collections.deque()
+        for run in itertools.chain(it, [None] * self.depth):
+            if run is not None:
+                self.submit(run)
+                window.append(run)
+            if len(window) > self.depth or (run is None and window):
+                yield window.popleft()
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "Prebuilder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,67 @@
+# FastMDSimulation/src/fastmdsimulation/core/plan.py
+
+"""
+Plan expansion: job YAML -> project, output dir and a lazy sequence of runs.
+
+Kept free of engine imports so `fastmds simulate --dry-run` (and anything else
+that only needs the plan) never loads OpenMM, PDBFixer or the orchestrator.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+
+import yaml
+
+from .sweep import MappedSequence, RunSequence, sweep_axes
+
+# Prepared config of a project, frozen for `fastmds worker`
+PLAN_FILE = "plan.json"
+
+
+# ------------------------------
+# Plan expansion
+# ------------------------------
+def _expand_runs(cfg: Dict[str, Any], outdir: str) -> Dict[str, Any]:
+    """Plan the project's runs; `runs` is a lazy sequence (see core.sweep)."""
+    defaults = cfg.get("defaults", {})
+    project = cfg["project"]
+    base = Path(outdir) / project
+    axes = sweep_axes(cfg.get("sweep") or {}, defaults)
+    runs = RunSequence(cfg["systems"], axes, base, cfg["stages"])
+    return {"project": project, "output_dir": base.as_posix(), "runs": runs}
+
+
+def _steps_to_ps(steps: int, timestep_fs: float) -> float:
+    return steps * timestep_fs / 1000.0
+
+
+def resolve_plan(config_path: str, outdir: str) -> Dict[str, Any]:
+    cfg = yaml.safe_load(Path(config_path).read_text())
+    plan = _expand_runs(cfg, outdir)
+    tfs = float(cfg.get("defaults", {}).get("timestep_fs", 2.0))
+
+    def _enrich(r: Dict[str, Any]) -> Dict[str, Any]:
+        run_tfs = float((r.get("sweep") or {}).get("timestep_fs", tfs))
+        st = []
+        for s in r["stages"]:
+            steps = int(s.get("steps", 0))
+            entry = {
+                "name": s["name"],
+                "steps": steps,
+                "approx_ps": round(_steps_to_ps(steps, run_tfs), 3),
+            }
+            if "report_interval" in s:
+                entry["report_interval"] = int(s["report_interval"])  # --estimate
+            if "trajectory" in s:
+                entry["trajectory"] = s["trajectory"]  # file name, --estimate
+            st.append(entry)
+        r2 = dict(r)
+        r2["stages"] = st
+        return r2
+
+    # Enriched lazily, so dry runs of large campaigns stream
+    plan["runs"] = MappedSequence(plan["runs"], _enrich)
+    plan["defaults"] = cfg.get("defaults", {})
+    return plan
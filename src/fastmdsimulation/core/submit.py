@@ -0,0 +1,257 @@
+# FastMDSimulation/src/fastmdsimulation/core/submit.py
+
+"""
+`fastmds submit`: one scheduler array task per run (or per packed group of
+runs) generated from resolve_plan, plus a dependent analysis array.
+
+Array task i runs `fastmds simulate --run-index a:b --resume` for its slice
+of the plan, so a requeued task continues where it stopped. The analysis
+array reads the run directories of its task from runs.txt. With SLURM every
+analysis task waits only for its own simulation task (aftercorr); PBS has no
+per-element array dependency, so the analysis array waits for the whole
+simulation array.
+
+Scheduler settings come from an options YAML such as
+examples/slurm_options.yml / examples/pbs_options.yml:
+
+  account: my_account
+  partition: gpu           # PBS: queue
+  time: "02:00:00"         # PBS: walltime
+  gpus: 1
+  nodes: 1                 # SLURM only
+  ntasks: 1                # SLURM only
+  ncpus: 4                 # PBS only
+  pack: 1                  # runs per array task (CLI --pack wins)
+  array_max: 8             # at most 8 array tasks at once
+  setup: ["module load cuda", "conda activate fastmds"]
+  analyze: {partition: gpu, time: "00:30:00"}
+
+Scripts are written to <output>/<project>/_submit/; --render-only stops there.
+"""
+
+from __future__ import annotations
+
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+from ..reporting.analysis_bridge import build_analyze_cmd
+from ..utils.logging import get_logger
+from .plan import resolve_plan
+
+logger = get_logger("submit")
+
+SCHEDULERS = ("slurm", "pbs")
+
+
+def load_options(path: str | None) -> Dict[str, Any]:
+    if not path:
+        return {}
+    return yaml.safe_load(Path(path).read_text()) or {}
+
+
+def detect_scheduler(options: Dict[str, Any]) -> str:
+    """PBS if the options look like PBS (queue/walltime), else SLURM."""
+    return "pbs" if ("queue" in options or "walltime" in options) else "slurm"
+
+
+def pack_runs(run_dirs: List[str], pack: int) -> List[List[str]]:
+    """Consecutive groups of `pack` runs, one per array task."""
+    pack = max(1, int(pack))
+    return [run_dirs[i : i + pack] for i in range(0, len(run_dirs), pack)]
+
+
+def _setup_lines(options: Dict[str, Any]) -> str:
+    setup = options.get("setup") or []
+    if isinstance(setup, str):
+        setup = [setup]
+    return "".join(f"{line}\n" for line in setup)
+
+
+def _slurm_header(
+    name: str, opts: Dict[str, Any], n_tasks: int, log: Path, gpus: bool
+) -> str:
+    lines = [
+        "#!/usr/bin/env bash",
+        f"#SBATCH -J {name}",
+        f"#SBATCH -p {opts.get('partition', 'gpu')}",
+        f"#SBATCH -t {opts.get('time', '02:00:00')}",
+        f"#SBATCH -N {opts.get('nodes', 1)}",
+        f"#SBATCH -n {opts.get('ntasks', 1)}",
+    ]
+    if opts.get("account"):
+        lines.append(f"#SBATCH -A {opts['account']}")
+    if gpus and str(opts.get("gpus", 1)) != "0":
+        lines.append(f"#SBATCH --gres=gpu:{opts.get('gpus', 1)}")
+    throttle = f"%{opts['array_max']}" if opts.get("array_max") else ""
+    lines.append(f"#SBATCH --array=0-{n_tasks - 1}{throttle}")
+    lines.append(f"#SBATCH -o {log}/{name}_%A_%a.out")
+    return "\n".join(lines) + "\n"
+
+
+def _pbs_header(
+    name: str, opts: Dict[str, Any], n_tasks: int, log: Path, gpus: bool
+) -> str:
+    ngpus = opts.get("gpus", 1) if gpus else 0
+    lines = [
+        "#!/usr/bin/env bash",
+        f"#PBS -N {name}",
+        f"#PBS -q {opts.get('queue', 'gpuq')}",
+        f"#PBS -l walltime={opts.get('walltime', '02:00:00')}",
+        f"#PBS -l select=1:ncpus={opts.get('ncpus', 4)}:ngpus={ngpus}",
+        f"#PBS -o {log}",
+        "#PBS -j oe",
+    ]
+    if opts.get("account"):
+        lines.append(f"#PBS -A {opts['account']}")
+    if n_tasks > 1:
+        # PBS arrays need at least two subjobs; a single task runs as index 0
+        throttle = f"%{opts['array_max']}" if opts.get("array_max") else ""
+        lines.append(f"#PBS -J 0-{n_tasks - 1}{throttle}")
+    lines.append('cd "$PBS_O_WORKDIR"')
+    return "\n".join(lines) + "\n"
+
+
+_INDEX = {"slurm": "${SLURM_ARRAY_TASK_ID}", "pbs": "${PBS_ARRAY_INDEX:-0}"}
+
+
+def _analysis_args(slides: bool, frames: str | None, atoms: str | None) -> List[str]:
+    """fastmda flags after -traj/-top, as in build_analyze_cmd (shell-quoted)."""
+    cmd = build_analyze_cmd(
+        Path("-"), Path("-"), slides=slides, frames=frames, atoms=atoms
+    )
+    return [shlex.quote(a) for a in cmd[6:]]
+
+
+def render(
+    config_path: str,
+    outdir: str,
+    *,
+    scheduler: str | None = None,
+    options: Dict[str, Any] | None = None,
+    pack: int | None = None,
+    analyze: bool = True,
+    slides: bool = True,
+    frames: str | None = None,
+    atoms: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Write the simulation (and analysis) array scripts for a job YAML.
+    Returns {"scheduler", "dir", "tasks", "runs", "simulate", "analyze"}.
+    """
+    options = dict(options or {})
+    scheduler = (scheduler or detect_scheduler(options)).lower()
+    if scheduler not in SCHEDULERS:
+        raise ValueError(
+            f"Unknown scheduler '{scheduler}'. Use: {', '.join(SCHEDULERS)}"
+        )
+
+    cfg = yaml.safe_load(Path(config_path).read_text()) or {}
+    if any(
+        str(st.get("ensemble", "")).upper() == "REMD" for st in cfg.get("stages") or []
+    ):
+        raise ValueError(
+            "REMD projects couple all temperatures; submit them as one job"
+        )
+
+    plan = resolve_plan(config_path, outdir)
+    run_dirs = [str(Path(r["run_dir"]).resolve()) for r in plan["runs"]]
+    if not run_dirs:
+        raise ValueError("The plan has no runs to submit")
+    groups = pack_runs(run_dirs, pack or options.get("pack", 1))
+    k = max(1, int(pack or options.get("pack", 1)))
+
+    out = Path(plan["output_dir"]).resolve() / "_submit"
+    logs = out / "logs"
+    logs.mkdir(parents=True, exist_ok=True)
+    (out / "runs.txt").write_text("".join(" ".join(g) + "\n" for g in groups))
+
+    header = _slurm_header if scheduler == "slurm" else _pbs_header
+    idx = _INDEX[scheduler]
+    project = plan["project"]
+    setup = _setup_lines(options)
+    job = shlex.quote(str(Path(config_path).resolve()))
+    base = shlex.quote(str(Path(outdir).resolve()))
+
+    sim = out / f"simulate.{scheduler}.sh"
+    sim.write_text(
+        header(f"fmds-{project}", options, len(groups), logs, gpus=True)
+        + "\nset -euo pipefail\n"
+        + setup
+        + f"i={idx}\n"
+        + f"fastmds simulate -s {job} -o {base} "
+        + f'--run-index "$((i * {k})):$((i * {k} + {k}))" --resume\n'
+    )
+
+    result = {
+        "scheduler": scheduler,
+        "dir": str(out),
+        "tasks": len(groups),
+        "runs": len(run_dirs),
+        "simulate": str(sim),
+        "analyze": None,
+    }
+    if analyze:
+        an_opts = {**options, **(options.get("analyze") or {})}
+        an = out / f"analyze.{scheduler}.sh"
+        an.write_text(
+            header(f"fmds-{project}-an", an_opts, len(groups), logs, gpus=False)
+            + "\nset -euo pipefail\n"
+            + setup
+            + f"i={idx}\n"
+            + f'runs=$(sed -n "$((i + 1))p" {shlex.quote(str(out / "runs.txt"))})\n'
+            + "if command -v fastmda >/dev/null 2>&1; then\n"
+            + "  ana=(fastmda)\n"
+            + "else\n"
+            + "  ana=(python -m fastmdanalysis)\n"
+            + "fi\n"
+            + "for run in $runs; do\n"
+            + '  for stage in "$run/production" "$run"/rep*/production; do\n'
+            + '    traj=$(ls -t "$stage"/traj.dcd "$stage"/traj.xtc "$stage"/traj.h5'
+            + " 2>/dev/null | head -n 1 || true)\n"
+            + '    [ -n "$traj" ] && [ -f "$stage/topology.pdb" ] || continue\n'
+            + '    "${ana[@]}" analyze -traj "$traj" -top "$stage/topology.pdb"'
+            + "".join(f" {a}" for a in _analysis_args(slides, frames, atoms))
+            + "\n"
+            + "  done\n"
+            + "done\n"
+        )
+        result["analyze"] = str(an)
+    return result
+
+
+def submit(rendered: Dict[str, Any]) -> Dict[str, str]:
+    """Submit rendered scripts; the analysis array depends on the simulation array."""
+    if rendered["scheduler"] == "slurm":
+        sim_id = _call(["sbatch", "--parsable", rendered["simulate"]]).split(";")[0]
+        ids = {"simulate": sim_id}
+        if rendered["analyze"]:
+            ids["analyze"] = _call(
+                [
+                    "sbatch",
+                    "--parsable",
+                    f"--dependency=aftercorr:{sim_id}",
+                    rendered["analyze"],
+                ]
+            ).split(";")[0]
+    else:
+        sim_id = _call(["qsub", rendered["simulate"]])
+        ids = {"simulate": sim_id}
+        if rendered["analyze"]:
+            ids["analyze"] = _call(
+                ["qsub", "-W", f"depend=afterok:{sim_id}", rendered["analyze"]]
+            )
+    return ids
+
+
+def _call(cmd: List[str]) -> str:
+    logger.info("submit: " + " ".join(cmd))
+    try:
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except FileNotFoundError:
+        sys.exit(f"{cmd[0]} not found; use --render-only to only write the scripts")
+    return out.stdout.strip()
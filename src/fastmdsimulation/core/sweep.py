@@ -0,0 +1,198 @@
+# FastMDSimulation/src/fastmdsimulation/core/sweep.py
+
+"""
+Lazy expansion of `sweep:` into runs.
+
+  sweep:
+    temperature_K: [300, 310, 320]
+    pressure_atm: [1.0, 1000.0]
+    ionic_strength_molar: [0.0, 0.15]
+    box_padding_nm: [1.0, 1.5]
+    timestep_fs: [2.0, 4.0]
+    seed: [11, 12]
+    replica: 3                     # [0, 1, 2]; seed = base seed + replica + 1
+    zip:                           # swept together instead of crossed
+      - [temperature_K, pressure_atm]
+
+Every key is its own axis of a Cartesian product, except the keys of a `zip`
+group, which advance together (equal lengths). Runs are produced on demand:
+RunSequence supports len(), indexing and iteration without materializing the
+full campaign. Run directories are named from the swept values in a fixed
+order, e.g. `prot_T300` (temperature only) or `prot_T300_P1000_seed11`.
+"""
+
+from __future__ import annotations
+
+import itertools
+import re
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# Sweepable keys -> run directory tag (in naming order)
+SWEEP_TAGS = {
+    "temperature_K": "T",
+    "pressure_atm": "P",
+    "ionic_strength_molar": "I",
+    "box_padding_nm": "pad",
+    "timestep_fs": "dt",
+    "seed": "seed",
+    "replica": "rep",
+}
+
+Axis = Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]
+
+
+def _values(key: str, raw: Any) -> List[Any]:
+    if key == "replica" and isinstance(raw, int) and not isinstance(raw, bool):
+        return list(range(raw))
+    values = list(raw) if isinstance(raw, (list, tuple)) else [raw]
+    if not values:
+        raise ValueError(f"sweep.{key} is empty")
+    return values
+
+
+def sweep_axes(sweep: Dict[str, Any], defaults: Dict[str, Any]) -> List[Axis]:
+    """Normalize a `sweep:` block into product axes of (keys, value tuples)."""
+    sweep = dict(sweep or {})
+    zips = sweep.pop("zip", None) or []
+    unknown = sorted(set(sweep) - set(SWEEP_TAGS))
+    if unknown:
+        raise ValueError(
+            f"Unsupported sweep key(s): {', '.join(unknown)}. "
+            f"Use: {', '.join(SWEEP_TAGS)} (and zip)."
+        )
+    if "temperature_K" not in sweep:
+        sweep["temperature_K"] = [defaults.get("temperature_K", 300)]
+
+    values = {k: _values(k, v) for k, v in sweep.items()}
+    zipped = set()
+    axes: List[Axis] = []
+    for group in zips:
+        keys = tuple(group)
+        missing = [k for k in keys if k not in values]
+        if missing:
+            raise ValueError(f"sweep.zip refers to unswept key(s): {missing}")
+        if zipped & set(keys):
+            raise ValueError(f"sweep.zip lists a key twice: {list(keys)}")
+        lengths = {len(values[k]) for k in keys}
+        if len(lengths) != 1:
+            raise ValueError(f"sweep.zip group {list(keys)} has unequal lengths")
+        zipped.update(keys)
+        axes.append((keys, list(zip(*(values[k] for k in keys)))))
+    for k, v in values.items():
+        if k not in zipped:
+            axes.append(((k,), [(x,) for x in v]))
+    return axes
+
+
+def _fmt(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:g}"
+    return re.sub(r"[^A-Za-z0-9.+-]+", "-", str(value))
+
+
+def run_dir_name(system_id: str, point: Dict[str, Any], swept: List[str]) -> str:
+    """Deterministic run directory name; temperature-only sweeps keep `{id}_T{T}`."""
+    parts = [f'{system_id}_T{point["temperature_K"]}']
+    for key, tag in SWEEP_TAGS.items():
+        if key != "temperature_K" and key in swept:
+            parts.append(f"{tag}{_fmt(point[key])}")
+    return "_".join(parts)
+
+
+class RunSequence(Sequence):
+    """Lazy systems x sweep-axes product of run dicts (last axis varies fastest)."""
+
+    def __init__(
+        self,
+        systems: List[Dict[str, Any]],
+        axes: List[Axis],
+        base: Path,
+        stages: List[Dict[str, Any]],
+    ):
+        self.systems = list(systems)
+        self.axes = axes
+        self.base = Path(base)
+        self.stages = stages
+        self.swept = [k for keys, _ in axes for k in keys]
+        self._per_system = 1
+        for _, vals in axes:
+            self._per_system *= len(vals)
+
+    def __len__(self) -> int:
+        return len(self.systems) * self._per_system
+
+    def _make(self, sys_cfg: Dict[str, Any], combo) -> Dict[str, Any]:
+        point: Dict[str, Any] = {}
+        for (keys, _), vals in zip(self.axes, combo):
+            point.update(zip(keys, vals))
+        sid = sys_cfg.get("id", "system")
+        run = {
+            "system_id": sid,
+            "temperature_K": point["temperature_K"],
+            "run_dir": (self.base / run_dir_name(sid, point, self.swept)).as_posix(),
+            "stages": self.stages,
+            "input": sys_cfg,  # full spec (type + files)
+        }
+        extra = {k: v for k, v in point.items() if k != "temperature_K"}
+        if extra:
+            run["sweep"] = extra
+        if "forcefield" in sys_cfg:
+            run["forcefield"] = sys_cfg["forcefield"]
+        return run
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("run index out of range")
+        sys_idx, rem = divmod(index, self._per_system)
+        combo = []
+        for _, vals in reversed(self.axes):
+            rem, i = divmod(rem, len(vals))
+            combo.append(vals[i])
+        return self._make(self.systems[sys_idx], list(reversed(combo)))
+
+    def __iter__(self):
+        for sys_cfg in self.systems:
+            for combo in itertools.product(*(vals for _, vals in self.axes)):
+                yield self._make(sys_cfg, combo)
+
+
+class MappedSequence(Sequence):
+    """Lazy `fn(item)` view over a sequence (len/indexing/iteration)."""
+
+    def __init__(self, items: Sequence, fn: Callable[[Any], Any]):
+        self.items = items
+        self.fn = fn
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.fn(x) for x in self.items[index]]
+        return self.fn(self.items[index])
+
+    def __iter__(self):
+        return (self.fn(x) for x in self.items)
+
+
+def apply_sweep_point(defaults: Dict[str, Any], point: Dict[str, Any]) -> None:
+    """
+    Apply a run's swept values (other than temperature) to its defaults. A
+    replica point derives its seed from the base seed and the replica index
+    (like in-process replicas), so replicas are independent and reproducible.
+    """
+    for key, value in point.items():
+        defaults[key] = value
+        if key == "timestep_fs" and isinstance(defaults.get("integrator"), dict):
+            # an explicit integrator.timestep_fs would otherwise win
+            defaults["integrator"] = {**defaults["integrator"], "timestep_fs": value}
+    if "replica" in point:
+        # 0 would let OpenMM pick a random seed
+        defaults["seed"] = int(defaults.get("seed") or 0) + int(point["replica"]) + 1
@@ -0,0 +1,287 @@
+# FastMDSimulation/src/fastmdsimulation/core/workqueue.py
+
+"""
+Shared-filesystem work queue (`fastmds worker --project <dir>`).
+
+Any number of workers, on any nodes that see the project directory, drain its
+runs without a central service. Workers read the frozen plan
+(<project>/plan.json, written by run_from_yaml after the inputs are fixed) and
+re-expand the runs from it, so inputs are never re-parsed or re-fixed.
+
+Claims live in <project>/_queue/:
+
+  <i>.claim    run i is taken; JSON owner record, mtime = last heartbeat
+  <i>.failed   run i failed (traceback in <run_dir>/error.log); not retried
+  .clock       touched to read the filesystem's current time
+
+A run is claimed by creating its claim file with O_CREAT | O_EXCL, so two
+workers never take the same run and no global lock is held. Each worker scans
+from its own cursor, which starts at an offset derived from its id and moves
+past every run it claims, and remembers the runs it has seen done or failed;
+a claim therefore costs a few metadata operations rather than a rescan of the
+whole campaign. While a run executes, a heartbeat thread refreshes the claim's
+mtime; a claim whose heartbeat is older than `stale_s` belongs to a dead
+worker and is reclaimed by the next worker, which resumes the run from its
+checkpoints. Heartbeat age is measured against the mtime of a freshly touched
+.clock file, so clock skew between nodes does not matter. A run is finished
+once its done.ok exists.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from ..utils.logging import attach_file_logger, get_logger
+from . import orchestrator
+from .plan import PLAN_FILE
+
+logger = get_logger("workqueue")
+
+QUEUE_DIR = "_queue"
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def load_plan(project: str | Path) -> Dict[str, Any]:
+    """The frozen plan of a project: {"config", "defaults", "runs"}."""
+    project = Path(project)
+    path = project / PLAN_FILE
+    if not path.exists():
+        raise FileNotFoundError(
+            f"{path} not found; prepare the project first "
+            "(fastmds worker --project <dir> --system job.yml)"
+        )
+    cfg = json.loads(path.read_text())
+    stages = cfg.get("stages") or []
+    if orchestrator._remd_stage_index(stages) is not None:
+        raise ValueError(
+            "REMD projects couple all runs; they cannot be drained by workers"
+        )
+    defaults = cfg.get("defaults", {})
+    if orchestrator.batch_settings(defaults)["size"]:
+        raise ValueError("batch mode is not supported by workers; unset defaults.batch")
+    runs = orchestrator._expand_runs(cfg, str(project.parent))["runs"]
+    return {"config": cfg, "defaults": defaults, "runs": runs}
+
+
+def fs_now(queue: Path) -> float:
+    """The filesystem's current time: the mtime of a freshly touched file."""
+    clock = queue / ".clock"
+    clock.touch()
+    return clock.stat().st_mtime
+
+
+def start_index(owner: str, n: int) -> int:
+    """Where `owner` starts scanning, spread over the runs by its id."""
+    return zlib.crc32(owner.encode()) % n if n else 0
+
+
+def _create_claim(claim: Path, record: Dict[str, Any]) -> bool:
+    """Atomically create `claim`; False if another worker holds it."""
+    try:
+        fd = os.open(claim, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as f:
+        f.write(json.dumps(record))
+    return True
+
+
+def _break_stale(claim: Path, seen: os.stat_result, owner: str) -> bool:
+    """
+    Remove a stale claim, unless another worker replaced it since `seen`.
+    The rename lets exactly one worker break a given claim.
+    """
+    grave = claim.with_name(f"{claim.name}.{zlib.crc32(owner.encode()):08x}")
+    try:
+        os.rename(claim, grave)
+    except FileNotFoundError:
+        return False
+    now = grave.stat()
+    if (now.st_ino, now.st_mtime_ns) != (seen.st_ino, seen.st_mtime_ns):
+        # a fresh claim by another worker: put it back
+        try:
+            os.link(grave, claim)
+        except FileExistsError:
+            pass
+        grave.unlink(missing_ok=True)
+        return False
+    grave.unlink(missing_ok=True)
+    return True
+
+
+def claim_next(
+    project: str | Path,
+    runs,
+    owner: str,
+    stale_s: float = 300.0,
+    start: int = 0,
+    finished: Optional[Set[int]] = None,
+) -> Optional[int]:
+    """
+    Claim the first run from `start` on (wrapping around) that is not done,
+    failed or held by a live worker. Runs found done or failed are added to
+    `finished` and never looked at again by the caller's later scans.
+    Returns its index, or None if nothing is claimable right now.
+    """
+    queue = Path(project) / QUEUE_DIR
+    queue.mkdir(exist_ok=True)
+    finished = set() if finished is None else finished
+    n = len(runs)
+    now = None
+    for j in range(n):
+        i = (start + j) % n
+        if i in finished:
+            continue
+        run = runs[i]
+        claim = queue / f"{i}.claim"
+        record = {"owner": owner, "run_dir": run["run_dir"], "time": time.time()}
+        if _create_claim(claim, record):
+            # done/failed are checked after claiming, so a run finished by a
+            # worker that released its claim a moment ago is not re-run
+            if (Path(run["run_dir"]) / "done.ok").exists() or (
+                queue / f"{i}.failed"
+            ).exists():
+                claim.unlink(missing_ok=True)
+                finished.add(i)
+                continue
+            return i
+        try:
+            seen = claim.stat()
+        except FileNotFoundError:
+            continue  # released meanwhile; picked up on a later scan
+        now = fs_now(queue) if now is None else now
+        age = now - seen.st_mtime
+        if age < stale_s:
+            continue
+        try:
+            prev = json.loads(claim.read_text()).get("owner", "?")
+        except Exception:
+            prev = "?"
+        if _break_stale(claim, seen, owner) and _create_claim(claim, record):
+            logger.warning(
+                f"Queue: reclaiming {Path(run['run_dir']).name} from {prev} "
+                f"(no heartbeat for {age:.0f} s)"
+            )
+            return i
+    return None
+
+
+def release(project: str | Path, index: int, owner: str) -> None:
+    """Drop a claim, unless another worker has reclaimed it meanwhile."""
+    claim = Path(project) / QUEUE_DIR / f"{index}.claim"
+    try:
+        if json.loads(claim.read_text()).get("owner") == owner:
+            claim.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def pending(project: str | Path, runs, finished: Optional[Set[int]] = None) -> int:
+    """Runs that are neither done nor failed (skipping those in `finished`)."""
+    queue = Path(project) / QUEUE_DIR
+    finished = finished or set()
+    return sum(
+        1
+        for i, run in enumerate(runs)
+        if i not in finished
+        and not (Path(run["run_dir"]) / "done.ok").exists()
+        and not (queue / f"{i}.failed").exists()
+    )
+
+
+class Heartbeat:
+    """Background thread refreshing a claim's mtime every `interval_s`."""
+
+    def __init__(self, path: Path, interval_s: float = 30.0):
+        self.path = path
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._beat, name=f"heartbeat-{path.name}", daemon=True
+        )
+
+    def _beat(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                os.utime(self.path)
+            except FileNotFoundError:
+                return
+
+    def __enter__(self) -> "Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(
+    project: str | Path,
+    heartbeat_s: float = 30.0,
+    stale_s: float = 300.0,
+    wait: bool = False,
+    max_runs: int | None = None,
+    poll_s: float | None = None,
+) -> Dict[str, List[str]]:
+    """
+    Claim and execute runs of `project` until none is left. With wait=True the
+    worker keeps polling while other workers hold claims, so runs of workers
+    that die are picked up. Returns {"done": [...], "failed": [...]} run dirs.
+    """
+    project = Path(project)
+    if stale_s <= heartbeat_s:
+        raise ValueError("stale_s must be larger than heartbeat_s")
+    attach_file_logger(str(project / "fastmds.log"))
+    plan = load_plan(project)
+    runs, defaults = plan["runs"], plan["defaults"]
+    owner = worker_id()
+    queue = project / QUEUE_DIR
+    queue.mkdir(exist_ok=True)
+    poll_s = heartbeat_s if poll_s is None else poll_s
+    logger.info(f"Worker {owner}: {len(runs)} run(s) in {project}")
+
+    result: Dict[str, List[str]] = {"done": [], "failed": []}
+    cursor = start_index(owner, len(runs))
+    finished: Set[int] = set()
+    while max_runs is None or len(result["done"]) + len(result["failed"]) < max_runs:
+        i = claim_next(project, runs, owner, stale_s, cursor, finished)
+        if i is None:
+            if wait and pending(project, runs, finished):
+                time.sleep(poll_s)
+                continue
+            break
+        cursor = i + 1
+        run = runs[i]
+        run_dir = Path(run["run_dir"])
+        try:
+            with Heartbeat(queue / f"{i}.claim", heartbeat_s):
+                (run_dir / "error.log").unlink(missing_ok=True)
+                # resume: a reclaimed run continues from its checkpoints
+                orchestrator._execute_run(run, defaults, resume=True)
+            result["done"].append(str(run_dir))
+        except Exception:
+            run_dir.mkdir(parents=True, exist_ok=True)
+            (run_dir / "error.log").write_text(traceback.format_exc())
+            (queue / f"{i}.failed").write_text(owner + "\n")
+            logger.error(f"Run failed: {run_dir.name} (see {run_dir / 'error.log'})")
+            result["failed"].append(str(run_dir))
+        finally:
+            finished.add(i)
+            release(project, i, owner)
+
+    logger.info(
+        f"Worker {owner}: {len(result['done'])} done, {len(result['failed'])} failed"
+    )
+    return result
@@ -0,0 +1,145 @@
+# FastMDSimulation/src/fastmdsimulation/engines/atom_selection.py
+
+"""
+Atom selections for trajectory groups, evaluated on an OpenMM Topology.
+
+A selection is terms joined by `and` / `or` (`and` binds tighter), each
+optionally prefixed with `not`:
+
+    all | protein | backbone | water | ions | solvent | solute
+    resname LIG HEM | name CA CB | chain A B | index 0-99,120
+
+`solute` is everything but water and ions (protein, ligands, cofactors,
+membrane). For example "protein or resname LIG", "solute and not resname POPC".
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, List, Sequence
+
+# fmt: off
+WATER_RESIDUES = {"HOH", "WAT", "SOL", "TIP3", "TIP4", "TIP5", "SPC", "T3P", "T4P"}
+ION_RESIDUES = {
+    "NA", "CL", "K", "MG", "CA", "ZN", "LI", "RB", "CS", "F", "BR", "I",
+    "NA+", "CL-", "K+", "SOD", "CLA", "POT", "CAL", "MG2",
+}
+ION_ELEMENTS = {"Li", "Na", "K", "Rb", "Cs", "Mg", "Ca", "Zn", "F", "Cl", "Br", "I"}
+PROTEIN_RESIDUES = {
+    "ALA", "ARG", "ASN", "ASP", "CYS", "GLN", "GLU", "GLY", "HIS", "ILE",
+    "LEU", "LYS", "MET", "PHE", "PRO", "SER", "THR", "TRP", "TYR", "VAL",
+    "HID", "HIE", "HIP", "HSD", "HSE", "HSP", "CYX", "ASH", "GLH", "LYN",
+    "ACE", "NME", "NMA",
+}
+# fmt: on
+BACKBONE_NAMES = {"N", "CA", "C", "O"}
+
+Predicate = Callable[[object], bool]
+
+
+def _is_water(atom) -> bool:
+    return atom.residue.name.upper() in WATER_RESIDUES
+
+
+def _is_ion(atom) -> bool:
+    res = atom.residue
+    if res.name.upper() in ION_RESIDUES:
+        return True
+    element = getattr(atom.element, "symbol", None)
+    return element in ION_ELEMENTS and len(list(res.atoms())) == 1
+
+
+def _is_protein(atom) -> bool:
+    return atom.residue.name.upper() in PROTEIN_RESIDUES
+
+
+_KEYWORDS = {
+    "all": lambda atom: True,
+    "protein": _is_protein,
+    "backbone": lambda atom: _is_protein(atom) and atom.name in BACKBONE_NAMES,
+    "water": _is_water,
+    "ions": _is_ion,
+    "solvent": lambda atom: _is_water(atom) or _is_ion(atom),
+    "solute": lambda atom: not (_is_water(atom) or _is_ion(atom)),
+}
+
+
+def _indices(text: str) -> set:
+    """'0-3,8' -> {0, 1, 2, 3, 8}."""
+    out = set()
+    for part in text.replace(" ", ",").split(","):
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            out.update(range(int(lo), int(hi) + 1))
+        elif part:
+            out.add(int(part))
+    return out
+
+
+def _term(text: str) -> Predicate:
+    words = text.split()
+    if not words:
+        raise ValueError("empty term in atom selection")
+    if words[0].lower() == "not":
+        inner = _term(" ".join(words[1:]))
+        return lambda atom: not inner(atom)
+    key, args = words[0].lower(), words[1:]
+    if key in _KEYWORDS and not args:
+        return _KEYWORDS[key]
+    if key == "resname" and args:
+        names = {a.upper() for a in args}
+        return lambda atom: atom.residue.name.upper() in names
+    if key == "name" and args:
+        names = set(args)
+        return lambda atom: atom.name in names
+    if key == "chain" and args:
+        ids = set(args)
+        return lambda atom: atom.residue.chain.id in ids
+    if key == "index" and args:
+        wanted = _indices(",".join(args))
+        return lambda atom: atom.index in wanted
+    raise ValueError(
+        f"Unknown atom selection term '{text}' (use {', '.join(_KEYWORDS)}, "
+        "resname ..., name ..., chain ..., index ...)"
+    )
+
+
+def select_atoms(topology, selection: str) -> List[int]:
+    """Sorted indices of the atoms `selection` matches; errors if none do."""
+    alternatives = [
+        [_term(t) for t in re.split(r"\s+and\s+", alt.strip(), flags=re.I)]
+        for alt in re.split(r"\s+or\s+", str(selection).strip(), flags=re.I)
+    ]
+    picked = [
+        atom.index
+        for atom in topology.atoms()
+        if any(all(p(atom) for p in alt) for alt in alternatives)
+    ]
+    if not picked:
+        raise ValueError(f"Atom selection '{selection}' matches no atoms")
+    return sorted(picked)
+
+
+def subset_topology(topology, indices: Sequence[int]):
+    """A Topology with only `indices` (chains, residues, ids and bonds kept)."""
+    from openmm.app import Topology
+
+    keep = set(indices)
+    sub = Topology()
+    sub.setPeriodicBoxVectors(topology.getPeriodicBoxVectors())
+    mapped = {}
+    for chain in topology.chains():
+        new_chain = None
+        for res in chain.residues():
+            atoms = [a for a in res.atoms() if a.index in keep]
+            if not atoms:
+                continue
+            if new_chain is None:
+                new_chain = sub.addChain(chain.id)
+            new_res = sub.addResidue(res.name, new_chain, res.id, res.insertionCode)
+            for a in atoms:
+                mapped[a.index] = sub.addAtom(a.name, a.element, new_res, a.id)
+    for a, b in topology.bonds():
+        if a.index in mapped and b.index in mapped:
+            sub.addBond(mapped[a.index], mapped[b.index])
+    return sub
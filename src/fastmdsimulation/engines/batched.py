@@ -0,0 +1,336 @@
+# FastMDSimulation/src/fastmdsimulation/engines/batched.py
+
+"""
+Batched build mode (`defaults.batch`): several small, non-periodic systems
+stepped together in one Context.
+
+Each system is placed as a non-interacting copy on a cubic grid whose cell is
+the largest system extent plus the nonbonded cutoff plus `spacing_nm`, so no
+pair of atoms from different copies is ever within the cutoff. A flat-bottom
+restraint on each copy's centroid (zero force within spacing_nm / 2 of its grid
+point) keeps diffusing copies from drifting into each other, in place of a
+CMMotionRemover (`removeCMMotion` is ignored). This requires a
+non-periodic nonbonded method (CutoffNonPeriodic, e.g. with an implicit solvent
+force field); explicitly solvated, periodic systems cannot be batched.
+
+DemuxReporter splits every report of the combined Context back into per-system
+outputs under <run_dir>/<stage>/: traj.dcd (coordinates in the system's own
+frame), state.log (potential energy from a single-copy Context, kinetic energy
+and temperature from the copy's own velocities and degrees of freedom) plus
+stage.json and topology.pdb at the end of the stage.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+from ..utils.logging import get_logger
+
+logger = get_logger("engine.batched")
+
+K_B = 0.0083144626  # kJ/(mol K)
+
+# Per-copy centroid restraint (flat bottom of radius r_batch around x0, y0, z0)
+_RESTRAINT = (
+    "0.5*k_batch*step(d-r_batch)*(d-r_batch)^2;" "d=sqrt((x1-x0)^2+(y1-y0)^2+(z1-z0)^2)"
+)
+
+
+# ------------------------------------------------------------
+# Layout (pure)
+# ------------------------------------------------------------
+def batch_settings(defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize `defaults.batch` (an int size or a mapping) to
+    {"size", "spacing_nm", "restraint_k"}; size 0 means batching is off.
+    """
+    raw = defaults.get("batch")
+    if raw is None or raw is False:
+        return {"size": 0, "spacing_nm": 2.0, "restraint_k": 100.0}
+    cfg = (
+        {"size": raw}
+        if isinstance(raw, int) and not isinstance(raw, bool)
+        else dict(raw)
+    )
+    size = int(cfg.get("size", 16))
+    if size < 0:
+        raise ValueError("batch.size must be >= 0")
+    return {
+        "size": size,
+        "spacing_nm": float(cfg.get("spacing_nm", 2.0)),
+        "restraint_k": float(cfg.get("restraint_k", 100.0)),
+    }
+
+
+def grid_offsets(n: int, cell_nm: float) -> List[Tuple[float, float, float]]:
+    """Cell origins for n copies on the smallest cubic grid that holds them."""
+    side = 1
+    while side**3 < n:
+        side += 1
+    out = []
+    for i in range(n):
+        ix, rem = divmod(i, side * side)
+        iy, iz = divmod(rem, side)
+        out.append((ix * cell_nm, iy * cell_nm, iz * cell_nm))
+    return out
+
+
+def cell_size(
+    extents_nm: Sequence[float], cutoff_nm: float, spacing_nm: float
+) -> float:
+    """Grid cell edge: largest copy extent + cutoff + spacing."""
+    return max(extents_nm) + cutoff_nm + spacing_nm if extents_nm else 0.0
+
+
+def centroid(points) -> Tuple[float, float, float]:
+    """Geometric centre of (x, y, z) points."""
+    n = len(points)
+    return tuple(math.fsum(p[i] for p in points) / n for i in range(3))  # type: ignore[return-value]
+
+
+def kinetic_temperature(kinetic_kj: float, dof: int) -> float:
+    """Instantaneous temperature (K) of kinetic energy spread over `dof`."""
+    return 2.0 * kinetic_kj / (dof * K_B) if dof > 0 else 0.0
+
+
+def copy_dof(system) -> int:
+    """
+    Degrees of freedom of one copy: 3 per massive particle minus constraints.
+    Batched Systems carry no CMMotionRemover, so each copy keeps its own
+    centre-of-mass motion and nothing is subtracted for it.
+    """
+    from openmm import unit
+
+    dof = 3 * sum(
+        1
+        for i in range(system.getNumParticles())
+        if system.getParticleMass(i).value_in_unit(unit.dalton) > 0
+    )
+    return dof - system.getNumConstraints()
+
+
+def add_centroid_restraints(
+    system, members: Sequence[Dict[str, Any]], radius_nm: float, k: float
+):
+    """Flat-bottom restraint holding each copy's centroid near its grid point."""
+    from openmm import CustomCentroidBondForce
+
+    force = CustomCentroidBondForce(1, _RESTRAINT)
+    force.addGlobalParameter("k_batch", k)
+    force.addGlobalParameter("r_batch", radius_nm)
+    for p in ("x0", "y0", "z0"):
+        force.addPerBondParameter(p)
+    for m in members:
+        n = m["end"] - m["start"]
+        g = force.addGroup(list(range(m["start"], m["end"])), [1.0] * n)
+        force.addBond([g], list(m["centroid"]))
+    system.addForce(force)
+    return force
+
+
+# ------------------------------------------------------------
+# Demultiplexing reporter
+# ------------------------------------------------------------
+class DemuxReporter:
+    """OpenMM reporter writing per-copy traj.dcd/state.log for one stage."""
+
+    def __init__(
+        self,
+        members: Sequence[Dict[str, Any]],
+        stage_name: str,
+        interval: int,
+        write_dcd: bool = True,
+    ):
+        self.members = members
+        self.stage_name = stage_name
+        self.interval = int(interval)
+        self.write_dcd = write_dcd
+        self._dcd: List[Any] = []
+        self._logs: List[Any] = []
+        self._handles: List[Any] = []
+
+    def _open(self, simulation) -> None:
+        from openmm.app import DCDFile
+
+        dt = simulation.integrator.getStepSize()
+        for m in self.members:
+            stage_dir = Path(m["run_dir"]) / self.stage_name
+            stage_dir.mkdir(parents=True, exist_ok=True)
+            log = open(stage_dir / "state.log", "w")
+            log.write(
+                '#"Step","Potential Energy (kJ/mole)",'
+                '"Kinetic Energy (kJ/mole)","Temperature (K)"\n'
+            )
+            self._logs.append(log)
+            if self.write_dcd:
+                fh = open(stage_dir / "traj.dcd", "wb")
+                self._handles.append(fh)
+                self._dcd.append(
+                    DCDFile(
+                        fh,
+                        m["topology"],
+                        dt,
+                        simulation.currentStep + self.interval,
+                        self.interval,
+                    )
+                )
+
+    def describeNextReport(self, simulation):
+        steps = self.interval - simulation.currentStep % self.interval
+        return (steps, True, True, False, False)
+
+    def report(self, simulation, state) -> None:
+        from openmm import unit
+
+        if not self._logs:
+            self._open(simulation)
+        pos = state.getPositions(asNumpy=True).value_in_unit(unit.nanometer)
+        vel = state.getVelocities(asNumpy=True).value_in_unit(
+            unit.nanometer / unit.picosecond
+        )
+        step = simulation.currentStep
+        for k, m in enumerate(self.members):
+            own = pos[m["start"] : m["end"]] - m["offset"]
+            v = vel[m["start"] : m["end"]]
+            ke = 0.5 * float((m["masses"][:, None] * v * v).sum())
+            m["context"].setPositions(own)
+            pe = (
+                m["context"]
+                .getState(getEnergy=True)
+                .getPotentialEnergy()
+                .value_in_unit(unit.kilojoule_per_mole)
+            )
+            temp = kinetic_temperature(ke, m["dof"])
+            self._logs[k].write(f"{step},{pe},{ke},{temp}\n")
+            self._logs[k].flush()
+            if self.write_dcd:
+                self._dcd[k].writeModel(own * unit.nanometer)
+
+    def close(self) -> None:
+        for fh in self._logs + self._handles:
+            fh.close()
+        self._logs, self._handles, self._dcd = [], [], []
+
+
+def _member_context(system):
+    from openmm import Context, Platform, VerletIntegrator, unit
+
+    try:
+        platform = Platform.getPlatformByName("CPU")
+    except Exception:
+        platform = Platform.getPlatformByName("Reference")
+    return Context(system, VerletIntegrator(1.0 * unit.femtoseconds), platform)
+
+
+def prepare_members(members: Sequence[Dict[str, Any]]) -> None:
+    """Attach masses, degrees of freedom and a single-copy energy Context."""
+    import numpy as np
+    from openmm import unit
+
+    for m in members:
+        system = m["system"]
+        m["masses"] = np.array(
+            [
+                system.getParticleMass(i).value_in_unit(unit.dalton)
+                for i in range(system.getNumParticles())
+            ]
+        )
+        m["dof"] = copy_dof(system)
+        m["context"] = _member_context(system)
+
+
+# ------------------------------------------------------------
+# Stage runner
+# ------------------------------------------------------------
+def run_batched_stage(
+    sim,
+    members: Sequence[Dict[str, Any]],
+    stage: Dict[str, Any],
+    defaults: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Run one stage for every copy in the combined Simulation and demultiplex
+    its outputs. Returns {"steps", "wall_s", "aggregate_ns_per_day"}.
+    """
+    from openmm import unit
+    from openmm.app import PDBFile
+
+    from .openmm_engine import _get_minimize_tolerance
+
+    name = stage.get("name", "stage")
+    steps = int(stage.get("steps", 0))
+    ensemble = (stage.get("ensemble") or "NVT").upper()
+    if ensemble not in ("NVT", "NVE"):
+        raise ValueError(
+            f"Batched stage '{name}': ensemble {ensemble} needs a periodic box; "
+            "only NVT/NVE stages can be batched"
+        )
+    interval = int(stage.get("report_interval", defaults.get("report_interval", 1000)))
+    logger.info(
+        f"Stage: {name} steps={steps} ensemble={ensemble} (batch of {len(members)})"
+    )
+
+    minimize = name.lower() == "minimize"
+    reporter = DemuxReporter(members, name, interval, write_dcd=not minimize)
+    sim.reporters = [reporter]
+    if minimize:
+        tol_q, tol_val = _get_minimize_tolerance(defaults)
+        maxit = int(defaults.get("minimize_max_iterations", 0))
+        logger.info(f"Minimize: tol={tol_val} kJ/mol/nm  maxit={maxit}")
+        sim.minimizeEnergy(tolerance=tol_q, maxIterations=maxit)
+
+    t0 = time.perf_counter()
+    try:
+        if steps > 0:
+            sim.step(steps)
+        if not reporter._logs:
+            # no report fell inside the stage (e.g. minimize); record the end state
+            reporter.report(
+                sim, sim.context.getState(getPositions=True, getVelocities=True)
+            )
+    finally:
+        reporter.close()
+    wall_s = time.perf_counter() - t0
+
+    positions = sim.context.getState(getPositions=True).getPositions(asNumpy=True)
+    positions = positions.value_in_unit(unit.nanometer)
+    for m in members:
+        stage_dir = Path(m["run_dir"]) / name
+        (stage_dir / "stage.json").write_text(json.dumps(stage, indent=2))
+        with open(stage_dir / "topology.pdb", "w") as f:
+            PDBFile.writeFile(
+                m["topology"],
+                (positions[m["start"] : m["end"]] - m["offset"]) * unit.nanometer,
+                f,
+                keepIds=True,
+            )
+
+    dt_fs = sim.integrator.getStepSize().value_in_unit(unit.femtoseconds)
+    ns = steps * dt_fs * 1e-6 * len(members)
+    rate = ns / (wall_s / 86400.0) if wall_s > 0 and steps else None
+    if rate is not None:
+        logger.info(
+            f"Batch: {name} {len(members)} systems  aggregate {rate:.2f} ns/day"
+        )
+    return {
+        "steps": steps,
+        "wall_s": round(wall_s, 3),
+        "aggregate_ns_per_day": round(rate, 3) if rate is not None else None,
+    }
+
+
+def write_batch_summary(
+    members: Sequence[Dict[str, Any]], stages: List[Dict[str, Any]]
+) -> None:
+    """batch.json in every member's run_dir: batch mates and per-stage throughput."""
+    summary = {
+        "systems": [Path(m["run_dir"]).name for m in members],
+        "stages": stages,
+    }
+    payload = json.dumps(summary, indent=2)
+    for m in members:
+        (Path(m["run_dir"]) / "batch.json").write_text(payload)
@@ -0,0 +1,140 @@
+# FastMDSimulation/src/fastmdsimulation/engines/io_policy.py
+
+"""
+I/O-budget reporting policy (`reporting:` in defaults or per stage).
+
+    reporting:
+      traj_budget_gb: 5      # trajectory per run, shared by its MD stages by steps
+      overhead_pct: 2        # wall time reporters and checkpoints may take
+
+With a policy, run_stage times a short probe of plain MD steps, one reporter
+frame, one state report and one checkpoint, then coarsens the DCD, state.log
+and checkpoint intervals until both budgets hold. Hand-set report_interval /
+checkpoint_interval act as the finest intervals allowed; the policy never
+reports more often than they ask. The overhead budget is split half to DCD
+frames, a quarter each to state reports and checkpoints. The derived values
+are recorded in stage.json ("reporting_policy") and in progress.json, so a
+resumed stage keeps the interval its trajectory was written with.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Dict
+
+from ..utils.logging import get_logger
+
+logger = get_logger("engine.io_policy")
+
+DCD_BYTES_PER_ATOM = 12  # 3 x float32 per atom per frame
+PROBE_STEPS = 100
+_SHARES = {"dcd": 0.5, "state": 0.25, "checkpoint": 0.25}
+
+
+def policy_settings(
+    stage: Dict[str, Any], defaults: Dict[str, Any]
+) -> Dict[str, Any] | None:
+    """Merged defaults.reporting + stage.reporting, or None if no budget is set."""
+    cfg = {**(defaults.get("reporting") or {}), **(stage.get("reporting") or {})}
+    budget = cfg.get("traj_budget_gb")
+    overhead = cfg.get("overhead_pct")
+    if budget is None and overhead is None:
+        return None
+    if (budget is not None and float(budget) <= 0) or (
+        overhead is not None and float(overhead) <= 0
+    ):
+        raise ValueError(f"reporting budgets must be positive: {cfg}")
+    return {
+        "traj_budget_gb": float(budget) if budget is not None else None,
+        "overhead_pct": float(overhead) if overhead is not None else None,
+        "run_steps": int(cfg.get("run_steps") or 0),
+    }
+
+
+def _round_up(value: float, multiple: int = 100) -> int:
+    """Round up to a multiple of 100 steps (or 1 below 100) for readable logs."""
+    n = max(1, math.ceil(value))
+    return n if n < multiple else math.ceil(n / multiple) * multiple
+
+
+def derive_intervals(
+    policy: Dict[str, Any],
+    atoms: int,
+    steps: int,
+    report_interval: int,
+    checkpoint_interval: int,
+    timings: Dict[str, float] | None = None,
+    bytes_per_atom: float = DCD_BYTES_PER_ATOM,
+) -> Dict[str, Any]:
+    """
+    Intervals meeting the policy's budgets for one stage of `steps` MD steps.
+    `timings` are seconds per step / dcd frame / state report / checkpoint;
+    `bytes_per_atom` is the frame size of the trajectory format.
+    """
+    dcd = state = max(1, int(report_interval))
+    checkpoint = max(1, int(checkpoint_interval))
+    out: Dict[str, Any] = {}
+
+    if policy.get("traj_budget_gb"):
+        run_steps = policy.get("run_steps") or steps
+        share = policy["traj_budget_gb"] * 1024**3 * steps / max(1, run_steps)
+        frame = atoms * bytes_per_atom
+        dcd = max(dcd, _round_up(steps * frame / share))
+        out["traj_budget_bytes"] = int(share)
+
+    if policy.get("overhead_pct") and timings and timings.get("step", 0) > 0:
+        allowed = policy["overhead_pct"] / 100.0 * timings["step"]
+        floor = {k: timings.get(k, 0.0) / (allowed * _SHARES[k]) for k in _SHARES}
+        dcd = max(dcd, _round_up(floor["dcd"]))
+        state = max(state, _round_up(floor["state"]))
+        checkpoint = max(checkpoint, _round_up(floor["checkpoint"]))
+        out["timings_s"] = {k: round(v, 6) for k, v in timings.items()}
+
+    if steps > 0:
+        dcd = min(dcd, steps)  # at least one frame per stage
+    out.update(
+        {
+            "dcd_interval": dcd,
+            "state_interval": state,
+            "checkpoint_interval": checkpoint,
+            "frames": steps // dcd if dcd else 0,
+            "traj_bytes": int((steps // dcd) * atoms * bytes_per_atom),
+        }
+    )
+    if timings and timings.get("step", 0) > 0:
+        cost = sum(
+            timings.get(k, 0.0) / out[f"{k}_interval"]
+            for k in ("dcd", "state", "checkpoint")
+        )
+        out["overhead_pct"] = round(100.0 * cost / timings["step"], 3)
+    return out
+
+
+def measure(sim, probe_steps: int = PROBE_STEPS) -> Dict[str, float]:
+    """
+    Seconds per MD step (a probe of plain steps, no reporters attached) and
+    per DCD frame, state report and checkpoint on this Context.
+    """
+    saved = sim.reporters
+    sim.reporters = []
+    try:
+        ctx = sim.context
+        ctx.getState(getEnergy=True)  # settle queued work before timing
+        t0 = time.perf_counter()
+        sim.step(probe_steps)
+        ctx.getState(getEnergy=True)
+        step = (time.perf_counter() - t0) / max(1, probe_steps)
+
+        def _time(fn, n=3):
+            t = time.perf_counter()
+            for _ in range(n):
+                fn()
+            return (time.perf_counter() - t) / n
+
+        frame = _time(lambda: ctx.getState(getPositions=True, enforcePeriodicBox=False))
+        state = _time(lambda: ctx.getState(getEnergy=True, getVelocities=True))
+        checkpoint = _time(ctx.createCheckpoint, n=1)
+    finally:
+        sim.reporters = saved
+    return {"step": step, "dcd": frame, "state": state, "checkpoint": checkpoint}
@@ -2,12 +2,51 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
+import os
+import pickle
+import re
+import shutil
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
+from ..utils.benchmarks import record_benchmark
+from ..utils.cache import cache_dir, cache_enabled, hash_key, package_version
+from ..utils.cpuset import cpu_budget
+from ..utils.cpuset import describe as describe_cpus
+from ..utils.filelock import FileLock
 from ..utils.logging import get_logger
+from . import system_cache
+from .atom_selection import select_atoms, subset_topology
+from .batched import (
+    add_centroid_restraints,
+    batch_settings,
+    cell_size,
+    centroid,
+    grid_offsets,
+    prepare_members,
+)
+from .io_policy import PROBE_STEPS, derive_intervals, measure, policy_settings
+from .platform_tune import tune_platform
 from .plumed_support import merge_plumed_configs, setup_plumed_force
+from .resume import (
+    frames_through,
+    read_progress,
+    truncate_state_log,
+    truncate_trajectory,
+    write_progress,
+)
+from .trajectory import (
+    CheckpointBarrier,
+    bytes_per_atom,
+    flushing,
+    group_topology_path,
+    trajectory_path,
+    trajectory_reporter,
+    trajectory_settings,
+)
 
 logger = get_logger("engine.openmm")
 
@@ -15,7 +54,46 @@ logger = get_logger("engine.openmm")
 # ------------------------------------------------------------
 # Common helpers
 # ------------------------------------------------------------
-def _load_forcefield(ff_files):
+# Process-wide ForceField memo: ((file, mtime_ns), ...) -> ForceField
+_FF_CACHE: Dict[Tuple[Tuple[str, int], ...], Any] = {}
+# Resolved Platform per requested name (the "auto" probe is not repeated)
+_PLATFORM_CACHE: Dict[str, Any] = {}
+
+
+def _resolve_ff_file(name: str) -> Path | None:
+    """Locate a force field XML the way ForceField does (cwd, then data dirs)."""
+    p = Path(name)
+    if p.is_file():
+        return p
+    try:
+        from openmm.app.forcefield import _getDataDirectories
+
+        for d in _getDataDirectories():
+            cand = Path(d) / name
+            if cand.is_file():
+                return cand
+    except Exception:
+        pass
+    return None
+
+
+def _ff_stamp(ff_files) -> Tuple[Tuple[str, int], ...] | None:
+    """Memo key: each file with its mtime; None if any file cannot be located."""
+    stamp = []
+    for f in ff_files:
+        path = _resolve_ff_file(str(f))
+        if path is None:
+            return None
+        stamp.append((str(f), path.stat().st_mtime_ns))
+    return tuple(stamp)
+
+
+def _persist_forcefields() -> bool:
+    val = os.getenv("FASTMDS_FORCEFIELD_CACHE", "").strip().lower()
+    return cache_enabled() and val in ("disk", "1", "on", "true", "yes")
+
+
+def _parse_forcefield(ff_files):
     from openmm.app import ForceField
 
     try:
@@ -29,17 +107,75 @@ def _load_forcefield(ff_files):
             raise e
 
 
+def _load_forcefield(ff_files):
+    """
+    Load (and memoize per process) a ForceField. With
+    FASTMDS_FORCEFIELD_CACHE=disk the parsed ForceField is also pickled into
+    the cache directory, so fresh worker processes skip the XML parse.
+    """
+    ff_files = tuple(ff_files)
+    stamp = _ff_stamp(ff_files)
+    if stamp is not None and stamp in _FF_CACHE:
+        return _FF_CACHE[stamp]
+
+    ff = None
+    pkl = None
+    if stamp is not None and _persist_forcefields():
+        key = hash_key({"files": stamp, "openmm": package_version("openmm")})
+        pkl = cache_dir("forcefields") / f"{key}.pkl"
+        if pkl.exists():
+            try:
+                with open(pkl, "rb") as fh:
+                    ff = pickle.load(fh)
+                logger.info(f"ForceField cache hit: {', '.join(ff_files)}")
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable ForceField cache {pkl}: {e}")
+                ff = None
+
+    if ff is None:
+        ff = _parse_forcefield(ff_files)
+        if pkl is not None:
+            tmp = pkl.with_name(f".{pkl.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp, "wb") as fh:
+                    pickle.dump(ff, fh, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, pkl)
+            except Exception as e:
+                tmp.unlink(missing_ok=True)
+                logger.warning(f"Could not persist ForceField to cache: {e}")
+
+    if stamp is not None:
+        _FF_CACHE[stamp] = ff
+    return ff
+
+
 def _select_platform(name: str):
+    """
+    Platform by name ("auto": CUDA > OpenCL > CPU), memoized per process.
+    "tune" is resolved per system in _new_simulation; without a system at hand
+    (daemon warm-up, executor device slots) it behaves like "auto".
+    """
     from openmm import Platform
 
-    if not name or name.lower() == "auto":
+    key = (name or "auto").lower()
+    if key == "tune":
+        key = "auto"
+    if key in _PLATFORM_CACHE:
+        return _PLATFORM_CACHE[key]
+    if key == "auto":
+        platform = None
         for cand in ("CUDA", "OpenCL", "CPU"):
             try:
-                return Platform.getPlatformByName(cand)
+                platform = Platform.getPlatformByName(cand)
+                break
             except Exception:
                 continue
-        return Platform.getPlatform(0)
-    return Platform.getPlatformByName(name)
+        if platform is None:
+            platform = Platform.getPlatform(0)
+    else:
+        platform = Platform.getPlatformByName(name)
+    _PLATFORM_CACHE[key] = platform
+    return platform
 
 
 def _maybe_barostat(
@@ -225,11 +361,21 @@ def _new_simulation(
     integrator,
     platform_name: str,
     platform_props: Dict[str, str] | None,
+    positions=None,
 ):
     from openmm.app import Simulation
 
+    if (platform_name or "").lower() == "tune":
+        # timed bursts on this system, or this host's cached decision
+        platform_name, platform_props = tune_platform(
+            system, integrator, positions, platform_props
+        )
     platform = _select_platform(platform_name)
     props = {str(k): str(v) for k, v in (platform_props or {}).items()}
+    cpu = platform.getName() == "CPU"
+    if cpu and "Threads" not in props and not os.getenv("OPENMM_CPU_THREADS"):
+        # OpenMM would use every core of the node; stay within this job's share
+        props["Threads"] = str(cpu_budget())
     sim = Simulation(topology, system, integrator, platform, props if props else None)
 
     # Log effective platform and common properties
@@ -255,6 +401,7 @@ def _new_simulation(
         "Platform: "
         + plat.getName()
         + (f" ({', '.join(defaults)})" if defaults else "")
+        + (f" on {describe_cpus()}" if cpu else "")
     )
     return sim
 
@@ -292,6 +439,8 @@ def _make_integrator(defaults: Dict[str, Any]):
         friction_ps: 1.0
         temperature_K: 300
         error_tolerance: 0.001   # only used by variable_* integrators
+
+    defaults.seed (e.g. from a seed sweep) sets the integrator's random seed.
     """
     from openmm import LangevinMiddleIntegrator  # NEW
     from openmm import (
@@ -320,36 +469,42 @@ def _make_integrator(defaults: Dict[str, Any]):
     errtol = float(spec.get("error_tolerance", spec.get("errorTol", 0.001)))
 
     if name == "langevin":
-        return LangevinIntegrator(
+        integrator = LangevinIntegrator(
             temperature_K * unit.kelvin,
             friction_ps / unit.picoseconds,
             timestep_fs * unit.femtoseconds,
         )
     elif name == "langevin_middle":  # NEW
-        return LangevinMiddleIntegrator(
+        integrator = LangevinMiddleIntegrator(
             temperature_K * unit.kelvin,
             friction_ps / unit.picoseconds,
             timestep_fs * unit.femtoseconds,
         )
     elif name == "brownian":
-        return BrownianIntegrator(
+        integrator = BrownianIntegrator(
             temperature_K * unit.kelvin,
             friction_ps / unit.picoseconds,
             timestep_fs * unit.femtoseconds,
         )
     elif name == "verlet":
-        return VerletIntegrator(timestep_fs * unit.femtoseconds)
+        integrator = VerletIntegrator(timestep_fs * unit.femtoseconds)
     elif name == "variable_langevin":
-        return VariableLangevinIntegrator(
+        integrator = VariableLangevinIntegrator(
             temperature_K * unit.kelvin, friction_ps / unit.picoseconds, errtol
         )
     elif name == "variable_verlet":
-        return VariableVerletIntegrator(errtol)
+        integrator = VariableVerletIntegrator(errtol)
+    else:
+        raise ValueError(
+            f"Unsupported integrator '{name}'. Use: "
+            "langevin, langevin_middle, brownian, verlet, variable_langevin, variable_verlet."
+        )
 
-    raise ValueError(
-        f"Unsupported integrator '{name}'. Use: "
-        "langevin, langevin_middle, brownian, verlet, variable_langevin, variable_verlet."
-    )
+    # Reproducible stochastic dynamics for seed sweeps
+    seed = defaults.get("seed")
+    if seed is not None and hasattr(integrator, "setRandomNumberSeed"):
+        integrator.setRandomNumberSeed(int(seed))
+    return integrator
 
 
 # ------------------------------------------------------------
@@ -400,7 +555,12 @@ def _build_simulation(pdb_path: Path, defaults: Dict[str, Any], run_dir: Path):
 
     integrator = _make_integrator(defaults)
     sim = _new_simulation(
-        modeller.topology, system, integrator, platform_name, platform_props
+        modeller.topology,
+        system,
+        integrator,
+        platform_name,
+        platform_props,
+        positions=modeller.positions,
     )
     sim.context.setPositions(modeller.positions)
 
@@ -408,6 +568,47 @@ def _build_simulation(pdb_path: Path, defaults: Dict[str, Any], run_dir: Path):
     return sim
 
 
+def _ligand_cache_path(
+    spec: Dict[str, Any], defaults: Dict[str, Any], ligand_ff: str
+) -> Path | None:
+    """
+    SystemGenerator cache database for ligand parameters. `ligand_cache` (per
+    system or in defaults) may name a file (e.g. a project-level cache) or be
+    false to disable; the default is a global cache per ligand force field and
+    openmmforcefields version.
+    """
+    choice = spec.get("ligand_cache", defaults.get("ligand_cache"))
+    if choice is False or (
+        isinstance(choice, str) and choice.strip().lower() in ("off", "false", "none")
+    ):
+        return None
+    if choice and choice is not True:
+        path = Path(str(choice)).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+    if not cache_enabled():
+        return None
+    name = f"{ligand_ff}-openmmforcefields-{package_version('openmmforcefields')}"
+    return cache_dir("openff") / f"{re.sub(r'[^A-Za-z0-9_.+-]+', '_', name)}.json"
+
+
+def _ligand_cached(cache_path: Path, smiles: str) -> bool:
+    """
+    True if the ligand's parameters are already stored in the cache database
+    (TinyDB JSON: {table: {doc_id: {"smiles": ..., "ffxml": ...}}}).
+    """
+    try:
+        tables = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return False
+    return any(
+        isinstance(doc, dict) and doc.get("smiles") == smiles
+        for table in (tables.values() if isinstance(tables, dict) else [])
+        if isinstance(table, dict)
+        for doc in table.values()
+    )
+
+
 def _build_protein_ligand_simulation(
     spec: Dict[str, Any], defaults: Dict[str, Any], run_dir: Path
 ):
@@ -463,12 +664,33 @@ def _build_protein_ligand_simulation(
         )
     public_cs_kwargs = {k: v for k, v in cs_kwargs.items() if not k.startswith("_")}
 
+    cache_path = _ligand_cache_path(spec, defaults, ligand_ff)
+    gen_kwargs: Dict[str, Any] = {}
+    if cache_path is not None:
+        gen_kwargs["cache"] = str(cache_path)
+        hit = _ligand_cached(cache_path, ligand_mol.to_smiles())
+        logger.info(
+            f"Ligand parameter cache {'hit' if hit else 'miss'}: "
+            f"{ligand_mol.name} ({ligand_ff}) -> {cache_path}"
+        )
+
     system_generator = SystemGenerator(
         forcefields=list(ff_files),
         small_molecule_forcefield=ligand_ff,
         molecules=[ligand_mol],
         forcefield_kwargs=public_cs_kwargs,
+        **gen_kwargs,
+    )
+    # The cache database is a single JSON file shared across workers; only the
+    # ligand template generation reads or writes it, so parameterize the ligand
+    # alone under the lock. Its template stays registered on the force field.
+    lock = (
+        FileLock(cache_path.with_name(f".{cache_path.name}.lock"))
+        if cache_path is not None
+        else contextlib.nullcontext()
     )
+    with lock:
+        system_generator.forcefield.createSystem(ligand_mol.to_topology().to_openmm())
 
     logger.info(
         f"Solvate protein-ligand: TIP3P  pad={padding_nm} nm  ionic={ionic_strength} M  "
@@ -492,7 +714,12 @@ def _build_protein_ligand_simulation(
 
     integrator = _make_integrator(defaults)
     sim = _new_simulation(
-        modeller.topology, system, integrator, platform_name, platform_props
+        modeller.topology,
+        system,
+        integrator,
+        platform_name,
+        platform_props,
+        positions=modeller.positions,
     )
     sim.context.setPositions(modeller.positions)
 
@@ -529,6 +756,7 @@ def _build_from_amber(spec: Dict[str, Any], defaults: Dict[str, Any], run_dir: P
         integrator,
         defaults.get("platform", "auto"),
         defaults.get("platform_properties"),
+        positions=inpcrd.positions,
     )
     sim.context.setPositions(inpcrd.positions)
     try:
@@ -580,6 +808,7 @@ def _build_from_gromacs(spec: Dict[str, Any], defaults: Dict[str, Any], run_dir:
         integrator,
         defaults.get("platform", "auto"),
         defaults.get("platform_properties"),
+        positions=gro.positions,
     )
     sim.context.setPositions(gro.positions)
     try:
@@ -640,6 +869,7 @@ def _build_from_charmm(spec: Dict[str, Any], defaults: Dict[str, Any], run_dir:
         integrator,
         defaults.get("platform", "auto"),
         defaults.get("platform_properties"),
+        positions=positions,
     )
     sim.context.setPositions(positions)
 
@@ -651,8 +881,16 @@ def _build_from_charmm(spec: Dict[str, Any], defaults: Dict[str, Any], run_dir:
 # Public dispatcher
 # ------------------------------------------------------------
 def build_simulation_from_spec(
-    spec: Dict[str, Any], defaults: Dict[str, Any], run_dir: Path
+    spec: Dict[str, Any],
+    defaults: Dict[str, Any],
+    run_dir: Path,
+    use_cache: bool | None = None,
 ):
+    """
+    Build the Simulation for one system spec. Built Systems are kept in the
+    persistent system cache (see engines.system_cache); a hit restores the
+    serialized System and solvated positions instead of rebuilding.
+    """
     stype = (spec.get("type") or "").lower()
     if not stype:
         if "pdb" in spec:
@@ -666,51 +904,456 @@ def build_simulation_from_spec(
         else:
             raise ValueError(f"Cannot infer simulation type from spec: {spec}")
 
+    builders = {
+        "pdb": lambda: _build_simulation(Path(spec["pdb"]), defaults, run_dir),
+        "pdb_ligand": lambda: _build_protein_ligand_simulation(spec, defaults, run_dir),
+        "amber": lambda: _build_from_amber(spec, defaults, run_dir),
+        "gromacs": lambda: _build_from_gromacs(spec, defaults, run_dir),
+        "charmm": lambda: _build_from_charmm(spec, defaults, run_dir),
+    }
+    if stype not in builders:
+        raise ValueError(f"Unknown system type '{stype}'. Spec: {spec}")
+
     run_dir.mkdir(parents=True, exist_ok=True)
 
-    if stype == "pdb":
-        return _build_simulation(Path(spec["pdb"]), defaults, run_dir)
-    if stype == "pdb_ligand":
-        return _build_protein_ligand_simulation(spec, defaults, run_dir)
-    if stype == "amber":
-        return _build_from_amber(spec, defaults, run_dir)
-    if stype == "gromacs":
-        return _build_from_gromacs(spec, defaults, run_dir)
-    if stype == "charmm":
-        return _build_from_charmm(spec, defaults, run_dir)
+    if use_cache is None:
+        use_cache = cache_enabled()
+    key = None
+    if use_cache:
+        try:
+            key = system_cache.system_cache_key(spec, defaults, stype)
+            entry = system_cache.lookup(key)
+        except Exception as e:
+            logger.warning(f"System cache unavailable: {e}")
+            key = entry = None
+        if entry is not None:
+            logger.info(f"System cache hit: {stype} {key[:12]}")
+            shutil.copy2(entry / "topology.pdb", run_dir / "topology.pdb")
+            return restore_simulation(entry, defaults)
+        if key:
+            logger.info(f"System cache miss: {stype} {key[:12]}; building")
+
+    sim = builders[stype]()
+
+    if key:
+
+        def _write(d: Path) -> None:
+            save_simulation_bundle(sim, d)
+            shutil.copy2(run_dir / "topology.pdb", d / "topology.pdb")
+
+        try:
+            system_cache.store(key, _write)
+        except Exception as e:
+            logger.warning(f"Could not store built System in cache: {e}")
+    return sim
+
+
+# ------------------------------------------------------------
+# Batched build (defaults.batch; see engines.batched)
+# ------------------------------------------------------------
+def build_batched_simulation(
+    specs: List[Dict[str, Any]],
+    defaults: Dict[str, Any],
+    run_dirs: List[Path],
+):
+    """
+    Build one Simulation holding every PDB spec as a non-interacting copy.
+    No solvent is added: the force field list should carry an implicit solvent
+    model, and the nonbonded method must be CutoffNonPeriodic (the default in
+    this mode). Returns (sim, members) where each member describes its copy's
+    atom range, grid offset, topology and single-copy System for run_batched_stage.
+    """
+    import numpy as np
+    from openmm import unit
+    from openmm.app import Modeller, PDBFile, Topology
+
+    settings = batch_settings(defaults)
+    cs = dict(defaults.get("create_system") or {})
+    method = str(cs.setdefault("nonbondedMethod", "CutoffNonPeriodic")).lower()
+    if method != "cutoffnonperiodic":
+        raise ValueError(
+            f"Batched builds need create_system.nonbondedMethod: CutoffNonPeriodic "
+            f"(got {cs['nonbondedMethod']}); copies would interact otherwise"
+        )
+    cutoff_nm = float(cs.get("nonbondedCutoff_nm", 1.0))
+    cs_kwargs = _create_system_kwargs({**defaults, "create_system": cs})
+    if "constraints" not in cs_kwargs:
+        cs_kwargs["constraints"] = _constraints_from_str(
+            defaults.get("constraints", "HBonds")
+        )
+    # No CMMotionRemover (createSystem adds one by default): a single remover for
+    # the combined System would not hold any one copy, and the centroid
+    # restraints already keep each copy in place.
+    if cs_kwargs.pop("_removeCMMotion", False):
+        logger.info("Batch: removeCMMotion ignored; centroid restraints hold copies")
+    cs_kwargs["removeCMMotion"] = False
+    ff = _load_forcefield(
+        defaults.get("forcefield", ["amber14-all.xml", "implicit/gbn2.xml"])
+    )
+
+    members: List[Dict[str, Any]] = []
+    for spec, run_dir in zip(specs, run_dirs):
+        if (spec.get("type") or "pdb").lower() != "pdb":
+            raise ValueError(f"Batched builds support PDB systems only: {spec}")
+        pdb = PDBFile(str(spec["pdb"]))
+        xyz = pdb.getPositions(asNumpy=True).value_in_unit(unit.nanometer)
+        xyz = xyz - xyz.min(axis=0)
+        system = create_system(ff, topology=pdb.topology, kwargs=cs_kwargs)
+        if any(
+            system.getForce(i).usesPeriodicBoundaryConditions()
+            for i in range(system.getNumForces())
+        ):
+            raise ValueError(
+                f"Batched builds need non-periodic systems; {spec['pdb']} uses PBC"
+            )
+        run_dir = Path(run_dir)
+        run_dir.mkdir(parents=True, exist_ok=True)
+        with open(run_dir / "topology.pdb", "w") as f:
+            PDBFile.writeFile(pdb.topology, xyz * unit.nanometer, f, keepIds=True)
+        members.append(
+            {
+                "run_dir": str(run_dir),
+                "topology": pdb.topology,
+                "system": system,
+                "xyz": xyz,
+            }
+        )
+
+    cell = cell_size(
+        [float(m["xyz"].max()) for m in members], cutoff_nm, settings["spacing_nm"]
+    )
+    modeller = Modeller(Topology(), [])
+    for m, origin in zip(members, grid_offsets(len(members), cell)):
+        m["offset"] = np.array(origin)
+        m["start"] = modeller.topology.getNumAtoms()
+        shifted = m.pop("xyz") + m["offset"]
+        modeller.add(m["topology"], shifted * unit.nanometer)
+        m["end"] = modeller.topology.getNumAtoms()
+        m["centroid"] = centroid(shifted)
+
+    system = create_system(ff, topology=modeller.topology, kwargs=cs_kwargs)
+    add_centroid_restraints(
+        system, members, settings["spacing_nm"] / 2.0, settings["restraint_k"]
+    )
+    logger.info(
+        f"Batch: {len(members)} systems, {modeller.topology.getNumAtoms()} atoms, "
+        f"grid cell {cell:.2f} nm (cutoff {cutoff_nm} nm)"
+    )
+
+    integrator = _make_integrator(defaults)
+    sim = _new_simulation(
+        modeller.topology,
+        system,
+        integrator,
+        defaults.get("platform", "auto"),
+        defaults.get("platform_properties", {}),
+        positions=modeller.positions,
+    )
+    sim.context.setPositions(modeller.positions)
+    prepare_members(members)
+    return sim, members
+
+
+# ------------------------------------------------------------
+# Serialized System bundle (resume / reuse)
+# ------------------------------------------------------------
+def save_simulation_bundle(sim, run_dir: Path) -> None:
+    """
+    Serialize the freshly built System and its initial State next to
+    run_dir/topology.pdb so the run can be restored without re-solvating.
+    """
+    from openmm import XmlSerializer
+
+    for name in ("system.xml", "state.xml"):
+        # may be hard links to a shared build; never write through them
+        (run_dir / name).unlink(missing_ok=True)
+    (run_dir / "system.xml").write_text(XmlSerializer.serialize(sim.system))
+    sim.saveState(str(run_dir / "state.xml"))
+
+
+def has_simulation_bundle(run_dir: Path) -> bool:
+    return all(
+        (run_dir / f).exists() for f in ("system.xml", "state.xml", "topology.pdb")
+    )
+
+
+def restore_simulation(
+    run_dir: Path, defaults: Dict[str, Any], state_file: str = "state.xml"
+):
+    """
+    Rebuild a Simulation from the bundle written by save_simulation_bundle.
+    `state_file` selects which saved State (in run_dir) to start from.
+    """
+    from openmm import XmlSerializer
+    from openmm.app import PDBFile
+
+    topology = PDBFile(str(run_dir / "topology.pdb")).topology
+    system = XmlSerializer.deserialize((run_dir / "system.xml").read_text())
+    integrator = _make_integrator(defaults)
+    sim = _new_simulation(
+        topology,
+        system,
+        integrator,
+        defaults.get("platform", "auto"),
+        defaults.get("platform_properties"),
+    )
+    sim.loadState(str(run_dir / state_file))
+    logger.info(f"Restored System and solvated topology from {run_dir}")
+    return sim
+
+
+def clone_simulation(sim, defaults: Dict[str, Any]):
+    """
+    Independent copy of `sim` (System, positions, velocities, box) on a new
+    Context with a fresh integrator built from `defaults`, e.g. for replicas.
+    """
+    from openmm import XmlSerializer
+
+    system = XmlSerializer.deserialize(XmlSerializer.serialize(sim.system))
+    integrator = _make_integrator(defaults)
+    clone = _new_simulation(
+        sim.topology,
+        system,
+        integrator,
+        defaults.get("platform", "auto"),
+        defaults.get("platform_properties"),
+    )
+    clone.context.setState(
+        sim.context.getState(getPositions=True, getVelocities=True, getParameters=True)
+    )
+    return clone
+
+
+def seed_velocities(sim, temperature_K: float, seed: int) -> None:
+    """Draw Maxwell-Boltzmann velocities reproducibly from `seed`."""
+    from openmm import unit
+
+    sim.context.setVelocitiesToTemperature(
+        float(temperature_K) * unit.kelvin, int(seed)
+    )
+
 
-    raise ValueError(f"Unknown system type '{stype}'. Spec: {spec}")
+def restore_completed_stages(
+    sim, completed: List[Tuple[Dict[str, Any], Path]], defaults: Dict[str, Any]
+) -> None:
+    """
+    Bring a restored Simulation to the end of the last completed stage: replay
+    the force set-up of every completed stage, then load its final state. A
+    serialized State (state.xml, written by shared stages) is preferred over
+    state.chk, which only loads on the platform and OpenMM build that wrote it.
+    """
+    if not completed:
+        return
+    for stage, stage_dir in completed:
+        _configure_stage_forces(sim, stage, stage_dir, defaults, reinitialize=False)
+    sim.context.reinitialize()
+    stage, stage_dir = completed[-1]
+    if (stage_dir / "state.xml").exists():
+        sim.loadState(str(stage_dir / "state.xml"))
+    else:
+        sim.loadCheckpoint(str(stage_dir / "state.chk"))
+    logger.info(f"Resume: continuing after completed stage '{stage.get('name')}'")
+
+
+def _current_step(sim) -> int:
+    try:
+        return int(sim.currentStep)
+    except Exception:
+        return 0
 
 
 # ------------------------------------------------------------
 # Stage runner
 # ------------------------------------------------------------
-def run_stage(sim, stage: Dict[str, Any], stage_dir: Path, defaults: Dict[str, Any]):
+def _configure_stage_forces(
+    sim,
+    stage: Dict[str, Any],
+    stage_dir: Path,
+    defaults: Dict[str, Any],
+    reinitialize: bool = True,
+) -> bool:
+    """
+    Apply the stage's PLUMED force and barostat to sim.system. The Context only
+    sees System changes after a reinitialize, which preserves the current state.
+    """
+    ensemble = (stage.get("ensemble") or "NVT").upper()
+    temperature_K = float(defaults.get("temperature_K", 300))
+    pressure_atm = float(defaults.get("pressure_atm", 1.0))
+
+    # Setup PLUMED if configured
+    plumed_config = merge_plumed_configs(defaults, stage)
+    plumed_force = setup_plumed_force(sim, plumed_config, stage_dir)
+
+    # reset/add barostat as needed
+    removed = 0
+    for idx in reversed(range(sim.system.getNumForces())):
+        if sim.system.getForce(idx).__class__.__name__ == "MonteCarloBarostat":
+            sim.system.removeForce(idx)
+            removed += 1
+    _maybe_barostat(sim.system, ensemble, temperature_K, pressure_atm)
+
+    changed = plumed_force is not None or removed > 0 or ensemble == "NPT"
+    if changed and reinitialize:
+        sim.context.reinitialize(preserveState=True)
+    return changed
+
+
+def _record_benchmark(sim, steps: int, wall_s: float) -> None:
+    """Feed this host's ns/day model used by `--estimate` (core.estimate)."""
+    try:
+        from openmm import unit
+
+        record_benchmark(
+            sim.context.getPlatform().getName(),
+            sim.topology.getNumAtoms(),
+            steps,
+            wall_s,
+            sim.integrator.getStepSize().value_in_unit(unit.femtoseconds),
+        )
+    except Exception as e:  # never fail a stage over bookkeeping
+        logger.debug(f"Benchmark not recorded: {e}")
+
+
+def run_stage(
+    sim,
+    stage: Dict[str, Any],
+    stage_dir: Path,
+    defaults: Dict[str, Any],
+    resume: bool = False,
+):
+    """
+    Run one stage. With resume=True and a checkpoint left by an interrupted
+    attempt, the stage restarts from state.chk with only the remaining steps
+    and appends to its existing trajectory/state.log. With a `reporting:`
+    budget the reporter intervals are derived per stage (see io_policy);
+    `trajectory:` picks the format (traj.dcd/.xtc/.h5), an off-thread
+    writer and extra per-selection trajectories (`groups`, see trajectory).
+    """
     from openmm.app import CheckpointReporter, DCDReporter, PDBFile, StateDataReporter
 
     name = stage.get("name", "stage")
     steps = int(stage.get("steps", 0))
     ensemble = (stage.get("ensemble") or "NVT").upper()
-    temperature_K = float(defaults.get("temperature_K", 300))
-    pressure_atm = float(defaults.get("pressure_atm", 1.0))
     report_interval = int(
         stage.get("report_interval", defaults.get("report_interval", 1000))
     )
     checkpoint_interval = int(
         stage.get("checkpoint_interval", defaults.get("checkpoint_interval", 10000))
     )
+    policy = None if name.lower() == "minimize" else policy_settings(stage, defaults)
+    traj = trajectory_settings(stage, defaults)
+    traj_path = trajectory_path(stage_dir, traj)
 
     logger.info(f"Stage: {name} steps={steps} ensemble={ensemble}")
 
     stage_dir.mkdir(parents=True, exist_ok=True)
+    chk_path = stage_dir / "state.chk"
+    progress = read_progress(stage_dir) if resume else None
+    resuming = progress is not None and chk_path.exists()
+
+    # Intervals derived by the first attempt; the trajectory was written with them
+    derived = (progress or {}).get("reporting") if resuming else None
+    if derived:
+        report_interval = int(derived["dcd_interval"])
+        checkpoint_interval = int(derived["checkpoint_interval"])
+    state_interval = int(derived["state_interval"]) if derived else report_interval
+
+    _configure_stage_forces(sim, stage, stage_dir, defaults)
+
+    remaining = steps
+    if resuming:
+        sim.loadCheckpoint(str(chk_path))
+        start_step = int(progress["start_step"])
+        current = _current_step(sim)
+        remaining = max(0, steps - (current - start_step))
+        probe = int((derived or {}).get("probe_steps", 0))  # ran without reporters
+        kept = truncate_trajectory(
+            traj_path,
+            frames_through(start_step + probe, current, report_interval),
+        )
+        for group in traj["groups"]:
+            truncate_trajectory(
+                trajectory_path(stage_dir, group),
+                frames_through(start_step + probe, current, group["interval"]),
+            )
+        truncate_state_log(stage_dir / "state.log", current)
+        logger.info(
+            f"Resume: {name} from checkpoint at step {current - start_step}/{steps} "
+            f"({remaining} remaining, {kept} frames kept)"
+        )
 
+    elif policy is not None and remaining > 0:
+        start_step = _current_step(sim)
+        probe, timings = 0, None
+        if policy["overhead_pct"]:
+            probe = min(PROBE_STEPS, remaining)
+            timings = measure(sim, probe)
+            remaining -= probe
+        derived = derive_intervals(
+            policy,
+            sim.topology.getNumAtoms(),
+            steps,
+            report_interval,
+            checkpoint_interval,
+            timings,
+            bytes_per_atom=bytes_per_atom(traj),
+        )
+        derived["probe_steps"] = probe
+        report_interval = derived["dcd_interval"]
+        state_interval = derived["state_interval"]
+        checkpoint_interval = derived["checkpoint_interval"]
+        write_progress(stage_dir, start_step, reporting=derived)
+        logger.info(
+            f"Reporting: {name} dcd every {report_interval} steps "
+            f"({derived['frames']} frames, {derived['traj_bytes'] / 1024**2:.1f} MB)  "
+            f"state every {state_interval}  checkpoint every {checkpoint_interval}"
+            + (
+                f"  (reporter overhead ~{derived['overhead_pct']}%)"
+                if "overhead_pct" in derived
+                else ""
+            )
+        )
+
+    append = {"append": True} if resuming else {}
     sim.reporters = []
+    writers = []
+    groups = []
     if name.lower() != "minimize":
-        sim.reporters.append(DCDReporter(str(stage_dir / "traj.dcd"), report_interval))
+        if traj["async"] or traj["format"] != "dcd":
+            writers.append(
+                trajectory_reporter(
+                    traj_path,
+                    traj,
+                    report_interval,
+                    append=resuming and traj_path.exists(),
+                )
+            )
+        else:
+            sim.reporters.append(
+                DCDReporter(str(stage_dir / "traj.dcd"), report_interval, **append)
+            )
+        for group in traj["groups"]:
+            indices = select_atoms(sim.topology, group["select"])
+            path = trajectory_path(stage_dir, group)
+            writers.append(
+                trajectory_reporter(
+                    path,
+                    group,
+                    group["interval"],
+                    append=resuming and path.exists(),
+                    atom_subset=indices,
+                )
+            )
+            groups.append((group, indices))
+            logger.info(
+                f"Trajectory group: {group['name']} '{group['select']}' "
+                f"{len(indices)} atoms every {group['interval']} steps -> {path.name}"
+            )
+        sim.reporters.extend(writers)
     sim.reporters.append(
         StateDataReporter(
             str(stage_dir / "state.log"),
-            report_interval,
+            state_interval,
             step=True,
             speed=True,
             potentialEnergy=True,
@@ -720,40 +1363,42 @@ def run_stage(sim, stage: Dict[str, Any], stage_dir: Path, defaults: Dict[str, A
             progress=True,
             remainingTime=True,
             totalSteps=steps,
+            **append,
         )
     )
+    checkpoint = CheckpointReporter(str(chk_path), checkpoint_interval)
     sim.reporters.append(
-        CheckpointReporter(str(stage_dir / "state.chk"), checkpoint_interval)
+        CheckpointBarrier(checkpoint, writers) if writers else checkpoint
     )
 
-    # Setup PLUMED if configured
-    plumed_config = merge_plumed_configs(defaults, stage)
-    plumed_force = setup_plumed_force(sim, plumed_config, stage_dir)
-
-    # reset/add barostat as needed
-    for idx in reversed(range(sim.system.getNumForces())):
-        if sim.system.getForce(idx).__class__.__name__ == "MonteCarloBarostat":
-            sim.system.removeForce(idx)
-    _maybe_barostat(sim.system, ensemble, temperature_K, pressure_atm)
-
-    # Re-initialize context if PLUMED was added
-    if plumed_force is not None:
-        sim.context.reinitialize(preserveState=True)
-
-    if name.lower() == "minimize":
+    if name.lower() == "minimize" and not resuming:
         tol_q, tol_val = _get_minimize_tolerance(defaults)
         maxit = int(defaults.get("minimize_max_iterations", 0))
         logger.info(f"Minimize: tol={tol_val} kJ/mol/nm  maxit={maxit}")
         sim.minimizeEnergy(tolerance=tol_q, maxIterations=maxit)
 
-    if steps > 0:
-        sim.step(steps)
-
-    (stage_dir / "stage.json").write_text(json.dumps(stage, indent=2))
+    if not resuming and derived is None:
+        write_progress(stage_dir, _current_step(sim))
+
+    with flushing(writers):
+        if remaining > 0:
+            t0 = time.perf_counter()
+            sim.step(remaining)
+    if remaining > 0:
+        _record_benchmark(sim, remaining, time.perf_counter() - t0)
+
+    # Final checkpoint: the next stage (or a resumed run) starts from here
+    sim.saveCheckpoint(str(chk_path))
+    record = {**stage, "reporting_policy": derived} if derived else stage
+    (stage_dir / "stage.json").write_text(json.dumps(record, indent=2))
+    positions = sim.context.getState(getPositions=True).getPositions(asNumpy=True)
     with open(stage_dir / "topology.pdb", "w") as f:
-        PDBFile.writeFile(
-            sim.topology,
-            sim.context.getState(getPositions=True).getPositions(),
-            f,
-            keepIds=True,
-        )
+        PDBFile.writeFile(sim.topology, positions, f, keepIds=True)
+    for group, indices in groups:
+        with open(group_topology_path(stage_dir, group), "w") as f:
+            PDBFile.writeFile(
+                subset_topology(sim.topology, indices),
+                positions[indices],
+                f,
+                keepIds=True,
+            )
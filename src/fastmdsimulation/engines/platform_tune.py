@@ -0,0 +1,275 @@
+# FastMDSimulation/src/fastmdsimulation/engines/platform_tune.py
+
+"""
+`platform: tune` — pick the fastest platform/precision for the actual system.
+
+Every available platform (Reference excluded) is timed in a short burst of MD
+steps on the system about to run, briefly relaxed first: CUDA/OpenCL/HIP at
+mixed and single precision (double is skipped; it rarely wins and costs the
+longest bursts), CPU at the whole CPU budget (utils.cpuset) and at half of it. The fastest
+configuration is used and the decision is stored in
+<cache root>/platform_tune/<fingerprint>.json, keyed by a power-of-two
+atom-count bucket. The fingerprint covers CPU model and count, visible GPUs,
+the OpenMM version and its platforms, so identical nodes sharing a cache
+directory share decisions while a different node type re-measures.
+Properties set in defaults.platform_properties are kept fixed.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import platform as _platform
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from ..utils.cache import cache_dir, cache_enabled, hash_key
+from ..utils.cpuset import cpu_budget
+from ..utils.filelock import FileLock
+from ..utils.logging import get_logger
+
+logger = get_logger("engine.tune")
+
+PRECISIONS = ("mixed", "single")
+_PRECISION_KEYS = {
+    "CUDA": "CudaPrecision",
+    "OpenCL": "OpenCLPrecision",
+    "HIP": "HipPrecision",
+}
+WARMUP_STEPS = 20
+RELAX_ITERATIONS = 100  # cap on the minimization before each burst
+BURST_S = 1.0  # time each candidate for about this long
+MAX_BURST_STEPS = 5000
+
+
+# ------------------------------
+# Cache key
+# ------------------------------
+def _cpu_model() -> str:
+    try:
+        for line in Path("/proc/cpuinfo").read_text().splitlines():
+            if line.startswith("model name"):
+                return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return _platform.processor()
+
+
+def _gpu_names() -> List[str]:
+    if not shutil.which("nvidia-smi"):
+        return []
+    try:
+        out = subprocess.run(
+            ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+    return [line.strip() for line in out.splitlines() if line.strip()]
+
+
+def hardware_fingerprint() -> str:
+    import openmm
+    from openmm import Platform
+
+    parts = {
+        "machine": _platform.machine(),
+        "cpu": _cpu_model(),
+        "cores": os.cpu_count(),
+        "gpus": _gpu_names(),
+        "visible": [
+            os.getenv(k, "")
+            for k in (
+                "CUDA_VISIBLE_DEVICES",
+                "HIP_VISIBLE_DEVICES",
+                "ROCR_VISIBLE_DEVICES",
+            )
+        ],
+        "openmm": openmm.__version__,
+        "platforms": sorted(
+            Platform.getPlatform(i).getName() for i in range(Platform.getNumPlatforms())
+        ),
+    }
+    return hash_key(parts)[:16]
+
+
+def atom_bucket(atoms: int) -> str:
+    """Power-of-two bucket label, e.g. 23558 -> '16384-32767'."""
+    lo = 1 << max(0, int(atoms).bit_length() - 1)
+    return f"{lo}-{2 * lo - 1}"
+
+
+def _tune_file(fingerprint: str) -> Path:
+    return cache_dir("platform_tune") / f"{fingerprint}.json"
+
+
+def load_decision(fingerprint: str, atoms: int) -> Dict[str, Any] | None:
+    try:
+        data = json.loads(_tune_file(fingerprint).read_text())
+    except (OSError, ValueError):
+        return None
+    return data.get(atom_bucket(atoms))
+
+
+def store_decision(fingerprint: str, atoms: int, decision: Dict[str, Any]) -> None:
+    path = _tune_file(fingerprint)
+    with FileLock(path.with_suffix(".lock")):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            data = {}
+        data[atom_bucket(atoms)] = decision
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2))
+        os.replace(tmp, path)
+
+
+# ------------------------------
+# Measurement
+# ------------------------------
+def _format(name: str, props: Dict[str, str]) -> str:
+    return name + (
+        f" ({', '.join(f'{k}={v}' for k, v in props.items())})" if props else ""
+    )
+
+
+def _own(plat, fixed: Dict[str, str]) -> Dict[str, str]:
+    """The fixed properties that this platform understands."""
+    names = set(plat.getPropertyNames())
+    return {k: v for k, v in fixed.items() if k in names}
+
+
+def candidates(fixed: Dict[str, str] | None = None) -> List[Tuple[str, Dict[str, str]]]:
+    """(platform, properties) configurations to time; `fixed` props always win."""
+    from openmm import Platform
+
+    fixed = {str(k): str(v) for k, v in (fixed or {}).items()}
+    out: List[Tuple[str, Dict[str, str]]] = []
+    for i in range(Platform.getNumPlatforms()):
+        plat = Platform.getPlatform(i)
+        name = plat.getName()
+        if name == "Reference":
+            continue
+        own = _own(plat, fixed)
+        if name == "CPU":
+            cores = cpu_budget()
+            variants = [
+                {"Threads": str(t)} for t in sorted({cores, max(1, cores // 2)})
+            ]
+        elif name in _PRECISION_KEYS:
+            variants = [{_PRECISION_KEYS[name]: p} for p in PRECISIONS]
+        else:
+            variants = [{}]
+        for variant in variants:
+            props = {**variant, **own}
+            if (name, props) not in out:
+                out.append((name, props))
+    return out
+
+
+def time_candidate(
+    system, integrator, positions, name: str, props: Dict[str, str]
+) -> float:
+    """
+    ns/day of a short burst of steps on one configuration. The positions are
+    usually straight from solvation, so they are relaxed briefly and given
+    thermal velocities first; clashes would otherwise blow up the burst or
+    force constant neighbour-list rebuilds and skew the timing.
+    """
+    from openmm import Context, LocalEnergyMinimizer, Platform, unit
+
+    integ = copy.deepcopy(integrator)
+    context = Context(system, integ, Platform.getPlatformByName(name), props)
+    try:
+        context.setPositions(positions)
+        LocalEnergyMinimizer.minimize(context, 10.0, RELAX_ITERATIONS)
+        if hasattr(integ, "getTemperature"):
+            context.setVelocitiesToTemperature(integ.getTemperature())
+        integ.step(WARMUP_STEPS)
+        context.getState(getEnergy=True)  # finish queued GPU work
+        steps, t0 = 0, time.perf_counter()
+        while steps < MAX_BURST_STEPS:
+            integ.step(50)
+            steps += 50
+            context.getState(getEnergy=True)
+            if time.perf_counter() - t0 >= BURST_S:
+                break
+        wall = time.perf_counter() - t0
+    finally:
+        del context
+    dt_fs = integ.getStepSize().value_in_unit(unit.femtoseconds)
+    return steps * dt_fs * 1e-6 / wall * 86400.0
+
+
+def tune_platform(
+    system,
+    integrator,
+    positions,
+    platform_props: Dict[str, str] | None = None,
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Fastest (platform, properties) for this system: the cached decision for
+    this host and atom-count bucket, else measured now (needs positions) and
+    cached. Falls back to ("auto", props) if nothing can be measured.
+    """
+    fixed = {str(k): str(v) for k, v in (platform_props or {}).items()}
+    atoms = system.getNumParticles()
+    fingerprint = hardware_fingerprint()
+    use_cache = cache_enabled()
+
+    decision = load_decision(fingerprint, atoms) if use_cache else None
+    if decision is not None:
+        from openmm import Platform
+
+        plat = Platform.getPlatformByName(decision["platform"])
+        props = {**decision["properties"], **_own(plat, fixed)}
+        logger.info(
+            f"Tune: cached {_format(decision['platform'], props)} "
+            f"for {atom_bucket(atoms)} atoms on this host"
+        )
+        return decision["platform"], props
+
+    if positions is None:
+        logger.info("Tune: no positions to measure with; using platform auto")
+        return "auto", fixed
+
+    results = []
+    for name, props in candidates(fixed):
+        try:
+            rate = time_candidate(system, integrator, positions, name, props)
+        except Exception as e:
+            logger.info(f"Tune: {_format(name, props)} unavailable ({e})")
+            continue
+        logger.info(f"Tune: {_format(name, props)} {rate:.1f} ns/day")
+        results.append((rate, name, props))
+    if not results:
+        logger.warning("Tune: no platform could be measured; using platform auto")
+        return "auto", fixed
+
+    rate, name, props = max(results, key=lambda r: r[0])
+    logger.info(
+        f"Tune: picked {_format(name, props)} ({rate:.1f} ns/day, {atoms} atoms)"
+    )
+    if use_cache:
+        store_decision(
+            fingerprint,
+            atoms,
+            {
+                "platform": name,
+                "properties": {k: v for k, v in props.items() if k not in fixed},
+                "ns_per_day": round(rate, 3),
+                "atoms": atoms,
+                "measurements": [
+                    {"platform": n, "properties": p, "ns_per_day": round(r, 3)}
+                    for r, n, p in results
+                ],
+                "time": int(time.time()),
+            },
+        )
+    return name, props
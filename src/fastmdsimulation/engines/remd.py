@@ -0,0 +1,362 @@
+# FastMDSimulation/src/fastmdsimulation/engines/remd.py
+
+"""
+Temperature replica exchange (stage `ensemble: REMD`).
+
+Each replica is a worker process that owns one Simulation, restored from its
+run directory after the stages that precede the REMD stage. The coordinator
+only ever exchanges temperatures: every `exchange_interval` steps it collects
+the replicas' potential energies (one float each), applies the Metropolis
+criterion to alternating neighbour pairs, and tells swapped replicas their new
+temperature (velocities are rescaled locally). Positions and velocities never
+cross process boundaries.
+
+Per-replica outputs go to <run_dir>/<stage>/ of the run the replica started
+from (traj.dcd, state.log, state.chk, stage.json, topology.pdb). The group
+directory holds exchanges.log (every attempt), temperatures.tsv (replica ->
+temperature after each exchange, for demuxing) and remd.json (acceptance and
+throughput).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.logging import attach_file_logger, get_logger
+
+logger = get_logger("engine.remd")
+
+K_B = 0.0083144626  # kJ/(mol K)
+
+
+# ------------------------------------------------------------
+# Exchange criterion (pure)
+# ------------------------------------------------------------
+def exchange_probability(t_i: float, t_j: float, e_i: float, e_j: float) -> float:
+    """
+    Metropolis acceptance for swapping the replicas at temperatures t_i and
+    t_j with potential energies e_i and e_j (kJ/mol).
+    """
+    delta = (1.0 / (K_B * t_i) - 1.0 / (K_B * t_j)) * (e_i - e_j)
+    return 1.0 if delta >= 0 else math.exp(delta)
+
+
+def attempt_exchanges(
+    temps: Sequence[float],
+    at_temp: List[int],
+    energies: Sequence[float],
+    cycle: int,
+    rng: random.Random,
+) -> List[Tuple[int, int, int, float, bool]]:
+    """
+    Attempt swaps between neighbouring temperatures, even pairs on even cycles
+    and odd pairs on odd cycles. `at_temp[m]` is the replica currently at
+    temperature index m and is updated in place.
+    Returns (m, replica_at_m, replica_at_m+1, probability, accepted) per attempt.
+    """
+    attempts = []
+    for m in range(cycle % 2, len(temps) - 1, 2):
+        a, b = at_temp[m], at_temp[m + 1]
+        p = exchange_probability(temps[m], temps[m + 1], energies[a], energies[b])
+        accepted = rng.random() < p
+        if accepted:
+            at_temp[m], at_temp[m + 1] = b, a
+        attempts.append((m, a, b, p, accepted))
+    return attempts
+
+
+def run_exchanges(
+    replicas: Sequence[Any],
+    temps: Sequence[float],
+    steps: int,
+    interval: int,
+    out_dir: Path,
+    timestep_fs: float = 2.0,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Drive the replicas through `steps` MD steps with an exchange attempt every
+    `interval` steps. Replica handles provide send_step(n), recv_energy(),
+    set_temperature(new_K, old_K) and finish(); replica r starts at temps[r]
+    (ascending).
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    n = len(replicas)
+    at_temp = list(range(n))
+    attempted = [0] * (n - 1)
+    accepted = [0] * (n - 1)
+
+    t0 = time.perf_counter()
+    done = 0
+    cycle = 0
+    with (
+        open(out_dir / "exchanges.log", "w") as xlog,
+        open(out_dir / "temperatures.tsv", "w") as tmap,
+    ):
+        xlog.write("# cycle\tstep\tT_i\tT_j\treplica_i\treplica_j\tprob\taccepted\n")
+        tmap.write("# step\t" + "\t".join(f"rep{r}" for r in range(n)) + "\n")
+        while done < steps:
+            chunk = min(interval, steps - done)
+            for rep in replicas:
+                rep.send_step(chunk)  # all replicas step concurrently
+            energies = [rep.recv_energy() for rep in replicas]
+            done += chunk
+            if done >= steps:
+                break
+
+            before = {r: m for m, r in enumerate(at_temp)}
+            for m, a, b, p, ok in attempt_exchanges(
+                temps, at_temp, energies, cycle, rng
+            ):
+                attempted[m] += 1
+                accepted[m] += int(ok)
+                xlog.write(
+                    f"{cycle}\t{done}\t{temps[m]}\t{temps[m + 1]}\t{a}\t{b}\t{p:.4f}\t{int(ok)}\n"
+                )
+            for m, r in enumerate(at_temp):
+                if before[r] != m:
+                    replicas[r].set_temperature(temps[m], temps[before[r]])
+            temp_of = {r: temps[m] for m, r in enumerate(at_temp)}
+            tmap.write(
+                f"{done}\t" + "\t".join(str(temp_of[r]) for r in range(n)) + "\n"
+            )
+            cycle += 1
+
+    for rep in replicas:
+        rep.finish()
+    wall_s = time.perf_counter() - t0
+
+    # One replica is at the lowest temperature at all times
+    ns_low = steps * timestep_fs * 1e-6
+    worker_hours = wall_s / 3600.0 * n
+    summary = {
+        "temperatures_K": list(temps),
+        "steps": steps,
+        "exchange_interval": interval,
+        "cycles": cycle,
+        "acceptance": [
+            {
+                "pair": [temps[m], temps[m + 1]],
+                "attempted": attempted[m],
+                "accepted": accepted[m],
+                "rate": round(accepted[m] / attempted[m], 4) if attempted[m] else None,
+            }
+            for m in range(n - 1)
+        ],
+        "final_temperatures_K": [
+            temps[m] for m, _ in sorted(enumerate(at_temp), key=lambda x: x[1])
+        ],
+        "wall_s": round(wall_s, 3),
+        "lowest_T_ns_per_worker_hour": (
+            round(ns_low / worker_hours, 6) if worker_hours > 0 else None
+        ),
+    }
+    (out_dir / "remd.json").write_text(json.dumps(summary, indent=2))
+    return summary
+
+
+# ------------------------------------------------------------
+# Replica worker processes
+# ------------------------------------------------------------
+def _replica_main(
+    conn,
+    run_dir: str,
+    completed: List[Dict[str, Any]],
+    stage: Dict[str, Any],
+    defaults: Dict[str, Any],
+    log_path: str | None = None,
+) -> None:
+    if log_path:
+        attach_file_logger(log_path)
+    try:
+        from openmm import unit
+        from openmm.app import DCDReporter, PDBFile, StateDataReporter
+
+        from .openmm_engine import (
+            _configure_stage_forces,
+            restore_completed_stages,
+            restore_simulation,
+        )
+
+        rdir = Path(run_dir)
+        sim = restore_simulation(rdir, defaults)
+        if completed:
+            restore_completed_stages(
+                sim, [(st, rdir / st["name"]) for st in completed], defaults
+            )
+        if not hasattr(sim.integrator, "setTemperature"):
+            raise ValueError(
+                "REMD needs a thermostatted (Langevin/Brownian) integrator"
+            )
+
+        stage_dir = rdir / stage["name"]
+        stage_dir.mkdir(parents=True, exist_ok=True)
+        _configure_stage_forces(sim, {**stage, "ensemble": "NVT"}, stage_dir, defaults)
+        interval = int(
+            stage.get("report_interval", defaults.get("report_interval", 1000))
+        )
+        sim.reporters = [
+            DCDReporter(str(stage_dir / "traj.dcd"), interval),
+            StateDataReporter(
+                str(stage_dir / "state.log"),
+                interval,
+                step=True,
+                speed=True,
+                potentialEnergy=True,
+                kineticEnergy=True,
+                temperature=True,
+                density=True,
+            ),
+        ]
+        conn.send(("ready", None))
+
+        while True:
+            op, *args = conn.recv()
+            if op == "step":
+                sim.step(int(args[0]))
+                e = sim.context.getState(getEnergy=True).getPotentialEnergy()
+                conn.send(("energy", e.value_in_unit(unit.kilojoule_per_mole)))
+            elif op == "temperature":
+                new_k, old_k = float(args[0]), float(args[1])
+                sim.integrator.setTemperature(new_k * unit.kelvin)
+                v = sim.context.getState(getVelocities=True).getVelocities(asNumpy=True)
+                sim.context.setVelocities(v * math.sqrt(new_k / old_k))
+                conn.send(("ok", None))
+            elif op == "finish":
+                sim.saveCheckpoint(str(stage_dir / "state.chk"))
+                (stage_dir / "stage.json").write_text(json.dumps(stage, indent=2))
+                with open(stage_dir / "topology.pdb", "w") as f:
+                    PDBFile.writeFile(
+                        sim.topology,
+                        sim.context.getState(getPositions=True).getPositions(),
+                        f,
+                        keepIds=True,
+                    )
+                conn.send(("done", None))
+                return
+    except BaseException:
+        conn.send(("error", traceback.format_exc()))
+
+
+class ProcessReplica:
+    """Coordinator-side handle of one replica worker process."""
+
+    def __init__(
+        self,
+        ctx,
+        run_dir: Path,
+        completed: List[Dict[str, Any]],
+        stage: Dict[str, Any],
+        defaults: Dict[str, Any],
+        log_path: str | None = None,
+    ):
+        self.name = Path(run_dir).name
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(
+            target=_replica_main,
+            args=(child, str(run_dir), completed, stage, defaults, log_path),
+            name=f"fastmds-remd-{self.name}",
+            daemon=True,
+        )
+        self.proc.start()
+        child.close()
+
+    def _recv(self):
+        try:
+            tag, payload = self.conn.recv()
+        except EOFError:
+            raise RuntimeError(
+                f"REMD replica {self.name} exited with code {self.proc.exitcode}"
+            )
+        if tag == "error":
+            raise RuntimeError(f"REMD replica {self.name} failed:\n{payload}")
+        return payload
+
+    def wait_ready(self) -> None:
+        self._recv()
+
+    def send_step(self, n: int) -> None:
+        self.conn.send(("step", n))
+
+    def recv_energy(self) -> float:
+        return float(self._recv())
+
+    def set_temperature(self, new_k: float, old_k: float) -> None:
+        self.conn.send(("temperature", new_k, old_k))
+        self._recv()
+
+    def finish(self) -> None:
+        self.conn.send(("finish",))
+        self._recv()
+        self.proc.join()
+
+    def kill(self) -> None:
+        if self.proc.is_alive():
+            self.proc.terminate()
+        self.proc.join()
+
+
+def run_remd(
+    members: List[Tuple[Path, float, Dict[str, Any]]],
+    completed: List[Dict[str, Any]],
+    stage: Dict[str, Any],
+    out_dir: Path,
+    start_method: str = "spawn",
+    log_path: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Run one REMD group. `members` are (run_dir, temperature_K, defaults) per
+    replica; `completed` are the stages already run in each run_dir.
+    """
+    import multiprocessing as mp
+
+    members = sorted(members, key=lambda m: float(m[1]))
+    temps = [float(t) for _, t, _ in members]
+    steps = int(stage.get("steps", 0))
+    interval = int(stage.get("exchange_interval", 1000))
+    if interval <= 0:
+        raise ValueError("REMD exchange_interval must be positive")
+    d0 = members[0][2]
+    integ = d0.get("integrator")
+    timestep_fs = float(
+        integ.get("timestep_fs", d0.get("timestep_fs", 2.0))
+        if isinstance(integ, dict)
+        else d0.get("timestep_fs", 2.0)
+    )
+
+    logger.info(
+        f"REMD: {len(members)} replicas  T={temps}  steps={steps}  "
+        f"exchange every {interval} -> {out_dir}"
+    )
+    ctx = mp.get_context(start_method)
+    replicas = [
+        ProcessReplica(ctx, rdir, completed, stage, d, log_path)
+        for rdir, _, d in members
+    ]
+    try:
+        for rep in replicas:
+            rep.wait_ready()
+        summary = run_exchanges(
+            replicas,
+            temps,
+            steps,
+            interval,
+            out_dir,
+            timestep_fs=timestep_fs,
+            seed=stage.get("seed"),
+        )
+    finally:
+        for rep in replicas:
+            rep.kill()
+    rates = ", ".join(
+        f"{a['pair'][0]}-{a['pair'][1]}: {a['rate']}" for a in summary["acceptance"]
+    )
+    logger.info(f"REMD: acceptance {rates}")
+    return summary
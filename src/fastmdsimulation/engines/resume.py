@@ -0,0 +1,174 @@
+# FastMDSimulation/src/fastmdsimulation/engines/resume.py
+
+"""Helpers for restarting a partially completed stage from its checkpoint."""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..utils.logging import get_logger
+
+logger = get_logger("engine.resume")
+
+PROGRESS_FILE = "progress.json"
+
+
+def write_progress(
+    stage_dir: Path, start_step: int, reporting: Dict[str, Any] | None = None
+) -> None:
+    """
+    Record the absolute step at which the stage's dynamics started (and the
+    reporter intervals an I/O policy derived for it, see io_policy).
+    """
+    data: Dict[str, Any] = {"start_step": int(start_step)}
+    if reporting:
+        data["reporting"] = reporting
+    (stage_dir / PROGRESS_FILE).write_text(json.dumps(data, indent=2))
+
+
+def read_progress(stage_dir: Path) -> Optional[Dict[str, Any]]:
+    path = stage_dir / PROGRESS_FILE
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text())
+        int(data["start_step"])
+        return data
+    except Exception:
+        logger.warning(f"Ignoring unreadable {path}")
+        return None
+
+
+def frames_through(start_step: int, step: int, interval: int) -> int:
+    """
+    Number of reporter frames a stage that began at `start_step` has written up
+    to and including absolute `step` (OpenMM reports on multiples of interval).
+    """
+    if interval <= 0 or step <= start_step:
+        return 0
+    return step // interval - start_step // interval
+
+
+def truncate_dcd(path: Path, n_frames: int) -> int:
+    """
+    Drop frames past `n_frames` from a DCD written by OpenMM's DCDFile and fix
+    the frame count in the header, so appending continues seamlessly.
+    Returns the number of frames kept.
+    """
+    if not path.exists():
+        return 0
+    with open(path, "r+b") as f:
+        head = f.read(100)
+        if len(head) < 100 or head[4:8] != b"CORD":
+            raise ValueError(f"Not a DCD file: {path}")
+        nset, istart, interval = struct.unpack("<3i", head[8:20])
+        has_box = struct.unpack("<i", head[48:52])[0] != 0
+        title_len = struct.unpack("<i", head[92:96])[0]
+        f.seek(92 + 4 + title_len + 4 + 4)
+        natoms = struct.unpack("<i", f.read(4))[0]
+        header_len = 92 + 4 + title_len + 4 + 12
+        frame_len = (56 if has_box else 0) + 3 * (8 + 4 * natoms)
+
+        f.seek(0, os.SEEK_END)
+        on_disk = (f.tell() - header_len) // frame_len
+        keep = max(0, min(int(n_frames), nset, on_disk))
+        f.truncate(header_len + keep * frame_len)
+        f.seek(8)
+        f.write(struct.pack("<i", keep))
+        f.seek(20)
+        f.write(struct.pack("<i", istart + keep * interval))
+    return keep
+
+
+def _xtc_frame_ends(f) -> List[int]:
+    """Byte offset after each complete frame of an XTC file."""
+    ends: List[int] = []
+    size = os.fstat(f.fileno()).st_size
+    pos = 0
+    while pos + 56 <= size:
+        f.seek(pos)
+        head = f.read(56)
+        magic, natoms = struct.unpack(">2i", head[:8])
+        if magic != 1995:
+            break
+        if natoms <= 9:  # small frames are stored uncompressed
+            end = pos + 56 + 12 * natoms
+        else:
+            f.seek(pos + 56 + 32)
+            nbytes = struct.unpack(">i", f.read(4))[0]
+            end = pos + 56 + 36 + (nbytes + 3) // 4 * 4
+        if end > size:
+            break  # torn frame from the interrupted write
+        ends.append(end)
+        pos = end
+    return ends
+
+
+def truncate_xtc(path: Path, n_frames: int) -> int:
+    """Drop XTC frames past `n_frames` (and any torn last frame)."""
+    if not path.exists():
+        return 0
+    with open(path, "r+b") as f:
+        ends = _xtc_frame_ends(f)
+        keep = max(0, min(int(n_frames), len(ends)))
+        f.truncate(ends[keep - 1] if keep else 0)
+    return keep
+
+
+def truncate_hdf5(path: Path, n_frames: int) -> int:
+    """Shrink the per-frame datasets of an MDTraj-layout HDF5 trajectory."""
+    if not path.exists():
+        return 0
+    import h5py
+
+    with h5py.File(path, "a") as h5:
+        keep = max(0, min(int(n_frames), h5["coordinates"].shape[0]))
+        for name in ("coordinates", "time", "cell_lengths", "cell_angles"):
+            if name in h5:
+                h5[name].resize(min(keep, h5[name].shape[0]), axis=0)
+    return keep
+
+
+def truncate_trajectory(path: Path, n_frames: int) -> int:
+    """truncate_dcd / truncate_xtc / truncate_hdf5 by file suffix."""
+    truncate = {".xtc": truncate_xtc, ".h5": truncate_hdf5}.get(
+        path.suffix, truncate_dcd
+    )
+    return truncate(path, n_frames)
+
+
+def truncate_state_log(path: Path, max_step: int) -> int:
+    """
+    Drop StateDataReporter rows whose step is beyond `max_step`.
+    Returns the number of data rows kept.
+    """
+    if not path.exists():
+        return 0
+    lines = path.read_text().splitlines(keepends=True)
+    step_col = None
+    kept = []
+    n_rows = 0
+    for line in lines:
+        if line.startswith("#"):
+            cols = [c.strip().strip('"') for c in line[1:].strip().split(",")]
+            step_col = cols.index("Step") if "Step" in cols else None
+            kept.append(line)
+            continue
+        if step_col is None:
+            kept.append(line)
+            continue
+        if not line.endswith("\n"):
+            continue  # torn row from the interrupted write
+        try:
+            step = int(float(line.split(",")[step_col]))
+        except (IndexError, ValueError):
+            continue
+        if step <= max_step:
+            kept.append(line)
+            n_rows += 1
+    path.write_text("".join(kept))
+    return n_rows
@@ -0,0 +1,206 @@
+# FastMDSimulation/src/fastmdsimulation/engines/system_cache.py
+
+"""
+Persistent cache of built Systems across the PDB, protein-ligand, AMBER,
+GROMACS and CHARMM routes.
+
+An entry is the bundle written by save_simulation_bundle (system.xml,
+state.xml, topology.pdb) stored under <cache root>/systems/<key>/. The key
+covers the contents of every input file (including GROMACS #include chains),
+the force field list, the normalized create_system/solvation settings and the
+package versions, but not temperature or platform, which are applied when the
+entry is restored. Entries are evicted least-recently-used once the cache
+exceeds FASTMDS_SYSTEM_CACHE_MAX_MB (default 4096).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.cache import (
+    cache_dir,
+    evict_lru,
+    hash_key,
+    package_version,
+    sha256_file,
+    touch,
+)
+from ..utils.logging import get_logger
+
+logger = get_logger("engine.system_cache")
+
+KIND = "systems"
+DEFAULT_MAX_MB = 4096
+
+# Spec keys that name input files (hashed by content, not by path)
+_FILE_KEYS = (
+    "pdb",
+    "fixed_pdb",
+    "ligand",
+    "prmtop",
+    "inpcrd",
+    "rst7",
+    "top",
+    "gro",
+    "itp",
+    "psf",
+    "crd",
+    "params",
+    "prm",
+    "rtf",
+    "str",
+)
+# Spec keys that do not change the built System (provenance, cache locations,
+# run layout, and preparation settings already reflected in the prepared files)
+_IGNORED_SPEC_KEYS = (
+    "id",
+    "include_dirs",
+    "source_pdb",
+    "source_ligand",
+    "ligand_cache",
+    "replicas",
+    "ph",
+    "keep_heterogens",
+    "keep_water",
+    "ligand_charge",
+)
+# Defaults that change the built System (createSystem settings are added separately)
+_BUILD_DEFAULT_KEYS = (
+    "forcefield",
+    "box_padding_nm",
+    "ionic_strength_molar",
+    "neutralize",
+    "ions",
+)
+_VERSIONED_PACKAGES = ("openmm", "openmmforcefields", "openff-toolkit")
+
+_INCLUDE_RE = re.compile(r'^\s*#include\s+"([^"]+)"', re.MULTILINE)
+
+
+def max_bytes() -> int:
+    try:
+        mb = float(os.getenv("FASTMDS_SYSTEM_CACHE_MAX_MB", DEFAULT_MAX_MB))
+    except ValueError:
+        mb = DEFAULT_MAX_MB
+    return int(mb * 1024 * 1024)
+
+
+def _as_list(v: Any) -> List[str]:
+    return [str(x) for x in v] if isinstance(v, (list, tuple)) else [str(v)]
+
+
+def _digest(path: str) -> str:
+    p = Path(path)
+    return sha256_file(p) if p.is_file() else f"missing:{p.name}"
+
+
+def _gromacs_includes(top: Path, include_dirs: List[str]) -> List[Path]:
+    """Resolve the #include chain of a .top/.itp (unresolvable names are skipped)."""
+    seen: List[Path] = []
+    stack = [top]
+    while stack:
+        f = stack.pop()
+        if f in seen or not f.is_file():
+            continue
+        seen.append(f)
+        for name in _INCLUDE_RE.findall(f.read_text(errors="replace")):
+            for d in [f.parent, *map(Path, include_dirs)]:
+                cand = (d / name).resolve()
+                if cand.is_file():
+                    stack.append(cand)
+                    break
+    return seen[1:]
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    return str(value)
+
+
+def _create_system_settings(defaults: Dict[str, Any]) -> Dict[str, Any]:
+    cs = dict(defaults.get("create_system") or {})
+    # Same precedence as the builders: create_system.constraints wins
+    cs.setdefault("constraints", defaults.get("constraints", "HBonds"))
+    return _normalize(cs)
+
+
+def system_cache_key(spec: Dict[str, Any], defaults: Dict[str, Any], stype: str) -> str:
+    files: Dict[str, List[str]] = {}
+    for k in _FILE_KEYS:
+        if k in spec:
+            files[k] = [_digest(p) for p in _as_list(spec[k])]
+    if stype == "gromacs" and "top" in spec:
+        includes = _gromacs_includes(
+            Path(spec["top"]), _as_list(spec.get("include_dirs") or [])
+        )
+        files["includes"] = [sha256_file(p) for p in includes]
+
+    ff = defaults.get("forcefield") or []
+    payload = {
+        "type": stype,
+        "files": files,
+        "spec": _normalize(
+            {
+                k: v
+                for k, v in spec.items()
+                if k not in _FILE_KEYS and k not in _IGNORED_SPEC_KEYS
+            }
+        ),
+        "defaults": _normalize(
+            {k: defaults.get(k) for k in _BUILD_DEFAULT_KEYS if k in defaults}
+        ),
+        # Local force field XMLs are hashed by content as well
+        "forcefield_files": [_digest(f) for f in _as_list(ff) if Path(f).is_file()],
+        "create_system": _create_system_settings(defaults),
+        "versions": {p: package_version(p) for p in _VERSIONED_PACKAGES},
+    }
+    return hash_key(payload)
+
+
+def lookup(key: str) -> Optional[Path]:
+    entry = cache_dir(KIND) / key
+    if not (entry / "system.xml").exists():
+        return None
+    touch(entry)
+    return entry
+
+
+def store(key: str, write: Callable[[Path], None]) -> Optional[Path]:
+    """
+    Populate a new entry via write(tmp_dir) and publish it atomically, then
+    prune the cache to its size bound. Returns the entry (None if a concurrent
+    writer published it first).
+    """
+    root = cache_dir(KIND)
+    entry = root / key
+    tmp = root / f".{key}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    try:
+        write(tmp)
+        os.rename(tmp, entry)
+    except OSError:
+        if entry.exists():
+            return None  # lost the race; the other entry is equivalent
+        raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    removed = evict_lru(root, max_bytes(), keep=[entry])
+    if removed:
+        logger.info(
+            f"System cache: evicted {len(removed)} least recently used entry(s)"
+        )
+    return entry
@@ -0,0 +1,702 @@
+# FastMDSimulation/src/fastmdsimulation/engines/trajectory.py
+
+"""
+Trajectory writing for run_stage (`trajectory:` in defaults or per stage).
+
+    trajectory:
+      format: xtc            # dcd (default) | xtc | hdf5
+      precision: 0.001       # nm; lossy fixed precision (xtc: always 0.001)
+      async: true            # write from a background thread
+      buffer_frames: 4       # ring buffer size; the integrator waits when full
+      fsync_every: 16        # frames between fsyncs (0: only at checkpoints/end)
+      groups:                # extra subset trajectories (see atom_selection)
+        solute: {select: solute, interval: 500}   # -> traj.solute.xtc
+
+Each format is a sink (traj.dcd, traj.xtc, traj.h5 in the stage directory):
+DCD is written in the layout of OpenMM's DCDFile, XTC through OpenMM's
+XTCFile (OpenMM >= 8.1), HDF5 through h5py in MDTraj's HDF5 layout with
+chunked, gzip-compressed datasets (and a scale-offset filter keeping
+`precision` when set), so FastMDAnalysis/MDTraj read all three.
+
+OpenMM's DCDReporter encodes and writes each frame inside `sim.step`, so the
+integrator stalls for the whole write. AsyncTrajectoryReporter copies the
+positions into a preallocated ring buffer and returns; a writer thread
+encodes and writes frames and fsyncs in batches. Memory is bounded by
+`buffer_frames`: when the writer falls that far behind, `report` blocks until
+a slot frees up.
+
+Before each checkpoint the buffer is drained (CheckpointBarrier), so state.chk
+never runs ahead of the trajectory. `flushing` closes the writer when the
+stage ends or fails and, on SIGTERM, flushes before the previous handler runs.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import math
+import os
+import re
+import signal
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from ..utils.logging import get_logger
+
+logger = get_logger("engine.trajectory")
+
+TRAJECTORY_FILES = {"dcd": "traj.dcd", "xtc": "traj.xtc", "hdf5": "traj.h5"}
+# Approximate bytes per atom per frame, for I/O budgets
+BYTES_PER_ATOM = {"dcd": 12.0, "xtc": 4.0, "hdf5": 11.0}
+LOSSY_HDF5_BYTES_PER_ATOM = 5.0
+XTC_PRECISION_NM = 0.001
+_AKMA_PS = 0.04888821  # DCD time unit in ps
+
+
+def trajectory_settings(
+    stage: Dict[str, Any], defaults: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Merged defaults.trajectory + stage.trajectory with the writer defaults."""
+    cfg = {**(defaults.get("trajectory") or {}), **(stage.get("trajectory") or {})}
+    fmt = str(cfg.get("format", "dcd")).lower()
+    fmt = {"h5": "hdf5"}.get(fmt, fmt)
+    if fmt not in TRAJECTORY_FILES:
+        raise ValueError(
+            f"Unknown trajectory format '{fmt}' (use one of: "
+            f"{', '.join(TRAJECTORY_FILES)})"
+        )
+    precision = cfg.get("precision")
+    out = {
+        "format": fmt,
+        "precision": float(precision) if precision is not None else None,
+        "async": bool(cfg.get("async", False)),
+        "buffer_frames": int(cfg.get("buffer_frames", 4)),
+        "fsync_every": int(cfg.get("fsync_every", 16)),
+    }
+    if out["buffer_frames"] < 1 or out["fsync_every"] < 0:
+        raise ValueError(
+            f"trajectory needs buffer_frames >= 1 and fsync_every >= 0: {cfg}"
+        )
+    if out["precision"] is not None and out["precision"] <= 0:
+        raise ValueError(f"trajectory precision must be positive: {cfg}")
+    out["groups"] = _groups(cfg.get("groups") or {}, out)
+    return out
+
+
+def _groups(cfg: Dict[str, Any], parent: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    `groups: {name: {select, interval[, format, precision]}}` -> a list sorted
+    by name; each entry holds full writer settings, inherited from the parent.
+    """
+    groups = []
+    for name, g in sorted(cfg.items()):
+        if not re.fullmatch(r"[A-Za-z0-9_-]+", str(name)):
+            raise ValueError(f"trajectory group name must be a plain word: '{name}'")
+        g = g or {}
+        if "select" not in g or int(g.get("interval", 0)) <= 0:
+            raise ValueError(
+                f"trajectory group '{name}' needs `select` and a positive `interval`"
+            )
+        own = trajectory_settings(
+            {}, {"trajectory": {**parent, **{k: g[k] for k in g if k != "groups"}}}
+        )
+        own.pop("groups")
+        own.update(name=str(name), select=str(g["select"]), interval=int(g["interval"]))
+        groups.append(own)
+    return groups
+
+
+def trajectory_path(stage_dir: Path, settings: Dict[str, Any]) -> Path:
+    """traj.<ext>, or traj.<group>.<ext> for a group from settings["groups"]."""
+    name = TRAJECTORY_FILES[settings["format"]]
+    if "name" in settings:
+        stem, ext = name.split(".")
+        name = f"{stem}.{settings['name']}.{ext}"
+    return Path(stage_dir) / name
+
+
+def group_topology_path(stage_dir: Path, group: Dict[str, Any]) -> Path:
+    return Path(stage_dir) / f"topology.{group['name']}.pdb"
+
+
+def bytes_per_atom(settings: Dict[str, Any]) -> float:
+    """Approximate size of one frame per atom in the configured format."""
+    if settings["format"] == "hdf5" and settings.get("precision"):
+        return LOSSY_HDF5_BYTES_PER_ATOM
+    return BYTES_PER_ATOM[settings["format"]]
+
+
+def _fsync_path(path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# ------------------------------------------------------------
+# Sinks: open(simulation, topology) -> (atoms, has_box);
+#        write(pos_nm, box_nm, step)
+# ------------------------------------------------------------
+def _cord_block(first_step: int, interval: int, dt: float) -> bytes:
+    """First 48 header bytes: frame count is patched in as frames are written."""
+    return struct.pack("<i4s9if", 84, b"CORD", 0, first_step, interval, *[0] * 6, dt)
+
+
+def _dcd_header(natoms: int, first_step: int, interval: int, dt: float, box: bool):
+    """The header OpenMM's DCDFile writes (dt in AKMA units)."""
+    head = _cord_block(first_step, interval, dt)
+    head += struct.pack("<13i", int(box), 0, 0, 0, 0, 0, 0, 0, 0, 24, 84, 164, 2)
+    head += struct.pack("<80s", b"Created by OpenMM")
+    head += struct.pack("<80s", b"Created " + time.asctime().encode("ascii"))
+    head += struct.pack("<4i", 164, 4, natoms, 4)
+    return head
+
+
+def _cell(vectors):
+    """Box vectors (nm) -> lengths (nm) and angles alpha, beta, gamma (deg)."""
+    import numpy as np
+
+    a, b, c = (np.asarray(v, dtype=float) for v in vectors)
+    la, lb, lc = (float(np.linalg.norm(v)) for v in (a, b, c))
+    cos = (
+        float(b @ c) / (lb * lc),
+        float(a @ c) / (la * lc),
+        float(a @ b) / (la * lb),
+    )
+    return (la, lb, lc), tuple(math.degrees(math.acos(x)) for x in cos), cos
+
+
+class _DCDSink:
+    def __init__(self, path, interval: int, append: bool, precision=None):
+        self.path, self.interval, self.append = str(path), int(interval), append
+        self._file = None
+
+    def open(self, simulation, topology):
+        from openmm import unit
+
+        natoms = topology.getNumAtoms()
+        self._has_box = topology.getPeriodicBoxVectors() is not None
+        if self.append:
+            f = self._file = open(self.path, "r+b")
+            f.seek(8)
+            self._nset, self._first, self._interval = struct.unpack("<3i", f.read(12))
+            f.seek(44)
+            self._dt = struct.unpack("<f", f.read(4))[0]
+            f.seek(268)
+            if struct.unpack("<i", f.read(4))[0] != natoms:
+                raise ValueError(
+                    f"Cannot append to {self.path}: different number of atoms"
+                )
+        else:
+            dt = simulation.integrator.getStepSize().value_in_unit(unit.picoseconds)
+            self._nset, self._first = 0, int(simulation.currentStep)
+            self._interval, self._dt = self.interval, dt / _AKMA_PS
+            self._file = open(self.path, "wb")
+            self._file.write(
+                _dcd_header(
+                    natoms, self._first, self._interval, self._dt, self._has_box
+                )
+            )
+        self._rowlen = struct.pack("<i", 4 * natoms)
+        return natoms, self._has_box
+
+    def write(self, pos, box, step) -> None:
+        import numpy as np
+
+        f = self._file
+        self._nset += 1
+        if self._interval > 1 and self._first + self._nset * self._interval > 1 << 31:
+            # Keep step counts inside int32 the way DCDFile does
+            self._first //= self._interval
+            self._dt *= self._interval
+            self._interval = 1
+            f.seek(0)
+            f.write(_cord_block(self._first, 1, self._dt))
+        f.seek(8)
+        f.write(struct.pack("<i", self._nset))
+        f.seek(20)
+        f.write(struct.pack("<i", self._first + self._nset * self._interval))
+        f.seek(0, os.SEEK_END)
+        if self._has_box and box is not None:
+            (la, lb, lc), _, (cos_bc, cos_ac, cos_ab) = _cell(box)
+            f.write(
+                struct.pack(
+                    "<i6di", 48, 10 * la, cos_ab, 10 * lb, cos_ac, cos_bc, 10 * lc, 48
+                )
+            )
+        for row in np.ascontiguousarray((pos * 10.0).T, dtype="<f4"):  # A, per axis
+            f.write(self._rowlen)
+            f.write(row.data)
+            f.write(self._rowlen)
+
+    def sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _XTCSink:
+    def __init__(self, path, interval: int, append: bool, precision=None):
+        self.path, self.interval, self.append = str(path), int(interval), append
+        if precision is not None and not math.isclose(precision, XTC_PRECISION_NM):
+            logger.warning(
+                f"Trajectory: XTC is written at {XTC_PRECISION_NM} nm precision "
+                f"(requested {precision})"
+            )
+
+    def open(self, simulation, topology):
+        try:
+            from openmm.app.xtcfile import XTCFile
+        except ImportError:
+            raise ImportError(
+                "trajectory format xtc needs OpenMM >= 8.1. Upgrade with: "
+                "conda install -c conda-forge 'openmm>=8.1'"
+            )
+        self._xtc = XTCFile(
+            self.path,
+            topology,
+            simulation.integrator.getStepSize(),
+            simulation.currentStep,
+            self.interval,
+            self.append,
+        )
+        return topology.getNumAtoms(), topology.getPeriodicBoxVectors() is not None
+
+    def write(self, pos, box, step) -> None:
+        from openmm import unit
+
+        self._xtc.writeModel(
+            pos * unit.nanometer,
+            periodicBoxVectors=None if box is None else box * unit.nanometer,
+        )
+
+    def sync(self) -> None:
+        _fsync_path(self.path)
+
+    def close(self) -> None:
+        self._xtc = None
+
+
+def _mdtraj_topology(topology) -> str:
+    """OpenMM Topology as the JSON MDTraj stores in HDF5 trajectories."""
+    chains = []
+    for chain in topology.chains():
+        residues = []
+        for res in chain.residues():
+            try:
+                seq = int(res.id)
+            except (TypeError, ValueError):
+                seq = res.index + 1
+            atoms = [
+                {
+                    "index": a.index,
+                    "name": a.name,
+                    "element": a.element.symbol if a.element is not None else "VS",
+                }
+                for a in res.atoms()
+            ]
+            residues.append(
+                {
+                    "index": res.index,
+                    "name": res.name,
+                    "resSeq": seq,
+                    "segmentID": "",
+                    "atoms": atoms,
+                }
+            )
+        chains.append(
+            {"index": chain.index, "chain_id": chain.id, "residues": residues}
+        )
+    bonds = [[a.index, b.index] for a, b in topology.bonds()]
+    return json.dumps({"chains": chains, "bonds": bonds})
+
+
+class _HDF5Sink:
+    CHUNK_BYTES = 1 << 20
+
+    def __init__(self, path, interval: int, append: bool, precision=None):
+        self.path, self.interval, self.append = str(path), int(interval), append
+        self.precision = precision
+        self._h5 = None
+
+    def open(self, simulation, topology):
+        try:
+            import h5py
+            import numpy as np
+        except ImportError:
+            raise ImportError(
+                "trajectory format hdf5 needs h5py. Install with: "
+                "conda install -c conda-forge h5py"
+            )
+        from openmm import unit
+
+        top = topology
+        natoms = top.getNumAtoms()
+        has_box = top.getPeriodicBoxVectors() is not None
+        self._dt = simulation.integrator.getStepSize().value_in_unit(unit.picoseconds)
+        if self.append and Path(self.path).exists():
+            h5 = self._h5 = h5py.File(self.path, "a")
+            if h5["coordinates"].shape[1] != natoms:
+                raise ValueError(
+                    f"Cannot append to {self.path}: different number of atoms"
+                )
+            return natoms, has_box
+
+        h5 = self._h5 = h5py.File(self.path, "w")
+        h5.attrs.update(
+            {
+                "conventions": "Pande",
+                "conventionVersion": "1.1",
+                "program": "FastMDSimulation",
+                "programVersion": "0.1.0",
+                "application": "OpenMM",
+                "title": Path(self.path).parent.name,
+            }
+        )
+        h5.create_dataset(
+            "topology", data=np.array([_mdtraj_topology(top).encode("utf-8")])
+        )
+        frames = max(1, self.CHUNK_BYTES // (natoms * 12))
+        coords = {"compression": "gzip", "compression_opts": 4}
+        if self.precision:
+            # lossy: keep digits down to `precision` nm, then deflate
+            coords["scaleoffset"] = max(0, math.ceil(-math.log10(self.precision)))
+        else:
+            coords["shuffle"] = True
+        shapes = {
+            "coordinates": ((natoms, 3), "nanometers", coords),
+            "time": ((), "picoseconds", {}),
+        }
+        if has_box:
+            shapes["cell_lengths"] = ((3,), "nanometers", {})
+            shapes["cell_angles"] = ((3,), "degrees", {})
+        for name, (shape, units, extra) in shapes.items():
+            ds = h5.create_dataset(
+                name,
+                shape=(0, *shape),
+                maxshape=(None, *shape),
+                chunks=(frames, *shape),
+                dtype="f4",
+                **extra,
+            )
+            ds.attrs["units"] = units
+        return natoms, has_box
+
+    def write(self, pos, box, step) -> None:
+        h5 = self._h5
+        n = h5["coordinates"].shape[0]
+        values = {"coordinates": pos, "time": step * self._dt}
+        if box is not None and "cell_lengths" in h5:
+            lengths, angles, _ = _cell(box)
+            values.update(cell_lengths=lengths, cell_angles=angles)
+        for name, value in values.items():
+            h5[name].resize(n + 1, axis=0)
+            h5[name][n] = value
+
+    def sync(self) -> None:
+        self._h5.flush()
+        _fsync_path(self.path)
+
+    def close(self) -> None:
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
+
+
+_SINKS = {"dcd": _DCDSink, "xtc": _XTCSink, "hdf5": _HDF5Sink}
+
+
+# ------------------------------------------------------------
+# Reporters
+# ------------------------------------------------------------
+class TrajectoryReporter:
+    """
+    OpenMM reporter writing every `reportInterval` steps to a sink, for all
+    atoms or the sorted indices in `atomSubset`.
+    """
+
+    def __init__(
+        self, sink, reportInterval: int, enforcePeriodicBox=None, atomSubset=None
+    ):
+        self._sink = sink
+        self._interval = int(reportInterval)
+        self._periodic = enforcePeriodicBox
+        self._subset = sorted(atomSubset) if atomSubset is not None else None
+        self._opened = False
+        self._closing = False
+
+    def describeNextReport(self, simulation):
+        steps = self._interval - simulation.currentStep % self._interval
+        return (steps, True, False, False, False, self._periodic)
+
+    def _frame(self, state):
+        from openmm import unit
+
+        pos = state.getPositions(asNumpy=True).value_in_unit(unit.nanometer)
+        if self._subset is not None:
+            pos = pos[self._subset]
+        box = None
+        if self._has_box:
+            box = state.getPeriodicBoxVectors(asNumpy=True).value_in_unit(
+                unit.nanometer
+            )
+        return pos, box
+
+    def _open(self, simulation) -> None:
+        topology = simulation.topology
+        if self._subset is not None:
+            from .atom_selection import subset_topology
+
+            topology = subset_topology(topology, self._subset)
+        self._atoms, self._has_box = self._sink.open(simulation, topology)
+        self._opened = True
+
+    def report(self, simulation, state):
+        import numpy as np
+
+        if self._closing:
+            raise RuntimeError(f"Trajectory writer for {self._sink.path} is closed")
+        if not self._opened:
+            self._open(simulation)
+        pos, box = self._frame(state)
+        if not np.isfinite(pos).all():
+            raise ValueError("Particle position is NaN or infinite")
+        self._sink.write(pos, box, simulation.currentStep)
+
+    def drain(self) -> None:
+        """Make every reported frame durable on disk."""
+        if self._opened and not self._closing:
+            self._sink.sync()
+
+    def close(self) -> None:
+        if self._opened and not self._closing:
+            self._sink.close()
+        self._closing = True
+
+
+class AsyncTrajectoryReporter(TrajectoryReporter):
+    """
+    TrajectoryReporter that hands frames to a writer thread through a ring of
+    `buffer_frames` preallocated float32 slots.
+    """
+
+    def __init__(
+        self,
+        sink,
+        reportInterval: int,
+        buffer_frames: int = 4,
+        fsync_every: int = 16,
+        enforcePeriodicBox=None,
+        atomSubset=None,
+    ):
+        super().__init__(sink, reportInterval, enforcePeriodicBox, atomSubset)
+        self._slots = max(1, int(buffer_frames))
+        self._fsync_every = max(0, int(fsync_every))
+        self._cond = threading.Condition(threading.RLock())
+        self._head = self._tail = 0  # frames queued / written
+        self._error: BaseException | None = None
+        self._thread: threading.Thread | None = None
+        self._unsynced = 0
+        self._fsyncs = 0
+        self._stalled = 0.0
+
+    def report(self, simulation, state):
+        if self._closing:
+            raise RuntimeError(f"Trajectory writer for {self._sink.path} is closed")
+        if self._thread is None:
+            self._open(simulation)
+        with self._cond:
+            if self._head - self._tail >= self._slots:
+                t0 = time.perf_counter()
+                while self._head - self._tail >= self._slots and self._error is None:
+                    self._cond.wait()  # back-pressure: writer is a full ring behind
+                self._stalled += time.perf_counter() - t0
+            self._raise()
+        i = self._head % self._slots
+        pos, box = self._frame(state)
+        self._pos[i] = pos
+        if box is not None:
+            self._box[i] = box
+        self._steps[i] = simulation.currentStep
+        with self._cond:
+            self._head += 1
+            self._cond.notify_all()
+
+    def _open(self, simulation) -> None:
+        import numpy as np
+
+        super()._open(simulation)
+        self._pos = np.empty((self._slots, self._atoms, 3), dtype="f4")
+        self._box = np.empty((self._slots, 3, 3)) if self._has_box else None
+        self._steps = np.zeros(self._slots, dtype=np.int64)
+        logger.debug(
+            f"Trajectory: async writer for {self._sink.path} "
+            f"({self._slots} x {self._pos[0].nbytes / 1024**2:.1f} MB buffer)"
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="fastmds-traj-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        import numpy as np
+
+        while True:
+            with self._cond:
+                while self._tail == self._head and not self._closing:
+                    self._cond.wait()
+                if self._tail == self._head:
+                    return
+                i = self._tail % self._slots
+            try:
+                if not np.isfinite(self._pos[i]).all():
+                    raise ValueError("Particle position is NaN or infinite")
+                box = self._box[i] if self._box is not None else None
+                self._sink.write(self._pos[i], box, int(self._steps[i]))
+                self._unsynced += 1
+                if self._fsync_every and self._unsynced >= self._fsync_every:
+                    self._sync()
+            except BaseException as e:  # surfaced in the simulation thread
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._tail += 1
+                self._cond.notify_all()
+
+    def _sync(self) -> None:
+        self._sink.sync()
+        self._unsynced = 0
+        self._fsyncs += 1
+
+    def _raise(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(
+                f"Trajectory writer failed: {self._error}"
+            ) from self._error
+
+    def drain(self) -> None:
+        """Block until every queued frame is written and synced to disk."""
+        if self._thread is None:
+            return
+        with self._cond:
+            while self._tail < self._head and self._error is None:
+                self._cond.wait()
+            self._raise()
+            if self._unsynced:
+                self._sync()
+
+    def close(self) -> None:
+        """Write out the buffer, stop the thread and close the file."""
+        if self._thread is None or self._closing:
+            self._closing = True
+            return
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+        try:
+            if self._error is None:
+                self._sync()
+        finally:
+            self._sink.close()
+        logger.info(
+            f"Trajectory: {self._tail} frame(s) written asynchronously "
+            f"({self._fsyncs} fsync(s), integrator waited {self._stalled:.2f}s "
+            f"on a full buffer)"
+        )
+        self._raise()
+
+
+def trajectory_reporter(
+    path,
+    settings: Dict[str, Any],
+    interval: int,
+    append: bool = False,
+    atom_subset: Sequence[int] | None = None,
+) -> TrajectoryReporter:
+    """Reporter writing `path` in the configured format, async if asked."""
+    sink = _SINKS[settings["format"]](path, interval, append, settings["precision"])
+    if settings["async"]:
+        return AsyncTrajectoryReporter(
+            sink,
+            interval,
+            buffer_frames=settings["buffer_frames"],
+            fsync_every=settings["fsync_every"],
+            atomSubset=atom_subset,
+        )
+    return TrajectoryReporter(sink, interval, atomSubset=atom_subset)
+
+
+class CheckpointBarrier:
+    """Wrap a checkpoint reporter so trajectories are on disk before state.chk."""
+
+    def __init__(self, reporter, writers: Sequence[TrajectoryReporter]):
+        self._reporter = reporter
+        self._writers = list(writers)
+
+    def describeNextReport(self, simulation):
+        return self._reporter.describeNextReport(simulation)
+
+    def report(self, simulation, state):
+        for writer in self._writers:
+            writer.drain()
+        self._reporter.report(simulation, state)
+
+
+def _close_all(writers: Sequence[TrajectoryReporter]) -> None:
+    """Close every writer; the first error is raised after all are closed."""
+    error = None
+    for writer in writers:
+        try:
+            writer.close()
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise error
+
+
+@contextlib.contextmanager
+def flushing(writers: Sequence[TrajectoryReporter]):
+    """
+    Close `writers` when the block ends, also on errors and KeyboardInterrupt.
+    A SIGTERM flushes their buffers, then gets the previous handler (by
+    default the process still dies of the signal). Python runs the handler
+    between reporter calls, so the flush happens at the next report.
+    """
+    if not writers:
+        yield
+        return
+    previous = None
+    if threading.current_thread() is threading.main_thread():
+        previous = signal.getsignal(signal.SIGTERM)
+        if previous in (signal.SIG_IGN, None):
+            previous = None
+        else:
+
+            def _on_term(signum, frame):
+                logger.warning("Trajectory: SIGTERM, flushing buffered frames")
+                with contextlib.suppress(Exception):
+                    _close_all(writers)
+                signal.signal(signum, previous)
+                if callable(previous):
+                    previous(signum, frame)
+                else:
+                    os.kill(os.getpid(), signum)
+
+            signal.signal(signal.SIGTERM, _on_term)
+    try:
+        yield
+    finally:
+        if previous is not None:
+            signal.signal(signal.SIGTERM, previous)
+        _close_all(writers)
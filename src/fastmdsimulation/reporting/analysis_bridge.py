@@ -1,27 +1,75 @@
 # FastMDSimulation/src/fastmdsimulation/reporting/analysis_bridge.py
 
 import importlib.util
+import re
 import subprocess
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..utils.logging import get_logger
 
+# Trajectory files run_stage writes (engines.trajectory), by `trajectory.format`
+TRAJECTORY_NAMES = {"dcd": "traj.dcd", "xtc": "traj.xtc", "hdf5": "traj.h5"}
+
+
+def find_trajectory(stage_dir: Path) -> Optional[Path]:
+    """The trajectory a stage wrote; the newest one if the format changed."""
+    found = [
+        stage_dir / n for n in TRAJECTORY_NAMES.values() if (stage_dir / n).is_file()
+    ]
+    return max(found, key=lambda p: p.stat().st_mtime) if found else None
+
+
+def planned_trajectory(
+    stage_dir: Path, stage: Dict[str, Any], defaults: Dict[str, Any]
+) -> Path:
+    """The trajectory a stage will write, from its `trajectory.format`."""
+    cfg = {**(defaults.get("trajectory") or {}), **(stage.get("trajectory") or {})}
+    fmt = str(cfg.get("format", "dcd")).lower()
+    return stage_dir / TRAJECTORY_NAMES.get({"h5": "hdf5"}.get(fmt, fmt), "traj.dcd")
+
 
 def _get_production_stage(run_dir: Path) -> Optional[Path]:
     prod = run_dir / "production"
-    traj, top = prod / "traj.dcd", prod / "topology.pdb"
-    if prod.is_dir() and traj.exists() and top.exists():
+    if prod.is_dir() and (prod / "topology.pdb").exists() and find_trajectory(prod):
         return prod
     return None
 
 
+def _is_replica_dir(path: Path) -> bool:
+    return re.fullmatch(r"rep\d+", path.name) is not None
+
+
+def run_label(run_dir: str | Path) -> str:
+    """`<run>` or, for a replica directory, `<run>/rep<k>`."""
+    run_dir = Path(run_dir)
+    if _is_replica_dir(run_dir):
+        return f"{run_dir.parent.name}/{run_dir.name}"
+    return run_dir.name
+
+
+def production_stages(run_dir: Path) -> List[Tuple[Path, str]]:
+    """
+    (production dir, log label) for each analyzable production of a run:
+    <run>/production, and <run>/rep<k>/production for runs with `replicas`.
+    """
+    reps = [p for p in run_dir.glob("rep*") if _is_replica_dir(p)]
+    out = []
+    for d in [run_dir] + sorted(reps, key=lambda p: int(p.name[3:])):
+        prod = _get_production_stage(d)
+        if prod:
+            out.append((prod, run_label(d)))
+    return out
+
+
 def iter_runs_with_production(project_dir: Path):
+    """(run or replica dir, production dir, trajectory, topology) per production."""
     for run in sorted([p for p in project_dir.iterdir() if p.is_dir()]):
-        prod = _get_production_stage(run)
-        if prod:
-            yield run, prod, prod / "traj.dcd", prod / "topology.pdb"
+        for prod, _ in production_stages(run):
+            yield prod.parent, prod, find_trajectory(prod), prod / "topology.pdb"
 
 
 def build_analyze_cmd(
@@ -64,60 +112,162 @@ def _run_and_stream(cmd: list[str], logger, prefix: str = "[fastmda] ") -> int:
     return proc.wait()
 
 
+class _Launcher:
+    """
+    Resolves the analysis command once per batch of analyses: `fastmda` first,
+    then `python -m fastmdanalysis`. The first one that succeeds is used for
+    every later run; one that cannot be started (exit 127) is not tried again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._working: Optional[List[str]] = None
+        self._unavailable: List[List[str]] = []
+
+    def candidates(self) -> List[List[str]]:
+        with self._lock:
+            if self._working is not None:
+                return [self._working]
+            return [
+                c
+                for c in (["fastmda"], [sys.executable, "-m", "fastmdanalysis"])
+                if c not in self._unavailable
+            ]
+
+    def record(self, prefix: List[str], rc: int) -> None:
+        with self._lock:
+            if rc == 0 and self._working is None:
+                self._working = prefix
+            elif rc == 127 and prefix not in self._unavailable:
+                self._unavailable.append(prefix)
+
+
+def _analyze_one(
+    run_dir: Path,
+    traj: Path,
+    top: Path,
+    logger,
+    *,
+    slides: bool,
+    frames: str | None,
+    atoms: str | None,
+    launcher: Optional[_Launcher] = None,
+) -> bool:
+    """Analyze one production trajectory with the first analysis command that works."""
+    launcher = launcher or _Launcher()
+    label = run_label(run_dir)
+    args = build_analyze_cmd(traj, top, slides=slides, frames=frames, atoms=atoms)[1:]
+    prefix = f"[fastmda:{label}] "
+    rc = 127
+    for i, launch in enumerate(launcher.candidates()):
+        cmd = launch + args
+        what = "run analysis: " if i == 0 else "run analysis fallback: "
+        logger.info(what + " ".join(cmd))
+        rc = _run_and_stream(cmd, logger, prefix=prefix)
+        launcher.record(launch, rc)
+        if rc == 0:
+            return True
+    logger.error(f"analysis failed for {label}: exit {rc}")
+    return False
+
+
 def analyze_with_bridge(
     project_dir: str,
     *,
     slides: bool = True,
     frames: str | None = None,
     atoms: str | None = None,
-) -> bool:
+    workers: int = 1,
+) -> Dict[str, str]:
+    """
+    Analyze every run with a production stage, up to `workers` at a time.
+    Returns {run_dir: "ok" | "failed"} (empty if nothing could be analyzed).
+    A map of failures is still truthy: test `"ok" in status.values()`.
+    """
     logger = get_logger("analysis")
     root = Path(project_dir)
     if not root.exists():
         logger.error(f"project dir not found: {root}")
-        return False
+        return {}
 
     if importlib.util.find_spec("fastmdanalysis") is None:
         logger.warning("FastMDAnalysis not installed. Install it or omit --analyze.")
-        return False
+        return {}
 
-    ok = False
-    for run_dir, prod, traj, top in iter_runs_with_production(root):
-        cmd = build_analyze_cmd(traj, top, slides=slides, frames=frames, atoms=atoms)
-        logger.info("run analysis: " + " ".join(cmd))
+    pool = AnalysisPool(workers, slides=slides, frames=frames, atoms=atoms)
+    for run_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        pool.submit(run_dir)
+    status = pool.join()
 
-        rc = _run_and_stream(cmd, logger, prefix="[fastmda] ")
-        if rc == 0:
-            ok = True
-            continue  # next run
-
-        # Fallback: python -m fastmdanalysis
-        pycmd = [
-            sys.executable,
-            "-m",
-            "fastmdanalysis",
-            "analyze",
-            "-traj",
-            str(traj),
-            "-top",
-            str(top),
-        ]
-        if slides:
-            pycmd.append("--slides")
-        if frames:
-            pycmd += ["--frames", str(frames)]
-        if atoms:
-            pycmd += ["--atoms", str(atoms)]
-        logger.info("run analysis fallback: " + " ".join(pycmd))
-
-        rc2 = _run_and_stream(pycmd, logger, prefix="[fastmda] ")
-        if rc2 == 0:
-            ok = True
-        else:
-            logger.error(f"analysis failed for {run_dir.name}: exit {rc2}")
-
-    if not ok:
+    if "ok" not in status.values():
         logger.warning(
             "no production stages found or analysis failed; skipping analysis."
         )
-    return ok
+    n_ok = sum(1 for v in status.values() if v == "ok")
+    if status:
+        logger.info(f"analysis: {n_ok}/{len(status)} run(s) ok")
+    return status
+
+
+class AnalysisPool:
+    """
+    FastMDAnalysis jobs for finished runs on up to `workers` background
+    threads (each job is a subprocess). Used by analyze_with_bridge and by
+    analyze-as-you-go, where runs are submitted as they finish. A run with
+    replicas queues one job per rep<k>. join() waits for every submitted job
+    and returns {run_dir (or run_dir/rep<k>): "ok" | "failed"}.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        *,
+        slides: bool = True,
+        frames: str | None = None,
+        atoms: str | None = None,
+    ):
+        self.logger = get_logger("analysis")
+        self.options = {"slides": slides, "frames": frames, "atoms": atoms}
+        self.launcher = _Launcher()
+        self.futures: Dict[str, Future] = {}
+        self.pool: ThreadPoolExecutor | None = None
+        if importlib.util.find_spec("fastmdanalysis") is None:
+            self.logger.warning(
+                "FastMDAnalysis not installed. Install it or omit --analyze."
+            )
+            return
+        self.pool = ThreadPoolExecutor(
+            max_workers=max(1, int(workers)), thread_name_prefix="fastmda"
+        )
+
+    def submit(self, run_dir: str | Path) -> None:
+        """Queue the analysis of a finished run (runs without production are skipped)."""
+        if self.pool is None:
+            return
+        for prod, label in production_stages(Path(run_dir)):
+            key = str(prod.parent)
+            if key in self.futures:
+                continue
+            self.logger.info(f"queue analysis: {label}")
+            self.futures[key] = self.pool.submit(
+                _analyze_one,
+                prod.parent,
+                find_trajectory(prod),
+                prod / "topology.pdb",
+                self.logger,
+                launcher=self.launcher,
+                **self.options,
+            )
+
+    def join(self) -> Dict[str, str]:
+        if self.pool is None:
+            return {}
+        self.pool.shutdown(wait=True)
+        status = {}
+        for run_dir, fut in self.futures.items():
+            try:
+                status[run_dir] = "ok" if fut.result() else "failed"
+            except Exception as e:
+                self.logger.error(f"analysis failed for {run_label(run_dir)}: {e}")
+                status[run_dir] = "failed"
+        return status
@@ -0,0 +1,61 @@
+# FastMDSimulation/src/fastmdsimulation/utils/benchmarks.py
+
+"""
+Per-host record of finished stages' throughput.
+
+engines.openmm_engine.run_stage adds one entry per MD stage to
+<cache root>/benchmarks/<hostname>.json (by platform name, the most recent
+MAX_BENCHMARKS kept); core.estimate reads them for its ns/day model.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .cache import cache_dir, cache_enabled
+from .filelock import FileLock
+
+MIN_BENCHMARK_WALL_S = 10.0  # shorter stages are dominated by start-up
+MAX_BENCHMARKS = 50  # kept per platform and host
+
+
+def benchmark_file() -> Path:
+    return cache_dir("benchmarks") / f"{socket.gethostname()}.json"
+
+
+def load_benchmarks() -> Dict[str, List[Dict[str, Any]]]:
+    """Recorded stage benchmarks of this host, by platform name."""
+    try:
+        return json.loads(benchmark_file().read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def record_benchmark(
+    platform: str, atoms: int, steps: int, wall_s: float, timestep_fs: float
+) -> None:
+    """Add one finished stage's throughput to this host's benchmarks."""
+    if not cache_enabled() or wall_s < MIN_BENCHMARK_WALL_S or steps <= 0:
+        return
+    ns_per_day = steps * timestep_fs * 1e-6 / wall_s * 86400.0
+    path = benchmark_file()
+    with FileLock(path.with_suffix(".lock")):
+        data = load_benchmarks()
+        entries = data.setdefault(platform, [])
+        entries.append(
+            {
+                "atoms": int(atoms),
+                "timestep_fs": float(timestep_fs),
+                "ns_per_day": round(ns_per_day, 3),
+                "time": int(time.time()),
+            }
+        )
+        data[platform] = entries[-MAX_BENCHMARKS:]
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2))
+        os.replace(tmp, path)
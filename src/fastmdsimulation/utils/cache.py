@@ -0,0 +1,134 @@
+# FastMDSimulation/src/fastmdsimulation/utils/cache.py
+
+"""
+Persistent, content-addressed on-disk caches.
+
+Entries live under a per-kind directory of the cache root:
+  - $FASTMDS_CACHE_DIR, else $XDG_CACHE_HOME/fastmdsimulation, else
+    ~/.cache/fastmdsimulation
+Set FASTMDS_CACHE=0 (or off/false/no) to bypass all caches. Size-bounded
+kinds are pruned least-recently-used first (see evict_lru).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+try:
+    from importlib import metadata as importlib_metadata
+except Exception:
+    import importlib_metadata  # type: ignore
+
+
+def cache_enabled() -> bool:
+    val = os.getenv("FASTMDS_CACHE", "").strip().lower()
+    return val not in ("0", "off", "false", "no")
+
+
+def cache_root() -> Path:
+    env = os.getenv("FASTMDS_CACHE_DIR")
+    if env:
+        return Path(env).expanduser()
+    xdg = os.getenv("XDG_CACHE_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "fastmdsimulation"
+
+
+def cache_dir(kind: str) -> Path:
+    """Return (and create) the directory holding entries of one cache kind."""
+    d = cache_root() / kind
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(8192), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_key(payload: Dict[str, Any]) -> str:
+    """Stable sha256 of a JSON-able description of everything an entry depends on."""
+    blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def package_version(name: str) -> str:
+    try:
+        return importlib_metadata.version(name)
+    except Exception:
+        return "n/a"
+
+
+def link_or_copy(src: Path, dst: Path) -> str:
+    """Materialize a cache entry at dst: hard link when possible, else copy."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+        return "linked"
+    except OSError:
+        shutil.copy2(src, dst)
+        return "copied"
+
+
+def store_atomic(src: Path, dst: Path) -> None:
+    """Copy src into the cache as dst without exposing a half-written entry."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _entry_size(path: Path) -> int:
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    return path.stat().st_size
+
+
+def touch(path: Path) -> None:
+    """Mark a cache entry as recently used."""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def evict_lru(directory: Path, max_bytes: int, keep: Iterable[Path] = ()) -> List[Path]:
+    """
+    Remove the least recently used entries (files or entry directories, by
+    mtime) of `directory` until it holds at most `max_bytes`.
+    Hidden names (in-flight temporaries, locks) are neither counted nor removed.
+    Returns the removed entries.
+    """
+    keep = {Path(p) for p in keep}
+    entries = []
+    for p in directory.iterdir():
+        if p.name.startswith("."):
+            continue
+        try:
+            entries.append((p.stat().st_mtime, p, _entry_size(p)))
+        except OSError:
+            continue  # removed concurrently
+    total = sum(size for _, _, size in entries)
+    removed: List[Path] = []
+    for _, p, size in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if p in keep:
+            continue
+        if p.is_dir():
+            shutil.rmtree(p, ignore_errors=True)
+        else:
+            p.unlink(missing_ok=True)
+        total -= size
+        removed.append(p)
+    return removed
@@ -0,0 +1,163 @@
+# FastMDSimulation/src/fastmdsimulation/utils/cpuset.py
+
+"""
+CPU budget, NUMA topology and disjoint core sets for CPU-platform runs.
+
+OpenMM's CPU platform defaults to every core of the machine, so processes
+sharing a node oversubscribe it. The budget of a process is
+SLURM_CPUS_PER_TASK (capped by the affinity mask) or else its affinity mask;
+`partition` splits that budget into disjoint per-worker core sets, each on a
+single NUMA node when it fits, for the executor to pin its workers to.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from .logging import get_logger
+
+logger = get_logger("cpuset")
+
+_NODE_DIR = Path("/sys/devices/system/node")
+
+
+def parse_cpulist(text: str) -> List[int]:
+    """'0-3,8,10-11' -> [0, 1, 2, 3, 8, 10, 11]."""
+    cpus: List[int] = []
+    for part in str(text).replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.extend(range(int(lo), int(hi) + 1))
+        else:
+            cpus.append(int(part))
+    return sorted(set(cpus))
+
+
+def format_cpulist(cpus: Sequence[int]) -> str:
+    """[0, 1, 2, 3, 8] -> '0-3,8'."""
+    out, cpus = [], sorted(set(cpus))
+    i = 0
+    while i < len(cpus):
+        j = i
+        while j + 1 < len(cpus) and cpus[j + 1] == cpus[j] + 1:
+            j += 1
+        out.append(str(cpus[i]) if i == j else f"{cpus[i]}-{cpus[j]}")
+        i = j + 1
+    return ",".join(out)
+
+
+def affinity() -> List[int]:
+    """CPUs this process may run on (all CPUs where there is no affinity API)."""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return list(range(os.cpu_count() or 1))
+
+
+def available_cpus() -> List[int]:
+    """The affinity mask, trimmed to SLURM_CPUS_PER_TASK when that is smaller."""
+    cpus = affinity()
+    try:
+        per_task = int(os.getenv("SLURM_CPUS_PER_TASK", "0"))
+    except ValueError:
+        per_task = 0
+    if 0 < per_task < len(cpus):
+        cpus = cpus[:per_task]
+    return cpus
+
+
+def cpu_budget() -> int:
+    """Threads a single CPU-platform run of this process should use."""
+    return len(available_cpus())
+
+
+def numa_nodes(cpus: Sequence[int] | None = None) -> Dict[int, List[int]]:
+    """{NUMA node: its CPUs among `cpus`}; one node 0 when sysfs has no topology."""
+    cpus = list(available_cpus() if cpus is None else cpus)
+    wanted = set(cpus)
+    nodes: Dict[int, List[int]] = {}
+    try:
+        for d in sorted(_NODE_DIR.glob("node[0-9]*")):
+            mine = [
+                c for c in parse_cpulist((d / "cpulist").read_text()) if c in wanted
+            ]
+            if mine:
+                nodes[int(d.name[4:])] = mine
+    except (OSError, ValueError):
+        nodes = {}
+    placed = {c for v in nodes.values() for c in v}
+    if not nodes or placed != wanted:
+        return {0: sorted(wanted)}
+    return nodes
+
+
+def node_of(cpus: Sequence[int]) -> List[int]:
+    """NUMA nodes a core set touches."""
+    wanted = set(cpus)
+    return [n for n, v in numa_nodes(affinity()).items() if wanted & set(v)]
+
+
+def partition(workers: int, threads: int | None = None) -> List[List[int]]:
+    """
+    Disjoint core sets for `workers` concurrent runs, `threads` cores each
+    (default: the budget split evenly). Sets are carved from one NUMA node
+    where they fit and handed out round-robin over nodes to spread memory
+    bandwidth. If the budget is too small for disjoint sets, sets wrap around
+    (and overlap) with a warning.
+    """
+    cpus = available_cpus()
+    workers = max(1, int(workers))
+    size = max(1, int(threads) if threads else len(cpus) // workers)
+
+    per_node: List[List[List[int]]] = []
+    leftover: List[int] = []
+    for node_cpus in numa_nodes(cpus).values():
+        chunks = [node_cpus[i : i + size] for i in range(0, len(node_cpus), size)]
+        if chunks and len(chunks[-1]) < size:
+            leftover.extend(chunks.pop())
+        per_node.append(chunks)
+    # round-robin over nodes, then sets that must span nodes
+    sets: List[List[int]] = []
+    while any(per_node):
+        for chunks in per_node:
+            if chunks:
+                sets.append(chunks.pop(0))
+    leftover.sort()
+    sets += [leftover[i : i + size] for i in range(0, len(leftover) - size + 1, size)]
+
+    if len(sets) < workers:
+        logger.warning(
+            f"CPU: {workers} worker(s) x {size} thread(s) exceed the "
+            f"{len(cpus)} available CPU(s); core sets overlap"
+        )
+        ring = cpus * (workers * size // max(1, len(cpus)) + 1)
+        sets = [ring[i * size : (i + 1) * size] for i in range(workers)]
+    return [sorted(set(s)) for s in sets[:workers]]
+
+
+def pin(cpus: Sequence[int] | None) -> bool:
+    """Restrict this process (and the threads it starts) to `cpus`."""
+    if not cpus:
+        return False
+    try:
+        os.sched_setaffinity(0, set(cpus))
+        return True
+    except (AttributeError, OSError) as e:
+        logger.warning(f"CPU: could not pin to {format_cpulist(cpus)} ({e})")
+        return False
+
+
+def describe(cpus: Sequence[int] | None = None) -> str:
+    """'cpus 0-7 on NUMA node 0' for the current (or given) core set."""
+    cpus = affinity() if cpus is None else list(cpus)
+    nodes = node_of(cpus)
+    where = (
+        f"NUMA node {nodes[0]}"
+        if len(nodes) == 1
+        else f"NUMA nodes {format_cpulist(nodes)}"
+    )
+    return f"cpus {format_cpulist(cpus)} on {where}"
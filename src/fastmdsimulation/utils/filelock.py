@@ -0,0 +1,68 @@
+# FastMDSimulation/src/fastmdsimulation/utils/filelock.py
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+try:
+    import fcntl  # POSIX
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore
+    import msvcrt
+
+
+class FileLock:
+    """
+    Exclusive inter-process lock held on `path` for the duration of a `with`
+    block (flock on POSIX, msvcrt byte-range lock on Windows). The lock is
+    released by the OS if the holding process dies.
+    """
+
+    def __init__(self, path: str | Path, poll_s: float = 0.2):
+        self.path = Path(path)
+        self.poll_s = poll_s
+        self._fh = None
+
+    def acquire(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fh = open(self.path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            else:  # pragma: no cover - Windows
+                while True:
+                    try:
+                        fh.seek(0)
+                        msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        time.sleep(self.poll_s)
+        except BaseException:
+            fh.close()
+            raise
+        self._fh = fh
+
+    def release(self) -> None:
+        fh, self._fh = self._fh, None
+        if fh is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            fh.close()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        return f"FileLock({os.fspath(self.path)!r})"
@@ -164,6 +164,15 @@ def attach_file_logger(
     return base
 
 
+def detach_file_logger() -> None:
+    """Remove and close the per-project file logger, if one is attached."""
+    global _file_handler
+    if _file_handler is not None:
+        logging.getLogger("fastmds").removeHandler(_file_handler)
+        _file_handler.close()
+        _file_handler = None
+
+
 def get_logger(name: str | None = None) -> logging.Logger:
     """Get the package logger or a namespaced child (e.g., 'engine.openmm')."""
     base = logging.getLogger("fastmds")
@@ -109,6 +109,25 @@ class TestFastMDSimulationAnalysis:
             assert "Analysis failed" in caplog.text
             assert result == "/mock/project/dir"
 
+    def test_simulate_with_all_runs_failed(self, tmp_path, caplog):
+        """A status map of failures is truthy but still reported as a failure."""
+        pdb_file = tmp_path / "protein.pdb"
+        pdb_file.write_text(
+            "ATOM      1  N   ALA A   1       0.000   0.000   0.000  1.00  0.00           N\nEND"
+        )
+
+        with (
+            patch("fastmdsimulation.api.simulate_from_pdb") as mock_simulate,
+            patch(
+                "fastmdsimulation.reporting.analysis_bridge.analyze_with_bridge",
+                return_value={"/mock/project/dir/run1": "failed"},
+            ),
+        ):
+            mock_simulate.return_value = "/mock/project/dir"
+            FastMDSimulation(str(pdb_file), output="test_output").simulate(analyze=True)
+
+        assert "Analysis failed or found no production stages" in caplog.text
+
     def test_simulate_with_yaml_and_analysis(self, tmp_path):
         """Test simulation with YAML file and analysis."""
         yaml_file = tmp_path / "job.yml"
@@ -133,3 +152,33 @@ class TestFastMDSimulationAnalysis:
                 "/mock/project/dir", slides=False, frames="100", atoms="backbone"
             )
             assert result == "/mock/project/dir"
+
+    def test_simulate_yaml_analyze_as_you_go(self, tmp_path):
+        """Runs are handed to the analysis pool as they finish; the pool is joined."""
+        job = tmp_path / "job.yml"
+        job.write_text("project: p\n")
+
+        with (
+            patch("fastmdsimulation.api.run_from_yaml") as mock_run,
+            patch(
+                "fastmdsimulation.reporting.analysis_bridge.AnalysisPool"
+            ) as mock_pool_cls,
+            patch(
+                "fastmdsimulation.reporting.analysis_bridge.analyze_with_bridge"
+            ) as mock_analyze,
+        ):
+            mock_run.return_value = "/mock/project/dir"
+            pool = mock_pool_cls.return_value
+
+            api = FastMDSimulation(str(job), output="test_output")
+            result = api.simulate(analyze_as_you_go=True, analysis_workers=2)
+
+            mock_pool_cls.assert_called_once_with(
+                2, slides=True, frames=None, atoms=None
+            )
+            mock_run.assert_called_once_with(
+                str(job), "test_output", on_run_done=pool.submit
+            )
+            pool.join.assert_called_once()
+            mock_analyze.assert_not_called()
+            assert result == "/mock/project/dir"
@@ -0,0 +1,98 @@
+# tests/cli/test_cold_start.py
+
+"""
+Cold-start budget of the CLI: `fastmds -v` and `fastmds simulate --dry-run`
+run in a fresh interpreter, must not import the engines, OpenMM or PDBFixer,
+and must finish within FASTMDS_COLD_START_BUDGET_S seconds (default 2.0) on
+top of bare interpreter start-up.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import fastmdsimulation
+
+SRC = str(Path(fastmdsimulation.__file__).resolve().parents[1])
+BUDGET_S = float(os.getenv("FASTMDS_COLD_START_BUDGET_S", "2.0"))
+
+# Modules that only the simulate/analyze paths may load
+HEAVY = (
+    "openmm",
+    "pdbfixer",
+    "fastmdsimulation.core.orchestrator",
+    "fastmdsimulation.engines",
+    "fastmdsimulation.core.simulate",
+    "fastmdsimulation.api",
+)
+
+_PROBE = """
+import json, sys
+argv, heavy = json.loads(sys.argv[1]), json.loads(sys.argv[2])
+sys.argv = ["fastmds"] + argv
+from fastmdsimulation.cli import main
+try:
+    main()
+except SystemExit:
+    pass
+loaded = [m for m in sys.modules if any(m == h or m.startswith(h + ".") for h in heavy)]
+print("LOADED=" + json.dumps(sorted(loaded)))
+"""
+
+
+def _run(*code_args: str) -> tuple:
+    env = {**os.environ, "PYTHONPATH": SRC + os.pathsep + os.getenv("PYTHONPATH", "")}
+    t0 = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", *code_args],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+    return time.perf_counter() - t0, out
+
+
+def _best_of(n: int, *code_args: str) -> tuple:
+    runs = [_run(*code_args) for _ in range(n)]
+    return min(t for t, _ in runs), runs[-1][1]
+
+
+@pytest.fixture(scope="module")
+def baseline_s():
+    return _best_of(3, "pass")[0]
+
+
+@pytest.fixture
+def job(tmp_path):
+    path = tmp_path / "job.yml"
+    path.write_text(
+        "project: p\n"
+        "stages: [{name: production, steps: 1000}]\n"
+        "systems: [{id: a, pdb: a.pdb}]\n"
+        "sweep: {temperature_K: [300, 310]}\n"
+    )
+    return path
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [["-v"], ["simulate", "-s", "JOB", "--dry-run", "--analyze"]],
+    ids=["version", "dry-run"],
+)
+def test_cold_start_budget(argv, job, baseline_s):
+    argv = [str(job) if a == "JOB" else a for a in argv]
+    elapsed, out = _best_of(3, _PROBE, json.dumps(argv), json.dumps(HEAVY))
+    assert out.returncode == 0, out.stderr
+
+    loaded = json.loads(out.stdout.rsplit("LOADED=", 1)[1])
+    assert loaded == [], f"cold start imported {loaded}"
+    assert elapsed - baseline_s < BUDGET_S, (
+        f"`fastmds {' '.join(argv)}` took {elapsed - baseline_s:.2f} s "
+        f"over interpreter start-up (budget {BUDGET_S} s)"
+    )
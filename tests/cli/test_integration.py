@@ -128,7 +128,7 @@ class TestCLIIntegration:
     @patch("fastmdsimulation.cli.setup_console")
     @patch("fastmdsimulation.cli.run_from_yaml")
     @patch("fastmdsimulation.cli.attach_file_logger")
-    @patch("fastmdsimulation.cli.analyze_with_bridge")
+    @patch("fastmdsimulation.reporting.analysis_bridge.analyze_with_bridge")
     def test_cli_simulate_with_analysis_flags(
         self,
         mock_analyze,
@@ -141,7 +141,7 @@ class TestCLIIntegration:
     ):
         """Test simulation with analysis flags."""
         mock_run_yaml.return_value = str(tmp_path / "analysis_test" / "WaterBox")
-        mock_analyze.return_value = True
+        mock_analyze.return_value = {"/tmp/project/run1": "ok"}
 
         argv = [
             "fastmds",
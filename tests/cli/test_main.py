@@ -19,6 +19,13 @@ class TestCLIMain:
 
         mock_setup_console.assert_not_called()
 
+    @patch("importlib.metadata.version", return_value="1.2.3")
+    def test_version_needs_no_subcommand(self, mock_version, capsys):
+        with patch("sys.argv", ["fastmds", "-v"]), pytest.raises(SystemExit) as exc:
+            main()
+        assert exc.value.code == 0
+        assert capsys.readouterr().out.strip() == "1.2.3"
+
     @patch("fastmdsimulation.cli.setup_console")
     @patch("importlib.metadata.version")
     def test_main_version_exception(self, mock_version, mock_setup_console):
@@ -82,15 +89,39 @@ class TestCLIMain:
         finally:
             os.unlink(yaml_path)
 
+    @patch("fastmdsimulation.cli.setup_console")
+    def test_main_simulate_yaml_estimate(self, mock_setup_console, tmp_path, capsys):
+        gro = tmp_path / "s.gro"
+        gro.write_text("t\n20000\n")
+        job = tmp_path / "job.yml"
+        job.write_text(
+            "project: p\n"
+            "defaults: {platform: CPU, report_interval: 500}\n"
+            "stages: [{name: minimize, steps: 0}, {name: production, steps: 5000}]\n"
+            f"systems: [{{id: a, top: a.top, gro: {gro}}}, {{id: b, pdb: none.pdb}}]\n"
+        )
+        with patch(
+            "sys.argv",
+            ["fastmds", "simulate", "-s", str(job), "-o", str(tmp_path), "--estimate"],
+        ):
+            main()
+
+        out = capsys.readouterr().out
+        assert "=== DRY RUN (SYSTEMIC SIMULATION) ===" in out
+        assert "≈ atoms: 20,000 (gro)" in out
+        assert "traj: 2.3 MB" in out  # 10 frames x 20000 atoms x 12 B
+        assert "≈ atoms: unknown" in out
+        assert "Estimate: 2 run(s)" in out and "1 run(s) not estimated" in out
+
     @patch("fastmdsimulation.cli.setup_console")
     @patch("fastmdsimulation.cli.run_from_yaml")
     @patch("fastmdsimulation.cli.attach_file_logger")
-    @patch("fastmdsimulation.cli.analyze_with_bridge")
+    @patch("fastmdsimulation.reporting.analysis_bridge.analyze_with_bridge")
     def test_main_simulate_yaml_with_analysis(
         self, mock_analyze, mock_attach_logger, mock_run_yaml, mock_setup_console
     ):
         mock_run_yaml.return_value = "/tmp/project"
-        mock_analyze.return_value = True
+        mock_analyze.return_value = {"/tmp/project/run1": "ok"}
 
         with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
             f.write("test yaml")
@@ -113,24 +144,30 @@ class TestCLIMain:
     @patch("fastmdsimulation.cli.setup_console")
     @patch("fastmdsimulation.cli.run_from_yaml")
     @patch("fastmdsimulation.cli.attach_file_logger")
-    @patch("fastmdsimulation.cli.analyze_with_bridge")
+    @patch("fastmdsimulation.reporting.analysis_bridge.analyze_with_bridge")
     def test_main_simulate_yaml_analysis_failed(
         self, mock_analyze, mock_attach_logger, mock_run_yaml, mock_setup_console
     ):
         mock_run_yaml.return_value = "/tmp/project"
-        mock_analyze.return_value = False
+        mock_analyze.return_value = {"/tmp/project/run1": "failed"}
 
         with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
             f.write("test yaml")
             yaml_path = f.name
 
         try:
-            with patch(
-                "sys.argv", ["fastmds", "simulate", "--system", yaml_path, "--analyze"]
+            with (
+                patch(
+                    "sys.argv",
+                    ["fastmds", "simulate", "--system", yaml_path, "--analyze"],
+                ),
+                patch("builtins.print") as mock_print,
             ):
                 main()
 
             mock_analyze.assert_called_once()
+            printed = " ".join(str(c.args[0]) for c in mock_print.call_args_list)
+            assert "Analysis skipped or failed for: run1" in printed
         finally:
             os.unlink(yaml_path)
 
@@ -164,12 +201,12 @@ class TestCLIMain:
     @patch("fastmdsimulation.cli.setup_console")
     @patch("fastmdsimulation.cli.simulate_from_pdb")
     @patch("fastmdsimulation.cli.attach_file_logger")
-    @patch("fastmdsimulation.cli.analyze_with_bridge")
+    @patch("fastmdsimulation.reporting.analysis_bridge.analyze_with_bridge")
     def test_main_simulate_pdb_with_config_and_analysis(
         self, mock_analyze, mock_attach_logger, mock_simulate_pdb, mock_setup_console
     ):
         mock_simulate_pdb.return_value = "/tmp/project"
-        mock_analyze.return_value = True
+        mock_analyze.return_value = {"/tmp/project/run1": "ok"}
 
         with patch(
             "sys.argv",
@@ -265,3 +302,240 @@ class TestCLIMain:
                 mock_run.assert_called_once()
         finally:
             os.unlink(yaml_path)
+
+    @patch("fastmdsimulation.cli.setup_console")
+    @patch("fastmdsimulation.cli.run_from_yaml")
+    @patch("fastmdsimulation.cli.attach_file_logger")
+    def test_main_simulate_yaml_workers_and_resume(
+        self, mock_attach_logger, mock_run_yaml, mock_setup_console
+    ):
+        mock_run_yaml.return_value = "/tmp/project"
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            f.write("test yaml")
+            yaml_path = f.name
+
+        try:
+            with patch(
+                "sys.argv",
+                [
+                    "fastmds",
+                    "simulate",
+                    "--system",
+                    yaml_path,
+                    "--workers",
+                    "4",
+                    "--resume",
+                ],
+            ):
+                main()
+
+            mock_run_yaml.assert_called_once_with(
+                yaml_path, "simulate_output", workers=4, resume=True
+            )
+        finally:
+            os.unlink(yaml_path)
+
+    @patch("fastmdsimulation.cli.setup_console")
+    @patch("fastmdsimulation.cli.run_from_yaml")
+    @patch("fastmdsimulation.cli.attach_file_logger")
+    @patch("fastmdsimulation.reporting.analysis_bridge.analyze_with_bridge")
+    @patch("fastmdsimulation.reporting.analysis_bridge.AnalysisPool")
+    def test_main_simulate_yaml_analyze_as_you_go(
+        self,
+        mock_pool_cls,
+        mock_analyze,
+        mock_attach_logger,
+        mock_run_yaml,
+        mock_setup_console,
+    ):
+        pool = mock_pool_cls.return_value
+        pool.join.return_value = {"/tmp/project/a_T300": True}
+        mock_run_yaml.return_value = "/tmp/project"
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            f.write("test yaml")
+            yaml_path = f.name
+
+        try:
+            with patch(
+                "sys.argv",
+                [
+                    "fastmds",
+                    "simulate",
+                    "--system",
+                    yaml_path,
+                    "--analyze-as-you-go",
+                    "--analysis-workers",
+                    "3",
+                ],
+            ):
+                main()
+
+            mock_pool_cls.assert_called_once_with(
+                3, slides=True, frames=None, atoms=None
+            )
+            mock_run_yaml.assert_called_once_with(
+                yaml_path, "simulate_output", on_run_done=pool.submit
+            )
+            pool.join.assert_called_once()
+            mock_analyze.assert_not_called()
+        finally:
+            os.unlink(yaml_path)
+
+    @patch("fastmdsimulation.cli.setup_console")
+    @patch(
+        "fastmdsimulation.cli.run_from_yaml",
+        side_effect=RuntimeError("1 run(s) failed"),
+    )
+    @patch("fastmdsimulation.reporting.analysis_bridge.AnalysisPool")
+    def test_analyze_as_you_go_joins_on_failure(
+        self, mock_pool_cls, mock_run_yaml, mock_setup_console
+    ):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            f.write("test yaml")
+            yaml_path = f.name
+
+        try:
+            with patch(
+                "sys.argv",
+                ["fastmds", "simulate", "--system", yaml_path, "--analyze-as-you-go"],
+            ):
+                with pytest.raises(RuntimeError):
+                    main()
+            mock_pool_cls.return_value.join.assert_called_once()
+        finally:
+            os.unlink(yaml_path)
+
+    @patch("fastmdsimulation.cli.setup_console")
+    @patch("fastmdsimulation.cli.run_from_yaml")
+    @patch("fastmdsimulation.cli.attach_file_logger")
+    @patch("fastmdsimulation.reporting.analysis_bridge.analyze_with_bridge")
+    def test_analysis_workers_and_failed_runs_reported(
+        self,
+        mock_analyze,
+        mock_attach_logger,
+        mock_run_yaml,
+        mock_setup_console,
+        capsys,
+    ):
+        mock_run_yaml.return_value = "/tmp/project"
+        mock_analyze.return_value = {
+            "/tmp/project/a_T300": "ok",
+            "/tmp/project/b_T300": "failed",
+        }
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            f.write("test yaml")
+            yaml_path = f.name
+
+        try:
+            with patch(
+                "sys.argv",
+                [
+                    "fastmds",
+                    "simulate",
+                    "--system",
+                    yaml_path,
+                    "--analyze",
+                    "--analysis-workers",
+                    "4",
+                ],
+            ):
+                main()
+
+            mock_analyze.assert_called_once_with(
+                "/tmp/project", slides=True, frames=None, atoms=None, workers=4
+            )
+            assert "failed for: b_T300" in capsys.readouterr().out
+        finally:
+            os.unlink(yaml_path)
+
+    @patch("fastmdsimulation.cli.setup_console")
+    @patch("fastmdsimulation.cli.run_from_yaml")
+    def test_run_index_passed_as_slice(self, mock_run_yaml, mock_setup_console):
+        mock_run_yaml.return_value = "/tmp/project"
+        with patch(
+            "sys.argv",
+            ["fastmds", "simulate", "-s", "job.yml", "--run-index", "2:4", "--resume"],
+        ):
+            main()
+        mock_run_yaml.assert_called_once_with(
+            "job.yml", "simulate_output", resume=True, run_slice=(2, 4)
+        )
+
+    @patch("fastmdsimulation.cli.setup_console")
+    @patch("fastmdsimulation.core.submit.submit")
+    def test_submit_render_only(self, mock_submit, mock_setup_console, tmp_path):
+        job = tmp_path / "job.yml"
+        job.write_text(
+            "project: p\n"
+            "stages: [{name: production, steps: 100}]\n"
+            "systems: [{id: a, pdb: a.pdb}, {id: b, pdb: b.pdb}]\n"
+        )
+        opts = tmp_path / "pbs.yml"
+        opts.write_text("queue: q\nwalltime: '01:00:00'\n")
+        with patch(
+            "sys.argv",
+            [
+                "fastmds",
+                "submit",
+                "-s",
+                str(job),
+                "-o",
+                str(tmp_path / "out"),
+                "--options",
+                str(opts),
+                "--render-only",
+            ],
+        ):
+            main()
+        mock_submit.assert_not_called()
+        assert (tmp_path / "out" / "p" / "_submit" / "simulate.pbs.sh").exists()
+        assert (tmp_path / "out" / "p" / "_submit" / "analyze.pbs.sh").exists()
+
+    @patch("fastmdsimulation.cli.setup_console")
+    @patch("fastmdsimulation.cli.run_from_yaml")
+    @patch("fastmdsimulation.core.workqueue.run_worker")
+    def test_worker_prepares_missing_plan(
+        self, mock_worker, mock_run_yaml, mock_setup_console, tmp_path
+    ):
+        job = tmp_path / "job.yml"
+        job.write_text("project: p\n")
+        mock_worker.return_value = {"done": ["a"], "failed": []}
+        with patch(
+            "sys.argv",
+            ["fastmds", "worker", "--project", str(tmp_path / "p"), "-s", str(job)],
+        ):
+            main()
+        mock_run_yaml.assert_called_once_with(
+            str(job), str(tmp_path), prepare_only=True
+        )
+        mock_worker.assert_called_once()
+
+    @patch("fastmdsimulation.cli.setup_console")
+    @patch("fastmdsimulation.cli.run_from_yaml")
+    @patch("fastmdsimulation.cli.attach_file_logger")
+    @patch("fastmdsimulation.core.daemon.submit_job")
+    def test_simulate_via_daemon(
+        self, mock_submit, mock_attach_logger, mock_run_yaml, mock_setup_console
+    ):
+        mock_submit.return_value = "/tmp/project"
+        with patch(
+            "sys.argv",
+            [
+                "fastmds",
+                "simulate",
+                "-s",
+                "job.yml",
+                "--via-daemon",
+                "--priority",
+                "3",
+                "--resume",
+            ],
+        ):
+            main()
+        mock_run_yaml.assert_not_called()
+        mock_submit.assert_called_once_with(
+            "job.yml", "simulate_output", socket_path=None, priority=3, resume=True
+        )
@@ -33,6 +33,25 @@ def _force_reference_platform(monkeypatch):
         monkeypatch.setenv("OPENMM_DEFAULT_PLATFORM", original)
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cache(monkeypatch, tmp_path_factory):
+    """Point the persistent caches at a per-test directory."""
+    monkeypatch.setenv("FASTMDS_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _clear_forcefield_memo():
+    """Do not leak memoized (possibly mocked) ForceFields/Platforms between tests."""
+    from fastmdsimulation.engines import openmm_engine
+
+    openmm_engine._FF_CACHE.clear()
+    openmm_engine._PLATFORM_CACHE.clear()
+    yield
+    openmm_engine._FF_CACHE.clear()
+    openmm_engine._PLATFORM_CACHE.clear()
+
+
 @pytest.fixture
 def tmp_jobdir(tmp_path):
     """Create a temporary directory for job files."""
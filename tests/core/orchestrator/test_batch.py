@@ -0,0 +1,145 @@
+# tests/core/orchestrator/test_batch.py
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import fastmdsimulation.core.orchestrator as orch
+
+
+class TestBatchGroups:
+    def test_chunks_by_temperature_and_size(self):
+        runs = [
+            {"system_id": f"s{i}", "temperature_K": t}
+            for i in range(5)
+            for t in (300, 310)
+        ]
+        groups = list(orch._batch_groups(runs, 2))
+        assert sorted(len(g) for g in groups) == [1, 1, 2, 2, 2, 2]
+        for g in groups:
+            assert len({r["temperature_K"] for r in g}) == 1
+
+    def test_sweep_values_and_forcefield_split_batches(self):
+        runs = [
+            {"system_id": "a", "temperature_K": 300, "sweep": {"seed": 1}},
+            {"system_id": "b", "temperature_K": 300, "sweep": {"seed": 2}},
+            {"system_id": "c", "temperature_K": 300, "forcefield": ["x.xml"]},
+            {"system_id": "d", "temperature_K": 300},
+        ]
+        assert [len(g) for g in orch._batch_groups(runs, 8)] == [1, 1, 1, 1]
+
+
+class TestRunFromYamlBatch:
+    def _cfg(self, tmp_path, extra=""):
+        cfg = tmp_path / "job.yml"
+        cfg.write_text(
+            "project: p\n"
+            "defaults: {platform: CPU, batch: {size: 2}}\n"
+            "stages: [{name: nvt, steps: 100}]\n"
+            "systems: [{id: a, pdb: a.pdb}, {id: b, pdb: b.pdb}, {id: c, pdb: c.pdb}]\n"
+            + extra
+        )
+        return cfg
+
+    @patch("fastmdsimulation.core.orchestrator._execute_run")
+    @patch("fastmdsimulation.core.orchestrator._execute_batch")
+    @patch("fastmdsimulation.core.orchestrator._prepare_systems")
+    @patch("fastmdsimulation.core.orchestrator._populate_inputs")
+    @patch("fastmdsimulation.core.orchestrator.attach_file_logger")
+    def test_runs_go_through_batches(
+        self, mock_attach, mock_populate, mock_prepare, mock_batch, mock_exec, tmp_path
+    ):
+        mock_prepare.side_effect = lambda c, base: c
+        orch.run_from_yaml(str(self._cfg(tmp_path)), str(tmp_path))
+
+        mock_exec.assert_not_called()
+        batches = [c.args[0] for c in mock_batch.call_args_list]
+        assert [[r["system_id"] for r in b] for b in batches] == [["a", "b"], ["c"]]
+
+    @patch("fastmdsimulation.core.orchestrator._prepare_systems")
+    @patch("fastmdsimulation.core.orchestrator._populate_inputs")
+    @patch("fastmdsimulation.core.orchestrator.attach_file_logger")
+    def test_remd_stage_rejected(
+        self, mock_attach, mock_populate, mock_prepare, tmp_path
+    ):
+        mock_prepare.side_effect = lambda c, base: c
+        cfg = self._cfg(tmp_path)
+        cfg.write_text(
+            cfg.read_text().replace(
+                "stages: [{name: nvt, steps: 100}]",
+                "stages: [{name: remd, steps: 100, ensemble: REMD}]",
+            )
+        )
+        with pytest.raises(ValueError, match="REMD"):
+            orch.run_from_yaml(str(cfg), str(tmp_path))
+
+
+class TestExecuteBatch:
+    @patch("fastmdsimulation.core.orchestrator.write_batch_summary")
+    @patch("fastmdsimulation.core.orchestrator.run_batched_stage")
+    @patch("fastmdsimulation.core.orchestrator.build_batched_simulation")
+    def test_builds_once_runs_stages_and_marks_done(
+        self, mock_build, mock_stage, mock_summary, tmp_path
+    ):
+        stages = [{"name": "minimize", "steps": 0}, {"name": "nvt", "steps": 10}]
+        batch = [
+            {
+                "system_id": sid,
+                "temperature_K": 300,
+                "run_dir": str(tmp_path / f"{sid}_T300"),
+                "stages": stages,
+                "input": {"id": sid, "pdb": f"{sid}.pdb"},
+            }
+            for sid in ("a", "b")
+        ]
+        for r in batch:
+            Path(r["run_dir"]).mkdir()
+        mock_build.return_value = ("sim", ["m0", "m1"])
+        mock_stage.return_value = {"steps": 10, "wall_s": 1.0}
+
+        orch._execute_batch(batch, {"temperature_K": 310})
+
+        specs, defaults_run, run_dirs = mock_build.call_args.args
+        assert [s["id"] for s in specs] == ["a", "b"]
+        assert defaults_run["temperature_K"] == 300
+        assert [c.args[2]["name"] for c in mock_stage.call_args_list] == [
+            "minimize",
+            "nvt",
+        ]
+        assert all((Path(r["run_dir"]) / "done.ok").exists() for r in batch)
+
+    def test_replicas_rejected(self, tmp_path):
+        batch = [
+            {
+                "system_id": "a",
+                "temperature_K": 300,
+                "run_dir": str(tmp_path / "a"),
+                "stages": [],
+                "input": {"id": "a", "replicas": 2},
+            }
+        ]
+        with pytest.raises(ValueError, match="replicas"):
+            orch._execute_batch(batch, {})
+
+
+class TestRunSlice:
+    @patch("fastmdsimulation.core.orchestrator._execute_run")
+    @patch("fastmdsimulation.core.orchestrator._prepare_systems")
+    @patch("fastmdsimulation.core.orchestrator._populate_inputs")
+    @patch("fastmdsimulation.core.orchestrator.attach_file_logger")
+    def test_only_sliced_runs_and_own_meta(
+        self, mock_attach, mock_populate, mock_prepare, mock_exec, tmp_path
+    ):
+        mock_prepare.side_effect = lambda c, base: c
+        cfg = tmp_path / "job.yml"
+        cfg.write_text(
+            "project: p\n"
+            "stages: [{name: nvt, steps: 100}]\n"
+            "systems: [{id: a, pdb: a.pdb}, {id: b, pdb: b.pdb}, {id: c, pdb: c.pdb}]\n"
+        )
+        base = orch.run_from_yaml(str(cfg), str(tmp_path), run_slice=(1, 3))
+
+        assert [c.args[0]["system_id"] for c in mock_exec.call_args_list] == ["b", "c"]
+        assert (Path(base) / "meta.1-3.json").exists()
+        assert not (Path(base) / "meta.json").exists()
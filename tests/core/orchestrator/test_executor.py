@@ -0,0 +1,275 @@
+# tests/core/orchestrator/test_executor.py
+
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import fastmdsimulation.core.orchestrator as orch
+from fastmdsimulation.core.executor import (
+    apply_slot,
+    device_slots,
+    resolve_execution,
+    run_parallel,
+)
+
+
+class TestResolveExecution:
+    def test_defaults_are_serial(self):
+        ex = resolve_execution({})
+        assert ex["workers"] == 1
+        assert ex["devices"] == []
+        assert ex["start_method"] == "spawn"
+
+    def test_cli_workers_override_yaml(self):
+        ex = resolve_execution({"execution": {"workers": 2, "devices": [0, 1]}}, 4)
+        assert ex["workers"] == 4
+        assert ex["devices"] == ["0", "1"]
+
+    def test_scalar_device_is_listified(self):
+        ex = resolve_execution({"execution": {"devices": 3}})
+        assert ex["devices"] == ["3"]
+
+
+class TestDeviceSlots:
+    def test_cuda_devices_cycle_over_slots(self):
+        ex = resolve_execution({"execution": {"workers": 3, "devices": [0, 1]}})
+        slots = device_slots(ex, "CUDA")
+        assert [s["platform_properties"] for s in slots] == [
+            {"CudaDeviceIndex": "0"},
+            {"CudaDeviceIndex": "1"},
+            {"CudaDeviceIndex": "0"},
+        ]
+
+    def test_opencl_device_key(self):
+        ex = resolve_execution({"execution": {"workers": 1, "devices": [2]}})
+        slots = device_slots(ex, "OpenCL")
+        assert slots[0]["platform_properties"] == {"OpenCLDeviceIndex": "2"}
+
+    def test_cpu_threads_per_worker(self):
+        ex = resolve_execution({"execution": {"workers": 2, "threads_per_worker": 3}})
+        slots = device_slots(ex, "CPU")
+        assert all(s["platform_properties"] == {"Threads": "3"} for s in slots)
+
+    def test_cpu_threads_split_cores(self, monkeypatch):
+        monkeypatch.delenv("SLURM_CPUS_PER_TASK", raising=False)
+        monkeypatch.setattr(
+            os, "sched_getaffinity", lambda pid: set(range(8)), raising=False
+        )
+        slots = device_slots(resolve_execution({}, 4), "CPU")
+        assert slots[0]["platform_properties"] == {"Threads": "2"}
+        cpus = [c for s in slots for c in s["cpus"]]
+        assert sorted(cpus) == list(range(8))  # disjoint sets
+
+    def test_cpu_explicit_cpusets(self):
+        ex = resolve_execution(
+            {"execution": {"workers": 2, "cpusets": ["0-3", "8-11,16"]}}
+        )
+        slots = device_slots(ex, "CPU")
+        assert [s["cpus"] for s in slots] == [[0, 1, 2, 3], [8, 9, 10, 11, 16]]
+        assert [s["platform_properties"] for s in slots] == [
+            {"Threads": "4"},
+            {"Threads": "5"},
+        ]
+
+    def test_apply_slot_merges_user_properties(self):
+        defaults = {
+            "platform": "auto",
+            "platform_properties": {"CudaPrecision": "mixed"},
+        }
+        slot = {
+            "index": 0,
+            "platform": "CUDA",
+            "platform_properties": {"CudaDeviceIndex": "1"},
+        }
+        out = apply_slot(defaults, slot)
+        assert out["platform"] == "CUDA"
+        assert out["platform_properties"] == {
+            "CudaPrecision": "mixed",
+            "CudaDeviceIndex": "1",
+        }
+        assert defaults["platform_properties"] == {"CudaPrecision": "mixed"}
+
+
+def _fake_execute_run(run, defaults, resume=False):
+    run_dir = Path(run["run_dir"])
+    run_dir.mkdir(parents=True, exist_ok=True)
+    (run_dir / "slot.json").write_text(
+        json.dumps(
+            {
+                "platform": defaults["platform"],
+                "props": defaults["platform_properties"],
+                "pid": os.getpid(),
+            }
+        )
+    )
+    if run["system_id"] == "boom":
+        raise RuntimeError("simulated failure")
+    if run["system_id"] == "crash":
+        os._exit(3)
+    (run_dir / "done.ok").write_text("simulation completed\n")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fork start method required")
+class TestRunParallel:
+    def _runs(self, tmp_path, ids):
+        return [
+            {
+                "system_id": sid,
+                "temperature_K": 300,
+                "run_dir": str(tmp_path / f"{sid}_T300"),
+                "stages": [],
+                "input": {},
+            }
+            for sid in ids
+        ]
+
+    def test_cpu_slots_and_failure_isolation(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(orch, "_execute_run", _fake_execute_run)
+        runs = self._runs(tmp_path, ["a", "boom", "crash", "b"])
+        ex = resolve_execution(
+            {
+                "execution": {
+                    "workers": 2,
+                    "threads_per_worker": 1,
+                    "start_method": "fork",
+                }
+            }
+        )
+
+        done = []
+        status = run_parallel(runs, {"platform": "CPU"}, ex, on_done=done.append)
+
+        assert status[runs[0]["run_dir"]] == "ok"
+        assert status[runs[1]["run_dir"]] == "failed"
+        assert status[runs[2]["run_dir"]] == "failed"
+        assert status[runs[3]["run_dir"]] == "ok"
+        assert sorted(done) == sorted([runs[0]["run_dir"], runs[3]["run_dir"]])
+
+        for r in (runs[0], runs[3]):
+            assert (Path(r["run_dir"]) / "done.ok").exists()
+        assert (
+            "simulated failure" in (Path(runs[1]["run_dir"]) / "error.log").read_text()
+        )
+        assert "code 3" in (Path(runs[2]["run_dir"]) / "error.log").read_text()
+
+        seen = [
+            json.loads((Path(r["run_dir"]) / "slot.json").read_text()) for r in runs
+        ]
+        assert all(s["platform"] == "CPU" for s in seen)
+        assert all(s["props"] == {"Threads": "1"} for s in seen)
+        assert all(s["pid"] != os.getpid() for s in seen)
+
+
+class TestRunFromYamlWorkers:
+    @patch("fastmdsimulation.core.orchestrator._prepare_systems")
+    @patch("fastmdsimulation.core.orchestrator._populate_inputs")
+    @patch("fastmdsimulation.core.orchestrator.attach_file_logger")
+    @patch("fastmdsimulation.core.orchestrator.run_parallel")
+    def test_workers_dispatch_to_executor(
+        self, mock_parallel, mock_attach, mock_populate, mock_prepare, tmp_path
+    ):
+        cfg_path = tmp_path / "job.yml"
+        cfg_path.write_text(
+            "project: p\n"
+            "defaults: {platform: CPU}\n"
+            "stages: [{name: minimize, steps: 0}]\n"
+            "systems: [{id: s1}, {id: s2}]\n"
+        )
+        mock_prepare.side_effect = lambda cfg, base: cfg
+        dispatched = []
+
+        def fake_parallel(runs, defaults, execution, **kwargs):
+            dispatched.extend(runs)
+            return {r["run_dir"]: "ok" for r in dispatched}
+
+        mock_parallel.side_effect = fake_parallel
+
+        project_dir = orch.run_from_yaml(str(cfg_path), str(tmp_path), workers=2)
+
+        mock_parallel.assert_called_once()
+        assert len(dispatched) == 2
+        assert mock_parallel.call_args.args[2]["workers"] == 2
+        meta = json.loads((Path(project_dir) / "meta.json").read_text())
+        assert "time_end" in meta
+
+    @patch("fastmdsimulation.core.orchestrator._prepare_systems")
+    @patch("fastmdsimulation.core.orchestrator._populate_inputs")
+    @patch("fastmdsimulation.core.orchestrator.attach_file_logger")
+    @patch("fastmdsimulation.core.orchestrator.run_parallel")
+    def test_failed_runs_raise_after_all_finish(
+        self, mock_parallel, mock_attach, mock_populate, mock_prepare, tmp_path
+    ):
+        cfg_path = tmp_path / "job.yml"
+        cfg_path.write_text(
+            "project: p\n"
+            "defaults: {execution: {workers: 2}, platform: CPU}\n"
+            "stages: []\n"
+            "systems: [{id: s1}, {id: s2}]\n"
+        )
+        mock_prepare.side_effect = lambda cfg, base: cfg
+        mock_parallel.side_effect = lambda runs, *a, **k: {
+            r["run_dir"]: ("failed" if r["system_id"] == "s2" else "ok") for r in runs
+        }
+
+        with pytest.raises(RuntimeError, match="s2_T300"):
+            orch.run_from_yaml(str(cfg_path), str(tmp_path))
+
+        meta = json.loads((tmp_path / "p" / "meta.json").read_text())
+        assert [Path(d).name for d in meta["failed_runs"]] == ["s2_T300"]
+
+
+class TestRunDoneHook:
+    def test_hook_only_for_finished_runs(self, tmp_path):
+        seen = []
+        (tmp_path / "done.ok").write_text("")
+        orch._notify_done(str(tmp_path), seen.append)
+        orch._notify_done(str(tmp_path / "missing"), seen.append)
+        orch._notify_done(str(tmp_path), None)
+        assert seen == [str(tmp_path)]
+
+    def test_hook_errors_do_not_stop_the_campaign(self, tmp_path):
+        (tmp_path / "done.ok").write_text("")
+
+        def _boom(run_dir):
+            raise RuntimeError("pool closed")
+
+        orch._notify_done(str(tmp_path), _boom)  # logged, not raised
+
+    @patch("fastmdsimulation.core.orchestrator._execute_run")
+    @patch("fastmdsimulation.core.orchestrator._prepare_systems")
+    @patch("fastmdsimulation.core.orchestrator._populate_inputs")
+    @patch("fastmdsimulation.core.orchestrator.attach_file_logger")
+    def test_serial_runs_reported_as_they_finish(
+        self, mock_attach, mock_populate, mock_prepare, mock_exec, tmp_path
+    ):
+        cfg = tmp_path / "job.yml"
+        cfg.write_text(
+            "project: p\n"
+            "defaults: {platform: CPU}\n"
+            "stages: [{name: nvt, steps: 10}]\n"
+            "systems: [{id: a}, {id: b}]\n"
+        )
+        mock_prepare.side_effect = lambda c, base: c
+        order = []
+
+        def _exec(run, defaults, resume=False):
+            order.append(("run", Path(run["run_dir"]).name))
+            Path(run["run_dir"]).mkdir(parents=True)
+            (Path(run["run_dir"]) / "done.ok").write_text("")
+
+        mock_exec.side_effect = _exec
+        orch.run_from_yaml(
+            str(cfg),
+            str(tmp_path),
+            on_run_done=lambda d: order.append(("done", Path(d).name)),
+        )
+        assert order == [
+            ("run", "a_T300"),
+            ("done", "a_T300"),
+            ("run", "b_T300"),
+            ("done", "b_T300"),
+        ]
@@ -0,0 +1,72 @@
+# tests/core/orchestrator/test_remd_phase.py
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import fastmdsimulation.core.orchestrator as orch
+
+
+class TestRemdPlanning:
+    def test_stage_index(self):
+        assert orch._remd_stage_index([{"name": "nvt"}]) is None
+        stages = [{"name": "nvt"}, {"name": "remd", "ensemble": "remd"}]
+        assert orch._remd_stage_index(stages) == 1
+        with pytest.raises(ValueError, match="last stage"):
+            orch._remd_stage_index(list(reversed(stages)))
+
+    def test_groups_by_system_and_other_sweep_values(self):
+        runs = [
+            {"system_id": "a", "temperature_K": 300, "sweep": {"seed": 1}},
+            {"system_id": "a", "temperature_K": 310, "sweep": {"seed": 1}},
+            {"system_id": "a", "temperature_K": 300, "sweep": {"seed": 2}},
+            {"system_id": "b", "temperature_K": 300},
+        ]
+        groups = list(orch._remd_groups(runs).values())
+        assert [len(g) for g in groups] == [2, 1, 1]
+
+
+class TestRunFromYamlRemd:
+    @patch("fastmdsimulation.core.orchestrator.run_remd")
+    @patch("fastmdsimulation.core.orchestrator._execute_run")
+    @patch("fastmdsimulation.core.orchestrator._prepare_systems")
+    @patch("fastmdsimulation.core.orchestrator._populate_inputs")
+    @patch("fastmdsimulation.core.orchestrator.attach_file_logger")
+    def test_pre_stages_then_one_remd_group(
+        self, mock_attach, mock_populate, mock_prepare, mock_exec, mock_remd, tmp_path
+    ):
+        cfg = tmp_path / "job.yml"
+        cfg.write_text(
+            "project: p\n"
+            "defaults: {platform: CPU}\n"
+            "stages:\n"
+            "  - {name: minimize, steps: 0}\n"
+            "  - {name: nvt, steps: 100}\n"
+            "  - {name: remd, steps: 1000, ensemble: REMD, exchange_interval: 100}\n"
+            "systems: [{id: s}]\n"
+            "sweep: {temperature_K: [310, 300, 320]}\n"
+        )
+        mock_prepare.side_effect = lambda c, base: c
+        mock_exec.side_effect = lambda run, d, resume=False: Path(run["run_dir"]).mkdir(
+            parents=True
+        )
+
+        orch.run_from_yaml(str(cfg), str(tmp_path))
+
+        pre = [c.args[0] for c in mock_exec.call_args_list]
+        assert len(pre) == 3
+        assert all(r["remd_pending"] for r in pre)
+        assert all(
+            [st["name"] for st in r["stages"]] == ["minimize", "nvt"] for r in pre
+        )
+
+        mock_remd.assert_called_once()
+        members, completed, stage, out_dir = mock_remd.call_args.args
+        assert [t for _, t, _ in members] == [300, 310, 320]
+        assert all(d["temperature_K"] == t for _, t, d in members)
+        assert [st["name"] for st in completed] == ["minimize", "nvt"]
+        assert stage["name"] == "remd"
+        assert Path(out_dir).name == "s_REMD"
+        for t in (300, 310, 320):
+            assert (tmp_path / "p" / f"s_T{t}" / "done.ok").exists()
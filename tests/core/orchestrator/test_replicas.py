@@ -0,0 +1,138 @@
+# tests/core/orchestrator/test_replicas.py
+
+import json
+import threading
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+import fastmdsimulation.core.orchestrator as orch
+
+
+def _run(tmp_path, replicas):
+    return {
+        "system_id": "trp",
+        "temperature_K": 300,
+        "run_dir": str(tmp_path / "trp_T300"),
+        "stages": [
+            {"name": "minimize", "steps": 0},
+            {"name": "nvt", "steps": 500},
+            {"name": "production", "steps": 1000},
+        ],
+        "input": {"id": "trp", "pdb": "trp.pdb", "replicas": replicas},
+    }
+
+
+class TestReplicaSettings:
+    def test_forms(self):
+        run = {"input": {}}
+        assert orch._replica_settings(run, {}) == (1, 1)
+        assert orch._replica_settings(run, {"replicas": 4}) == (4, 4)
+        run = {"input": {"replicas": {"count": 8, "concurrent": 2}}}
+        assert orch._replica_settings(run, {"replicas": 4}) == (8, 2)
+        run = {"input": {"replicas": {"count": 2, "concurrent": 16}}}
+        assert orch._replica_settings(run, {}) == (2, 2)
+
+
+@patch("fastmdsimulation.core.orchestrator.seed_velocities")
+@patch("fastmdsimulation.core.orchestrator.clone_simulation")
+@patch("fastmdsimulation.core.orchestrator.run_stage")
+@patch("fastmdsimulation.core.orchestrator.build_simulation_from_spec")
+class TestReplicas:
+    def test_replicas_run_into_rep_dirs(
+        self, mock_build, mock_stage, mock_clone, mock_seed, tmp_path
+    ):
+        mock_build.return_value = Mock(name="built")
+        mock_clone.side_effect = lambda sim, d: Mock(name=f"clone{d['seed']}")
+
+        def fake_stage(sim, st, stage_dir, defaults, resume=False):
+            Path(stage_dir).mkdir(parents=True, exist_ok=True)
+            (Path(stage_dir) / "stage.json").write_text("{}")
+
+        mock_stage.side_effect = fake_stage
+        run = _run(tmp_path, 3)
+
+        orch._execute_run(run, {"temperature_K": 300, "timestep_fs": 2.0})
+
+        run_dir = Path(run["run_dir"])
+        stage_dirs = [Path(c.args[2]) for c in mock_stage.call_args_list]
+        # minimize runs once in the shared build, the rest once per replica
+        assert [d.name for d in stage_dirs].count("minimize") == 1
+        per_replica = sorted(
+            str(d.relative_to(run_dir)) for d in stage_dirs if run_dir in d.parents
+        )
+        assert per_replica == [
+            f"rep{k}/{st}" for k in range(3) for st in ("nvt", "production")
+        ]
+        assert mock_clone.call_count == 2
+        seeds = sorted(c.args[2] for c in mock_seed.call_args_list)
+        assert seeds == [1, 2, 3]
+        report = json.loads((run_dir / "replicas.json").read_text())
+        assert report["replicas"] == 3
+        assert report["ns_total"] == pytest.approx(3 * 1500 * 2.0e-6)
+        assert report["ns_per_day_aggregate"] > 0
+        assert (run_dir / "done.ok").exists()
+
+    def test_failed_replica_is_reported_after_others_finish(
+        self, mock_build, mock_stage, mock_clone, mock_seed, tmp_path
+    ):
+        mock_build.return_value = Mock()
+        bad = Mock(name="bad")
+        mock_clone.side_effect = lambda sim, d: bad if d["seed"] == 2 else Mock()
+
+        def fake_stage(sim, st, stage_dir, defaults, resume=False):
+            if sim is bad:
+                raise RuntimeError("NaN")
+
+        mock_stage.side_effect = fake_stage
+
+        with pytest.raises(RuntimeError, match="rep1"):
+            orch._execute_run(_run(tmp_path, 3), {"share_build": False})
+        run_dir = tmp_path / "trp_T300"
+        assert not (run_dir / "done.ok").exists()
+        assert json.loads((run_dir / "replicas.json").read_text())["replicas"] == 3
+
+    def test_clones_are_made_before_any_replica_steps(
+        self, mock_build, mock_stage, mock_clone, mock_seed, tmp_path
+    ):
+        mock_build.return_value = Mock(name="built")
+        events = []
+
+        def fake_clone(sim, d):
+            events.append(("clone", threading.get_ident()))
+            return Mock()
+
+        def fake_stage(sim, st, stage_dir, defaults, resume=False):
+            events.append(("stage", Path(stage_dir).parent.name))
+
+        mock_clone.side_effect = fake_clone
+        mock_stage.side_effect = fake_stage
+
+        orch._execute_run(_run(tmp_path, 3), {"share_build": False})
+
+        clones = [e for e in events if e[0] == "clone"]
+        assert clones == [("clone", threading.get_ident())] * 2
+        assert events[:2] == clones  # before any stage touched the build
+        assert all(
+            c.args[0] is mock_build.return_value for c in mock_clone.call_args_list
+        )
+
+
+@patch("fastmdsimulation.core.orchestrator._prepare_systems")
+@patch("fastmdsimulation.core.orchestrator._populate_inputs")
+@patch("fastmdsimulation.core.orchestrator.attach_file_logger")
+def test_replicas_rejected_with_remd(
+    mock_attach, mock_populate, mock_prepare, tmp_path
+):
+    mock_prepare.side_effect = lambda c, base: c
+    cfg = tmp_path / "job.yml"
+    cfg.write_text(
+        "project: p\n"
+        "defaults: {platform: CPU}\n"
+        "sweep: {temperature_K: [300, 310]}\n"
+        "stages: [{name: remd, steps: 100, ensemble: REMD}]\n"
+        "systems: [{id: a, pdb: a.pdb, replicas: 2}]\n"
+    )
+    with pytest.raises(ValueError, match="replicas cannot be combined with an REMD"):
+        orch.run_from_yaml(str(cfg), str(tmp_path))
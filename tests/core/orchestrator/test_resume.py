@@ -0,0 +1,119 @@
+# tests/core/orchestrator/test_resume.py
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import fastmdsimulation.core.orchestrator as orch
+
+
+def _run(tmp_path):
+    return {
+        "system_id": "sys1",
+        "temperature_K": 300,
+        "run_dir": str(tmp_path / "sys1_T300"),
+        "stages": [
+            {"name": "minimize", "steps": 0},
+            {"name": "nvt", "steps": 100},
+            {"name": "production", "steps": 100},
+        ],
+        "input": {"id": "sys1", "type": "pdb", "pdb": "x.pdb"},
+    }
+
+
+def _complete(run_dir: Path, *names):
+    for n in names:
+        (run_dir / n).mkdir(parents=True, exist_ok=True)
+        (run_dir / n / "stage.json").write_text("{}")
+
+
+class TestExecuteRunResume:
+    @patch("fastmdsimulation.core.orchestrator.run_stage")
+    @patch("fastmdsimulation.core.orchestrator.restore_completed_stages")
+    @patch("fastmdsimulation.core.orchestrator.restore_simulation")
+    @patch("fastmdsimulation.core.orchestrator.has_simulation_bundle")
+    @patch("fastmdsimulation.core.orchestrator.build_simulation_from_spec")
+    def test_resume_reuses_bundle_and_skips_completed_stages(
+        self,
+        mock_build,
+        mock_has,
+        mock_restore,
+        mock_restore_stages,
+        mock_run_stage,
+        tmp_path,
+    ):
+        run = _run(tmp_path)
+        run_dir = Path(run["run_dir"])
+        _complete(run_dir, "minimize", "nvt")
+        mock_has.return_value = True
+        sim = Mock()
+        mock_restore.return_value = sim
+
+        orch._execute_run(run, {"temperature_K": 300}, resume=True)
+
+        mock_build.assert_not_called()
+        mock_restore.assert_called_once()
+        completed = mock_restore_stages.call_args.args[1]
+        assert [st["name"] for st, _ in completed] == ["minimize", "nvt"]
+        assert mock_run_stage.call_count == 1
+        stage = mock_run_stage.call_args.args[1]
+        assert stage["name"] == "production"
+        assert mock_run_stage.call_args.kwargs["resume"] is True
+        assert (run_dir / "done.ok").exists()
+
+    @patch("fastmdsimulation.core.orchestrator.run_stage")
+    @patch("fastmdsimulation.core.orchestrator.save_simulation_bundle")
+    @patch("fastmdsimulation.core.orchestrator.has_simulation_bundle")
+    @patch("fastmdsimulation.core.orchestrator.build_simulation_from_spec")
+    def test_resume_without_bundle_builds_and_saves(
+        self, mock_build, mock_has, mock_save, mock_run_stage, tmp_path
+    ):
+        run = _run(tmp_path)
+        mock_has.return_value = False
+        mock_build.return_value = Mock()
+
+        orch._execute_run(run, {"temperature_K": 300}, resume=True)
+
+        mock_build.assert_called_once()
+        mock_save.assert_called_once()
+        assert mock_run_stage.call_count == 3
+
+    @patch("fastmdsimulation.core.orchestrator.run_stage")
+    @patch("fastmdsimulation.core.orchestrator.save_simulation_bundle")
+    @patch("fastmdsimulation.core.orchestrator.build_simulation_from_spec")
+    def test_without_resume_stage_json_is_ignored(
+        self, mock_build, mock_save, mock_run_stage, tmp_path
+    ):
+        run = _run(tmp_path)
+        _complete(Path(run["run_dir"]), "minimize", "nvt")
+        mock_build.return_value = Mock()
+
+        orch._execute_run(run, {"temperature_K": 300})
+
+        assert mock_run_stage.call_count == 3
+        assert mock_run_stage.call_args.kwargs["resume"] is False
+
+    @patch("fastmdsimulation.core.orchestrator.run_stage")
+    @patch("fastmdsimulation.core.orchestrator.build_simulation_from_spec")
+    def test_bundle_failure_is_not_fatal(self, mock_build, mock_run_stage, tmp_path):
+        run = _run(tmp_path)
+        mock_build.return_value = Mock()
+        with patch(
+            "fastmdsimulation.core.orchestrator.save_simulation_bundle",
+            side_effect=RuntimeError("no serializer"),
+        ):
+            orch._execute_run(run, {"temperature_K": 300})
+
+        assert (Path(run["run_dir"]) / "done.ok").exists()
+
+
+class TestPendingRuns:
+    def test_done_runs_skipped_only_with_resume(self, tmp_path):
+        runs = [
+            {"run_dir": str(tmp_path / "a_T300")},
+            {"run_dir": str(tmp_path / "b_T300")},
+        ]
+        Path(runs[0]["run_dir"]).mkdir()
+        (Path(runs[0]["run_dir"]) / "done.ok").write_text("ok")
+
+        assert list(orch._pending_runs(runs, resume=True)) == [runs[1]]
+        assert list(orch._pending_runs(runs, resume=False)) == runs
@@ -0,0 +1,147 @@
+# tests/core/orchestrator/test_shared_build.py
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import fastmdsimulation.core.orchestrator as orch
+
+
+def _run(tmp_path, temp, sid="sys1"):
+    return {
+        "system_id": sid,
+        "temperature_K": temp,
+        "run_dir": str(tmp_path / f"{sid}_T{temp}"),
+        "stages": [
+            {"name": "minimize", "steps": 0},
+            {"name": "nvt", "steps": 100},
+        ],
+        "input": {"id": sid, "type": "pdb", "pdb": f"{sid}.pdb"},
+    }
+
+
+def _fake_save(sim, run_dir):
+    Path(run_dir).mkdir(parents=True, exist_ok=True)
+    for name in ("system.xml", "state.xml", "topology.pdb"):
+        (Path(run_dir) / name).write_text(name)
+
+
+def _fake_run_stage(sim, stage, stage_dir, defaults, resume=False):
+    Path(stage_dir).mkdir(parents=True, exist_ok=True)
+    (Path(stage_dir) / "stage.json").write_text("{}")
+
+
+@patch("fastmdsimulation.core.orchestrator.run_stage", side_effect=_fake_run_stage)
+@patch("fastmdsimulation.core.orchestrator.restore_simulation")
+@patch(
+    "fastmdsimulation.core.orchestrator.save_simulation_bundle", side_effect=_fake_save
+)
+@patch("fastmdsimulation.core.orchestrator.build_simulation_from_spec")
+class TestSharedBuild:
+    def test_temperature_sweep_builds_and_minimizes_once(
+        self, mock_build, mock_save, mock_restore, mock_run_stage, tmp_path
+    ):
+        builder = Mock()
+        builder.saveState.side_effect = lambda p: Path(p).write_text("min")
+        mock_build.return_value = builder
+        mock_restore.return_value = Mock()
+
+        runs = [_run(tmp_path, t) for t in (300, 310, 320)]
+        for run in runs:
+            orch._execute_run(run, {"temperature_K": 300})
+
+        mock_build.assert_called_once()
+        assert mock_restore.call_count == 2
+        assert all(
+            c.kwargs["state_file"] == "minimized.xml"
+            for c in mock_restore.call_args_list
+        )
+        stages = [c.args[1]["name"] for c in mock_run_stage.call_args_list]
+        assert stages == ["minimize", "nvt", "nvt", "nvt"]
+        # Each run gets the equilibration stage at its own temperature
+        temps = [c.args[3]["temperature_K"] for c in mock_run_stage.call_args_list]
+        assert temps[1:] == [300, 310, 320]
+
+        for run in runs:
+            run_dir = Path(run["run_dir"])
+            assert (run_dir / "system.xml").exists()
+            assert (run_dir / "minimize" / "stage.json").exists()
+            # platform-independent state for resume/REMD, not just state.chk
+            assert (run_dir / "minimize" / "state.xml").read_text() == "min"
+            assert (run_dir / "done.ok").exists()
+
+    def test_build_relevant_defaults_change_the_key(
+        self, mock_build, mock_save, mock_restore, mock_run_stage, tmp_path
+    ):
+        run = _run(tmp_path, 300)
+        a = orch._shared_build_dir(run, {"temperature_K": 300})
+        b = orch._shared_build_dir(run, {"temperature_K": 350})
+        c = orch._shared_build_dir(run, {"temperature_K": 300, "box_padding_nm": 1.5})
+        assert a == b
+        assert a != c
+        assert a.parent == tmp_path / "_build" / "shared"
+
+    def test_opt_out_builds_every_run(
+        self, mock_build, mock_save, mock_restore, mock_run_stage, tmp_path
+    ):
+        mock_build.return_value = Mock()
+        for t in (300, 310):
+            orch._execute_run(_run(tmp_path, t), {"share_build": False})
+
+        assert mock_build.call_count == 2
+        mock_restore.assert_not_called()
+        assert not (tmp_path / "_build").exists()
+
+    def test_failed_bundle_save_falls_back_to_building(
+        self, mock_build, mock_save, mock_restore, mock_run_stage, tmp_path
+    ):
+        mock_build.return_value = Mock()
+        mock_save.side_effect = RuntimeError("no serializer")
+        for t in (300, 310):
+            orch._execute_run(_run(tmp_path, t), {})
+
+        assert mock_build.call_count == 2
+        mock_restore.assert_not_called()
+
+
+class TestRunDefaults:
+    def test_reporting_budget_gets_run_md_steps(self, tmp_path):
+        run = _run(tmp_path, 300)
+        run["stages"] = run["stages"] + [{"name": "production", "steps": 900}]
+        d = orch._run_defaults(run, {"reporting": {"traj_budget_gb": 5}})
+        assert d["reporting"] == {"traj_budget_gb": 5, "run_steps": 1000}
+        assert "reporting" not in orch._run_defaults(run, {})
+
+
+@patch("fastmdsimulation.core.orchestrator.restore_simulation")
+@patch("fastmdsimulation.core.orchestrator.build_simulation_from_spec")
+class TestPrebuiltHandoff:
+    def test_ready_bundle_replaces_build(self, mock_build, mock_restore, tmp_path):
+        run = _run(tmp_path, 300)
+        defaults_run = orch._run_defaults(run, {})
+        pre = orch._prebuild_dir(run, defaults_run)
+        pre.mkdir(parents=True)
+        (pre / "topology.pdb").write_text("top")
+        (pre / "prebuilt.ok").write_text("")
+
+        target = Path(run["run_dir"])
+        sim = orch._build(run, defaults_run, target)
+
+        mock_build.assert_not_called()
+        assert sim is mock_restore.return_value
+        assert mock_restore.call_args.args[0] == pre
+        assert (target / "topology.pdb").read_text() == "top"
+
+    def test_no_pipeline_builds_in_process(self, mock_build, mock_restore, tmp_path):
+        run = _run(tmp_path, 300)
+        orch._build(run, orch._run_defaults(run, {}), Path(run["run_dir"]))
+        mock_build.assert_called_once()
+        assert not (tmp_path / "_build" / "prebuilt").exists()
+
+    def test_prebuild_key_ignores_temperature(self, mock_build, mock_restore, tmp_path):
+        a, b = _run(tmp_path, 300), _run(tmp_path, 310)
+        assert orch._prebuild_dir(a, orch._run_defaults(a, {})) == orch._prebuild_dir(
+            b, orch._run_defaults(b, {})
+        )
+        assert orch._prebuild_job(a, {})[2] == orch._prebuild_dir(
+            a, orch._run_defaults(a, {})
+        )
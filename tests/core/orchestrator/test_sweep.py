@@ -0,0 +1,162 @@
+# tests/core/orchestrator/test_sweep.py
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+import fastmdsimulation.core.orchestrator as orch
+from fastmdsimulation.core.orchestrator import _expand_runs, resolve_plan
+from fastmdsimulation.core.sweep import apply_sweep_point, run_dir_name, sweep_axes
+
+
+def _cfg(sweep, systems=("sys1",)):
+    return {
+        "project": "p",
+        "defaults": {"temperature_K": 300, "timestep_fs": 2.0},
+        "systems": [{"id": s} for s in systems],
+        "sweep": sweep,
+        "stages": [{"name": "production", "steps": 1000}],
+    }
+
+
+class TestSweepExpansion:
+    def test_cartesian_product_and_names(self):
+        plan = _expand_runs(
+            _cfg({"temperature_K": [300, 310], "pressure_atm": [1.0, 1000.0]}), "/o"
+        )
+        names = [Path(r["run_dir"]).name for r in plan["runs"]]
+        assert names == [
+            "sys1_T300_P1",
+            "sys1_T300_P1000",
+            "sys1_T310_P1",
+            "sys1_T310_P1000",
+        ]
+        assert plan["runs"][1]["sweep"] == {"pressure_atm": 1000.0}
+
+    def test_temperature_only_keeps_legacy_names(self):
+        plan = _expand_runs(_cfg({"temperature_K": [300]}), "/o")
+        run = plan["runs"][0]
+        assert Path(run["run_dir"]).name == "sys1_T300"
+        assert "sweep" not in run
+
+    def test_zip_advances_together(self):
+        plan = _expand_runs(
+            _cfg(
+                {
+                    "temperature_K": [300, 350],
+                    "pressure_atm": [1.0, 500.0],
+                    "seed": [7, 8],
+                    "zip": [["temperature_K", "pressure_atm"]],
+                }
+            ),
+            "/o",
+        )
+        pts = [(r["temperature_K"], r["sweep"]["pressure_atm"]) for r in plan["runs"]]
+        assert pts == [(300, 1.0), (300, 1.0), (350, 500.0), (350, 500.0)]
+        assert Path(plan["runs"][3]["run_dir"]).name == "sys1_T350_P500_seed8"
+
+    def test_replica_count_and_all_axes(self):
+        sweep = {
+            "ionic_strength_molar": [0.0, 0.15],
+            "box_padding_nm": [1.0],
+            "timestep_fs": [4.0],
+            "replica": 2,
+        }
+        runs = _expand_runs(_cfg(sweep), "/o")["runs"]
+        assert len(runs) == 4
+        assert Path(runs[-1]["run_dir"]).name == "sys1_T300_I0.15_pad1_dt4_rep1"
+
+    def test_lazy_indexing_matches_iteration(self):
+        sweep = {"temperature_K": [300, 310, 320], "seed": [1, 2], "replica": 2}
+        runs = _expand_runs(_cfg(sweep, systems=("a", "b")), "/o")["runs"]
+        assert list(runs) == [runs[i] for i in range(len(runs))]
+        assert runs[-1] == list(runs)[-1]
+        assert runs[2:4] == list(runs)[2:4]
+
+    def test_large_campaign_is_not_materialized(self):
+        sweep = {
+            "temperature_K": list(range(100)),
+            "seed": list(range(100)),
+            "replica": 100,
+        }
+        runs = _expand_runs(_cfg(sweep), "/o")["runs"]
+        assert len(runs) == 1_000_000
+        assert runs[999_999]["sweep"] == {"seed": 99, "replica": 99}
+
+    def test_invalid_sweeps(self):
+        with pytest.raises(ValueError, match="Unsupported sweep key"):
+            sweep_axes({"salinity": [1]}, {})
+        with pytest.raises(ValueError, match="unequal lengths"):
+            sweep_axes(
+                {
+                    "temperature_K": [1, 2],
+                    "seed": [1],
+                    "zip": [["temperature_K", "seed"]],
+                },
+                {},
+            )
+
+    def test_run_dir_name_is_order_independent(self):
+        point = {"temperature_K": 300, "seed": 3, "pressure_atm": 1.0}
+        assert run_dir_name("x", point, ["seed", "pressure_atm", "temperature_K"]) == (
+            "x_T300_P1_seed3"
+        )
+
+
+class TestSweepApplication:
+    def test_apply_point_overrides_integrator_timestep(self):
+        d = {"integrator": {"name": "langevin_middle", "timestep_fs": 2.0}}
+        apply_sweep_point(d, {"timestep_fs": 4.0, "pressure_atm": 10.0})
+        assert d["integrator"]["timestep_fs"] == 4.0
+        assert d["timestep_fs"] == 4.0
+        assert d["pressure_atm"] == 10.0
+
+    def test_replica_points_get_distinct_seeds(self):
+        seeds = []
+        for replica in (0, 1):
+            d = {"seed": 7}
+            apply_sweep_point(d, {"replica": replica})
+            seeds.append(d["seed"])
+        assert seeds == [8, 9]
+        d = {}
+        apply_sweep_point(d, {"seed": 11, "replica": 2})
+        assert d["seed"] == 14
+
+    @patch("fastmdsimulation.core.orchestrator.seed_velocities")
+    @patch("fastmdsimulation.core.orchestrator.run_stage")
+    @patch("fastmdsimulation.core.orchestrator.build_simulation_from_spec")
+    def test_replica_runs_seed_integrator_and_velocities(
+        self, mock_build, mock_stage, mock_seed, tmp_path
+    ):
+        mock_build.return_value = Mock()
+        runs = _expand_runs(_cfg({"replica": 2}), tmp_path)["runs"]
+        for run in runs:
+            orch._execute_run(
+                run, {"temperature_K": 300, "seed": 5, "share_build": False}
+            )
+        assert {c.args[3]["seed"] for c in mock_stage.call_args_list} == {6, 7}
+        assert [c.args[2] for c in mock_seed.call_args_list] == [6, 7]
+
+    def test_resolve_plan_uses_swept_timestep(self, tmp_path):
+        cfg = tmp_path / "job.yml"
+        cfg.write_text(
+            "project: p\n"
+            "defaults: {timestep_fs: 2.0}\n"
+            "stages: [{name: production, steps: 1000}]\n"
+            "systems: [{id: s}]\n"
+            "sweep: {timestep_fs: [2.0, 4.0]}\n"
+        )
+        plan = resolve_plan(str(cfg), str(tmp_path))
+        assert [r["stages"][0]["approx_ps"] for r in plan["runs"]] == [2.0, 4.0]
+
+    @patch("fastmdsimulation.core.orchestrator.run_stage")
+    @patch("fastmdsimulation.core.orchestrator.build_simulation_from_spec")
+    def test_execute_run_applies_swept_values(self, mock_build, mock_stage, tmp_path):
+        mock_build.return_value = Mock()
+        plan = _expand_runs(_cfg({"pressure_atm": [250.0], "seed": [5]}), tmp_path)
+        runs = plan["runs"]
+        orch._execute_run(runs[0], {"temperature_K": 300, "share_build": False})
+        d = mock_stage.call_args.args[3]
+        assert d["pressure_atm"] == 250.0
+        assert d["seed"] == 5
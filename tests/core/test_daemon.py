@@ -0,0 +1,187 @@
+# tests/core/test_daemon.py
+
+import logging
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from fastmdsimulation.core import daemon
+from fastmdsimulation.core.daemon import Daemon, request, request_stream, submit_job
+from fastmdsimulation.utils import logging as fmds_logging
+from fastmdsimulation.utils.logging import get_logger
+
+
+class TestQueue:
+    def test_priority_then_fifo(self):
+        d = Daemon()
+        for name, prio in [("a", 0), ("b", 5), ("c", 0), ("d", 5)]:
+            d.submit(f"{name}.yml", "out", priority=prio)
+        order = [d._next()["config"] for _ in range(4)]
+        assert order == ["b.yml", "d.yml", "a.yml", "c.yml"]
+
+    def test_unknown_kwargs_dropped(self):
+        job = Daemon().submit("a.yml", "out", kwargs={"resume": True, "x": 1})
+        assert job["kwargs"] == {"resume": True}
+
+
+@pytest.fixture
+def served(tmp_path):
+    sock = tmp_path / "d.sock"
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=daemon.serve, args=(sock,), kwargs={"ready": ready}, daemon=True
+    )
+    thread.start()
+    assert ready.wait(10)
+    yield sock
+    try:
+        request(sock, {"op": "shutdown"})
+    except OSError:
+        pass
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+class TestServe:
+    def test_submit_streams_logs_and_reports_status(self, served, tmp_path):
+        def fake_run(config, output, **kwargs):
+            get_logger("orchestrator").info(f"hello from {config} {kwargs}")
+            return str(tmp_path / "out" / "p")
+
+        records = []
+        capture = logging.Handler()
+        capture.emit = records.append
+        base = logging.getLogger("fastmds")
+        level = base.level
+        base.setLevel(logging.INFO)
+        base.addHandler(capture)
+        try:
+            with patch("fastmdsimulation.core.orchestrator.run_from_yaml", fake_run):
+                project = submit_job(
+                    str(tmp_path / "job.yml"),
+                    str(tmp_path / "out"),
+                    served,
+                    resume=True,
+                )
+        finally:
+            base.removeHandler(capture)
+            base.setLevel(level)
+
+        assert project == str(tmp_path / "out" / "p")
+        streamed = [r for r in records if getattr(r, "fastmds_remote", False)]
+        assert any("hello from" in r.getMessage() for r in streamed)
+        assert any("'resume': True" in r.getMessage() for r in streamed)
+        jobs = request(served, {"op": "status"})["jobs"]
+        assert [(j["id"], j["state"]) for j in jobs] == [(1, "done")]
+
+    def test_failed_job_raises_and_daemon_survives(self, served, tmp_path):
+        with patch(
+            "fastmdsimulation.core.orchestrator.run_from_yaml",
+            side_effect=ValueError("bad yaml"),
+        ):
+            with pytest.raises(RuntimeError, match="bad yaml"):
+                submit_job("job.yml", str(tmp_path), served)
+        assert request(served, {"op": "status"})["jobs"][0]["state"] == "failed"
+
+    def test_relative_inputs_resolve_in_submitter_cwd(
+        self, served, tmp_path, monkeypatch
+    ):
+        job_dir = tmp_path / "client"
+        job_dir.mkdir()
+        (job_dir / "water.pdb").write_text("END\n")
+        (job_dir / "job.yml").write_text(
+            "project: p\n"
+            "stages: [{name: nvt, steps: 10}]\n"
+            "systems: [{id: w, fixed_pdb: water.pdb}]\n"
+        )
+        elsewhere = tmp_path / "elsewhere"
+        elsewhere.mkdir()
+        monkeypatch.chdir(elsewhere)  # the daemon's own working directory
+        seen = []
+
+        def execute(run, defaults, resume=False):
+            seen.append(run["input"]["pdb"])
+
+        req = {
+            "op": "submit",
+            "config": str(job_dir / "job.yml"),
+            "output": str(tmp_path / "out"),
+            "cwd": str(job_dir),
+            "kwargs": {"workers": 1},
+            "stream": True,
+        }
+        with patch("fastmdsimulation.core.orchestrator._execute_run", execute):
+            events = list(request_stream(served, req))
+
+        assert events[-1]["event"] == "done", events[-1]
+        assert seen == [str(job_dir / "water.pdb")]
+        assert Path.cwd() == elsewhere
+        assert fmds_logging._file_handler is None  # project log detached
+
+    def test_submit_job_sends_cwd(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        sent = []
+
+        def fake_stream(path, req):
+            sent.append(req)
+            yield {"event": "done", "project_dir": "p"}
+
+        with patch("fastmdsimulation.core.daemon.request_stream", fake_stream):
+            submit_job("job.yml", "out", tmp_path / "d.sock")
+        assert sent[0]["cwd"] == str(tmp_path)
+        assert sent[0]["config"] == str(tmp_path / "job.yml")
+
+    def test_other_connections_not_streamed(self, served, tmp_path):
+        running, release = threading.Event(), threading.Event()
+
+        def fake_run(config, output, **kwargs):
+            if config.endswith("a.yml"):
+                running.set()
+                release.wait(10)
+            get_logger("orchestrator").info(f"running {Path(config).name}")
+            return output
+
+        def _submit(name):
+            req = {
+                "op": "submit",
+                "config": str(tmp_path / name),
+                "output": str(tmp_path),
+                "stream": True,
+            }
+            return list(request_stream(served, req))
+
+        base = logging.getLogger("fastmds")
+        level = base.level
+        base.setLevel(logging.INFO)
+        try:
+            with patch("fastmdsimulation.core.orchestrator.run_from_yaml", fake_run):
+                result = {}
+                first = threading.Thread(
+                    target=lambda: result.update(a=_submit("a.yml"))
+                )
+                first.start()
+                assert running.wait(10)
+                queued = request(
+                    served, {"op": "submit", "config": "b.yml", "output": str(tmp_path)}
+                )
+                release.set()
+                first.join(10)
+                assert queued["event"] == "queued"
+                done_c = _submit("c.yml")
+        finally:
+            base.setLevel(level)
+
+        msgs = [e["msg"] for e in result["a"] if e["event"] == "log"]
+        assert "running a.yml" in msgs
+        assert not any("job 2" in m or "b.yml" in m for m in msgs)
+        assert done_c[-1]["event"] == "done"
+
+    def test_second_daemon_refused(self, served):
+        with pytest.raises(RuntimeError, match="already listening"):
+            daemon.serve(served)
+
+    def test_no_daemon(self, tmp_path):
+        with pytest.raises(RuntimeError, match="fastmds serve"):
+            submit_job("job.yml", str(tmp_path), tmp_path / "none.sock")
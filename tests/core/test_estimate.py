@@ -0,0 +1,166 @@
+# tests/core/test_estimate.py
+
+import pytest
+
+from fastmdsimulation.core import estimate
+from fastmdsimulation.core.estimate import (
+    PlanEstimator,
+    count_atoms,
+    estimate_run,
+    throughput,
+)
+from fastmdsimulation.utils.benchmarks import record_benchmark
+
+
+def _pdb(path, coords, element="C", resname="ALA"):
+    lines = [
+        f"ATOM  {i + 1:5d}  CA  {resname} A{i + 1:4d}    "
+        f"{x:8.3f}{y:8.3f}{z:8.3f}  1.00  0.00          {element:>2}"
+        for i, (x, y, z) in enumerate(coords)
+    ]
+    path.write_text("\n".join(lines + ["END"]) + "\n")
+    return path
+
+
+class TestCountAtoms:
+    def test_topology_inputs_read_directly(self, tmp_path):
+        prmtop = tmp_path / "s.prmtop"
+        prmtop.write_text(
+            "%VERSION x\n%FLAG TITLE\n%FORMAT(20a4)\nsys\n"
+            "%FLAG POINTERS\n%FORMAT(10I8)\n   23558      18\n"
+        )
+        gro = tmp_path / "s.gro"
+        gro.write_text("title\n 4021\n")
+        psf = tmp_path / "s.psf"
+        psf.write_text("PSF EXT\n\n       1 !NTITLE\n\n     912 !NATOM\n")
+
+        assert count_atoms({"prmtop": str(prmtop)}, {}) == (23558, "prmtop")
+        assert count_atoms({"top": "t", "gro": str(gro)}, {}) == (4021, "gro")
+        assert count_atoms({"psf": str(psf)}, {}) == (912, "psf")
+
+    def test_pdb_solvated_box(self, tmp_path):
+        # 2 nm solute extent + 2 x 1 nm padding -> 4 nm cube
+        pdb = _pdb(tmp_path / "p.pdb", [(0, 0, 0), (20, 0, 0)], element="H")
+        atoms, source = count_atoms(
+            {"pdb": str(pdb)}, {"box_padding_nm": 1.0, "ionic_strength_molar": 0.0}
+        )
+        waters = int((64.0 - 2 * estimate.NM3_PER_SOLUTE_ATOM) * 33.4)
+        assert atoms == 2 + 3 * waters
+        assert "pad 1 nm" in source
+
+    def test_pdb_padding_and_hydrogens(self, tmp_path):
+        coords = [(i / 10.0, 0, 0) for i in range(200)]
+        pdb = _pdb(tmp_path / "p.pdb", coords)
+        small, _ = count_atoms({"pdb": str(pdb)}, {"box_padding_nm": 1.0})
+        large, _ = count_atoms({"pdb": str(pdb)}, {"box_padding_nm": 1.5})
+        assert large > small
+        # heavy-atom-only inputs are scaled up for the hydrogens PDBFixer adds
+        with_h = _pdb(tmp_path / "h.pdb", coords, element="H")
+        assert count_atoms({"pdb": str(with_h)}, {"box_padding_nm": 1.0})[0] < small
+
+    def test_crystal_waters_ignored(self, tmp_path):
+        pdb = _pdb(tmp_path / "w.pdb", [(0, 0, 0), (90, 0, 0)], resname="HOH")
+        with pytest.raises(ValueError, match="no ATOM"):
+            count_atoms({"pdb": str(pdb)}, {})
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(OSError):
+            count_atoms({"pdb": str(tmp_path / "none.pdb")}, {})
+
+
+class TestThroughput:
+    def test_model_scales_recorded_rate(self):
+        # 500000 steps x 2 fs = 1 ns in 864 s -> 100 ns/day at 20000 atoms
+        record_benchmark("CUDA", 20000, 500000, 864.0, 2.0)
+        record_benchmark("CPU", 20000, 5000, 864.0, 2.0)
+        rate, platform, n = throughput("auto")
+        assert (platform, n) == ("CUDA", 1)
+        assert rate * 2.0 / 20000 == pytest.approx(100.0)
+        assert throughput("cpu")[1:] == ("CPU", 1)
+
+    def test_default_without_benchmarks(self):
+        rate, platform, n = throughput("OpenCL")
+        assert (rate, platform, n) == (
+            estimate.DEFAULT_THROUGHPUT["OpenCL"],
+            "OpenCL",
+            0,
+        )
+
+
+class TestEstimateRun:
+    def test_wall_disk_memory(self, tmp_path):
+        record_benchmark("CUDA", 20000, 500000, 864.0, 2.0)  # 100 ns/day
+        prmtop = tmp_path / "s.prmtop"
+        prmtop.write_text("%FLAG POINTERS\n%FORMAT(10I8)\n   20000\n")
+        run = {
+            "input": {"prmtop": str(prmtop), "replicas": 2},
+            "stages": [
+                {"name": "minimize", "steps": 0},
+                {"name": "production", "steps": 500000, "report_interval": 5000},
+            ],
+        }
+        est = estimate_run(run, {"platform": "CUDA", "report_interval": 1000})
+        assert est["ns_per_day"] == pytest.approx(100.0)
+        assert est["wall_s"] == pytest.approx(2 * 864.0)
+        assert est["traj_bytes"] == 2 * 100 * 20000 * 12
+        assert est["peak_mem_bytes"] > 20000 * 1024
+
+    def test_trajectory_budget_caps_disk(self, tmp_path):
+        gro = tmp_path / "s.gro"
+        gro.write_text("t\n200000\n")
+        run = {
+            "input": {"gro": str(gro)},
+            "stages": [{"name": "production", "steps": 1000000}],
+        }
+        defaults = {"report_interval": 500, "reporting": {"traj_budget_gb": 1}}
+        assert estimate_run(run, defaults)["traj_bytes"] == 1024**3
+
+    def test_compressed_format_shrinks_disk(self, tmp_path):
+        gro = tmp_path / "s.gro"
+        gro.write_text("t\n10000\n")
+        run = {
+            "input": {"gro": str(gro)},
+            "stages": [
+                {"name": "production", "steps": 100000, "trajectory": {"format": "xtc"}}
+            ],
+        }
+        dcd = estimate_run(run, {"report_interval": 1000}, stages=[{"steps": 100000}])
+        xtc = estimate_run(run, {"report_interval": 1000})
+        assert dcd["traj_bytes"] == 100 * 10000 * 12
+        assert xtc["traj_bytes"] == dcd["traj_bytes"] // 3
+
+    def test_swept_timestep_speeds_up_ns_per_day(self, tmp_path):
+        record_benchmark("CUDA", 20000, 500000, 864.0, 2.0)
+        gro = tmp_path / "s.gro"
+        gro.write_text("t\n20000\n")
+        run = {
+            "input": {"gro": str(gro)},
+            "sweep": {"timestep_fs": 4.0},
+            "stages": [{"name": "production", "steps": 250000}],
+        }
+        est = estimate_run(run, {"platform": "CUDA"})
+        assert est["ns_per_day"] == pytest.approx(200.0)
+        assert est["wall_s"] == pytest.approx(432.0)
+
+    def test_ionic_strength_sweep_recounts_atoms(self, tmp_path):
+        pdb = _pdb(tmp_path / "p.pdb", [(0, 0, 0), (20, 0, 0)], element="H")
+        cache = {}
+        atoms = [
+            estimate_run(
+                {
+                    "input": {"pdb": str(pdb)},
+                    "sweep": {"ionic_strength_molar": c},
+                    "stages": [],
+                },
+                {},
+                _atoms_cache=cache,
+            )["atoms"]
+            for c in (0.0, 1.0)
+        ]
+        assert atoms[1] > atoms[0]
+
+    def test_unreadable_input_is_reported(self, tmp_path):
+        estimator = PlanEstimator({})
+        est = estimator({"input": {"pdb": "none.pdb"}, "stages": []})
+        assert est["atoms"] is None and est["atoms_source"].startswith("unknown")
+        assert "1 run(s) not estimated" in estimator.summary()
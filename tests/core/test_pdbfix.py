@@ -0,0 +1,112 @@
+# tests/core/test_pdbfix.py
+
+import os
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+from fastmdsimulation.core.pdbfix import fix_pdb_with_pdbfixer
+
+
+@pytest.fixture
+def fake_pdbfixer(monkeypatch):
+    """Stand-in PDBFixer/PDBFile modules that count fixer invocations."""
+    calls = []
+
+    class FakeFixer:
+        def __init__(self, filename):
+            calls.append(filename)
+            self.topology, self.positions = "top", "pos"
+
+        def removeHeterogens(self, keepWater=False):
+            pass
+
+        def findMissingResidues(self):
+            pass
+
+        def findMissingAtoms(self):
+            pass
+
+        def addMissingAtoms(self):
+            pass
+
+        def addMissingHydrogens(self, pH=7.0):
+            self.topology = f"pH={pH}"
+
+    class FakePDBFile:
+        @staticmethod
+        def writeFile(topology, positions, f, keepIds=False):
+            f.write(f"REMARK {topology}\nEND\n")
+
+    openmm = types.ModuleType("openmm")
+    app = types.ModuleType("openmm.app")
+    app.PDBFile = FakePDBFile
+    openmm.app = app
+    pdbfixer = types.ModuleType("pdbfixer")
+    pdbfixer.PDBFixer = FakeFixer
+    monkeypatch.setitem(sys.modules, "openmm", openmm)
+    monkeypatch.setitem(sys.modules, "openmm.app", app)
+    monkeypatch.setitem(sys.modules, "pdbfixer", pdbfixer)
+    return calls
+
+
+class TestPDBFixerCache:
+    def test_second_fix_is_a_cache_hit(self, tmp_path, fake_pdbfixer):
+        raw = tmp_path / "prot.pdb"
+        raw.write_text("ATOM raw\n")
+
+        fix_pdb_with_pdbfixer(str(raw), str(tmp_path / "p1" / "prot_fixed.pdb"))
+        fix_pdb_with_pdbfixer(str(raw), str(tmp_path / "p2" / "prot_fixed.pdb"))
+
+        assert len(fake_pdbfixer) == 1
+        assert (
+            tmp_path / "p2" / "prot_fixed.pdb"
+        ).read_text() == "REMARK pH=7.0\nEND\n"
+
+    def test_options_are_part_of_the_key(self, tmp_path, fake_pdbfixer):
+        raw = tmp_path / "prot.pdb"
+        raw.write_text("ATOM raw\n")
+        out = tmp_path / "out.pdb"
+
+        fix_pdb_with_pdbfixer(str(raw), str(out), ph=7.0)
+        fix_pdb_with_pdbfixer(str(raw), str(out), ph=5.5)
+        fix_pdb_with_pdbfixer(str(raw), str(out), ph=7.0, keep_water=True)
+
+        assert len(fake_pdbfixer) == 3
+
+    def test_input_content_is_part_of_the_key(self, tmp_path, fake_pdbfixer):
+        raw = tmp_path / "prot.pdb"
+        out = tmp_path / "out.pdb"
+        raw.write_text("ATOM one\n")
+        fix_pdb_with_pdbfixer(str(raw), str(out))
+        raw.write_text("ATOM two\n")
+        fix_pdb_with_pdbfixer(str(raw), str(out))
+
+        assert len(fake_pdbfixer) == 2
+
+    def test_miss_does_not_write_through_hard_link(self, tmp_path, fake_pdbfixer):
+        raw = tmp_path / "prot.pdb"
+        raw.write_text("ATOM raw\n")
+        out = tmp_path / "out.pdb"
+
+        fix_pdb_with_pdbfixer(str(raw), str(out))
+        fix_pdb_with_pdbfixer(str(raw), str(out))  # hit: out may be a hard link
+        (cached,) = (Path(os.environ["FASTMDS_CACHE_DIR"]) / "pdbfixer").glob("*.pdb")
+        out_before = out.read_text()
+        fix_pdb_with_pdbfixer(str(raw), str(out), ph=4.0)  # miss rewrites out
+
+        assert cached.read_text() == out_before == "REMARK pH=7.0\nEND\n"
+        assert out.read_text() == "REMARK pH=4.0\nEND\n"
+        assert len(fake_pdbfixer) == 2
+
+    def test_cache_disabled(self, tmp_path, fake_pdbfixer, monkeypatch):
+        monkeypatch.setenv("FASTMDS_CACHE", "0")
+        raw = tmp_path / "prot.pdb"
+        raw.write_text("ATOM raw\n")
+
+        fix_pdb_with_pdbfixer(str(raw), str(tmp_path / "a.pdb"))
+        fix_pdb_with_pdbfixer(str(raw), str(tmp_path / "b.pdb"))
+
+        assert len(fake_pdbfixer) == 2
@@ -0,0 +1,82 @@
+# tests/core/test_pipeline.py
+
+from unittest.mock import patch
+
+from fastmdsimulation.core import pipeline
+from fastmdsimulation.core.pipeline import (
+    CLAIMED,
+    READY,
+    Prebuilder,
+    claim_prebuilt,
+    prebuild_depth,
+)
+
+
+class TestPrebuildDepth:
+    def test_off_by_default(self):
+        assert prebuild_depth({}) == 0
+        assert prebuild_depth({"prebuild": None}) == 0
+
+    def test_value(self):
+        assert prebuild_depth({"prebuild": 2}) == 2
+        assert prebuild_depth({"prebuild": -1}) == 0
+
+
+class TestClaimPrebuilt:
+    def test_missing_dir(self, tmp_path):
+        assert claim_prebuilt(tmp_path / "nope") is None
+        assert not (tmp_path / "nope").exists()
+
+    def test_ready_bundle_is_used(self, tmp_path):
+        (tmp_path / READY).write_text("")
+        assert claim_prebuilt(tmp_path) == tmp_path
+
+    def test_unstarted_bundle_is_claimed(self, tmp_path):
+        assert claim_prebuilt(tmp_path) is None
+        assert (tmp_path / CLAIMED).exists()
+
+    def test_worker_skips_claimed_bundle(self, tmp_path):
+        (tmp_path / CLAIMED).write_text("")
+        assert pipeline._prebuild_main({}, {}, str(tmp_path)) == "skipped"
+
+
+class TestPrefetch:
+    def test_submits_depth_runs_ahead(self, tmp_path):
+        log = []
+        with Prebuilder(2, lambda r: None) as pre:
+            with patch.object(
+                pre, "submit", side_effect=lambda r: log.append(("submit", r))
+            ):
+                for run in pre.prefetch(range(5)):
+                    log.append(("run", run))
+        assert log == [
+            ("submit", 0),
+            ("submit", 1),
+            ("submit", 2),
+            ("run", 0),
+            ("submit", 3),
+            ("run", 1),
+            ("submit", 4),
+            ("run", 2),
+            ("run", 3),
+            ("run", 4),
+        ]
+
+    def test_fewer_runs_than_depth(self):
+        with Prebuilder(3, lambda r: None) as pre:
+            with patch.object(pre, "submit"):
+                assert list(pre.prefetch([1])) == [1]
+
+    def test_shared_target_submitted_once(self, tmp_path):
+        target = tmp_path / "prebuilt" / "s-abc"
+        with Prebuilder(1, lambda r: ({}, {}, target)) as pre:
+            with patch.object(pre.pool, "submit") as submit:
+                list(pre.prefetch([1, 2, 3]))
+        assert submit.call_count == 1
+        assert target.is_dir()
+
+    def test_worker_process_round_trip(self, tmp_path):
+        (tmp_path / CLAIMED).write_text("")
+        with Prebuilder(1, lambda r: None) as pre:
+            fut = pre.pool.submit(pipeline._prebuild_main, {}, {}, str(tmp_path))
+            assert fut.result(timeout=60) == "skipped"
@@ -0,0 +1,115 @@
+# tests/core/test_submit.py
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from fastmdsimulation.core import submit
+from fastmdsimulation.core.submit import detect_scheduler, pack_runs, render
+
+
+def _job(tmp_path, stages="[{name: production, steps: 100}]"):
+    cfg = tmp_path / "job.yml"
+    cfg.write_text(
+        "project: p\n"
+        "sweep: {temperature_K: [300, 310]}\n"
+        f"stages: {stages}\n"
+        "systems: [{id: a, pdb: a.pdb}, {id: b, pdb: b.pdb}, {id: c, pdb: c.pdb}]\n"
+    )
+    return str(cfg)
+
+
+class TestHelpers:
+    def test_detect_scheduler(self):
+        assert detect_scheduler({}) == "slurm"
+        assert detect_scheduler({"partition": "gpu", "time": "1:00:00"}) == "slurm"
+        assert detect_scheduler({"queue": "gpuq", "walltime": "1:00:00"}) == "pbs"
+
+    def test_pack_runs(self):
+        assert pack_runs(["a", "b", "c"], 2) == [["a", "b"], ["c"]]
+        assert pack_runs(["a", "b"], 0) == [["a"], ["b"]]
+
+
+class TestRender:
+    def test_slurm_one_task_per_run(self, tmp_path):
+        out = render(
+            _job(tmp_path),
+            str(tmp_path / "out"),
+            options={"account": "acc", "array_max": 2, "setup": "module load cuda"},
+        )
+        assert (out["scheduler"], out["runs"], out["tasks"]) == ("slurm", 6, 6)
+        sim = Path(out["simulate"]).read_text()
+        assert "#SBATCH --array=0-5%2" in sim
+        assert "#SBATCH -A acc" in sim
+        assert "module load cuda\n" in sim
+        assert "i=${SLURM_ARRAY_TASK_ID}" in sim
+        assert '--run-index "$((i * 1)):$((i * 1 + 1))" --resume' in sim
+
+        runs = (Path(out["dir"]) / "runs.txt").read_text().splitlines()
+        assert len(runs) == 6
+        assert runs[0].endswith("a_T300")
+
+        an = Path(out["analyze"]).read_text()
+        assert "--gres" not in an
+        assert "python -m fastmdanalysis" in an
+        assert '"$run"/rep*/production' in an
+        assert "--slides" in an
+
+    def test_packed_pbs(self, tmp_path):
+        out = render(
+            _job(tmp_path),
+            str(tmp_path / "out"),
+            options={"queue": "q", "walltime": "01:00:00", "analyze": {"queue": "cpu"}},
+            pack=4,
+            slides=False,
+            frames="0,-1,10",
+        )
+        assert (out["scheduler"], out["tasks"]) == ("pbs", 2)
+        sim = Path(out["simulate"]).read_text()
+        assert "#PBS -J 0-1" in sim
+        assert "#PBS -q q" in sim
+        assert '--run-index "$((i * 4)):$((i * 4 + 4))"' in sim
+        runs = (Path(out["dir"]) / "runs.txt").read_text().splitlines()
+        assert [len(line.split()) for line in runs] == [4, 2]
+        an = Path(out["analyze"]).read_text()
+        assert "#PBS -q cpu" in an
+        assert "--frames 0,-1,10" in an
+        assert "--slides" not in an
+
+    def test_no_analyze(self, tmp_path):
+        out = render(_job(tmp_path), str(tmp_path / "out"), analyze=False)
+        assert out["analyze"] is None
+        assert not list(Path(out["dir"]).glob("analyze.*"))
+
+    def test_remd_rejected(self, tmp_path):
+        job = _job(tmp_path, stages="[{name: remd, steps: 100, ensemble: REMD}]")
+        with pytest.raises(ValueError, match="REMD"):
+            render(job, str(tmp_path / "out"))
+
+
+class TestSubmit:
+    @patch("fastmdsimulation.core.submit._call")
+    def test_slurm_analysis_depends_per_task(self, mock_call):
+        mock_call.side_effect = ["101;cluster", "102"]
+        ids = submit.submit(
+            {"scheduler": "slurm", "simulate": "sim.sh", "analyze": "an.sh"}
+        )
+        assert ids == {"simulate": "101", "analyze": "102"}
+        assert mock_call.call_args_list[1].args[0] == [
+            "sbatch",
+            "--parsable",
+            "--dependency=aftercorr:101",
+            "an.sh",
+        ]
+
+    @patch("fastmdsimulation.core.submit._call")
+    def test_pbs_analysis_depends_on_array(self, mock_call):
+        mock_call.side_effect = ["7[].pbs", "8.pbs"]
+        submit.submit({"scheduler": "pbs", "simulate": "sim.sh", "analyze": "an.sh"})
+        assert mock_call.call_args_list[1].args[0] == [
+            "qsub",
+            "-W",
+            "depend=afterok:7[].pbs",
+            "an.sh",
+        ]
@@ -0,0 +1,201 @@
+# tests/core/test_workqueue.py
+
+import json
+import multiprocessing as mp
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from fastmdsimulation.core import orchestrator as orch
+from fastmdsimulation.core.workqueue import (
+    QUEUE_DIR,
+    _break_stale,
+    claim_next,
+    load_plan,
+    release,
+    run_worker,
+)
+
+
+def _project(tmp_path, n=6, extra_defaults=""):
+    cfg = {
+        "project": "p",
+        "defaults": {"platform": "CPU"},
+        "stages": [{"name": "nvt", "steps": 100}],
+        "systems": [{"id": f"s{i}", "pdb": f"s{i}.pdb"} for i in range(n)],
+    }
+    if extra_defaults:
+        cfg["defaults"].update(extra_defaults)
+    base = tmp_path / "p"
+    base.mkdir()
+    orch._freeze_plan(base, cfg)
+    return base
+
+
+def _fake_execute(run, defaults, resume=False):
+    """Stand-in for _execute_run: record who ran it, then mark it done."""
+    run_dir = Path(run["run_dir"])
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with open(run_dir / "ran_by", "a") as f:
+        f.write(f"{os.getpid()} resume={resume}\n")
+    time.sleep(0.05)
+    (run_dir / "done.ok").write_text("ok\n")
+
+
+def _worker_proc(project):
+    run_worker(project, heartbeat_s=0.1, stale_s=5.0)
+
+
+class TestPlan:
+    def test_run_from_yaml_freezes_prepared_plan(self, tmp_path):
+        job = tmp_path / "job.yml"
+        job.write_text(
+            "project: p\n"
+            "stages: [{name: nvt, steps: 100}]\n"
+            "systems: [{id: a, pdb: a.pdb}]\n"
+        )
+        with (
+            patch.object(orch, "_prepare_systems") as mock_prepare,
+            patch.object(orch, "_populate_inputs"),
+            patch.object(orch, "attach_file_logger"),
+            patch.object(orch, "_execute_run") as mock_exec,
+        ):
+            mock_prepare.side_effect = lambda c, base: {
+                **c,
+                "systems": [{"id": "a", "pdb": "/fixed/a.pdb"}],
+            }
+            base = orch.run_from_yaml(str(job), str(tmp_path), prepare_only=True)
+
+        mock_exec.assert_not_called()
+        plan = load_plan(base)
+        assert plan["runs"][0]["input"]["pdb"] == "/fixed/a.pdb"
+
+    def test_missing_plan(self, tmp_path):
+        with pytest.raises(FileNotFoundError, match="plan.json"):
+            load_plan(tmp_path)
+
+    def test_batch_mode_rejected(self, tmp_path):
+        base = _project(tmp_path, extra_defaults={"batch": 4})
+        with pytest.raises(ValueError, match="batch"):
+            load_plan(base)
+
+
+class TestClaims:
+    def test_claims_are_exclusive_and_skip_done(self, tmp_path):
+        base = _project(tmp_path, n=3)
+        runs = load_plan(base)["runs"]
+        Path(runs[0]["run_dir"]).mkdir(parents=True)
+        (Path(runs[0]["run_dir"]) / "done.ok").write_text("ok\n")
+
+        assert claim_next(base, runs, "w1") == 1
+        assert claim_next(base, runs, "w2") == 2
+        assert claim_next(base, runs, "w3") is None
+
+    def test_stale_claim_is_reclaimed(self, tmp_path):
+        base = _project(tmp_path, n=1)
+        runs = load_plan(base)["runs"]
+        assert claim_next(base, runs, "dead") == 0
+        claim = base / QUEUE_DIR / "0.claim"
+        old = time.time() - 600
+        os.utime(claim, (old, old))
+
+        assert claim_next(base, runs, "w2", stale_s=300) == 0
+        assert json.loads(claim.read_text())["owner"] == "w2"
+
+    def test_scan_starts_at_cursor_and_remembers_finished(self, tmp_path):
+        base = _project(tmp_path, n=4)
+        runs = load_plan(base)["runs"]
+        for k in (2, 3):
+            Path(runs[k]["run_dir"]).mkdir(parents=True)
+            (Path(runs[k]["run_dir"]) / "done.ok").write_text("ok\n")
+        finished = set()
+
+        assert claim_next(base, runs, "w1", start=2, finished=finished) == 0
+        assert finished == {2, 3}
+        assert not (base / QUEUE_DIR / "2.claim").exists()
+        assert claim_next(base, runs, "w1", start=1, finished=finished) == 1
+        assert claim_next(base, runs, "w1", finished=finished) is None
+
+    def test_staleness_uses_filesystem_clock(self, tmp_path):
+        base = _project(tmp_path, n=1)
+        runs = load_plan(base)["runs"]
+        assert claim_next(base, runs, "w1") == 0
+        # a node whose clock runs an hour ahead must not see the claim as stale
+        skewed = time.time() + 3600
+        with patch("fastmdsimulation.core.workqueue.time.time", return_value=skewed):
+            assert claim_next(base, runs, "w2", stale_s=300) is None
+
+    def test_replaced_claim_is_not_broken(self, tmp_path):
+        base = _project(tmp_path, n=1)
+        claim = base / QUEUE_DIR / "0.claim"
+        claim.parent.mkdir()
+        claim.write_text(json.dumps({"owner": "dead"}))
+        old = time.time() - 600
+        os.utime(claim, (old, old))
+        seen = claim.stat()
+        claim.unlink()
+        claim.write_text(json.dumps({"owner": "w2"}))  # another worker took over
+
+        assert not _break_stale(claim, seen, "w3")
+        assert json.loads(claim.read_text())["owner"] == "w2"
+        assert [p.name for p in claim.parent.iterdir()] == ["0.claim"]
+
+    def test_release_keeps_foreign_claim(self, tmp_path):
+        base = _project(tmp_path, n=1)
+        runs = load_plan(base)["runs"]
+        claim_next(base, runs, "w2")
+        release(base, 0, "w1")
+        assert (base / QUEUE_DIR / "0.claim").exists()
+        release(base, 0, "w2")
+        assert not (base / QUEUE_DIR / "0.claim").exists()
+
+
+class TestRunWorker:
+    @patch("fastmdsimulation.core.workqueue.attach_file_logger")
+    @patch("fastmdsimulation.core.orchestrator._execute_run")
+    def test_failed_run_is_recorded_and_not_retried(
+        self, mock_exec, mock_attach, tmp_path
+    ):
+        base = _project(tmp_path, n=2)
+        outcomes = iter([RuntimeError("boom"), None])
+
+        def execute(run, defaults, resume=False):
+            err = next(outcomes)
+            if err:
+                raise err
+            _fake_execute(run, defaults, resume)
+
+        mock_exec.side_effect = execute
+
+        result = run_worker(base, heartbeat_s=0.1, stale_s=1.0)
+
+        assert len(result["failed"]) == 1 and len(result["done"]) == 1
+        runs = [r["run_dir"] for r in load_plan(base)["runs"]]
+        (failed,) = (base / QUEUE_DIR).glob("*.failed")  # workers start anywhere
+        assert runs[int(failed.stem)] == result["failed"][0]
+        assert "boom" in (Path(result["failed"][0]) / "error.log").read_text()
+        assert not list((base / QUEUE_DIR).glob("*.claim"))
+        assert all(c.kwargs["resume"] for c in mock_exec.call_args_list)
+
+    @pytest.mark.skipif(
+        "fork" not in mp.get_all_start_methods(), reason="needs fork start method"
+    )
+    @patch("fastmdsimulation.core.workqueue.attach_file_logger")
+    def test_local_processes_drain_each_run_once(self, mock_attach, tmp_path):
+        base = _project(tmp_path, n=8)
+        ctx = mp.get_context("fork")
+        with patch.object(orch, "_execute_run", _fake_execute):
+            procs = [ctx.Process(target=_worker_proc, args=(base,)) for _ in range(3)]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join(timeout=60)
+        assert all(p.exitcode == 0 for p in procs)
+
+        runs = load_plan(base)["runs"]
+        ran = [(Path(r["run_dir"]) / "ran_by").read_text().splitlines() for r in runs]
+        assert all(len(lines) == 1 for lines in ran)
+        assert all((Path(r["run_dir"]) / "done.ok").exists() for r in runs)
@@ -0,0 +1,88 @@
+# tests/engines/test_atom_selection.py
+
+from types import SimpleNamespace
+
+import pytest
+
+# flake8 E402: allow import guard before heavy deps
+pytest.importorskip("openmm")
+
+from fastmdsimulation.engines.atom_selection import (  # noqa: E402
+    select_atoms,
+    subset_topology,
+)
+
+
+def _topology():
+    """ALA (N CA C O CB) on chain A, LIG on chain B, two waters, Na+ and Cl-."""
+    atoms, residues, chains = [], [], {}
+    spec = [
+        ("A", "ALA", ["N", "CA", "C", "O", "CB"]),
+        ("B", "LIG", ["C1", "O1"]),
+        ("W", "HOH", ["O", "H1", "H2"]),
+        ("W", "HOH", ["O", "H1", "H2"]),
+        ("I", "NA", ["NA"]),
+        ("I", "Cl-", ["CL"]),
+    ]
+    for chain_id, resname, names in spec:
+        chain = chains.setdefault(chain_id, SimpleNamespace(id=chain_id, res=[]))
+        res = SimpleNamespace(name=resname, chain=chain, id=str(len(residues) + 1))
+        res.insertionCode = ""
+        res.members = []
+        res.atoms = lambda r=res: iter(r.members)
+        for name in names:
+            symbol = {"NA": "Na", "CL": "Cl"}.get(name, name[0])
+            atom = SimpleNamespace(
+                name=name,
+                index=len(atoms),
+                id=str(len(atoms) + 1),
+                residue=res,
+                element=SimpleNamespace(symbol=symbol),
+            )
+            res.members.append(atom)
+            atoms.append(atom)
+        chain.res.append(res)
+        residues.append(res)
+    return SimpleNamespace(
+        atoms=lambda: iter(atoms),
+        chains=lambda: iter(
+            SimpleNamespace(id=c.id, residues=lambda c=c: iter(c.res))
+            for c in chains.values()
+        ),
+        bonds=lambda: iter([(atoms[0], atoms[1]), (atoms[1], atoms[7])]),
+        getPeriodicBoxVectors=lambda: None,
+    )
+
+
+class TestSelectAtoms:
+    @pytest.mark.parametrize(
+        "selection, expected",
+        [
+            ("protein", [0, 1, 2, 3, 4]),
+            ("backbone", [0, 1, 2, 3]),
+            ("water", [7, 8, 9, 10, 11, 12]),
+            ("ions", [13, 14]),
+            ("solute", [0, 1, 2, 3, 4, 5, 6]),
+            ("protein or resname lig", [0, 1, 2, 3, 4, 5, 6]),
+            ("name CA or chain B and not name O1", [1, 5]),
+            ("solvent and not water", [13, 14]),
+            ("index 0-1, 14", [0, 1, 14]),
+        ],
+    )
+    def test_selections(self, selection, expected):
+        assert select_atoms(_topology(), selection) == expected
+
+    def test_empty_and_unknown_selections(self):
+        with pytest.raises(ValueError, match="matches no atoms"):
+            select_atoms(_topology(), "resname POPC")
+        with pytest.raises(ValueError, match="Unknown atom selection"):
+            select_atoms(_topology(), "lipids")
+
+
+class TestSubsetTopology:
+    def test_keeps_selected_atoms_and_their_bonds(self):
+        sub = subset_topology(_topology(), [0, 1, 5, 6])
+        assert [a.name for a in sub.atoms()] == ["N", "CA", "C1", "O1"]
+        assert [c.id for c in sub.chains()] == ["A", "B"]
+        assert [r.name for r in sub.residues()] == ["ALA", "LIG"]
+        assert sub.getNumBonds() == 1  # N-CA; CA-water O loses its partner
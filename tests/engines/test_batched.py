@@ -0,0 +1,75 @@
+# tests/engines/test_batched.py
+
+import itertools
+import math
+from unittest.mock import Mock
+
+import pytest
+
+from fastmdsimulation.engines.batched import (
+    batch_settings,
+    cell_size,
+    centroid,
+    copy_dof,
+    grid_offsets,
+    kinetic_temperature,
+)
+
+
+class TestBatchSettings:
+    def test_off_by_default(self):
+        assert batch_settings({})["size"] == 0
+        assert batch_settings({"batch": False})["size"] == 0
+
+    def test_int_and_mapping(self):
+        assert batch_settings({"batch": 8})["size"] == 8
+        s = batch_settings({"batch": {"size": 4, "spacing_nm": 3}})
+        assert s == {"size": 4, "spacing_nm": 3.0, "restraint_k": 100.0}
+
+    def test_negative_size_rejected(self):
+        with pytest.raises(ValueError):
+            batch_settings({"batch": -1})
+
+
+class TestLayout:
+    @pytest.mark.parametrize("n", [1, 8, 9, 27, 64])
+    def test_grid_cells_are_distinct_and_spaced(self, n):
+        cell = 5.0
+        offs = grid_offsets(n, cell)
+        assert len(set(offs)) == n
+        for a, b in itertools.combinations(offs, 2):
+            assert math.dist(a, b) >= cell - 1e-9
+
+    def test_grid_is_compact(self):
+        offs = grid_offsets(27, 1.0)
+        assert max(max(o) for o in offs) == 2.0
+
+    def test_cell_size(self):
+        assert cell_size([2.0, 3.5], 1.2, 2.0) == pytest.approx(6.7)
+
+    def test_centroid(self):
+        assert centroid([(0, 0, 0), (2, 4, 6)]) == (1.0, 2.0, 3.0)
+
+
+class TestKineticTemperature:
+    def test_equipartition(self):
+        # 3N/2 kT of kinetic energy at 300 K
+        dof = 300
+        ke = 0.5 * dof * 0.0083144626 * 300.0
+        assert kinetic_temperature(ke, dof) == pytest.approx(300.0)
+
+    def test_zero_dof(self):
+        assert kinetic_temperature(1.0, 0) == 0.0
+
+
+class TestCopyDof:
+    def test_no_com_correction(self):
+        pytest.importorskip("openmm")
+        from openmm import unit
+
+        masses = [12.0, 1.0, 0.0]  # the massless site has no degrees of freedom
+        system = Mock()
+        system.getNumParticles.return_value = len(masses)
+        system.getParticleMass.side_effect = lambda i: masses[i] * unit.dalton
+        system.getNumConstraints.return_value = 1
+        assert copy_dof(system) == 5
@@ -0,0 +1,54 @@
+# tests/engines/test_forcefield_cache.py
+
+import os
+from unittest.mock import patch
+
+from fastmdsimulation.engines import openmm_engine
+from fastmdsimulation.engines.openmm_engine import _ff_stamp, _load_forcefield
+
+
+def _xml(tmp_path, name="ff.xml"):
+    p = tmp_path / name
+    p.write_text("<ForceField/>")
+    return str(p)
+
+
+@patch("fastmdsimulation.engines.openmm_engine._parse_forcefield")
+class TestForceFieldMemo:
+    def test_same_files_parse_once(self, mock_parse, tmp_path):
+        mock_parse.return_value = {"ff": 1}
+        files = [_xml(tmp_path, "a.xml"), _xml(tmp_path, "b.xml")]
+
+        first = _load_forcefield(files)
+        second = _load_forcefield(list(files))
+
+        assert first is second
+        mock_parse.assert_called_once_with(tuple(files))
+
+    def test_mtime_change_invalidates(self, mock_parse, tmp_path):
+        mock_parse.side_effect = [{"v": 1}, {"v": 2}]
+        f = _xml(tmp_path)
+        assert _load_forcefield([f]) == {"v": 1}
+        st = os.stat(f)
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert _load_forcefield([f]) == {"v": 2}
+
+    def test_unresolvable_files_are_not_memoized(self, mock_parse, tmp_path):
+        mock_parse.side_effect = [{"v": 1}, {"v": 2}]
+        assert _ff_stamp(["no-such-ff.xml"]) is None
+        _load_forcefield(["no-such-ff.xml"])
+        _load_forcefield(["no-such-ff.xml"])
+        assert mock_parse.call_count == 2
+
+    def test_disk_cache_survives_a_fresh_process(
+        self, mock_parse, tmp_path, monkeypatch
+    ):
+        monkeypatch.setenv("FASTMDS_FORCEFIELD_CACHE", "disk")
+        mock_parse.return_value = {"parsed": True}
+        f = _xml(tmp_path)
+
+        _load_forcefield([f])
+        openmm_engine._FF_CACHE.clear()  # what a new worker process starts with
+        assert _load_forcefield([f]) == {"parsed": True}
+
+        mock_parse.assert_called_once()
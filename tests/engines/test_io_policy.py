@@ -0,0 +1,61 @@
+# tests/engines/test_io_policy.py
+
+import pytest
+
+from fastmdsimulation.engines.io_policy import derive_intervals, policy_settings
+
+GB = 1024**3
+
+
+class TestSettings:
+    def test_off_without_budgets(self):
+        assert policy_settings({}, {}) is None
+        assert policy_settings({}, {"reporting": {}}) is None
+
+    def test_stage_overrides_defaults(self):
+        p = policy_settings(
+            {"reporting": {"overhead_pct": 1}},
+            {"reporting": {"traj_budget_gb": 5, "overhead_pct": 2, "run_steps": 10}},
+        )
+        assert p == {"traj_budget_gb": 5.0, "overhead_pct": 1.0, "run_steps": 10}
+
+    def test_non_positive_rejected(self):
+        with pytest.raises(ValueError, match="positive"):
+            policy_settings({}, {"reporting": {"traj_budget_gb": 0}})
+
+
+class TestDerive:
+    def test_trajectory_budget_coarsens_dcd(self):
+        # 200k atoms x 12 B = 2.4 MB per frame; 1M steps at every 500 would be 4.8 GB
+        policy = {"traj_budget_gb": 1.0, "overhead_pct": None, "run_steps": 0}
+        out = derive_intervals(policy, 200_000, 1_000_000, 500, 10_000)
+        assert out["traj_bytes"] <= 1.0 * GB
+        assert out["dcd_interval"] % 100 == 0 and out["dcd_interval"] > 500
+        assert out["state_interval"] == 500
+        assert out["checkpoint_interval"] == 10_000
+
+    def test_run_budget_shared_by_steps(self):
+        policy = {"traj_budget_gb": 1.0, "overhead_pct": None, "run_steps": 4_000_000}
+        out = derive_intervals(policy, 200_000, 1_000_000, 500, 10_000)
+        assert out["traj_budget_bytes"] == GB // 4
+        assert out["traj_bytes"] <= GB / 4
+
+    def test_hand_set_interval_is_the_finest(self):
+        policy = {"traj_budget_gb": 100.0, "overhead_pct": None, "run_steps": 0}
+        out = derive_intervals(policy, 1000, 100_000, 5000, 10_000)
+        assert out["dcd_interval"] == 5000
+
+    def test_overhead_budget(self):
+        timings = {"step": 0.001, "dcd": 0.01, "state": 0.001, "checkpoint": 0.05}
+        policy = {"traj_budget_gb": None, "overhead_pct": 2.0, "run_steps": 0}
+        out = derive_intervals(policy, 1000, 1_000_000, 100, 1000, timings)
+        # 2% of 1 ms = 20 us per step; dcd gets half: 10 ms / 10 us = 1000 steps
+        assert out["dcd_interval"] == 1000
+        assert out["state_interval"] == 200
+        assert out["checkpoint_interval"] == 10_000
+        assert out["overhead_pct"] <= 2.0
+
+    def test_short_stage_keeps_one_frame(self):
+        policy = {"traj_budget_gb": 1e-6, "overhead_pct": None, "run_steps": 0}
+        out = derive_intervals(policy, 100_000, 5000, 1000, 10_000)
+        assert out["dcd_interval"] == 5000 and out["frames"] == 1
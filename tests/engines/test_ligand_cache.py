@@ -0,0 +1,44 @@
+# tests/engines/test_ligand_cache.py
+
+import json
+
+from fastmdsimulation.engines.openmm_engine import _ligand_cache_path, _ligand_cached
+
+
+class TestLigandCachePath:
+    def test_global_default_per_forcefield(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FASTMDS_CACHE_DIR", str(tmp_path))
+        a = _ligand_cache_path({}, {}, "openff-2.2.1")
+        b = _ligand_cache_path({}, {}, "gaff-2.11")
+        assert a.parent == tmp_path / "openff"
+        assert a.name.startswith("openff-2.2.1-openmmforcefields-")
+        assert a != b
+
+    def test_project_level_path(self, tmp_path):
+        path = tmp_path / "proj" / "ligands.json"
+        assert _ligand_cache_path({}, {"ligand_cache": str(path)}, "x") == path
+        assert path.parent.is_dir()
+
+    def test_disabled(self, monkeypatch):
+        assert _ligand_cache_path({"ligand_cache": False}, {}, "x") is None
+        assert _ligand_cache_path({}, {"ligand_cache": "off"}, "x") is None
+        monkeypatch.setenv("FASTMDS_CACHE", "0")
+        assert _ligand_cache_path({}, {}, "x") is None
+
+
+class TestLigandCached:
+    def test_detects_stored_smiles(self, tmp_path):
+        db = tmp_path / "db.json"
+        assert _ligand_cached(db, "CCO") is False
+        smiles = "[H][C@@]1(O)C/C=C\\\\C1"
+        db.write_text(json.dumps({"openff": {"1": {"smiles": smiles, "ffxml": ""}}}))
+        assert _ligand_cached(db, smiles) is True
+        assert _ligand_cached(db, "c1ccccc1") is False
+
+    def test_exact_match_only(self, tmp_path):
+        db = tmp_path / "db.json"
+        db.write_text(json.dumps({"openff": {"1": {"smiles": "CCOC", "ffxml": ""}}}))
+        assert _ligand_cached(db, "CCOC") is True
+        assert _ligand_cached(db, "CCO") is False
+        db.write_text("not json")
+        assert _ligand_cached(db, "CCO") is False
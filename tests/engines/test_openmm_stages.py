@@ -1,6 +1,6 @@
 from unittest.mock import Mock, patch
 
-from fastmdsimulation.engines.openmm_engine import run_stage
+from fastmdsimulation.engines.openmm_engine import restore_completed_stages, run_stage
 
 # import pytest
 
@@ -122,3 +122,28 @@ class TestRunStage:
 
             # Should not add barostat for NVT
             mock_sim.system.addForce.assert_not_called()
+
+
+@patch("fastmdsimulation.engines.openmm_engine._configure_stage_forces")
+class TestRestoreCompletedStages:
+    def test_prefers_serialized_state(self, mock_forces, tmp_path):
+        (tmp_path / "minimize").mkdir()
+        (tmp_path / "minimize" / "state.chk").write_bytes(b"chk")
+        (tmp_path / "minimize" / "state.xml").write_text("<State/>")
+        sim = Mock()
+
+        restore_completed_stages(
+            sim, [({"name": "minimize"}, tmp_path / "minimize")], {}
+        )
+
+        sim.loadState.assert_called_once_with(str(tmp_path / "minimize" / "state.xml"))
+        sim.loadCheckpoint.assert_not_called()
+
+    def test_falls_back_to_checkpoint(self, mock_forces, tmp_path):
+        (tmp_path / "nvt").mkdir()
+        sim = Mock()
+
+        restore_completed_stages(sim, [({"name": "nvt"}, tmp_path / "nvt")], {})
+
+        sim.loadCheckpoint.assert_called_once_with(str(tmp_path / "nvt" / "state.chk"))
+        sim.loadState.assert_not_called()
@@ -0,0 +1,148 @@
+# tests/engines/test_platform_tune.py
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from fastmdsimulation.engines import platform_tune
+from fastmdsimulation.engines.platform_tune import (
+    atom_bucket,
+    candidates,
+    load_decision,
+    store_decision,
+    time_candidate,
+    tune_platform,
+)
+
+
+class _Platform:
+    def __init__(self, name, props):
+        self.name, self.props = name, props
+
+    def getName(self):
+        return self.name
+
+    def getPropertyNames(self):
+        return self.props
+
+
+_PLATFORMS = {
+    "Reference": _Platform("Reference", []),
+    "CPU": _Platform("CPU", ["Threads"]),
+    "CUDA": _Platform("CUDA", ["CudaDeviceIndex", "CudaPrecision"]),
+}
+
+
+@pytest.fixture
+def platforms(monkeypatch):
+    names = list(_PLATFORMS)
+    monkeypatch.setattr("openmm.Platform.getNumPlatforms", lambda: len(names))
+    monkeypatch.setattr("openmm.Platform.getPlatform", lambda i: _PLATFORMS[names[i]])
+    monkeypatch.setattr("openmm.Platform.getPlatformByName", lambda n: _PLATFORMS[n])
+    monkeypatch.setattr(platform_tune, "cpu_budget", lambda: 8)
+    monkeypatch.setattr(platform_tune, "hardware_fingerprint", lambda: "node-a")
+
+
+def _system(atoms):
+    system = Mock()
+    system.getNumParticles.return_value = atoms
+    return system
+
+
+class TestCacheKey:
+    @pytest.mark.parametrize(
+        "atoms,bucket", [(1, "1-1"), (23558, "16384-32767"), (32768, "32768-65535")]
+    )
+    def test_atom_bucket(self, atoms, bucket):
+        assert atom_bucket(atoms) == bucket
+
+    def test_decisions_stored_per_bucket(self):
+        store_decision("fp", 20000, {"platform": "CUDA", "properties": {}})
+        assert load_decision("fp", 30000)["platform"] == "CUDA"
+        assert load_decision("fp", 40000) is None
+        assert load_decision("other", 20000) is None
+
+
+class TestTune:
+    def test_candidates_vary_precision_and_threads(self, platforms):
+        got = candidates({"CudaDeviceIndex": "1"})
+        assert got == [
+            ("CPU", {"Threads": "4"}),
+            ("CPU", {"Threads": "8"}),
+            ("CUDA", {"CudaPrecision": "mixed", "CudaDeviceIndex": "1"}),
+            ("CUDA", {"CudaPrecision": "single", "CudaDeviceIndex": "1"}),
+        ]
+
+    def test_fastest_picked_cached_and_reused(self, platforms, caplog):
+        rates = {("CPU", "4"): 40.0, ("CPU", "8"): 90.0, ("CUDA", "mixed"): 60.0}
+
+        def timed(system, integrator, positions, name, props):
+            key = (name, props.get("Threads") or props.get("CudaPrecision"))
+            if key not in rates:
+                raise RuntimeError("no device")
+            return rates[key]
+
+        with patch.object(platform_tune, "time_candidate", side_effect=timed) as t:
+            picked = tune_platform(_system(5000), Mock(), positions=[])
+            assert picked == ("CPU", {"Threads": "8"})
+            assert t.call_count == 4
+
+            again = tune_platform(_system(6000), Mock(), positions=None)
+            assert again == picked
+            assert t.call_count == 4  # same bucket: no re-measurement
+
+        decision = load_decision("node-a", 5000)
+        assert len(decision["measurements"]) == 3
+        assert decision["ns_per_day"] == 90.0
+
+    def test_nothing_measurable_falls_back_to_auto(self, platforms):
+        with patch.object(
+            platform_tune, "time_candidate", side_effect=RuntimeError("x")
+        ):
+            assert tune_platform(_system(100), Mock(), [], {"Threads": "2"}) == (
+                "auto",
+                {"Threads": "2"},
+            )
+        assert load_decision("node-a", 100) is None
+
+    def test_no_positions_and_no_decision(self, platforms):
+        assert tune_platform(_system(100), Mock(), None) == ("auto", {})
+
+
+class _Integrator:
+    def __init__(self, events):
+        self.events = events
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def step(self, n):
+        self.events.append("step")
+
+    def getTemperature(self):
+        return 300.0
+
+    def getStepSize(self):
+        return Mock(value_in_unit=lambda u: 2.0)
+
+
+def test_burst_runs_on_relaxed_positions(platforms, monkeypatch):
+    events = []
+    context = Mock()
+    context.setVelocitiesToTemperature.side_effect = lambda t: events.append("vel")
+    monkeypatch.setattr("openmm.Context", lambda *a: context, raising=False)
+    monkeypatch.setattr(
+        "openmm.LocalEnergyMinimizer.minimize",
+        lambda ctx, tol, its: events.append(("minimize", ctx, its)),
+        raising=False,
+    )
+    monkeypatch.setattr(platform_tune, "BURST_S", 0.0)
+
+    rate = time_candidate(_system(10), _Integrator(events), [], "CPU", {})
+
+    assert rate > 0
+    assert events[:3] == [
+        ("minimize", context, platform_tune.RELAX_ITERATIONS),
+        "vel",
+        "step",
+    ]
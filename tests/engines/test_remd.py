@@ -0,0 +1,86 @@
+# tests/engines/test_remd.py
+
+import json
+import math
+import random
+
+import pytest
+
+from fastmdsimulation.engines.remd import (
+    K_B,
+    attempt_exchanges,
+    exchange_probability,
+    run_exchanges,
+)
+
+
+class FakeReplica:
+    """In-process stand-in for a replica worker: energy follows the configuration."""
+
+    def __init__(self, energy):
+        self.energy = energy
+        self.temperature_calls = []
+        self.steps = 0
+        self.finished = False
+
+    def send_step(self, n):
+        self.steps += n
+
+    def recv_energy(self):
+        return self.energy
+
+    def set_temperature(self, new_k, old_k):
+        self.temperature_calls.append((new_k, old_k))
+
+    def finish(self):
+        self.finished = True
+
+
+class TestExchangeCriterion:
+    def test_downhill_swap_always_accepted(self):
+        # the hotter replica has the lower energy: swapping is favourable
+        assert exchange_probability(300.0, 310.0, -100.0, -200.0) == 1.0
+
+    def test_uphill_swap_probability(self):
+        p = exchange_probability(300.0, 310.0, -200.0, -100.0)
+        expected = math.exp((1 / (K_B * 300) - 1 / (K_B * 310)) * (-100.0))
+        assert p == pytest.approx(expected)
+        assert 0.0 < p < 1.0
+
+    def test_alternating_neighbour_pairs(self):
+        temps = [300, 310, 320, 330]
+        at_temp = [0, 1, 2, 3]
+        energies = [0.0, -1e6, 0.0, -1e6]  # every even pair swaps
+        even = attempt_exchanges(temps, at_temp, energies, 0, random.Random(0))
+        assert [a[0] for a in even] == [0, 2]
+        assert at_temp == [1, 0, 3, 2]
+        odd = attempt_exchanges(temps, at_temp, energies, 1, random.Random(0))
+        assert [a[0] for a in odd] == [1]
+
+
+class TestRunExchanges:
+    def test_logs_and_temperature_updates(self, tmp_path):
+        reps = [FakeReplica(0.0), FakeReplica(-1e6), FakeReplica(0.0)]
+        summary = run_exchanges(
+            reps, [300.0, 320.0, 340.0], steps=5000, interval=1000, out_dir=tmp_path
+        )
+
+        assert all(r.steps == 5000 and r.finished for r in reps)
+        # cycle 0 swaps replicas 0 and 1 (favourable), later cycles as energies dictate
+        assert reps[0].temperature_calls[0] == (320.0, 300.0)
+        assert reps[1].temperature_calls[0] == (300.0, 320.0)
+        assert summary["cycles"] == 4
+        assert summary["acceptance"][0]["attempted"] == 2
+        assert summary["lowest_T_ns_per_worker_hour"] > 0
+
+        lines = (tmp_path / "exchanges.log").read_text().splitlines()
+        assert lines[0].startswith("# cycle")
+        assert len(lines) == 1 + 4  # pairs (0), (1), (0), (1)
+        tmap = (tmp_path / "temperatures.tsv").read_text().splitlines()
+        assert tmap[1].split("\t") == ["1000", "320.0", "300.0", "340.0"]
+        assert json.loads((tmp_path / "remd.json").read_text())["steps"] == 5000
+
+    def test_final_chunk_is_shortened(self, tmp_path):
+        reps = [FakeReplica(0.0), FakeReplica(0.0)]
+        run_exchanges(reps, [300.0, 310.0], steps=2500, interval=1000, out_dir=tmp_path)
+        assert reps[0].steps == 2500
@@ -0,0 +1,131 @@
+import struct
+
+from fastmdsimulation.engines.resume import (
+    frames_through,
+    read_progress,
+    truncate_dcd,
+    truncate_state_log,
+    truncate_xtc,
+    write_progress,
+)
+
+
+def _write_dcd(path, natoms, nframes, *, box=True, first_step=1000, interval=1000):
+    """Write a DCD with the same layout as openmm.app.DCDFile."""
+    header = struct.pack(
+        "<i4c9if",
+        84,
+        b"C",
+        b"O",
+        b"R",
+        b"D",
+        nframes,
+        first_step,
+        interval,
+        first_step + nframes * interval,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0.002,
+    )
+    header += struct.pack("<13i", int(box), 0, 0, 0, 0, 0, 0, 0, 0, 24, 84, 164, 2)
+    header += struct.pack("<80s", b"Created by OpenMM")
+    header += struct.pack("<80s", b"Created today")
+    header += struct.pack("<4i", 164, 4, natoms, 4)
+    body = b""
+    for frame in range(nframes):
+        if box:
+            body += struct.pack("<i6di", 48, 20.0, 0.0, 20.0, 0.0, 0.0, 20.0, 48)
+        for _ in range(3):
+            body += struct.pack("<i", 4 * natoms)
+            body += struct.pack(f"<{natoms}f", *([float(frame)] * natoms))
+            body += struct.pack("<i", 4 * natoms)
+    path.write_bytes(header + body)
+    return len(header), (56 if box else 0) + 3 * (8 + 4 * natoms)
+
+
+class TestFramesThrough:
+    def test_counts_reports_after_stage_start(self):
+        assert frames_through(0, 5000, 1000) == 5
+        assert frames_through(2500, 5000, 1000) == 3
+        assert frames_through(5000, 5000, 1000) == 0
+
+    def test_non_positive_interval(self):
+        assert frames_through(0, 5000, 0) == 0
+
+
+class TestTruncateDcd:
+    def test_truncates_frames_and_header_count(self, tmp_path):
+        dcd = tmp_path / "traj.dcd"
+        header_len, frame_len = _write_dcd(dcd, natoms=3, nframes=5)
+
+        assert truncate_dcd(dcd, 2) == 2
+
+        data = dcd.read_bytes()
+        assert len(data) == header_len + 2 * frame_len
+        assert struct.unpack("<i", data[8:12])[0] == 2
+        assert struct.unpack("<i", data[20:24])[0] == 1000 + 2 * 1000
+
+    def test_drops_partial_trailing_frame(self, tmp_path):
+        dcd = tmp_path / "traj.dcd"
+        header_len, frame_len = _write_dcd(dcd, natoms=4, nframes=3, box=False)
+        with open(dcd, "ab") as f:
+            f.write(b"\0" * (frame_len // 2))
+
+        assert truncate_dcd(dcd, 10) == 3
+        assert len(dcd.read_bytes()) == header_len + 3 * frame_len
+
+    def test_missing_file(self, tmp_path):
+        assert truncate_dcd(tmp_path / "none.dcd", 3) == 0
+
+
+def _xtc_frame(step, natoms=3):
+    """An uncompressed XTC frame (xdrfile stores <= 9 atoms as plain floats)."""
+    head = struct.pack(">3if", 1995, natoms, step, step * 0.002)
+    head += struct.pack(">9f", 3, 0, 0, 0, 3, 0, 0, 0, 3) + struct.pack(">i", natoms)
+    return head + struct.pack(f">{3 * natoms}f", *range(3 * natoms))
+
+
+class TestTruncateXtc:
+    def test_keeps_whole_frames(self, tmp_path):
+        xtc = tmp_path / "traj.xtc"
+        frames = [_xtc_frame(1000 * k) for k in range(1, 5)]
+        xtc.write_bytes(b"".join(frames) + frames[0][:30])  # torn tail
+
+        assert truncate_xtc(xtc, 10) == 4
+        assert truncate_xtc(xtc, 2) == 2
+        assert xtc.read_bytes() == frames[0] + frames[1]
+
+
+class TestTruncateStateLog:
+    def test_keeps_rows_up_to_step(self, tmp_path):
+        log = tmp_path / "state.log"
+        log.write_text(
+            '#"Progress (%)","Step","Potential Energy (kJ/mole)"\n'
+            "10.0%,1000,-5.0\n"
+            "20.0%,2000,-6.0\n"
+            "30.0%,3000,-7.0\n"
+            "40.0%,40"
+        )
+
+        assert truncate_state_log(log, 2000) == 2
+        lines = log.read_text().splitlines()
+        assert lines[0].startswith("#")
+        assert [ln.split(",")[1] for ln in lines[1:]] == ["1000", "2000"]
+
+
+class TestProgress:
+    def test_roundtrip(self, tmp_path):
+        write_progress(tmp_path, 4200)
+        assert read_progress(tmp_path) == {"start_step": 4200}
+
+    def test_roundtrip_with_derived_intervals(self, tmp_path):
+        write_progress(tmp_path, 10, reporting={"dcd_interval": 500})
+        assert read_progress(tmp_path)["reporting"] == {"dcd_interval": 500}
+
+    def test_missing_or_corrupt(self, tmp_path):
+        assert read_progress(tmp_path) is None
+        (tmp_path / "progress.json").write_text("{not json")
+        assert read_progress(tmp_path) is None
@@ -0,0 +1,135 @@
+# tests/engines/test_system_cache.py
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from fastmdsimulation.engines import system_cache
+from fastmdsimulation.engines.openmm_engine import build_simulation_from_spec
+
+
+def _fake_save(sim, d):
+    (Path(d) / "system.xml").write_text("<System/>")
+    (Path(d) / "state.xml").write_text("<State/>")
+
+
+def _fake_build(pdb, defaults, run_dir):
+    (run_dir / "topology.pdb").write_text("ATOM\n")
+    return Mock(name="built")
+
+
+class TestSystemCacheKey:
+    def test_content_not_path_and_temperature_ignored(self, tmp_path):
+        a = tmp_path / "a" / "x.pdb"
+        b = tmp_path / "b" / "y.pdb"
+        for p in (a, b):
+            p.parent.mkdir()
+            p.write_text("ATOM\n")
+        d = {"forcefield": ["amber14-all.xml"], "temperature_K": 300}
+        ka = system_cache.system_cache_key({"id": "a", "pdb": str(a)}, d, "pdb")
+        kb = system_cache.system_cache_key(
+            {"id": "b", "pdb": str(b)}, {**d, "temperature_K": 350}, "pdb"
+        )
+        assert ka == kb
+
+        b.write_text("HETATM\n")
+        assert system_cache.system_cache_key({"pdb": str(b)}, d, "pdb") != ka
+
+    def test_create_system_and_constraints_change_key(self, tmp_path):
+        spec = {"prmtop": str(tmp_path / "p"), "inpcrd": str(tmp_path / "c")}
+        base = system_cache.system_cache_key(spec, {}, "amber")
+        assert base == system_cache.system_cache_key(
+            spec, {"constraints": "HBonds"}, "amber"
+        )
+        assert base != system_cache.system_cache_key(
+            spec, {"create_system": {"hydrogenMass_amu": 3.0}}, "amber"
+        )
+        assert base != system_cache.system_cache_key(
+            spec, {"constraints": "AllBonds"}, "amber"
+        )
+
+    def test_gromacs_include_chain_is_hashed(self, tmp_path):
+        ff = tmp_path / "ff"
+        ff.mkdir()
+        (ff / "lig.itp").write_text("[ moleculetype ]\n")
+        top = tmp_path / "topol.top"
+        top.write_text('#include "lig.itp"\n')
+        spec = {
+            "top": str(top),
+            "gro": str(tmp_path / "c.gro"),
+            "include_dirs": [str(ff)],
+        }
+
+        k1 = system_cache.system_cache_key(spec, {}, "gromacs")
+        (ff / "lig.itp").write_text("[ moleculetype ]\n; changed\n")
+        assert system_cache.system_cache_key(spec, {}, "gromacs") != k1
+
+
+@patch("fastmdsimulation.engines.openmm_engine.restore_simulation")
+@patch(
+    "fastmdsimulation.engines.openmm_engine.save_simulation_bundle",
+    side_effect=_fake_save,
+)
+@patch(
+    "fastmdsimulation.engines.openmm_engine._build_simulation", side_effect=_fake_build
+)
+class TestBuildWithSystemCache:
+    def test_second_build_restores_from_cache(
+        self, mock_build, mock_save, mock_restore, tmp_path
+    ):
+        pdb = tmp_path / "in.pdb"
+        pdb.write_text("ATOM\n")
+        spec = {"id": "s", "pdb": str(pdb)}
+
+        build_simulation_from_spec(spec, {}, tmp_path / "r1")
+        sim = build_simulation_from_spec(spec, {}, tmp_path / "r2")
+
+        mock_build.assert_called_once()
+        mock_restore.assert_called_once()
+        assert sim is mock_restore.return_value
+        assert (tmp_path / "r2" / "topology.pdb").read_text() == "ATOM\n"
+
+    def test_same_input_in_two_projects_hits(
+        self, mock_build, mock_save, mock_restore, tmp_path
+    ):
+        # specs as _prepare_systems leaves them: per-project _build paths
+        for project, replicas in (("p1", 2), ("p2", 4)):
+            fixed = tmp_path / project / "_build" / "s_fixed.pdb"
+            fixed.parent.mkdir(parents=True)
+            fixed.write_text("ATOM\n")
+            spec = {
+                "id": "s",
+                "type": "pdb",
+                "pdb": str(fixed),
+                "fixed_pdb": str(fixed),
+                "source_pdb": str(tmp_path / "in.pdb"),
+                "ph": 7.0,
+                "replicas": replicas,
+            }
+            build_simulation_from_spec(spec, {}, tmp_path / project / "s_T300")
+
+        mock_build.assert_called_once()
+        mock_restore.assert_called_once()
+
+    def test_cache_disabled(self, mock_build, mock_save, mock_restore, tmp_path):
+        pdb = tmp_path / "in.pdb"
+        pdb.write_text("ATOM\n")
+        spec = {"pdb": str(pdb)}
+        for r in ("r1", "r2"):
+            build_simulation_from_spec(spec, {}, tmp_path / r, use_cache=False)
+        assert mock_build.call_count == 2
+        mock_restore.assert_not_called()
+
+    def test_size_bound_evicts_older_entries(
+        self, mock_build, mock_save, mock_restore, tmp_path, monkeypatch
+    ):
+        monkeypatch.setenv("FASTMDS_SYSTEM_CACHE_MAX_MB", "0.00001")  # ~10 bytes
+        for i in range(3):
+            pdb = tmp_path / f"in{i}.pdb"
+            pdb.write_text(f"ATOM {i}\n")
+            build_simulation_from_spec({"pdb": str(pdb)}, {}, tmp_path / f"r{i}")
+        entries = [
+            p
+            for p in (system_cache.cache_dir(system_cache.KIND)).iterdir()
+            if not p.name.startswith(".")
+        ]
+        assert len(entries) == 1
@@ -0,0 +1,240 @@
+# tests/engines/test_trajectory.py
+
+import struct
+import threading
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# flake8 E402: allow import guard before heavy deps
+np = pytest.importorskip("numpy")
+pytest.importorskip("openmm")
+
+from openmm import unit  # noqa: E402
+
+from fastmdsimulation.engines.resume import truncate_dcd, truncate_hdf5  # noqa: E402
+from fastmdsimulation.engines.trajectory import (  # noqa: E402
+    AsyncTrajectoryReporter,
+    CheckpointBarrier,
+    _DCDSink,
+    trajectory_path,
+    trajectory_reporter,
+    trajectory_settings,
+)
+
+ATOMS = 5
+
+
+def _writer(path, append=False, **kw):
+    return AsyncTrajectoryReporter(_DCDSink(path, 10, append), 10, **kw)
+
+
+def _sim(step=0, box=True):
+    sim = Mock()
+    sim.currentStep = step
+    sim.topology.getNumAtoms.return_value = ATOMS
+    sim.topology.chains.return_value = []
+    sim.topology.bonds.return_value = []
+    sim.topology.getPeriodicBoxVectors.return_value = (
+        np.eye(3) * 3.0 * unit.nanometer if box else None
+    )
+    sim.integrator.getStepSize.return_value = 2.0 * unit.femtoseconds
+    return sim
+
+
+def _state(value):
+    state = Mock()
+    pos = np.full((ATOMS, 3), float(value))
+    state.getPositions.return_value = pos * unit.nanometer
+    state.getPeriodicBoxVectors.return_value = np.eye(3) * 3.0 * unit.nanometer
+    return state
+
+
+def _frames(path):
+    """(nset, [x row of each frame]) of a DCD with a unit cell record."""
+    data = path.read_bytes()
+    nset = struct.unpack("<i", data[8:12])[0]
+    frame_len = 56 + 3 * (8 + 4 * ATOMS)
+    xs = []
+    for k in range(nset):
+        row = 276 + k * frame_len + 56 + 4
+        xs.append(np.frombuffer(data[row : row + 4 * ATOMS], dtype="<f4"))
+    return nset, xs
+
+
+class TestSettings:
+    def test_off_by_default(self):
+        assert trajectory_settings({}, {})["async"] is False
+
+    def test_stage_overrides_defaults(self):
+        got = trajectory_settings(
+            {"trajectory": {"buffer_frames": 8}},
+            {"trajectory": {"async": True, "buffer_frames": 2}},
+        )
+        assert got == {
+            "format": "dcd",
+            "precision": None,
+            "async": True,
+            "buffer_frames": 8,
+            "fsync_every": 16,
+            "groups": [],
+        }
+
+    def test_format_alias_and_unknown(self):
+        assert trajectory_settings({"trajectory": {"format": "H5"}}, {})["format"] == (
+            "hdf5"
+        )
+        with pytest.raises(ValueError, match="netcdf"):
+            trajectory_settings({"trajectory": {"format": "netcdf"}}, {})
+
+    def test_groups_inherit_writer_settings(self):
+        got = trajectory_settings(
+            {},
+            {
+                "trajectory": {
+                    "format": "xtc",
+                    "async": True,
+                    "groups": {
+                        "solute": {"select": "solute", "interval": 100},
+                        "ca": {"select": "name CA", "interval": 50, "format": "dcd"},
+                    },
+                }
+            },
+        )
+        ca, solute = got["groups"]
+        assert (ca["name"], ca["format"], ca["interval"]) == ("ca", "dcd", 50)
+        assert (solute["format"], solute["async"]) == ("xtc", True)
+        assert trajectory_path(Path("run"), solute) == Path("run/traj.solute.xtc")
+
+    @pytest.mark.parametrize(
+        "groups",
+        [{"a b": {"select": "all", "interval": 1}}, {"x": {"select": "all"}}],
+    )
+    def test_bad_groups_rejected(self, groups):
+        with pytest.raises(ValueError, match="group"):
+            trajectory_settings({"trajectory": {"groups": groups}}, {})
+
+    def test_empty_buffer_rejected(self):
+        with pytest.raises(ValueError, match="buffer_frames"):
+            trajectory_settings({"trajectory": {"buffer_frames": 0}}, {})
+
+
+class TestAsyncTrajectoryReporter:
+    def test_frames_written_in_order_and_resume_compatible(self, tmp_path):
+        path = tmp_path / "traj.dcd"
+        rep = _writer(path, buffer_frames=2, fsync_every=3)
+        sim = _sim()
+        assert rep.describeNextReport(sim)[:2] == (10, True)
+        for k in range(5):
+            rep.report(sim, _state(k))
+        rep.close()
+
+        nset, xs = _frames(path)
+        assert nset == 5
+        assert [float(x[0]) for x in xs] == [0.0, 10.0, 20.0, 30.0, 40.0]  # A
+        assert truncate_dcd(path, 3) == 3
+
+    def test_append_continues_frame_count(self, tmp_path):
+        path = tmp_path / "traj.dcd"
+        for attempt in range(2):
+            rep = _writer(path, append=attempt == 1)
+            for k in range(2):
+                rep.report(_sim(), _state(attempt * 2 + k))
+            rep.close()
+        nset, xs = _frames(path)
+        assert nset == 4 and float(xs[3][0]) == 30.0
+
+    def test_back_pressure_bounds_the_buffer(self, tmp_path):
+        rep = _writer(tmp_path / "traj.dcd", buffer_frames=2)
+        gate = threading.Event()
+        write = rep._sink.write
+        rep._sink.write = lambda *frame: (gate.wait(), write(*frame))
+        sim = _sim()
+        rep.report(sim, _state(0))
+        rep.report(sim, _state(1))
+        third = threading.Thread(target=rep.report, args=(sim, _state(2)))
+        third.start()
+        third.join(0.2)
+        assert third.is_alive()  # ring full: the simulation thread waits
+        gate.set()
+        third.join(5)
+        assert not third.is_alive()
+        rep.close()
+        assert _frames(tmp_path / "traj.dcd")[0] == 3
+
+    def test_writer_error_surfaces_in_simulation_thread(self, tmp_path):
+        rep = _writer(tmp_path / "traj.dcd")
+        rep.report(_sim(), _state(float("nan")))
+        with pytest.raises(RuntimeError, match="NaN"):
+            rep.close()
+
+    def test_checkpoint_waits_for_buffered_frames(self, tmp_path):
+        path = tmp_path / "traj.dcd"
+        rep = _writer(path, buffer_frames=4, fsync_every=0)
+        checkpoint = Mock()
+        barrier = CheckpointBarrier(checkpoint, [rep])
+        sim = _sim()
+        for k in range(3):
+            rep.report(sim, _state(k))
+        written = []
+        checkpoint.report.side_effect = lambda s, st: written.append(_frames(path)[0])
+        barrier.report(sim, Mock())
+        assert written == [3]
+        rep.close()
+
+
+class TestHDF5:
+    def test_lossy_chunked_compressed_and_truncatable(self, tmp_path):
+        h5py = pytest.importorskip("h5py")
+        path = tmp_path / "traj.h5"
+        settings = trajectory_settings(
+            {"trajectory": {"format": "hdf5", "precision": 0.001}}, {}
+        )
+        rep = trajectory_reporter(path, settings, 10)
+        sim = _sim()
+        for k in range(3):
+            sim.currentStep = 10 * (k + 1)
+            rep.report(sim, _state(k + 0.12345))
+        rep.close()
+
+        with h5py.File(path, "r") as h5:
+            coords = h5["coordinates"]
+            assert coords.shape == (3, ATOMS, 3)
+            assert coords.chunks is not None and coords.compression == "gzip"
+            assert abs(float(coords[2, 0, 0]) - 2.12345) <= 0.001
+            assert list(h5["time"][:]) == pytest.approx([0.02, 0.04, 0.06])
+            assert h5.attrs["conventions"] == "Pande"
+        assert truncate_hdf5(path, 2) == 2
+        with h5py.File(path, "r") as h5:
+            assert h5["coordinates"].shape[0] == h5["time"].shape[0] == 2
+
+
+class TestSubset:
+    def test_subset_writer_keeps_selected_atoms(self, tmp_path, monkeypatch):
+        from fastmdsimulation.engines import atom_selection
+
+        subsets = []
+        sub = _sim().topology
+        sub.getNumAtoms.return_value = 2
+        monkeypatch.setattr(
+            atom_selection,
+            "subset_topology",
+            lambda top, idx: subsets.append(idx) or sub,
+        )
+        path = tmp_path / "traj.ca.dcd"
+        rep = trajectory_reporter(
+            path, trajectory_settings({}, {}), 10, atom_subset=[3, 1]
+        )
+        sim = _sim()
+        state = _state(0)
+        pos = np.arange(ATOMS * 3, dtype=float).reshape(ATOMS, 3)
+        state.getPositions.return_value = pos * unit.nanometer
+        rep.report(sim, state)
+        rep.close()
+
+        assert subsets == [[1, 3]]
+        data = path.read_bytes()
+        assert struct.unpack("<i", data[268:272])[0] == 2  # atoms in the header
+        x = np.frombuffer(data[276 + 56 + 4 : 276 + 56 + 12], dtype="<f4")
+        assert list(x) == [30.0, 90.0]  # x of atoms 1 and 3, in Angstrom
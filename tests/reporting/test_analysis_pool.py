@@ -0,0 +1,103 @@
+# tests/reporting/test_analysis_pool.py
+
+import threading
+from unittest.mock import Mock, patch
+
+from fastmdsimulation.reporting.analysis_bridge import AnalysisPool, _analyze_one
+
+
+def _run_dir(root, name, production=True):
+    run_dir = root / name
+    prod = run_dir / "production"
+    prod.mkdir(parents=True)
+    if production:
+        (prod / "traj.dcd").write_text("traj")
+        (prod / "topology.pdb").write_text("top")
+    return run_dir
+
+
+@patch(
+    "fastmdsimulation.reporting.analysis_bridge.importlib.util.find_spec",
+    return_value=True,
+)
+class TestAnalysisPool:
+    def test_runs_in_background_and_joins(self, mock_spec, tmp_path):
+        a, b = _run_dir(tmp_path, "a"), _run_dir(tmp_path, "b")
+        threads = set()
+
+        def _fake(cmd, logger, prefix="[fastmda] "):
+            threads.add(threading.current_thread().name)
+            return 0 if "/a/" in cmd[3] else 1
+
+        with patch(
+            "fastmdsimulation.reporting.analysis_bridge._run_and_stream",
+            side_effect=_fake,
+        ):
+            pool = AnalysisPool(2, slides=False)
+            pool.submit(a)
+            pool.submit(b)
+            status = pool.join()
+
+        assert status == {str(a): "ok", str(b): "failed"}
+        assert all(t.startswith("fastmda") for t in threads)
+
+    def test_skips_runs_without_production_and_duplicates(self, mock_spec, tmp_path):
+        a = _run_dir(tmp_path, "a")
+        empty = _run_dir(tmp_path, "empty", production=False)
+        with patch(
+            "fastmdsimulation.reporting.analysis_bridge._run_and_stream",
+            return_value=0,
+        ) as run:
+            pool = AnalysisPool()
+            pool.submit(a)
+            pool.submit(a)
+            pool.submit(empty)
+            assert pool.join() == {str(a): "ok"}
+        assert run.call_count == 1
+
+    def test_not_installed_is_a_no_op(self, mock_spec, tmp_path):
+        mock_spec.return_value = None
+        pool = AnalysisPool()
+        pool.submit(_run_dir(tmp_path, "a"))
+        assert pool.join() == {}
+
+    def test_replicas_analyzed_separately(self, mock_spec, tmp_path):
+        run = tmp_path / "sys_300K"
+        for k in (0, 1, 10):
+            _run_dir(run, f"rep{k}")
+        prefixes = []
+
+        def _fake(cmd, logger, prefix="[fastmda] "):
+            prefixes.append(prefix)
+            return 0
+
+        with patch(
+            "fastmdsimulation.reporting.analysis_bridge._run_and_stream",
+            side_effect=_fake,
+        ):
+            pool = AnalysisPool()
+            pool.submit(run)
+            status = pool.join()
+
+        assert status == {str(run / f"rep{k}"): "ok" for k in (0, 1, 10)}
+        assert prefixes == [f"[fastmda:sys_300K/rep{k}] " for k in (0, 1, 10)]
+
+
+def test_failure_names_the_run(tmp_path):
+    run_dir = _run_dir(tmp_path, "sys_T300")
+    logger = Mock()
+    with patch(
+        "fastmdsimulation.reporting.analysis_bridge._run_and_stream",
+        return_value=1,
+    ):
+        ok = _analyze_one(
+            run_dir,
+            run_dir / "production" / "traj.dcd",
+            run_dir / "production" / "topology.pdb",
+            logger,
+            slides=False,
+            frames=None,
+            atoms=None,
+        )
+    assert not ok
+    logger.error.assert_called_once_with("analysis failed for sys_T300: exit 1")
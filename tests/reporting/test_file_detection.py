@@ -1,6 +1,10 @@
+import os
+
 from fastmdsimulation.reporting.analysis_bridge import (
     _get_production_stage,
+    find_trajectory,
     iter_runs_with_production,
+    planned_trajectory,
 )
 
 
@@ -118,3 +122,47 @@ class TestIterRunsWithProduction:
         assert len(results) == 1
         run_dir, prod_dir, traj, top = results[0]
         assert run_dir.name == "valid_run"
+
+    def test_iter_runs_with_production_replicas(self, tmp_path):
+        """Each rep<k>/production of a run with replicas is yielded."""
+        run_dir = tmp_path / "run1"
+        for rep in ["rep0", "rep1"]:
+            prod_dir = run_dir / rep / "production"
+            prod_dir.mkdir(parents=True)
+            (prod_dir / "traj.dcd").write_text("trajectory")
+            (prod_dir / "topology.pdb").write_text("topology")
+        (run_dir / "rep2" / "production").mkdir(parents=True)  # unfinished
+
+        results = list(iter_runs_with_production(tmp_path))
+
+        assert [r[0] for r in results] == [run_dir / "rep0", run_dir / "rep1"]
+        assert results[1][2] == run_dir / "rep1" / "production" / "traj.dcd"
+
+
+class TestTrajectoryDiscovery:
+    """The production trajectory is found whatever format it was written in."""
+
+    def test_compressed_format_found(self, tmp_path):
+        prod_dir = tmp_path / "run1" / "production"
+        prod_dir.mkdir(parents=True)
+        (prod_dir / "traj.xtc").write_text("trajectory")
+        (prod_dir / "topology.pdb").write_text("topology")
+
+        _, _, traj, _ = list(iter_runs_with_production(tmp_path))[0]
+
+        assert traj == prod_dir / "traj.xtc"
+
+    def test_newest_wins_after_format_change(self, tmp_path):
+        (tmp_path / "traj.dcd").write_text("old")
+        (tmp_path / "traj.h5").write_text("new")
+        os.utime(tmp_path / "traj.dcd", (1, 1))
+
+        assert find_trajectory(tmp_path) == tmp_path / "traj.h5"
+        assert find_trajectory(tmp_path / "missing") is None
+
+    def test_planned_from_stage_or_defaults(self, tmp_path):
+        defaults = {"trajectory": {"format": "xtc"}}
+        assert planned_trajectory(tmp_path, {}, defaults).name == "traj.xtc"
+        stage = {"trajectory": {"format": "h5"}}
+        assert planned_trajectory(tmp_path, stage, defaults).name == "traj.h5"
+        assert planned_trajectory(tmp_path, {}, {}).name == "traj.dcd"
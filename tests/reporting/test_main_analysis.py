@@ -15,7 +15,7 @@ class TestAnalyzeWithBridge:
         ):
             result = analyze_with_bridge(str(tmp_path / "nonexistent"))
 
-            assert result is False
+            assert result == {}
             logger.error.assert_called_once()
 
     def test_analyze_with_bridge_fastmda_not_installed(self, tmp_path):
@@ -34,7 +34,7 @@ class TestAnalyzeWithBridge:
 
             result = analyze_with_bridge(str(tmp_path))
 
-            assert result is False
+            assert result == {}
             logger.warning.assert_called_once_with(
                 "FastMDAnalysis not installed. Install it or omit --analyze."
             )
@@ -63,7 +63,7 @@ class TestAnalyzeWithBridge:
                 str(tmp_path), slides=True, frames="0,-1,10", atoms="protein"
             )
 
-            assert result is True
+            assert result == {str(run_dir): "ok"}
             mock_run_and_stream.assert_called_once()
             logger.info.assert_any_call(
                 "run analysis: fastmda analyze -traj "
@@ -96,7 +96,7 @@ class TestAnalyzeWithBridge:
         ):
             result = analyze_with_bridge(str(tmp_path))
 
-            assert result is True
+            assert result == {str(run_dir): "ok"}
             assert mock_run_and_stream.call_count == 2
             # Verify fallback command was used
             second_call = mock_run_and_stream.call_args_list[1]
@@ -127,7 +127,7 @@ class TestAnalyzeWithBridge:
         ):
             result = analyze_with_bridge(str(tmp_path))
 
-            assert result is False
+            assert result == {str(run_dir): "failed"}
             logger.error.assert_called_once()
 
     @patch("fastmdsimulation.reporting.analysis_bridge._run_and_stream")
@@ -147,7 +147,7 @@ class TestAnalyzeWithBridge:
         ):
             result = analyze_with_bridge(str(tmp_path))
 
-            assert result is False
+            assert result == {}
             logger.warning.assert_called_once_with(
                 "no production stages found or analysis failed; skipping analysis."
             )
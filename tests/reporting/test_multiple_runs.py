@@ -29,7 +29,10 @@ class TestAnalyzeWithBridgeMultipleRuns:
         ):
             result = analyze_with_bridge(str(tmp_path))
 
-            assert result is True
+            assert result == {
+                str(tmp_path / "run1"): "ok",
+                str(tmp_path / "run2"): "ok",
+            }
             assert mock_run_and_stream.call_count == 2  # One for each run
 
     @patch("fastmdsimulation.reporting.analysis_bridge._run_and_stream")
@@ -39,7 +42,7 @@ class TestAnalyzeWithBridgeMultipleRuns:
     ):
         """Test analysis with mix of successful and failed runs."""
         # Setup multiple runs
-        for run_name in ["run_success", "run_fail"]:
+        for run_name in ["run1_success", "run2_fail"]:
             run_dir = tmp_path / run_name
             prod_dir = run_dir / "production"
             prod_dir.mkdir(parents=True)
@@ -47,8 +50,8 @@ class TestAnalyzeWithBridgeMultipleRuns:
             (prod_dir / "topology.pdb").write_text("topology")
 
         mock_find_spec.return_value = True
-        # First run succeeds, second run fails both attempts
-        mock_run_and_stream.side_effect = [0, 1, 1]
+        # First run succeeds (fastmda is then reused), second run fails
+        mock_run_and_stream.side_effect = [0, 1]
 
         logger = MagicMock()
         with patch(
@@ -56,7 +59,66 @@ class TestAnalyzeWithBridgeMultipleRuns:
         ):
             result = analyze_with_bridge(str(tmp_path))
 
-            assert result is True  # At least one succeeded
-            assert (
-                mock_run_and_stream.call_count == 3
-            )  # 1 for first run, 2 for second run
+            assert result == {
+                str(tmp_path / "run1_success"): "ok",
+                str(tmp_path / "run2_fail"): "failed",
+            }
+            # the working command is resolved once: no fallback retry for run2
+            assert mock_run_and_stream.call_count == 2
+
+    @patch("fastmdsimulation.reporting.analysis_bridge._run_and_stream")
+    @patch("fastmdsimulation.reporting.analysis_bridge.importlib.util.find_spec")
+    def test_missing_fastmda_is_tried_once(
+        self, mock_find_spec, mock_run_and_stream, tmp_path
+    ):
+        """A launcher that cannot start (exit 127) is skipped for later runs."""
+        for run_name in ["run1", "run2", "run3"]:
+            prod_dir = tmp_path / run_name / "production"
+            prod_dir.mkdir(parents=True)
+            (prod_dir / "traj.dcd").write_text("trajectory")
+            (prod_dir / "topology.pdb").write_text("topology")
+
+        mock_find_spec.return_value = True
+        mock_run_and_stream.side_effect = lambda cmd, logger, prefix: (
+            127 if cmd[0] == "fastmda" else 0
+        )
+
+        with patch("fastmdsimulation.reporting.analysis_bridge.get_logger"):
+            result = analyze_with_bridge(str(tmp_path))
+
+        assert set(result.values()) == {"ok"}
+        launched = [c.args[0][0] for c in mock_run_and_stream.call_args_list]
+        assert launched.count("fastmda") == 1
+        assert len(launched) == 4
+
+    @patch("fastmdsimulation.reporting.analysis_bridge._run_and_stream")
+    @patch("fastmdsimulation.reporting.analysis_bridge.importlib.util.find_spec")
+    def test_concurrent_workers_with_run_prefixes(
+        self, mock_find_spec, mock_run_and_stream, tmp_path
+    ):
+        """Analyses overlap up to `workers`, each with its own log prefix."""
+        import threading
+
+        names = ["run1", "run2", "run3"]
+        for run_name in names:
+            prod_dir = tmp_path / run_name / "production"
+            prod_dir.mkdir(parents=True)
+            (prod_dir / "traj.dcd").write_text("trajectory")
+            (prod_dir / "topology.pdb").write_text("topology")
+
+        mock_find_spec.return_value = True
+        barrier = threading.Barrier(3, timeout=10)
+
+        def _fake(cmd, logger, prefix):
+            barrier.wait()  # only passes if all three run at once
+            return 0
+
+        mock_run_and_stream.side_effect = _fake
+        with patch("fastmdsimulation.reporting.analysis_bridge.get_logger"):
+            result = analyze_with_bridge(str(tmp_path), workers=3)
+
+        assert sorted(result) == [str(tmp_path / n) for n in names]
+        prefixes = sorted(
+            c.kwargs["prefix"] for c in mock_run_and_stream.call_args_list
+        )
+        assert prefixes == [f"[fastmda:{n}] " for n in names]
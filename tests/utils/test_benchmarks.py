@@ -0,0 +1,25 @@
+# tests/utils/test_benchmarks.py
+
+import json
+
+from fastmdsimulation.utils import benchmarks
+from fastmdsimulation.utils.benchmarks import load_benchmarks, record_benchmark
+
+
+class TestBenchmarks:
+    def test_short_stages_not_recorded(self):
+        record_benchmark("CUDA", 20000, 1000, 1.0, 2.0)
+        assert load_benchmarks() == {}
+
+    def test_file_is_per_host(self, monkeypatch):
+        monkeypatch.setattr(benchmarks.socket, "gethostname", lambda: "node7")
+        record_benchmark("CUDA", 1000, 100000, 20.0, 2.0)
+        assert benchmarks.benchmark_file().name == "node7.json"
+        assert json.loads(benchmarks.benchmark_file().read_text())["CUDA"]
+
+    def test_keeps_most_recent_entries(self, monkeypatch):
+        monkeypatch.setattr(benchmarks, "MAX_BENCHMARKS", 2)
+        for steps in (100000, 200000, 300000):
+            record_benchmark("CPU", 1000, steps, 20.0, 2.0)
+        rates = [e["ns_per_day"] for e in load_benchmarks()["CPU"]]
+        assert rates == [1728.0, 2592.0]
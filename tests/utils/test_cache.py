@@ -0,0 +1,97 @@
+import os
+
+from fastmdsimulation.utils.cache import (
+    cache_dir,
+    cache_enabled,
+    cache_root,
+    evict_lru,
+    hash_key,
+    link_or_copy,
+    sha256_file,
+    store_atomic,
+    touch,
+)
+
+
+class TestCacheLocation:
+    def test_env_cache_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("FASTMDS_CACHE_DIR", str(tmp_path / "c"))
+        assert cache_root() == tmp_path / "c"
+        assert cache_dir("pdbfixer").is_dir()
+
+    def test_xdg_fallback(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("FASTMDS_CACHE_DIR", raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert cache_root() == tmp_path / "fastmdsimulation"
+
+    def test_cache_can_be_disabled(self, monkeypatch):
+        monkeypatch.setenv("FASTMDS_CACHE", "off")
+        assert cache_enabled() is False
+        monkeypatch.setenv("FASTMDS_CACHE", "1")
+        assert cache_enabled() is True
+
+
+class TestCacheHelpers:
+    def test_hash_key_is_order_independent(self):
+        assert hash_key({"a": 1, "b": [1, 2]}) == hash_key({"b": [1, 2], "a": 1})
+        assert hash_key({"a": 1}) != hash_key({"a": 2})
+
+    def test_sha256_file(self, tmp_path):
+        p = tmp_path / "x.txt"
+        p.write_text("abc")
+        assert sha256_file(p).startswith("ba7816bf")
+
+    def test_store_and_link(self, tmp_path):
+        src = tmp_path / "src.pdb"
+        src.write_text("ATOM\n")
+        entry = tmp_path / "cache" / "k.pdb"
+        store_atomic(src, entry)
+        assert entry.read_text() == "ATOM\n"
+        assert not list(entry.parent.glob(".*.tmp"))
+
+        dst = tmp_path / "build" / "out.pdb"
+        dst.parent.mkdir()
+        dst.write_text("stale")
+        assert link_or_copy(entry, dst) in ("linked", "copied")
+        assert dst.read_text() == "ATOM\n"
+
+    def test_link_falls_back_to_copy(self, tmp_path, monkeypatch):
+        src = tmp_path / "a"
+        src.write_text("x")
+
+        def no_link(*args):
+            raise OSError("cross-device link")
+
+        monkeypatch.setattr(os, "link", no_link)
+        assert link_or_copy(src, tmp_path / "b") == "copied"
+        assert (tmp_path / "b").read_text() == "x"
+
+
+class TestEvictLru:
+    def _entry(self, root, name, size, mtime):
+        d = root / name
+        d.mkdir()
+        (d / "system.xml").write_bytes(b"x" * size)
+        os.utime(d, (mtime, mtime))
+        return d
+
+    def test_oldest_entries_go_first(self, tmp_path):
+        old = self._entry(tmp_path, "old", 100, 1000)
+        mid = self._entry(tmp_path, "mid", 100, 2000)
+        new = self._entry(tmp_path, "new", 100, 3000)
+        (tmp_path / ".tmp-inflight").write_bytes(b"y" * 1000)
+
+        removed = evict_lru(tmp_path, 200)
+
+        assert removed == [old]
+        assert mid.exists() and new.exists()
+        assert (tmp_path / ".tmp-inflight").exists()
+
+    def test_touch_refreshes_and_keep_is_respected(self, tmp_path):
+        a = self._entry(tmp_path, "a", 100, 1000)
+        b = self._entry(tmp_path, "b", 100, 2000)
+        touch(a)
+
+        assert evict_lru(tmp_path, 100) == [b]
+        assert evict_lru(tmp_path, 0, keep=[a]) == []
+        assert a.exists()
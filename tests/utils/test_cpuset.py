@@ -0,0 +1,72 @@
+# tests/utils/test_cpuset.py
+
+import os
+
+import pytest
+
+from fastmdsimulation.utils import cpuset
+from fastmdsimulation.utils.cpuset import (
+    available_cpus,
+    describe,
+    format_cpulist,
+    numa_nodes,
+    parse_cpulist,
+    partition,
+)
+
+
+@pytest.fixture
+def node(monkeypatch, tmp_path):
+    """A 16-CPU, 2-NUMA-node machine; returns a setter for the affinity mask."""
+    for n, cpus in ((0, "0-7"), (1, "8-15")):
+        d = tmp_path / f"node{n}"
+        d.mkdir()
+        (d / "cpulist").write_text(cpus + "\n")
+    monkeypatch.setattr(cpuset, "_NODE_DIR", tmp_path)
+    monkeypatch.delenv("SLURM_CPUS_PER_TASK", raising=False)
+    mask = {"cpus": set(range(16))}
+    monkeypatch.setattr(
+        os, "sched_getaffinity", lambda pid: mask["cpus"], raising=False
+    )
+    return lambda cpus: mask.update(cpus=set(cpus))
+
+
+class TestCpuList:
+    def test_round_trip(self):
+        assert parse_cpulist("0-3, 8,10-11") == [0, 1, 2, 3, 8, 10, 11]
+        assert format_cpulist([11, 0, 1, 2, 3, 8, 10]) == "0-3,8,10-11"
+
+
+class TestBudget:
+    def test_slurm_cpus_per_task_caps_affinity(self, node, monkeypatch):
+        monkeypatch.setenv("SLURM_CPUS_PER_TASK", "4")
+        assert available_cpus() == [0, 1, 2, 3]
+        monkeypatch.setenv("SLURM_CPUS_PER_TASK", "64")
+        assert len(available_cpus()) == 16
+
+    def test_affinity_mask(self, node):
+        node(range(4, 12))
+        assert available_cpus() == list(range(4, 12))
+        assert numa_nodes() == {0: [4, 5, 6, 7], 1: [8, 9, 10, 11]}
+
+
+class TestPartition:
+    def test_disjoint_and_numa_local(self, node):
+        sets = partition(4)
+        assert sets == [
+            list(range(0, 4)),
+            list(range(8, 12)),
+            list(range(4, 8)),
+            list(range(12, 16)),
+        ]
+        assert describe(sets[1]) == "cpus 8-11 on NUMA node 1"
+
+    def test_set_spanning_nodes_only_when_needed(self, node):
+        node(range(4, 12))  # 4 CPUs on each node
+        assert partition(1, 8) == [list(range(4, 12))]
+        assert describe([6, 7, 8]) == "cpus 6-8 on NUMA nodes 0-1"
+
+    def test_oversubscription_overlaps(self, node):
+        node(range(4))
+        sets = partition(3, 2)
+        assert sets == [[0, 1], [2, 3], [0, 1]]
@@ -4,7 +4,7 @@ import logging
 import os
 from unittest.mock import patch
 
-from fastmdsimulation.utils.logging import attach_file_logger
+from fastmdsimulation.utils.logging import attach_file_logger, detach_file_logger
 
 
 class TestAttachFileLogger:
@@ -61,3 +61,16 @@ class TestAttachFileLogger:
         ]
         assert len(file_handlers) == 1
         assert file_handlers[0].level == logging.ERROR
+
+    def test_detach_file_logger(self, tmp_path):
+        """Test detach_file_logger stops writing to the project log."""
+        log_file = tmp_path / "test.log"
+        logger = attach_file_logger(str(log_file))
+        handlers = len(logger.handlers)
+
+        detach_file_logger()
+        logger.warning("after detach")
+        detach_file_logger()  # no-op without a file logger
+
+        assert len(logger.handlers) == handlers - 1
+        assert "after detach" not in log_file.read_text()
@@ -0,0 +1,38 @@
+# tests/utils/test_filelock.py
+
+import sys
+import threading
+import time
+
+import pytest
+
+from fastmdsimulation.utils.filelock import FileLock
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="flock semantics")
+class TestFileLock:
+    def test_creates_parent_and_releases(self, tmp_path):
+        path = tmp_path / "a" / "b" / ".lock"
+        with FileLock(path) as lock:
+            assert path.exists()
+            assert lock._fh is not None
+        assert lock._fh is None
+
+    def test_excludes_concurrent_holders(self, tmp_path):
+        path = tmp_path / ".lock"
+        events = []
+
+        def hold(tag):
+            with FileLock(path):
+                events.append(f"{tag}-in")
+                time.sleep(0.05)
+                events.append(f"{tag}-out")
+
+        threads = [threading.Thread(target=hold, args=(t,)) for t in "ab"]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert events[0][0] == events[1][0]
+        assert events[2][0] == events[3][0]